@@ -203,6 +203,17 @@ add_tool(
 )
 
 
+add_tool(
+    n,
+    label="  Write Presets Audit",
+    key="Write_Presets_Audit",
+    module="LGA_Write_Presets_Audit",
+    attr="main",
+    icon=icon_RnW,
+    context=None,
+)
+
+
 add_tool(
     n,
     label="  Write Focus",
@@ -1,10 +1,53 @@
 """
 _______________________________________________________________________
 
-  LGA_MediaManager_FileScanner v2.43 | Lega
+  LGA_MediaManager_FileScanner v2.53 | Lega
 
   Escaneo del proyecto, tabla de medias y relink de archivos offline.
 
+  v2.51: La normalizacion propia -sin normpath- se reemplaza por la de
+         LGA_MediaManager_pathkey, la misma que usa el escaneo: una
+         ruta con ./ o con barra final, o una carpeta del proyecto
+         escrita con barra final, ya no dan dos claves distintas. El
+         %04d de los Reads offline, las carpetas del modo Watch y el
+         commonpath contra el proyecto pasan por las claves de
+         pathkey en vez de re.sub y replace().lower() sueltos.
+         is_sequence_match usa patrones compilados, y add_file_to_table
+         deja de armar un item por fila que nunca iba a la tabla.
+  v2.48: Boton Watch en el pie, apagado por defecto. Prendido, vigila
+         las carpetas que recorrio el escaneo -inotify en Linux,
+         fecha de la carpeta en el resto- y cuando algo cambia
+         re-lista solo esas carpetas en el pool y reemplaza solo sus
+         filas: una secuencia que aterriza, un render que termina o
+         un archivo borrado a mano se ven sin Rescan. Los avisos
+         llegan juntados en tandas, y si llega una mientras corre un
+         re-listado o una operacion, se suma a la siguiente. Una
+         fila con Read cuyo archivo desaparecio no se pierde: vuelve
+         como Offline. Copy to y Delete re-listan al terminar las
+         carpetas que tocaron, con Watch prendido o no.
+  v2.47: Columna Missing: cuantos frames le faltan a la secuencia
+         adentro de su rango, ordenable, con los tramos en el tooltip.
+         search_unmatched_reads arma los mismos tramos para los Reads
+         de afuera de las locations, y de ahi sale tambien si la
+         carpeta se puede borrar, en vez del min/max que tenia.
+  v2.46: Pastilla Changed, que aparece cuando hay algo distinto
+         respecto del escaneo anterior de este script: archivos nuevos,
+         borrados, secuencias con otro rango y filas que cambiaron de
+         estado. Filtra como las demas, cada fila dice que le paso en
+         el tooltip del path, y las borradas -que no tienen fila- van
+         en el tooltip de la pastilla. Solo se compara un escaneo que
+         termino entero.
+  v2.45: Boton Duplicates (Alt+U). Corre como una tanda mas, con su
+         ventana de progreso y su X, y al terminar deja a la vista solo
+         las filas duplicadas con sus copias en el tooltip del path, y
+         un cartel con los grupos, la location de cada copia y el
+         espacio que se recupera. Total o Rescan vuelven a la tabla
+         entera.
+  v2.44: Columnas Size y Modified, que ordenan por el numero y no por
+         el texto. El pie suma los totales de disco por estado
+         -"Unused: 412 GB" es lo que libera un Delete- y, en el
+         tooltip, por location. Las filas de Reads sin escanear sacan
+         el dato del mismo os.scandir que ya cuenta los frames.
   v2.43: Suma on_scan_failed: el cartel de que el escaneo se corto por
          un error, con el detalle y la referencia al log.
   v2.42: Sin cambios propios: acompana la version de la tool, que
@@ -290,6 +333,7 @@ QPoint = QtCore.QPoint
 QSize = QtCore.QSize
 QTimer = QtCore.QTimer
 QThread = QtCore.QThread
+QItemSelectionModel = QtCore.QItemSelectionModel
 Signal = QtCore.Signal
 QObject = QtCore.QObject
 QRunnable = QtCore.QRunnable
@@ -325,6 +369,7 @@ def _is_inside(hijo, padre):
         return False
 import LGA_MediaManager_config as mm_config
 import LGA_MediaManager_paths as mm_paths
+import LGA_MediaManager_pathkey as mm_pathkey
 from LGA_MediaManager_config import get_read_path
 
 try:
@@ -342,11 +387,19 @@ TOOLTIPS = {
     "reveal": "Abre la carpeta en el explorador del sistema",
     "relink": "Busca el archivo y reapunta el Read",
     "copy_to": "Copia a una de las locations con Copy to",
+    "duplicates": (
+        "Busca archivos y secuencias identicos byte a byte entre las locations.\n"
+        "Total vuelve a mostrar todo"
+    ),
     "delete": "Manda el archivo a la papelera",
     "settings": "Ajustes del Media Manager",
     # La ✕ del buscador.
     "search_clear": "Limpiar",
     "rescan": "Vuelve a escanear el proyecto desde cero",
+    "watch": (
+        "Vigila las carpetas del escaneo y actualiza solo las filas que\n"
+        "cambian, sin Rescan"
+    ),
     "path_scroll": (
         "Corre el path para ver el final.\n"
         "Aparece cuando el mas largo no entra en su columna"
@@ -357,6 +410,7 @@ TOOLTIPS = {
     "pill_unused": "Solo los archivos que existen y ningun Read usa",
     "pill_outside": "Solo los archivos que estan afuera",
     "pill_online": "Solo los archivos disponibles y usados por un Read",
+    "pill_changed": "Solo lo que cambio desde el ultimo escaneo de este script",
 }
 
 # Los dos extremos donde va una accion adentro de un QLineEdit. Se resuelven
@@ -415,6 +469,12 @@ COL_STATUS_MIN_WIDTH = 84
 COL_READ_EXTRA = 0
 COL_STATUS_EXTRA = 5
 COL_PATH_MIN_WIDTH = 300
+# Size y Modified tambien se miden; esto es solo el piso.
+COL_SIZE_MIN_WIDTH = 72
+COL_MODIFIED_MIN_WIDTH = 120
+COL_MISSING_MIN_WIDTH = 72
+# Cuantos tramos faltantes se listan en el tooltip antes de resumir el resto.
+MISSING_TOOLTIP_RUNS = 20
 # Lo mas angosta que se deja la columna del path en pantalla. No es lo que el
 # path NECESITA -eso se mide- sino hasta donde se la deja comprimir antes de
 # que deje de ser legible; de ahi en mas la diferencia la cubre su barra.
@@ -504,6 +564,10 @@ RESCAN_FONT_SIZE = 13
 # una vuelta cada ~0,8 s, que es la del prototipo.
 RESCAN_SPIN_MS = 24
 RESCAN_SPIN_STEP = 11.0
+# Cada cuanto se reintenta un re-listado que llego con el escaneo, una tanda o
+# un relink corriendo: esos recorren la tabla por ruta y no se les cambian las
+# filas en el medio.
+WATCH_RETRY_MS = 500
 
 # Tamano de letra de la tabla, en PIXELES. Iba en pt, que Qt convierte con el
 # DPI logico del sistema: 72 en macOS y 96 en Windows, o sea que el mismo
@@ -512,12 +576,15 @@ RESCAN_SPIN_STEP = 11.0
 DEFAULT_FONT_SIZE = 13
 
 
-def normalize_path_for_comparison(file_path):
-    """
-    Normaliza una ruta de archivo para comparacion
-    Convierte a minusculas y reemplaza barras invertidas por barras normales
-    """
-    return file_path.replace("\\", "/").lower()
+# Una sola normalizacion para todo el Media Manager, memorizada. La que habia
+# aca no pasaba por normpath y la de utils si: una ruta con ./ o con barra
+# final daba una clave en la tabla y otra en el escaneo.
+normalize_path_for_comparison = mm_pathkey.normalize
+
+# Lo que is_sequence_match le saca a cada lado antes de comparar: corre una vez
+# por Read y por secuencia, y compilar el patron en cada vuelta se notaba.
+_NUMERALES_RE = re.compile(r"#+")
+_RELLENO_RE = re.compile(r"%\d+d")
 
 
 # Agrega el directorio send2trash a sys.path
@@ -546,19 +613,49 @@ from LGA_MediaManager_utils import (
     TransparentTextDelegate,
     CopyWorker,
     DeleteWorker,
+    DuplicateWorker,
+    SnapshotWorker,
+    WatchWorker,
+    DirectoryRefreshWorker,
     ProgressWindow,
     expand_sequence,
+    row_key,
+    split_range,
     COL_PATH,
     COL_READ,
     COL_STATUS,
     COL_FOLDER_DELETE,
     COL_SEQUENCE,
     COL_NUM,
+    COL_SIZE,
+    COL_MODIFIED,
+    COL_MISSING,
     READ_NONE,
+    format_size,
+    format_mtime,
 )
 
 # Importar SettingsWindow desde settings
 from LGA_MediaManager_settings import SettingsWindow
+from LGA_ToolPack_FrameRuns import (
+    frame_runs,
+    missing_runs,
+    count_frames,
+    format_runs,
+)
+
+# Las columnas que no se arrastran a mano: sus anchos los decide la
+# herramienta -tres fijas o medidas sobre su contenido y el path con todo el
+# sobrante-, asi que un arrastre solo podia desarmarlos y dejar huecos.
+FIXED_COLUMNS = (
+    COL_PATH,
+    COL_NUM,
+    COL_READ,
+    COL_STATUS,
+    COL_SIZE,
+    COL_MODIFIED,
+    COL_MISSING,
+)
 
 
 def _rango_original(read_node_name):
@@ -858,9 +955,34 @@ class FileScanner(QWidget):
         self.status_filter = "all"
         self.search_query = ""
         self.status_pills = []
+        # Con la busqueda de duplicados hecha: {ruta de fila: las rutas de sus
+        # copias}. Mientras no sea None la tabla muestra solo esas filas, y es
+        # un tercer filtro que se suma con AND a los otros dos.
+        self.duplicate_groups = None
+        # Lo que cambio desde el escaneo anterior de este script: {ruta de
+        # fila: que le paso}. None hasta que llega el primer diff. Las rutas
+        # borradas no tienen fila y van aparte, en el tooltip de la pastilla.
+        self.changed_rows = None
+        self.snapshot_worker = None
+        # Si el ultimo escaneo llego a entregar filas. Un escaneo cancelado o
+        # caido no se compara ni se guarda: contra una tabla incompleta, todo
+        # lo que falta se leeria como borrado.
+        self._scan_ok = False
         # Un escaneo por vez: dos ScannerWorker escribiendo sobre la misma
         # tabla se pisan las filas.
         self._scan_running = False
+        # Cuenta los escaneos. Un re-listado que arranco antes de un Rescan
+        # trae filas de la tabla vieja, y se lo reconoce por este numero.
+        self._scan_generation = 0
+        # Modo Watch: las carpetas que recorrio el ultimo escaneo, el worker
+        # que las vigila -en un pool propio, porque no termina nunca- y el
+        # re-listado en curso con las carpetas que esperan el siguiente.
+        self.watched_dirs = []
+        self.watch_worker = None
+        self._watch_pool = None
+        self.refresh_worker = None
+        self._refresh_pending = set()
+        self._refresh_retry = False
         self.load_settings()  # Cargar settings del archivo .ini
         # El tema y el tamano de letra salen del .ini, asi que se resuelven
         # ANTES de armar la UI: la hoja de la tabla los usa al construirse.
@@ -917,7 +1039,7 @@ class FileScanner(QWidget):
         # ------------------------------------------------------------------
         #                      Barra de herramientas
         # ------------------------------------------------------------------
-        # Cinco botones con icono + texto + el atajo escrito al lado, un
+        # Seis botones con icono + texto + el atajo escrito al lado, un
         # separador antes de Delete, y Settings a la derecha con texto y el
         # mismo estilo que los demas: antes era un engranaje pelado de 24x24
         # con la hoja puesta en 'border: none', que no se leia como boton.
@@ -955,6 +1077,11 @@ class FileScanner(QWidget):
         self.copy_button = self._make_toolbar_button(
             "Copy to…", "folder-input", "Alt + C", TOOLTIPS["copy_to"]
         )
+        # No toca disco para escribir -solo lee- asi que va del lado de los
+        # que no borran. Alt+U y no Alt+D: la D ya es Delete.
+        self.duplicates_button = self._make_toolbar_button(
+            "Duplicates", "copy", "Alt + U", TOOLTIPS["duplicates"]
+        )
         self.delete_button = self._make_toolbar_button(
             "Delete", "trash-2", "Alt + D", TOOLTIPS["delete"], peligro=True
         )
@@ -985,6 +1112,7 @@ class FileScanner(QWidget):
         self.go_to_read_button.clicked.connect(self.go_to_read)
         self.reveal_button.clicked.connect(self.reveal_selected)
         self.relink_button.clicked.connect(self.relink)
+        self.duplicates_button.clicked.connect(self.find_duplicates)
         self.delete_button.clicked.connect(self.delete_selected)
         self.settings_button.clicked.connect(self.show_settings_window)
 
@@ -998,6 +1126,7 @@ class FileScanner(QWidget):
             (self.reveal_button, "R"),
             (self.relink_button, "L"),
             (self.copy_button, "C"),
+            (self.duplicates_button, "U"),
             (self.delete_button, "D"),
         ):
             atajo = QShortcut(QKeySequence("Alt+%s" % letra), self)
@@ -1010,6 +1139,7 @@ class FileScanner(QWidget):
         main_buttons_layout.addWidget(self.reveal_button)
         main_buttons_layout.addWidget(self.relink_button)
         main_buttons_layout.addWidget(self.copy_button)
+        main_buttons_layout.addWidget(self.duplicates_button)
 
         # Delete va del otro lado de un separador: es el unico de la fila que
         # toca archivos en disco.
@@ -1042,11 +1172,22 @@ class FileScanner(QWidget):
 
         # Crear la tabla
         self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        # El '#' va ultimo en la lista porque su indice LOGICO es el 5. Lo que
-        # lo pone primero en pantalla es el moveSection de mas abajo.
+        self.table.setColumnCount(9)
+        # El '#' va en el indice LOGICO 5. Lo que lo pone primero en pantalla
+        # es el moveSection de mas abajo. Size, Modified y Missing van
+        # despues: se agregaron al final para no correr ningun indice.
         self.table.setHorizontalHeaderLabels(
-            ["File Path", "Read", "Status", "Folder_Delete", "Sequence", "#"]
+            [
+                "File Path",
+                "Read",
+                "Status",
+                "Folder_Delete",
+                "Sequence",
+                "#",
+                "Size",
+                "Modified",
+                "Missing",
+            ]
         )
         # Cabecera propia: la nativa no sabe poner el icono de orden despues
         # del texto ni pintarlo con el color de acento en la columna ordenada.
@@ -1078,7 +1219,7 @@ class FileScanner(QWidget):
         # divisor.
         cabecera = self.table.horizontalHeader()
         cabecera.setStretchLastSection(False)
-        for columna in (COL_PATH, COL_NUM, COL_READ, COL_STATUS):
+        for columna in FIXED_COLUMNS:
             cabecera.setSectionResizeMode(columna, QHeaderView.Fixed)
         # Al reordenar hay que rehacer el '#': cuenta lo que se ve, de arriba
         # hacia abajo. Va por layoutChanged y no por sortIndicatorChanged
@@ -1374,7 +1515,7 @@ class FileScanner(QWidget):
         Lo mas angosta que puede quedar la ventana: lo que mide la barra.
 
         Manda SOLO la barra de herramientas. Es la unica fila que de verdad no
-        se puede achicar: son seis botones de ancho fijo que no envuelven, y si
+        se puede achicar: son siete botones de ancho fijo que no envuelven, y si
         no entran el ultimo -justamente el de los ajustes- se va de la vista.
 
         El pie ya NO cuenta. Contaba, y era la fila mas ancha de las dos por
@@ -1386,7 +1527,7 @@ class FileScanner(QWidget):
         if not getattr(self, "toolbar_buttons", None):
             return
         ancho = sum(datos["boton"].width() for datos in self.toolbar_buttons)
-        # Los cinco espacios entre botones, mas el del separador.
+        # Los seis espacios entre botones, mas el del separador.
         ancho += BUTTON_SPACING * (len(self.toolbar_buttons) + 1)
         ancho += 1  # el separador vertical
 
@@ -1422,6 +1563,10 @@ class FileScanner(QWidget):
             ancho += entrada["texto"].sizeHint().width()
         # La separacion entre entradas y la que las despega del Rescan.
         ancho += FOOTER_GAP * len(entradas)
+        if getattr(self, "totals_label", None) is not None:
+            ancho += self.totals_label.sizeHint().width() + FOOTER_GAP
+        if getattr(self, "watch_button", None) is not None:
+            ancho += self.watch_button.sizeHint().width() + FOOTER_GAP
         if getattr(self, "rescan_button", None) is not None:
             ancho += self.rescan_button.sizeHint().width()
         return ancho
@@ -1486,6 +1631,13 @@ class FileScanner(QWidget):
                     estado, estado, TOOLTIPS["pill_%s" % estado.lower()]
                 )
             )
+        # Changed no es un estado: es lo que cambio desde el escaneo anterior.
+        # Arranca escondida y aparece sola cuando hay algo que mostrar.
+        self.changed_pill = self._make_status_pill(
+            "changed", "Changed", TOOLTIPS["pill_changed"], icono="info"
+        )
+        self.changed_pill.hide()
+        fila.addWidget(self.changed_pill)
 
         fila.addStretch(1)
 
@@ -1748,6 +1900,75 @@ class FileScanner(QWidget):
         item.setBackground(QColor(self.status_bg(estado)))
         return item
 
+    def set_row_disk(self, row, info):
+        """
+        Escribe el tamano y la fecha de una fila, con su clave de orden.
+
+        `info` es el octavo elemento de la tupla del escaneo: {"size",
+        "mtime"}, sacado del stat que el listado ya trajo. Se ordena por el
+        numero en Qt.UserRole y no por el texto: por texto, "9 MB" iba despues
+        que "412 GB". Sin dato -un Offline- la clave es -1, asi que esas filas
+        quedan juntas en una punta y no mezcladas con los archivos vacios.
+        """
+        info = info or {}
+        tamano = info.get("size")
+        fecha = info.get("mtime")
+        for columna, texto, clave, alineacion in (
+            (
+                COL_SIZE,
+                format_size(tamano),
+                -1 if tamano is None else tamano,
+                Qt.AlignVCenter | Qt.AlignRight,
+            ),
+            (
+                COL_MODIFIED,
+                format_mtime(fecha),
+                -1 if fecha is None else fecha,
+                Qt.AlignVCenter | Qt.AlignLeft,
+            ),
+        ):
+            item = SortKeyItem(texto)
+            item.setData(Qt.UserRole, clave)
+            item.setTextAlignment(alineacion)
+            item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+            self.table.setItem(row, columna, item)
+
+    def set_row_missing(self, row, info):
+        """
+        La columna Missing: cuantos frames le faltan a la secuencia.
+
+        El numero es la cuenta de frames, no de huecos -un hueco de 40 frames
+        pesa mas que dos de uno- y ordena por ese mismo numero. Los tramos van
+        en el tooltip. Un archivo suelto o una secuencia que no se pudo leer
+        no tiene dato y ordena aparte, con -1.
+        """
+        faltantes = (info or {}).get("missing")
+        if faltantes is None:
+            texto, clave, tooltip = "", -1, ""
+        else:
+            clave = count_frames(faltantes)
+            texto = str(clave) if clave else ""
+            tooltip = (
+                "Missing frames: %s"
+                % format_runs(faltantes, MISSING_TOOLTIP_RUNS)
+                if clave
+                else ""
+            )
+        item = SortKeyItem(texto)
+        item.setData(Qt.UserRole, clave)
+        item.setTextAlignment(Qt.AlignVCenter | Qt.AlignRight)
+        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+        item.setToolTip(tooltip)
+        self.table.setItem(row, COL_MISSING, item)
+
+    def row_size(self, row):
+        """Los bytes de una fila, o None si no se conocen."""
+        item = self.table.item(row, COL_SIZE)
+        clave = item.data(Qt.UserRole) if item is not None else None
+        if clave is None or clave < 0:
+            return None
+        return clave
+
     def repaint_status_column(self):
         """
         Repinta los fondos de Status con el tema y el shot folder actuales.
@@ -1852,14 +2073,69 @@ class FileScanner(QWidget):
                 cuentas[estado] += 1
         for datos in self.status_pills:
             clave = datos["clave"]
-            datos["contador"].setText(
-                str(total if clave == "all" else cuentas.get(clave, 0))
-            )
+            if clave == "changed":
+                cuenta = len(self.changed_rows or ())
+            else:
+                cuenta = total if clave == "all" else cuentas.get(clave, 0)
+            datos["contador"].setText(str(cuenta))
         self.apply_status_bar_stylesheet()
+        self.update_size_totals()
+
+    def update_size_totals(self):
+        """
+        Los totales de disco del pie: por estado y, en el tooltip, por
+        location.
+
+        Salen de los tamanos que ya tiene cada fila, o sea del escaneo: no se
+        vuelve a tocar el disco. Van por estado porque es la pregunta con la
+        que se abre la herramienta antes de borrar -"Unused: 412 GB" es lo
+        que se libera- y por location para saber de donde sale.
+        """
+        etiqueta = getattr(self, "totals_label", None)
+        if etiqueta is None or getattr(self, "table", None) is None:
+            return
+        por_estado = {estado: 0 for estado in STATUS_ORDER}
+        por_location = {}
+        carpetas = self.scan_folders
+        for row in range(self.table.rowCount()):
+            tamano = self.row_size(row)
+            if not tamano:
+                continue
+            estado = self.row_status(row)
+            if estado in por_estado:
+                por_estado[estado] += tamano
+            location = self.location_of(self.row_path(row), carpetas)
+            por_location[location] = por_location.get(location, 0) + tamano
+
+        # Offline no tiene bytes: si se lo mostrara, diria siempre 0.
+        partes = [
+            "%s: %s" % (estado, format_size(por_estado[estado]))
+            for estado in STATUS_ORDER
+            if por_estado[estado]
+        ]
+        etiqueta.setText("   ".join(partes))
+        renglones = [
+            "%s: %s" % (carpeta or "Outside every scan location", format_size(b))
+            for carpeta, b in sorted(por_location.items())
+        ]
+        etiqueta.setToolTip("\n".join(renglones))
+
+    def location_of(self, ruta, carpetas=None):
+        """La scan location que contiene `ruta`, o "" si no esta en ninguna."""
+        if carpetas is None:
+            carpetas = self.scan_folders
+        return next((c for c in carpetas or () if _is_inside(ruta, c)), "")
 
     def on_pill_clicked(self, clave):
-        """Cambia el filtro de estado. Total apaga el filtro."""
+        """
+        Cambia el filtro de estado. Total apaga el filtro.
+
+        Total apaga tambien el de duplicados: es el "mostrame todo" de la
+        ventana, y sin eso no habia forma de salir de esa vista sin Rescan.
+        """
         self.status_filter = clave
+        if clave == "all":
+            self.clear_duplicates()
         self.apply_status_bar_stylesheet()
         self.apply_filters()
 
@@ -1893,20 +2169,27 @@ class FileScanner(QWidget):
         """
         Muestra y esconde filas segun el estado elegido y lo buscado.
 
-        Los dos filtros se combinan con AND. La busqueda es coincidencia
-        parcial sobre el path completo, sin distinguir mayusculas.
+        Los filtros se combinan con AND. La busqueda es coincidencia parcial
+        sobre el path completo, sin distinguir mayusculas.
         """
         if getattr(self, "table", None) is None:
             return
         buscado = (self.search_query or "").lower()
         visibles = 0
         for row in range(self.table.rowCount()):
-            pasa_estado = (
-                self.status_filter == "all"
-                or self.row_status(row) == self.status_filter
-            )
+            if self.status_filter == "changed":
+                pasa_estado = self.row_path(row) in (self.changed_rows or ())
+            else:
+                pasa_estado = (
+                    self.status_filter == "all"
+                    or self.row_status(row) == self.status_filter
+                )
             pasa_texto = not buscado or buscado in self.row_path(row).lower()
-            visible = pasa_estado and pasa_texto
+            pasa_duplicado = (
+                self.duplicate_groups is None
+                or self.row_path(row) in self.duplicate_groups
+            )
+            visible = pasa_estado and pasa_texto and pasa_duplicado
             self.table.setRowHidden(row, not visible)
             if visible:
                 visibles += 1
@@ -2032,6 +2315,22 @@ class FileScanner(QWidget):
 
         fila.addStretch(1)
 
+        # Los totales de disco. Los escribe update_size_totals, que corre cada
+        # vez que cambian los contadores de las pastillas.
+        self.totals_label = QLabel("", self)
+        fila.addWidget(self.totals_label, 0, Qt.AlignVCenter)
+
+        # Watch va apagado al abrir: vigilar es un hilo corriendo todo el
+        # tiempo que la ventana este abierta, y eso se pide, no se regala.
+        self.watch_button = QPushButton("Watch", self)
+        self.watch_button.setCheckable(True)
+        self.watch_button.setToolTip(TOOLTIPS["watch"])
+        self.watch_button.setFixedHeight(RESCAN_HEIGHT)
+        self.watch_button.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        self.watch_button.setFocusPolicy(Qt.NoFocus)
+        self.watch_button.toggled.connect(self.toggle_watch)
+        fila.addWidget(self.watch_button)
+
         self.rescan_button = QPushButton("Rescan", self)
         self.rescan_button.setToolTip(TOOLTIPS["rescan"])
         self.rescan_button.setFixedHeight(RESCAN_HEIGHT)
@@ -2072,6 +2371,12 @@ class FileScanner(QWidget):
             )
         self.update_legend_texts()
 
+        if getattr(self, "totals_label", None) is not None:
+            self.totals_label.setStyleSheet(
+                "QLabel { color: %s; font-size: %dpx; background: transparent; }"
+                % (Paleta.TEXT_DIM, FOOTER_LEGEND_FONT_SIZE)
+            )
+
         if getattr(self, "rescan_button", None) is not None:
             izquierda = RESCAN_PADDING + RESCAN_ICON_SIZE + PILL_GAP
             self.rescan_button.setStyleSheet(
@@ -2120,6 +2425,45 @@ class FileScanner(QWidget):
             if getattr(self, "_rescan_timer", None) is not None:
                 self._pintar_rescan()
 
+        if getattr(self, "watch_button", None) is not None:
+            # La misma hoja que Rescan, con el icono por setIcon -este no
+            # gira- y el estado prendido en el color de acento.
+            self.watch_button.setStyleSheet(
+                "QPushButton {"
+                " background-color: %(fondo)s;"
+                " border: 1px solid %(borde)s;"
+                " border-radius: %(radio)dpx;"
+                " color: %(texto)s;"
+                " font-size: %(letra)dpx;"
+                " %(semibold)s"
+                " padding-left: %(pad)dpx;"
+                " padding-right: %(pad)dpx;"
+                " }"
+                "QPushButton:hover:!checked {"
+                " background-color: %(hover)s; border-color: %(borde_hover)s; }"
+                "QPushButton:checked {"
+                " background-color: %(acento)s; border-color: %(acento)s;"
+                " color: %(sobre_acento)s; }"
+                "QPushButton:checked:hover {"
+                " background-color: %(acento_hover)s;"
+                " border-color: %(acento_hover)s; }"
+                % {
+                    "fondo": Paleta.SURFACE_RAISED,
+                    "borde": Paleta.BORDER_STRONG,
+                    "radio": Metric.RADIUS_CONTROL,
+                    "texto": Paleta.TEXT_STRONG,
+                    "letra": RESCAN_FONT_SIZE,
+                    "pad": RESCAN_PADDING,
+                    "hover": Paleta.SURFACE_HOVER,
+                    "borde_hover": Paleta.BORDER_HOVER,
+                    "acento": Paleta.ACCENT,
+                    "acento_hover": Paleta.ACCENT_HOVER,
+                    "sobre_acento": Paleta.TEXT_ON_ACCENT,
+                    "semibold": UIStyle.semibold_css(),
+                }
+            )
+            self.refresh_watch_icon()
+
         # El pie puede ser mas ancho que la barra, asi que el minimo de la
         # ventana se recalcula aca tambien: cuando la barra lo fijo, el pie
         # todavia no existia.
@@ -2230,9 +2574,198 @@ class FileScanner(QWidget):
         # Sin esto, un archivo recien copiado a una scan location no aparece:
         # el dedup de la sesion lo sigue dando por procesado.
         self._processed_files_session = set()
+        # Los duplicados se calcularon sobre la tabla vieja.
+        self.duplicate_groups = None
+        # Lo que esperaba re-listarse queda cubierto por el escaneo entero.
+        self._refresh_pending = set()
         self.update_status_counts()
         self.scan_project()
 
+    # ----------------------------------------------------------------------
+    #                              Modo Watch
+    # ----------------------------------------------------------------------
+    # Vigilar y re-listar son dos cosas separadas. WatchWorker solo dice que
+    # carpetas cambiaron; DirectoryRefreshWorker las vuelve a listar por el
+    # mismo find_files del escaneo; y on_directories_refreshed cambia las
+    # filas de esas carpetas y ninguna otra. El re-listado lo usan tambien
+    # Copy to y Delete, que saben que carpetas tocaron sin vigilar nada.
+
+    def refresh_watch_icon(self):
+        """El ojo de Watch, en el color que le toca segun este prendido."""
+        if getattr(self, "watch_button", None) is None:
+            return
+        Paleta = (getattr(self, "UI", None) or UIStyle.theme(None)).Color
+        color = (
+            Paleta.TEXT_ON_ACCENT if self.watch_button.isChecked() else Paleta.TEXT
+        )
+        self.watch_button.setIcon(tinted_icon("eye", color, RESCAN_ICON_SIZE))
+        self.watch_button.setIconSize(QSize(RESCAN_ICON_SIZE, RESCAN_ICON_SIZE))
+
+    def toggle_watch(self, activo):
+        """Prende o apaga el modo Watch desde el boton del pie."""
+        self.refresh_watch_icon()
+        if activo:
+            self.start_watch()
+        else:
+            self.stop_watch()
+
+    def start_watch(self):
+        """
+        Arranca a vigilar las carpetas del ultimo escaneo.
+
+        Se llama tambien al terminar cada escaneo con Watch prendido: el
+        escaneo nuevo puede haber recorrido otras carpetas, y el worker viejo
+        se cambia por uno con la lista nueva.
+        """
+        self.stop_watch()
+        if not self.watched_dirs:
+            return
+        if self._watch_pool is None:
+            self._watch_pool = QThreadPool(self)
+            self._watch_pool.setMaxThreadCount(1)
+        self.watch_worker = WatchWorker(self.watched_dirs)
+        self.watch_worker.signals.changed.connect(self.refresh_directories)
+        self._watch_pool.start(self.watch_worker)
+
+    def stop_watch(self):
+        if self.watch_worker is not None:
+            try:
+                self.watch_worker.cancel()
+            except (RuntimeError, AttributeError):
+                pass
+            self.watch_worker = None
+
+    def scan_roots(self):
+        """Las carpetas que escanea el escaneo, con su misma caida al shot."""
+        return list(self.scan_folders or [self.project_folder])
+
+    def refresh_directories(self, carpetas):
+        """
+        Pide re-listar estas carpetas. Las de afuera del escaneo se ignoran.
+
+        Las de afuera no se re-listan porque el escaneo tampoco las lista:
+        find_files sobre una carpeta cualquiera traeria como Unused todo lo
+        que hay ahi, que el escaneo entero no mostraria nunca.
+        """
+        raices = self.scan_roots()
+        for carpeta in carpetas:
+            if any(
+                os.path.normcase(os.path.normpath(carpeta))
+                == os.path.normcase(os.path.normpath(raiz))
+                or _is_inside(carpeta, raiz)
+                for raiz in raices
+            ):
+                self._refresh_pending.add(carpeta)
+        self._flush_refresh()
+
+    def _flush_refresh(self):
+        """
+        Arranca el re-listado de lo pendiente, o lo deja para despues.
+
+        Uno por vez: lo que llega mientras corre uno se junta y sale en el
+        siguiente, asi que una rafaga nunca apila workers.
+        """
+        if not self._refresh_pending:
+            return
+        if self.refresh_worker is not None or self.operacion_en_curso() is not None:
+            # Un solo reintento armado por vez, por mas avisos que lleguen.
+            if not self._refresh_retry:
+                self._refresh_retry = True
+                QTimer.singleShot(WATCH_RETRY_MS, self._retry_refresh)
+            return
+        carpetas, self._refresh_pending = self._refresh_pending, set()
+        self.refresh_worker = DirectoryRefreshWorker(self, carpetas)
+        self.refresh_worker.generacion = self._scan_generation
+        self.refresh_worker.signals.files_found.connect(self.on_directories_refreshed)
+        self.refresh_worker.signals.failed.connect(
+            lambda detalle: debug_print("El re-listado fallo: %s" % detalle)
+        )
+        self.refresh_worker.signals.finished.connect(self._on_refresh_finished)
+        QThreadPool.globalInstance().start(self.refresh_worker)
+
+    def _retry_refresh(self):
+        self._refresh_retry = False
+        self._flush_refresh()
+
+    def _on_refresh_finished(self):
+        self.refresh_worker = None
+        self._flush_refresh()
+
+    def on_directories_refreshed(self, data):
+        """
+        Cambia las filas de las carpetas re-listadas por las que llegaron.
+
+        Lo demas de la tabla no se toca. Una fila con Read cuyo archivo ya no
+        aparece vuelve como Offline, que es lo que diria un Rescan: el Read
+        sigue apuntando ahi. Lo que no se rehace es search_unmatched_reads,
+        que recorre todos los Reads del script.
+        """
+        carpetas, filas = data
+        worker = self.refresh_worker
+        if (
+            worker is None
+            or getattr(worker, "generacion", None) != self._scan_generation
+            or self._scan_running
+        ):
+            # Llego despues de un Rescan: son filas de la tabla anterior.
+            return
+        claves = set(normalize_path_for_comparison(c) for c in carpetas)
+        nuevas = {row_key(fila[0]): fila for fila in filas}
+        elegidas = set(self.row_path(fila) for fila in self.selected_rows())
+
+        self.table.setSortingEnabled(False)
+        a_sacar = []
+        perdidas = []
+        sesion = getattr(self, "_processed_files_session", set())
+        for fila in range(self.table.rowCount()):
+            ruta = self.row_path(fila)
+            if mm_pathkey.dir_key(ruta) not in claves:
+                continue
+            a_sacar.append(fila)
+            clave = row_key(ruta)
+            sesion.discard(clave)
+            nodos = self.row_read_names(fila)
+            if nodos and clave not in nuevas:
+                perdidas.append((ruta, nodos))
+        for fila in reversed(a_sacar):
+            self.table.removeRow(fila)
+
+        # Las que se fueron con Read vuelven por la rama de los Reads sueltos
+        # de add_file_to_table, que mira el disco y las marca Offline.
+        offline = []
+        for ruta, nodos in perdidas:
+            base, rango = split_range(ruta)
+            es_secuencia = "#" in base
+            offline.append(
+                (
+                    base,
+                    {base: nodos},
+                    es_secuencia,
+                    rango,
+                    True,
+                    False,
+                    es_secuencia,
+                    {"size": None, "mtime": None},
+                )
+            )
+        self.add_file_to_table(list(nuevas.values()) + offline)
+        self.table.setSortingEnabled(True)
+
+        # Los duplicados se calcularon sobre filas que pueden no estar mas.
+        self.clear_duplicates()
+        self.refresh_path_tooltips()
+        self.update_status_counts()
+        self.apply_filters()
+        if elegidas:
+            modelo = self.table.selectionModel()
+            for fila in range(self.table.rowCount()):
+                if self.row_path(fila) in elegidas:
+                    modelo.select(
+                        self.table.model().index(fila, COL_PATH),
+                        QItemSelectionModel.Select | QItemSelectionModel.Rows,
+                    )
+        self.update_button_states()
+
     # ----------------------------------------------------------------------
     #                     Lectura de la seleccion
     # ----------------------------------------------------------------------
@@ -2372,6 +2905,8 @@ class FileScanner(QWidget):
         # offline.
         self.relink_button.setEnabled(hay_seleccion)
         self.copy_button.setEnabled(todos_outside and hay_destinos)
+        # Duplicates no mira la seleccion: compara la tabla entera.
+        self.duplicates_button.setEnabled(self.table.rowCount() > 1)
         self.delete_button.setEnabled(ninguno_offline)
 
         self.refresh_toolbar_icons()
@@ -2715,7 +3250,14 @@ class FileScanner(QWidget):
         mostrara ni forma de pararlo: la ventana de progreso es hija de esta y
         desaparecia con ella.
         """
-        for atributo in ("_batch_worker", "relink_worker", "scanner_worker"):
+        for atributo in (
+            "_batch_worker",
+            "relink_worker",
+            "scanner_worker",
+            "snapshot_worker",
+            "watch_worker",
+            "refresh_worker",
+        ):
             worker = getattr(self, atributo, None)
             if worker is not None:
                 try:
@@ -2902,7 +3444,7 @@ class FileScanner(QWidget):
         # lo que no entra lo cubre la barra del path.
         encabezado = self.table.horizontalHeader()
         encabezado.setStretchLastSection(False)
-        for columna in (COL_PATH, COL_NUM, COL_READ, COL_STATUS):
+        for columna in FIXED_COLUMNS:
             encabezado.setSectionResizeMode(columna, QHeaderView.Fixed)
 
         # Ajustar el tamano de la ventana
@@ -3002,6 +3544,17 @@ class FileScanner(QWidget):
         self.table.setColumnWidth(COL_NUM, COL_NUM_WIDTH)
         self.table.setColumnWidth(COL_READ, self.read_column_width())
         self.table.setColumnWidth(COL_STATUS, self.status_column_width())
+        self.table.setColumnWidth(
+            COL_SIZE, self.text_column_width(COL_SIZE, COL_SIZE_MIN_WIDTH)
+        )
+        self.table.setColumnWidth(
+            COL_MODIFIED,
+            self.text_column_width(COL_MODIFIED, COL_MODIFIED_MIN_WIDTH),
+        )
+        self.table.setColumnWidth(
+            COL_MISSING,
+            self.text_column_width(COL_MISSING, COL_MISSING_MIN_WIDTH),
+        )
 
     def read_column_width(self):
         """Lo que mide el Read mas largo, con el aire de la celda."""
@@ -3022,6 +3575,34 @@ class FileScanner(QWidget):
             ancho + READ_CELL_PADDING * 2 + COL_READ_EXTRA,
         )
 
+    def text_column_width(self, columna, minimo):
+        """
+        Lo que mide el texto mas largo de una columna de datos, con su aire.
+
+        Size y Modified se miden igual que Read: el contenido se conoce entero
+        y lo que sobre ahi se lo saca al path.
+        """
+        if getattr(self, "table", None) is None:
+            return minimo
+        fuente = QFont(self.table.font())
+        fuente.setPixelSize(max(1, self.font_size - 1))
+        metrica = QFontMetrics(fuente)
+        ancho = 0
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, columna)
+            if item is not None:
+                ancho = max(ancho, horizontal_advance(metrica, item.text()))
+        # El titulo cuenta: con una tabla de puros "4 KB", la cabecera -que
+        # lleva ademas el icono de orden- quedaba cortada.
+        titulo = self.table.horizontalHeaderItem(columna)
+        ancho_titulo = (
+            horizontal_advance(metrica, titulo.text() if titulo else "")
+            + HEADER_PADDING * 2
+            + HEADER_ICON_GAP
+            + HEADER_ICON_SIZE
+        )
+        return max(minimo, ancho + READ_CELL_PADDING * 2, ancho_titulo)
+
     def status_column_width(self):
         """
         Lo que mide el estado mas largo, con su punto y sus paddings.
@@ -3101,6 +3682,9 @@ class FileScanner(QWidget):
             COL_NUM_WIDTH
             + self.table.columnWidth(COL_READ)
             + self.table.columnWidth(COL_STATUS)
+            + self.table.columnWidth(COL_SIZE)
+            + self.table.columnWidth(COL_MODIFIED)
+            + self.table.columnWidth(COL_MISSING)
         )
         sobrante = max(COL_PATH_VIEW_MIN, self.table.viewport().width() - otras)
         self.table.setColumnWidth(COL_PATH, sobrante)
@@ -3683,6 +4267,9 @@ class FileScanner(QWidget):
                 frame_range = ""
                 is_folder_deletable = False
                 secuencia = is_sequence
+                # Tamano y fecha: de la MISMA lectura de la carpeta que busca
+                # los frames. Sin archivo en disco quedan en None.
+                info = {"size": None, "mtime": None}
 
                 if is_sequence:
                     secuencia = True
@@ -3714,15 +4301,35 @@ class FileScanner(QWidget):
                             hashes = ""
 
                         frame_numbers = []
+                        # Se cuenta aca lo que hay en la carpeta: es lo que el
+                        # segundo os.listdir de abajo volvia a pedir para
+                        # saber si la carpeta se puede borrar entera.
+                        entradas_en_carpeta = 0
                         if file_pattern:
-                            for filename in os.listdir(directory):
-                                m = file_pattern.match(filename)
-                                if m:
+                            with os.scandir(directory) as entradas:
+                                for entrada in entradas:
+                                    entradas_en_carpeta += 1
+                                    m = file_pattern.match(entrada.name)
+                                    if not m:
+                                        continue
                                     frame_numbers.append(int(m.group(1)))
+                                    try:
+                                        dato = entrada.stat()
+                                    except OSError:
+                                        continue
+                                    info["size"] = (info["size"] or 0) + dato.st_size
+                                    info["mtime"] = max(
+                                        info["mtime"] or dato.st_mtime, dato.st_mtime
+                                    )
                         # logging.info(f"frame_numbers: {frame_numbers}")
 
                         if frame_numbers:
-                            frame_range = f"[{min(frame_numbers)}-{max(frame_numbers)}]"
+                            # Los mismos tramos que arma el escaneo para las
+                            # secuencias de las locations: de aca salen el
+                            # rango, los huecos y si la carpeta es borrable.
+                            tramos = frame_runs(frame_numbers)
+                            info["missing"] = missing_runs(tramos)
+                            frame_range = f"[{tramos[0][0]}-{tramos[-1][1]}]"
                             # No necesitamos reemplazar los '#' si ya estaban en la ruta
                             if "%" in read_path:
                                 is_sequence = True
@@ -3743,9 +4350,10 @@ class FileScanner(QWidget):
                                 is_sequence = False
                             # read_path = read_path if '#' in read_path else read_path.replace('%0d', hashes).replace('%04d', hashes).replace('%03d', hashes)
                             # logging.info(f"read_path: {read_path}")
-                            is_folder_deletable = len(frame_numbers) == (
-                                max(frame_numbers) - min(frame_numbers) + 1
-                            ) and len(os.listdir(directory)) == len(frame_numbers)
+                            is_folder_deletable = (
+                                len(tramos) == 1
+                                and entradas_en_carpeta == len(frame_numbers)
+                            )
 
                         else:
                             # Aqui, debes asegurarte de que 'nodes' no este vacio y luego obtener el nombre del nodo
@@ -3793,6 +4401,14 @@ class FileScanner(QWidget):
                     else:
                         frame_range = ""
                         is_folder_deletable = False
+                        # Un archivo suelto afuera de las locations: no hay
+                        # listado de su carpeta del que sacarlo, y es un stat
+                        # por Read, no por frame.
+                        try:
+                            dato = os.stat(read_path)
+                            info = {"size": dato.st_size, "mtime": dato.st_mtime}
+                        except OSError:
+                            pass
 
                 # Para archivos no secuenciales, agregarlos directamente con is_sequence=False
                 for node in unmatched_nodes:
@@ -3811,6 +4427,7 @@ class FileScanner(QWidget):
                             True,
                             is_folder_deletable,
                             secuencia,
+                            info,
                         )
                     )
 
@@ -3827,6 +4444,7 @@ class FileScanner(QWidget):
             is_unmatched,
             is_deletable,
             seq_state,
+            info,
         ) in enumerate(to_add):
             logger.debug(
                 f"[{i+1}/{len(to_add)}] {file_path} - Is_seq: {is_seq} - Range: {frame_range}"
@@ -3929,6 +4547,8 @@ class FileScanner(QWidget):
         # Un escaneo por vez: dos workers escribiendo sobre la misma tabla se
         # pisan las filas.
         self._scan_running = True
+        self._scan_ok = False
+        self._scan_generation += 1
         self._spin_rescan(True)
         if getattr(self, "rescan_button", None) is not None:
             self.rescan_button.setEnabled(False)
@@ -4006,8 +4626,119 @@ class FileScanner(QWidget):
             self.rescan_button.setEnabled(True)
             self.apply_footer_stylesheet()
 
+        if self._scan_ok:
+            self.compare_with_last_scan()
+            if getattr(self, "watch_button", None) is not None and (
+                self.watch_button.isChecked()
+            ):
+                self.start_watch()
+
+    def compare_with_last_scan(self):
+        """
+        Arranca la comparacion contra el escaneo anterior de este script.
+
+        La foto de la tabla se saca ACA, en el hilo principal, y es lo unico
+        que se le lee: el worker compara diccionarios por clave y guarda la
+        foto nueva para la proxima vez.
+        """
+        filas = [
+            (self.row_path(fila), self.row_status(fila), self.row_read(fila))
+            for fila in range(self.table.rowCount())
+        ]
+        self.snapshot_worker = SnapshotWorker(nuke.root().name(), filas)
+        self.snapshot_worker.signals.diffed.connect(self.on_snapshot_diffed)
+        QThreadPool.globalInstance().start(self.snapshot_worker)
+
+    def on_snapshot_diffed(self, cambios):
+        """
+        Muestra lo que cambio: la pastilla Changed y un tooltip por fila.
+
+        Sin foto anterior -el primer escaneo de este script- o sin cambios, la
+        pastilla no aparece: un "0 changed" en cada apertura es ruido.
+        """
+        self.snapshot_worker = None
+        filas = {}
+        if cambios:
+            for ruta in cambios["new"]:
+                filas[ruta] = "New since the last scan"
+            for ruta, viejo, nuevo in cambios["range"]:
+                filas[ruta] = "Frame range %s → %s" % (viejo or "–", nuevo or "–")
+            for ruta, viejo, nuevo, _read in cambios["status"]:
+                texto = "Was %s, now %s" % (viejo, nuevo)
+                filas[ruta] = (
+                    filas[ruta] + "\n" + texto if ruta in filas else texto
+                )
+        hay_algo = bool(filas) or bool(cambios and cambios["removed"])
+        self.changed_rows = filas if hay_algo else None
+
+        if getattr(self, "changed_pill", None) is not None:
+            self.changed_pill.setVisible(hay_algo)
+            self.changed_pill.setToolTip(
+                self._resumen_cambios(cambios) if hay_algo else TOOLTIPS["pill_changed"]
+            )
+        if not hay_algo and self.status_filter == "changed":
+            self.status_filter = "all"
+        self.refresh_path_tooltips()
+        self.update_status_counts()
+        self.apply_filters()
+
+    @staticmethod
+    def _resumen_cambios(cambios):
+        """
+        El tooltip de Changed: el resumen, y las rutas que ya no estan.
+
+        Las borradas van aca porque no tienen fila donde mostrarse.
+        """
+        desde = cambios.get("since")
+        partes = [
+            "Since %s: %d new, %d removed, %d range change(s), %d status change(s)"
+            % (
+                format_mtime(desde),
+                len(cambios["new"]),
+                len(cambios["removed"]),
+                len(cambios["range"]),
+                len(cambios["status"]),
+            )
+        ]
+        if cambios["removed"]:
+            partes.append("")
+            partes.append("Removed:")
+            partes.extend(cambios["removed"][:15])
+            if len(cambios["removed"]) > 15:
+                partes.append("...")
+        return "\n".join(partes)
+
+    def refresh_path_tooltips(self):
+        """
+        El tooltip del path: con que es identica y que le cambio.
+
+        Lo escriben dos cosas -los duplicados y el diff contra el escaneo
+        anterior- y se arma aca de las dos para que una no le borre el texto
+        a la otra.
+        """
+        duplicados = self.duplicate_groups or {}
+        cambios = self.changed_rows or {}
+        for fila in range(self.table.rowCount()):
+            celda = self.table.item(fila, COL_PATH)
+            if celda is None:
+                continue
+            ruta = celda.text()
+            partes = []
+            if ruta in cambios:
+                partes.append(cambios[ruta])
+            if duplicados.get(ruta):
+                partes.append("Identical to:\n" + "\n".join(duplicados[ruta]))
+            celda.setToolTip("\n\n".join(partes))
+
     def on_files_found(self, data):
         files_data, unmatched_reads_data = data
+        # Llegan solo cuando el escaneo termino entero: cancelado o caido, el
+        # worker emite `finished` sin pasar por aca.
+        self._scan_ok = True
+        # Lo que recorrio el escaneo es lo que vigila el modo Watch.
+        self.watched_dirs = list(
+            getattr(self.scanner_worker, "carpetas_vistas", None) or []
+        )
         self.logger.debug(
             f"\n=== on_files_found: Agregando {len(files_data)} archivos de find_files ==="
         )
@@ -4085,6 +4816,7 @@ class FileScanner(QWidget):
                 is_unmatched_read,
                 is_folder_deletable,
                 sequence_state,
+                info,
             ) = file_data
             read_node_name = next(iter(read_files.values()))[0]
             row_position = self.table.rowCount()
@@ -4108,31 +4840,21 @@ class FileScanner(QWidget):
 
             # Encuentra el patron de digitos en el nombre del archivo y reemplazalo con '#'
             if is_unmatched_read:
-                match = re.search(r"%0(\d+)d", file_path)
-                if match:
-                    digits = int(match.group(1))
-                    file_path = re.sub(r"%0\d+d", "#" * digits, file_path)
+                file_path = mm_pathkey.hashes(file_path)
                 # Convertir %0Xd a # en las claves de read_files y normalizar para comparacion
-                normalized_read_files = {}
-                for path, nodes in read_files.items():
-                    new_key = re.sub(r"%0(\d+)d", lambda m: "#" * int(m.group(1)), path)
-                    # Usar la funcion de normalizacion centralizada
-                    new_key = normalize_path_for_comparison(new_key)
-                    normalized_read_files[new_key] = nodes
+                normalized_read_files = {
+                    mm_pathkey.read_key(path): nodes
+                    for path, nodes in read_files.items()
+                }
 
             row_position = self.table.rowCount()
             self.table.insertRow(row_position)
             self.logger.debug(f"  *** FILA INSERTADA EN POSICION {row_position} ***")
 
-            # Normalizacion del path y adicion a la tabla
-            normalized_file_path = file_path.replace("\\", "/").lower()
+            # Adicion a la tabla, con las barras hacia adelante
             casi_file_path = file_path.replace(
                 "\\", "/"
             )  # Se mantiene para visualizacion en la UI
-            file_item = QTableWidgetItem(
-                normalized_file_path + (frame_range if is_sequence else "")
-            )
-            file_item.setFlags(file_item.flags() & ~Qt.ItemIsEditable)
 
             # Usar casi_file_path para el item que se mostrara en la tabla
             casi_file_item = QTableWidgetItem(
@@ -4283,14 +5005,13 @@ class FileScanner(QWidget):
                         state = "Offline"
                     else:
                         # Verificar si el archivo esta dentro del directorio del shot
-                        file_directory = os.path.dirname(os.path.normpath(file_path))
-                        normi_file_directory = file_directory.replace("\\", "/").lower()
+                        normi_file_directory = mm_pathkey.dir_key(file_path)
                         # print(f"normi_file_directory: {normi_file_directory}")
 
                         # Normalizar self.project_folder
-                        normi_project_folder = self.project_folder.replace(
-                            "\\", "/"
-                        ).lower()
+                        normi_project_folder = normalize_path_for_comparison(
+                            self.project_folder
+                        )
                         # print(f"normi_project_folder: {normi_project_folder}")
 
                         # Calcular el commonpath con rutas normalizadas y imprimirlo
@@ -4302,7 +5023,7 @@ class FileScanner(QWidget):
                             # print("Las rutas estan en unidades de disco diferentes, no se puede encontrar un path comun.")
                             common_path = ""
 
-                        common_path_normi = common_path.replace("\\", "/").lower()
+                        common_path_normi = normalize_path_for_comparison(common_path)
                         # print(f"common_path_normi: {common_path_normi}")
 
                         if common_path_normi == normi_project_folder:
@@ -4355,6 +5076,8 @@ class FileScanner(QWidget):
             sequence_item.setTextAlignment(Qt.AlignCenter)
             sequence_item.setFlags(sequence_item.flags() & ~Qt.ItemIsEditable)
             self.table.setItem(row_position, COL_SEQUENCE, sequence_item)
+            self.set_row_disk(row_position, info)
+            self.set_row_missing(row_position, info)
 
             # La columna Read se rehace como SortKeyItem para que se ordene
             # numerico -Read2 antes que Read12- y las filas sin Read caigan al
@@ -4430,8 +5153,8 @@ class FileScanner(QWidget):
     def is_sequence_match(self, sequence_path, read_path, frame_range):
         # Verifica si la secuencia de archivos coincide con algun archivo en los nodos Read
         # Ajustamos el proceso de coincidencia para secuencias
-        sequence_base_path = re.sub(r"#+", "", sequence_path.split("[")[0])
-        read_base_path = re.sub(r"%\d+d", "", read_path)
+        sequence_base_path = _NUMERALES_RE.sub("", sequence_path.split("[")[0])
+        read_base_path = _RELLENO_RE.sub("", read_path)
         # Usar la funcion de normalizacion centralizada para la comparacion
         return normalize_path_for_comparison(
             sequence_base_path
@@ -4562,6 +5285,93 @@ class FileScanner(QWidget):
                 partes.append("...")
         return "\n".join(partes)
 
+    # --------------------------------------------------------- duplicados ---
+    def find_duplicates(self):
+        """
+        Busca filas con el mismo contenido, en cualquier location.
+
+        El plan sale de la tabla: cada fila con sus archivos reales y el tamano
+        que trajo el escaneo. Offline no entra -no hay nada que leer- y las
+        filas sin tamano tampoco: sin el, el primer filtro no puede descartar
+        nada y habria que hashear a ciegas.
+        """
+        if self.operacion_en_curso() is not None:
+            debug_print("Hay una operacion en curso: se ignoran los duplicados")
+            return
+        plan = []
+        for fila in range(self.table.rowCount()):
+            tamano = self.row_size(fila)
+            if not tamano or self.row_status(fila) == "Offline":
+                continue
+            ruta = self.row_path(fila)
+            archivos = expand_sequence(ruta)
+            if archivos:
+                plan.append((ruta, archivos, tamano))
+        if len(plan) < 2:
+            QMessageBox.information(self, "Duplicates", "Nothing to compare.")
+            return
+        self._run_batch(
+            DuplicateWorker(plan), "Finding duplicates", self._on_duplicates_finished
+        )
+
+    def _on_duplicates_finished(self, hechos, salteados, errores, cancelado):
+        """Deja a la vista solo los duplicados y cuenta cuanto se recupera."""
+        worker = self._batch_worker
+        self._batch_worker = None
+        grupos = worker.grupos if worker is not None and not cancelado else []
+        if cancelado:
+            self.update_button_states()
+            return
+
+        self.duplicate_groups = {}
+        for grupo in grupos:
+            for ruta in grupo["rutas"]:
+                self.duplicate_groups[ruta] = [r for r in grupo["rutas"] if r != ruta]
+        # En el path queda a mano con que es igual, sin abrir nada.
+        self.refresh_path_tooltips()
+        self.apply_filters()
+
+        QMessageBox.information(
+            self, "Duplicates", self._resumen_duplicados(grupos, errores)
+        )
+
+    def _resumen_duplicados(self, grupos, errores):
+        """
+        El cartel final: cuantos grupos, cuanto se libera y los mas grandes.
+
+        Cada copia lleva su location entre corchetes: lo que se quiere saber
+        para decidir cual borrar es DONDE esta cada una, y la ruta completa no
+        siempre lo dice a simple vista.
+        """
+        if not grupos:
+            partes = ["No byte-identical files or sequences found."]
+        else:
+            recuperable = sum(grupo["recuperable"] for grupo in grupos)
+            partes = [
+                "%d group(s) of identical media. %s reclaimable."
+                % (len(grupos), format_size(recuperable)),
+                "Press Total to show every row again.",
+                "",
+            ]
+            for grupo in grupos[:10]:
+                partes.append("%s each:" % format_size(grupo["tamano"]))
+                for ruta in grupo["rutas"]:
+                    location = self.location_of(ruta) or "outside"
+                    partes.append("  [%s] %s" % (os.path.basename(location), ruta))
+            if len(grupos) > 10:
+                partes.append("...")
+        if errores:
+            partes.append("")
+            partes.append("Failed: %s" % "; ".join(errores[:10]))
+        return "\n".join(partes)
+
+    def clear_duplicates(self):
+        """Sale de la vista de duplicados y saca los tooltips que dejo."""
+        if self.duplicate_groups is None:
+            return
+        self.duplicate_groups = None
+        self.refresh_path_tooltips()
+
     # ------------------------------------------------------------ borrado ---
     def delete_selected(self):
         """
@@ -4689,6 +5499,11 @@ class FileScanner(QWidget):
                 borrados += len(archivos)
                 self.table.removeRow(fila)
         total = getattr(self, "_delete_total", 0)
+        # Lo que quedo en esas carpetas se re-lista: una secuencia borrada a
+        # medias, o un Read que apuntaba ahi, tienen que verse como quedaron.
+        self.refresh_directories(
+            set(os.path.dirname(ruta) for ruta in pedidas if ruta)
+        )
         self._delete_paths = []
         self._delete_total = 0
         self.renumber_visible_rows()
@@ -4896,6 +5711,14 @@ class FileScanner(QWidget):
                 continue
             if nodo is not None:
                 tocados.append(nodo)
+        # Las carpetas destino se re-listan: la copia tiene que aparecer en la
+        # tabla si cayo adentro del escaneo, sin esperar un Rescan.
+        self.refresh_directories(
+            set(
+                registro["carpeta"]
+                for registro in getattr(self, "_copy_reapuntar", []) or []
+            )
+        )
         self._copy_reapuntar = []
         self.focus_nodes(tocados)
         self.update_status_counts()
@@ -1,7 +1,7 @@
 """
 _______________________________________
 
-  LGA_MediaManager_config v2.43 | Lega
+  LGA_MediaManager_config v2.53 | Lega
   Donde vive la configuracion del Media Manager, y que tiene adentro
 
   v2.28: El tema de fabrica pasa de "lga" a "pack": la herramienta
@@ -207,7 +207,7 @@ FONT_SIZE_MAX = 20
 # Las letras que ya usan los mnemonicos de la barra de herramientas. Si una
 # location toma una de estas, Qt no dispara ninguno de los dos y avisa por
 # consola con "ambiguous shortcut".
-RESERVED_SHORTCUTS = ("G", "R", "L", "C", "D")
+RESERVED_SHORTCUTS = ("G", "R", "L", "C", "U", "D")
 
 # Los tres destinos que traia el .ini historico, mapeados a la location de
 # fabrica que los reemplaza. Se comparan por la ruta vieja normalizada porque
@@ -0,0 +1,115 @@
+"""
+_______________________________________
+
+  LGA_MediaManager_pathkey v2.53 | Lega
+  La clave con la que el Media Manager compara rutas
+
+  Dos rutas son la misma fila si dan la misma clave: mismas carpetas
+  sin ./ ni ../, barras hacia adelante, todo en minusculas. Una ruta
+  de Read con %04d da la clave de la secuencia con ####, y el rango
+  de una fila -"[1001-1129]"- no es parte de la clave: una secuencia
+  que gano frames sigue siendo la misma.
+
+  Antes habia tres normalize_path_for_comparison, una por modulo, y
+  no hacian lo mismo: la de utils pasaba por normpath y las otras
+  dos no, asi que una ruta con ./ o con barra final daba dos claves
+  segun quien preguntara.
+
+  Las claves se memorizan. Un escaneo pregunta por la misma ruta de
+  Read una vez por archivo encontrado, y por la misma carpeta una vez
+  por frame: de cada tres mil preguntas, solo la primera hace cuentas.
+  lru_cache es seguro entre hilos, y el escaneo corre en el pool.
+
+  No importa Qt ni Nuke a proposito, igual que LGA_MediaManager_paths:
+  asi se puede probar sin PySide.
+
+  v2.51: Modulo nuevo.
+_______________________________________
+
+"""
+
+import functools
+import os
+import re
+
+
+# Cuantas claves se recuerdan por funcion. Un shot grande tiene decenas de
+# miles de frames, pero las rutas que se repiten -Reads, carpetas, secuencias-
+# son muchas menos; pasado el tope se olvidan las menos usadas.
+PATH_KEY_CACHE = 65536
+
+# %04d, el relleno de Nuke para los frames.
+PADDING_RE = re.compile(r"%0(\d+)d")
+# El rango con el que se muestra una secuencia, al final de la ruta. Acepta
+# frames negativos: "[-5-10]".
+RANGE_RE = re.compile(r"\[(-?\d+)-(-?\d+)\]\s*$")
+
+
+def _numerales(match):
+    return "#" * int(match.group(1))
+
+
+@functools.lru_cache(maxsize=PATH_KEY_CACHE)
+def normalize(ruta):
+    """
+    La ruta lista para comparar: normpath, barras "/" y minusculas.
+
+    normpath va antes que el cambio de barras para que en Windows tambien
+    resuelva las "\\". Una ruta vacia da "" y no ".", que es lo que
+    devolveria normpath.
+    """
+    if not ruta:
+        return ""
+    return os.path.normpath(ruta).replace("\\", "/").lower()
+
+
+def hashes(ruta):
+    """El relleno de Nuke como numerales: "a.%04d.exr" -> "a.####.exr"."""
+    if "%" not in ruta:
+        return ruta
+    return PADDING_RE.sub(_numerales, ruta)
+
+
+@functools.lru_cache(maxsize=PATH_KEY_CACHE)
+def read_key(ruta):
+    """
+    La clave de la ruta de un Read: el relleno como numerales, normalizada.
+
+    Es la que se compara contra la ruta de una secuencia del escaneo, que
+    siempre lleva numerales.
+    """
+    return normalize(hashes(ruta))
+
+
+def split_range(ruta):
+    """
+    La ruta de una fila partida en (base, rango): "[1001-1129]" o "".
+    """
+    rango = RANGE_RE.search(ruta)
+    if not rango:
+        return ruta.strip(), ""
+    return ruta[: rango.start()].strip(), rango.group(0).strip()
+
+
+@functools.lru_cache(maxsize=PATH_KEY_CACHE)
+def key(ruta):
+    """
+    La clave canonica de una fila o de un Read: sin rango, con numerales
+    y normalizada.
+
+    Es la clave de la foto del escaneo: no puede cambiar entre versiones
+    sin subir SNAPSHOT_VERSION.
+    """
+    return read_key(split_range(ruta)[0])
+
+
+@functools.lru_cache(maxsize=PATH_KEY_CACHE)
+def dir_key(ruta):
+    """La clave de la carpeta de una ruta: la que da normalize() a la carpeta."""
+    return normalize(os.path.dirname(ruta))
+
+
+def clear_cache():
+    """Olvida todas las claves. Solo hace falta para medir."""
+    for funcion in (normalize, read_key, key, dir_key):
+        funcion.cache_clear()
@@ -1,7 +1,7 @@
 """
 _______________________________________
 
-  LGA_MediaManager_paths v2.43 | Lega
+  LGA_MediaManager_paths v2.53 | Lega
   Como se interpretan las rutas relativas al .nk
 
   El shot folder y las locations se escriben como rutas RELATIVAS a la
@@ -21,6 +21,18 @@ _______________________________________
 
   No importa Qt a proposito: asi se puede probar sin PySide.
 
+  v2.50: resolve lista en paralelo todas las ramas de un nivel, con
+         un tope de hilos: "../../*input*/*plates*/*" contra un
+         servidor abre decenas de carpetas por nivel, y cada listado
+         es un viaje de ida y vuelta. El orden del resultado, el corte
+         en MAX_MATCHES y la comparacion sin mayusculas de
+         _match_segment son los mismos que cuando iba de a una.
+  v2.49: _subdirs guarda cada listado unos segundos, en un cache del
+         modulo que comparten todas las llamadas a resolve y todos
+         los hilos. Mientras se escribe en una fila de los ajustes,
+         las carpetas detras de las otras filas -y los niveles de
+         arriba de la propia, que casi nunca cambian- no se vuelven
+         a listar. clear_cache() lo vacia.
   v2.27: Modulo nuevo. Sale del prototipo del rediseno, donde esta
          escrito en JS.
 _______________________________________
@@ -29,6 +41,9 @@ _______________________________________
 
 import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Un patron con comodines en varios niveles puede abrir muchisimas ramas. El
@@ -37,6 +52,22 @@ import re
 MAX_MATCHES = 512
 
 
+# Cuanto vale un listado de subcarpetas. Escribiendo "../*assets*" en los
+# ajustes, cada tecla vuelve a resolver la fila entera, y la carpeta de arriba
+# es la misma en todas: listarla una vez cada unos segundos alcanza. Es corto a
+# proposito, porque una carpeta recien creada tiene que aparecer sin reabrir.
+SUBDIRS_TTL_SECONDS = 5.0
+# Tope de carpetas recordadas. Pasado, se tiran las vencidas, y si no alcanza
+# se empieza de cero: es un cache, no un indice del servidor.
+SUBDIRS_CACHE_MAX = 4096
+
+
+# Cuantas carpetas de un mismo nivel se listan a la vez. Contra un servidor
+# cada listado es sobre todo espera, asi que unos pocos hilos rinden casi como
+# tantos como ramas; mas que eso solo le suma carga al servidor.
+RESOLVE_THREADS = 8
+
+
 # Los cuatro resultados posibles de interpretar el texto de una ruta. Se
 # distinguen porque la UI dice una cosa distinta en cada caso.
 EMPTY = "empty"  # el campo esta vacio
@@ -213,23 +244,65 @@ def _match_segment(patron, nombres):
     return [n for n in nombres if rx.match(n)]
 
 
-def _subdirs(ruta):
-    """Los nombres de las subcarpetas de `ruta`. [] si no se puede leer."""
+# {ruta: (hora, nombres)}. Lo comparten los workers de la ventana de ajustes y
+# el del escaneo, asi que va con lock: un dict se puede leer desde varios
+# hilos, pero la poda de abajo lo recorre.
+_subdirs_cache = {}
+_subdirs_lock = threading.Lock()
+
+
+def clear_cache():
+    """Olvida todos los listados. La proxima resolucion va a disco."""
+    with _subdirs_lock:
+        _subdirs_cache.clear()
+
+
+def _subdirs(ruta, max_age=SUBDIRS_TTL_SECONDS):
+    """
+    Los nombres de las subcarpetas de `ruta`. [] si no se puede leer.
+
+    Con `max_age` en cero va siempre a disco; el resultado se guarda igual.
+    """
+    clave = os.path.normcase(ruta)
+    ahora = time.time()
+    if max_age > 0:
+        with _subdirs_lock:
+            guardado = _subdirs_cache.get(clave)
+        if guardado is not None and ahora - guardado[0] < max_age:
+            return guardado[1]
     try:
         with os.scandir(ruta) as entradas:
-            return [e.name for e in entradas if e.is_dir()]
+            nombres = [e.name for e in entradas if e.is_dir()]
     except (OSError, ValueError):
         # Un permiso denegado o una unidad desconectada no son un error de la
-        # ruta que escribio el usuario: son cero coincidencias por ahi.
-        return []
-
-
-def resolve(path, nk_dir=""):
+        # ruta que escribio el usuario: son cero coincidencias por ahi. Se
+        # guarda tambien: una unidad que no responde es justo la que mas
+        # tarda en decir que no.
+        nombres = []
+    with _subdirs_lock:
+        if len(_subdirs_cache) >= SUBDIRS_CACHE_MAX:
+            for vieja in [
+                c for c, (hora, _) in _subdirs_cache.items()
+                if ahora - hora >= SUBDIRS_TTL_SECONDS
+            ]:
+                del _subdirs_cache[vieja]
+            if len(_subdirs_cache) >= SUBDIRS_CACHE_MAX:
+                _subdirs_cache.clear()
+        _subdirs_cache[clave] = (ahora, nombres)
+    return nombres
+
+
+def resolve(path, nk_dir="", max_age=SUBDIRS_TTL_SECONDS):
     """
     A que carpetas reales llega una ruta. TOCA DISCO: va fuera del hilo principal.
 
     Baja nivel por nivel en vez de usar glob.glob porque glob distingue
-    mayusculas en macOS y en Linux, y aca no se quiere distinguir.
+    mayusculas en macOS y en Linux, y aca no se quiere distinguir. Cada
+    listado pasa por el cache de _subdirs; `max_age` es cuan viejo se acepta.
+
+    Las ramas de un mismo nivel se listan en paralelo pero se RECORREN en
+    orden, igual que antes: el resultado y el corte en MAX_MATCHES no
+    dependen de que listado termino primero.
     """
     parsed = parse_path(path, nk_dir)
     if not parsed.usable:
@@ -239,26 +312,54 @@ def resolve(path, nk_dir=""):
     # directorio actual, que es lo unico que se puede hacer.
     actuales = [parsed.root or "."]
     truncado = False
+    pool = None
 
-    for segmento in parsed.segments:
-        siguientes = []
-        lleno = False
-        for base in actuales:
-            for nombre in _match_segment(segmento, _subdirs(base)):
-                siguientes.append(base.rstrip("/") + "/" + nombre)
-                if len(siguientes) >= MAX_MATCHES:
-                    lleno = True
-                    break
-            if lleno:
-                break
-        truncado = truncado or lleno
-        actuales = siguientes
-        if not actuales:
-            return Resolution(parsed.kind, [], truncado)
+    try:
+        for segmento in parsed.segments:
+            siguientes, lleno = _expand_level(
+                segmento, actuales, max_age, pool
+            )
+            if pool is None and len(siguientes) > 1:
+                # El pool se arma recien cuando hay mas de una rama: la
+                # mayoria de las rutas no tienen comodin y no lo necesitan.
+                pool = ThreadPoolExecutor(max_workers=RESOLVE_THREADS)
+            truncado = truncado or lleno
+            actuales = siguientes
+            if not actuales:
+                return Resolution(parsed.kind, [], truncado)
+    finally:
+        if pool is not None:
+            # Lo que quedo en cola despues del corte ya no le sirve a nadie.
+            pool.shutdown(wait=False, cancel_futures=True)
 
     return Resolution(parsed.kind, actuales, truncado)
 
 
+def _expand_level(segmento, actuales, max_age, pool):
+    """
+    Un nivel de resolve: (siguientes, lleno).
+
+    Con pool, los listados de todas las ramas salen a la vez y map() los
+    devuelve en el orden de `actuales`; el corte en MAX_MATCHES se aplica
+    recorriendo en ese orden, asi que da lo mismo que la version de a una.
+    """
+    if pool is not None and len(actuales) > 1:
+        listados = pool.map(lambda base: _subdirs(base, max_age), actuales)
+    else:
+        listados = (_subdirs(base, max_age) for base in actuales)
+    siguientes = []
+    lleno = False
+    for base, nombres in zip(actuales, listados):
+        for nombre in _match_segment(segmento, nombres):
+            siguientes.append(base.rstrip("/") + "/" + nombre)
+            if len(siguientes) >= MAX_MATCHES:
+                lleno = True
+                break
+        if lleno:
+            break
+    return siguientes, lleno
+
+
 def seg_matches(pattern, target):
     """
     Si el segmento `pattern` abarca al segmento `target`.
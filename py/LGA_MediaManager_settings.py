@@ -1,9 +1,20 @@
 """
 _______________________________________
 
-  LGA_MediaManager_settings v2.43 | Lega
+  LGA_MediaManager_settings v2.53 | Lega
   Ventana de ajustes del Media Manager
 
+  v2.53: La resolucion de una fila vence a los SUBDIRS_TTL_SECONDS de
+         LGA_MediaManager_paths, igual que los listados: se guardaba
+         mientras el texto no cambiara, y una carpeta creada con la
+         ventana abierta no aparecia nunca.
+  v2.49: Escribir en una fila resuelve SOLO esa fila. Cada fila
+         recuerda el texto con el que se resolvio y su resultado, y
+         _resolve_now pide solo las que cambiaron. Una fila que ya
+         esta en camino con el mismo texto no se vuelve a pedir, y
+         una que cambio mientras se resolvia se descarta de su tanda
+         sin cortar las demas. Los listados de disco los comparte el
+         cache de LGA_MediaManager_paths.
   v2.38: Add location lleva la fila nueva a la vista. Con la tabla ya
          en su alto maximo, la fila nacia abajo del area visible: la
          creaba, le ponia el foco y no se veia, asi que escribir el
@@ -153,6 +164,7 @@ _______________________________________
 
 import os
 import re
+import time
 
 from LGA_QtAdapter_ToolPack import QtWidgets, QtGui, QtCore, horizontal_advance
 import LGA_UI_Style_ToolPack as UIStyle
@@ -309,10 +321,10 @@ FOOTER_BUTTON_GAP = 12
 DROP_LINE_WIDTH = 2
 DRAG_OPACITY = 0.35
 
-# Las cinco letras que ya usan los botones de la barra principal. Si una
+# Las seis letras que ya usan los botones de la barra principal. Si una
 # location toma una de estas, Qt no dispara NINGUNO de los dos y tira un
 # warning de "ambiguous shortcut", asi que se rechazan.
-RESERVED_SHORTCUTS = ("G", "R", "L", "C", "D")
+RESERVED_SHORTCUTS = ("G", "R", "L", "C", "U", "D")
 
 
 # Los tooltips van en castellano y salen de aca, no hardcodeados en el widget,
@@ -1170,7 +1182,12 @@ class SettingsWindow(QWidget):
         self.UI = UIStyle.theme(self.appearance.get("theme"))
 
         self.rows = []
-        self._worker = None
+        # Por fila: (texto resuelto, Resolution, hora), y lo que esta en
+        # camino, (texto pedido, worker). Es lo que evita volver a resolver
+        # una fila que no cambio, o que ya se esta resolviendo con el mismo
+        # texto. La resolucion vence como los listados de disco.
+        self._resolved_rows = {}
+        self._in_flight = {}
         self._dragging = None
         self._resolve_timer = QTimer(self)
         self._resolve_timer.setSingleShot(True)
@@ -1581,6 +1598,10 @@ class SettingsWindow(QWidget):
         if respuesta != QMessageBox.Yes:
             return
         self.rows.remove(fila)
+        self._resolved_rows.pop(fila.uid, None)
+        en_camino = self._in_flight.pop(fila.uid, None)
+        if en_camino is not None:
+            en_camino[1].cancel_key(fila.uid)
         self.rows_layout.removeWidget(fila)
         fila.setParent(None)
         fila.deleteLater()
@@ -2001,7 +2022,7 @@ class SettingsWindow(QWidget):
                     for fila in filas:
                         errores[fila.uid].add(campo)
         for letra, filas in atajos.items():
-            # Las cinco de la barra no se pueden usar aunque no las repita
+            # Las seis de la barra no se pueden usar aunque no las repita
             # nadie: Qt no dispararia ni el boton ni la location.
             if len(filas) > 1 or letra in RESERVED_SHORTCUTS:
                 for fila in filas:
@@ -2039,18 +2060,55 @@ class SettingsWindow(QWidget):
                 fila.set_resolution(None, self.UI)
             return
 
-        if self._worker is not None:
-            self._worker.cancel()
-        pedidos = [(fila.uid, fila.path()) for fila in [self.shot_row] + self.rows]
-        self._worker = PathResolveWorker(pedidos, self.nk_dir)
-        self._worker.signals.resolved.connect(self._resolved)
-        QThreadPool.globalInstance().start(self._worker)
+        pedidos = []
+        for fila in [self.shot_row] + self.rows:
+            texto = fila.path()
+            hecho = self._resolved_rows.get(fila.uid)
+            en_camino = self._in_flight.get(fila.uid)
+            if (
+                hecho is not None
+                and hecho[0] == texto
+                and time.time() - hecho[2] < paths.SUBDIRS_TTL_SECONDS
+            ):
+                # Ya resuelta con este texto. Si habia otra en camino para un
+                # texto intermedio, ya no sirve.
+                if en_camino is not None:
+                    en_camino[1].cancel_key(fila.uid)
+                    del self._in_flight[fila.uid]
+                fila.set_resolution(hecho[1], self.UI)
+                continue
+            if en_camino is not None:
+                if en_camino[0] == texto:
+                    continue
+                en_camino[1].cancel_key(fila.uid)
+                del self._in_flight[fila.uid]
+            pedidos.append((fila.uid, texto))
+        if not pedidos:
+            return
+
+        worker = PathResolveWorker(pedidos, self.nk_dir)
+        worker.signals.resolved.connect(
+            lambda resultados, w=worker: self._resolved(w, resultados)
+        )
+        for uid, texto in pedidos:
+            self._in_flight[uid] = (texto, worker)
+        QThreadPool.globalInstance().start(worker)
 
-    def _resolved(self, resultados):
-        self._worker = None
+    def _resolved(self, worker, resultados):
+        """Aplica lo que trajo una tanda, fila por fila y solo si sigue vigente."""
         for fila in [self.shot_row] + self.rows:
-            if fila.uid in resultados:
-                fila.set_resolution(resultados[fila.uid], self.UI)
+            en_camino = self._in_flight.get(fila.uid)
+            if fila.uid not in resultados or en_camino is None:
+                continue
+            if en_camino[1] is not worker:
+                continue
+            del self._in_flight[fila.uid]
+            self._resolved_rows[fila.uid] = (
+                en_camino[0],
+                resultados[fila.uid],
+                time.time(),
+            )
+            fila.set_resolution(resultados[fila.uid], self.UI)
 
     # ------------------------------------------------------------- validacion --
     def problems(self):
@@ -2192,9 +2250,9 @@ class SettingsWindow(QWidget):
         if self.appearance != self.saved_appearance:
             self.appearance_previewed.emit(dict(self.saved_appearance))
             self.appearance = dict(self.saved_appearance)
-        if self._worker is not None:
-            self._worker.cancel()
-            self._worker = None
+        for _texto, worker in self._in_flight.values():
+            worker.cancel()
+        self._in_flight = {}
         super().closeEvent(event)
 
     def eventFilter(self, obj, event):
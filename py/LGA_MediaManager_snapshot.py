@@ -0,0 +1,153 @@
+"""
+_______________________________________
+
+  LGA_MediaManager_snapshot v2.53 | Lega
+  La foto del ultimo escaneo de cada script, y que cambio desde ahi
+
+  Al volver a abrir el Media Manager despues de un dia de renders la
+  pregunta no es "que hay" sino "que cambio". Para contestarla se
+  guarda, por script, una foto compacta del escaneo: una entrada por
+  fila con su ruta, su rango, su estado y su Read. El escaneo
+  siguiente se compara contra esa foto por CLAVE -la ruta normalizada
+  sin el rango-, no fila contra fila de la tabla.
+
+  La clave la arma quien llama: este modulo no sabe como se normaliza
+  una ruta en el Media Manager, solo guarda y compara diccionarios.
+
+  No importa Qt a proposito, igual que LGA_MediaManager_paths: asi se
+  puede probar sin PySide.
+
+  v2.46: Modulo nuevo.
+_______________________________________
+
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+
+import LGA_MediaManager_config as mm_config
+
+
+# Al lado del .ini del usuario, en su propia carpeta: una foto por script.
+SNAPSHOT_DIR_NAME = "MediaManagerScans"
+# Si cambia la forma de la entrada, se sube: una foto de otra version se
+# ignora y el escaneo siguiente arranca de cero en vez de dar un diff falso.
+SNAPSHOT_VERSION = 1
+
+# Los cuatro campos de una entrada, en este orden. Es una lista y no un dict
+# por fila para que la foto de un shot con miles de archivos no repita los
+# nombres de los campos miles de veces.
+RUTA, RANGO, ESTADO, READ = range(4)
+
+
+def snapshot_path(nk_path, create_dir=False):
+    """
+    Donde vive la foto de este script. None si no hay donde guardarla.
+
+    El nombre sale de un hash de la ruta del .nk y no de su nombre: dos
+    shots distintos tienen muchas veces el mismo nombre de script.
+    """
+    ini = mm_config.get_user_ini_path(create_dir=create_dir)
+    if not ini or not nk_path:
+        return None
+    carpeta = os.path.join(os.path.dirname(ini), SNAPSHOT_DIR_NAME)
+    if create_dir:
+        try:
+            os.makedirs(carpeta, exist_ok=True)
+        except OSError:
+            return None
+    clave = os.path.normcase(os.path.normpath(nk_path)).replace("\\", "/")
+    nombre = hashlib.sha1(clave.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(carpeta, nombre + ".json.gz")
+
+
+def load(ruta):
+    """
+    La foto guardada: {"time", "rows"}, o None si no hay una que sirva.
+
+    Un archivo roto o de otra version vale lo mismo que no tener foto: el
+    peor caso es no mostrar cambios una vez, no mostrar cambios falsos.
+    """
+    if not ruta or not os.path.isfile(ruta):
+        return None
+    try:
+        with gzip.open(ruta, "rt", encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(datos, dict) or datos.get("version") != SNAPSHOT_VERSION:
+        return None
+    filas = datos.get("rows")
+    if not isinstance(filas, dict):
+        return None
+    return {"time": datos.get("time"), "rows": filas}
+
+
+def save(ruta, filas):
+    """
+    Guarda la foto. Devuelve True si quedo escrita.
+
+    Atomico por lo mismo que el .ini: dos Nukes con el mismo script abierto
+    pueden escanear a la vez, y un archivo a medias es una foto rota.
+    """
+    if not ruta:
+        return False
+    temporal = ruta + ".tmp"
+    try:
+        with gzip.open(temporal, "wt", encoding="utf-8") as archivo:
+            json.dump(
+                {"version": SNAPSHOT_VERSION, "time": time.time(), "rows": filas},
+                archivo,
+                separators=(",", ":"),
+            )
+        os.replace(temporal, ruta)
+        return True
+    except OSError:
+        try:
+            os.remove(temporal)
+        except OSError:
+            pass
+        return False
+
+
+def diff(previas, actuales):
+    """
+    Lo que cambio entre dos fotos, comparando por clave.
+
+    Devuelve un dict con cuatro listas:
+      new      rutas que no estaban
+      removed  rutas que estaban y ya no
+      range    (ruta, rango viejo, rango nuevo) de secuencias que crecieron
+               o se achicaron
+      status   (ruta, estado viejo, estado nuevo, read) de filas cuyo
+               estado dio vuelta
+
+    Es O(filas): un recorrido por cada lado sobre diccionarios, sin mirar
+    la tabla ni el disco.
+    """
+    cambios = {"new": [], "removed": [], "range": [], "status": []}
+    for clave, actual in actuales.items():
+        previa = previas.get(clave)
+        if previa is None:
+            cambios["new"].append(actual[RUTA])
+            continue
+        if previa[RANGO] != actual[RANGO]:
+            cambios["range"].append((actual[RUTA], previa[RANGO], actual[RANGO]))
+        if previa[ESTADO] != actual[ESTADO]:
+            cambios["status"].append(
+                (actual[RUTA], previa[ESTADO], actual[ESTADO], actual[READ])
+            )
+    for clave, previa in previas.items():
+        if clave not in actuales:
+            cambios["removed"].append(previa[RUTA])
+    for lista in cambios.values():
+        lista.sort()
+    return cambios
+
+
+def is_empty(cambios):
+    """Si el diff no tiene nada que mostrar."""
+    return not cambios or not any(cambios.values())
@@ -1,11 +1,55 @@
 """
 _______________________________________________________________________
 
-  LGA_MediaManager_utils v2.43 | Lega
+  LGA_MediaManager_utils v2.53 | Lega
 
   Worker de escaneo, copia de archivos y widgets compartidos del
   Media Manager.
 
+  v2.52: walk_with_stats no baja a los links a carpetas: los deja en
+         dirs, como os.walk con followlinks=False. Seguirlos colgaba
+         el escaneo con un link circular y sumaba dos veces el tamano
+         de un arbol linkeado, tambien en la busqueda de duplicados.
+  v2.51: normalize_path_for_comparison, split_range y row_key pasan
+         a LGA_MediaManager_pathkey, memorizadas. row_key es ahora
+         la clave canonica, que tambien lleva el %04d a ####: para
+         las filas del escaneo da lo mismo que antes. find_files
+         arma las claves de los Reads una vez y no una por secuencia.
+  v2.49: PathResolveWorker suma cancel_key: descarta una fila de la
+         tanda sin cortar las otras, y entrega lo que si resolvio.
+  v2.48: Suma WatchWorker y DirectoryRefreshWorker, el modo Watch.
+         El primero corre LGA_MediaManager_watch en su propio hilo y
+         avisa que carpetas cambiaron, ya juntadas en tandas. El
+         segundo es un ScannerWorker que re-lista SOLO esas carpetas,
+         sin bajar a las de adentro, por el mismo find_files: las
+         filas salen agrupadas y clasificadas igual que en el
+         escaneo, y la foto del script se saca una vez por tanda y no
+         una por carpeta. walk_with_stats y find_files suman
+         `recursivo`, y find_files anota las carpetas que recorrio en
+         carpetas_vistas, que son las que se vigilan. split_range y
+         row_key parten la ruta de una fila en base y rango: la clave
+         es la que ya armaba SnapshotWorker.
+  v2.47: find_files guarda los huecos de cada secuencia como tramos
+         -LGA_ToolPack_FrameRuns- en el info de la tupla, como
+         "missing". Salen de los frames que ya juntaba para el rango:
+         sin I/O extra. Suma COL_MISSING.
+  v2.46: Suma SnapshotWorker: arma la foto del escaneo por clave -la
+         ruta normalizada sin el rango-, la compara contra la anterior
+         y guarda la nueva, todo en el pool.
+  v2.45: Suma DuplicateWorker y file_digest. Busca contenido igual
+         en tres escalones, del mas barato al mas caro: el tamano que
+         ya trajo el escaneo, el hash de los primeros 64 KB y recien
+         ahi el hash completo, los dos en un pool de hilos. Un archivo
+         que entra entero en el parcial no se vuelve a leer.
+  v2.44: El escaneo junta tamano y fecha de cada fila sin un stat
+         aparte: walk_with_stats recorre con os.scandir, y el
+         DirEntry ya trae el stat. La tupla suma un octavo elemento,
+         info = {"size", "mtime"}: para una secuencia, la suma de sus
+         frames y el frame mas nuevo. De paso la segunda pasada usa
+         el listado de la primera en vez de otro os.walk, y el
+         is_folder_deletable de cada secuencia sale de ese listado en
+         vez de un os.listdir por secuencia. Suma format_size y
+         format_mtime.
   v2.43: El escaneo devolvia la tabla VACIA. Adentro de run() quedo
          un `for node in read_nodes` huerfano cuando v2.40 saco el
          `read_nodes = nuke.allNodes("Read")` de arriba -que era el
@@ -191,11 +235,16 @@ import shutil
 import sys
 import configparser
 import logging
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 QThreadPool = QtCore.QThreadPool
 
 from LGA_MediaManager_logging import configure_logger, debug_print, get_log_prefix
+from LGA_ToolPack_FrameRuns import frame_runs, missing_runs
 from LGA_UI_Style_ToolPack import Color, PATH_PALETTE
 import LGA_UI_Style_ToolPack as UIStyle
+import LGA_MediaManager_watch as mm_watch
+import LGA_MediaManager_pathkey as mm_pathkey
 
 
 def resolve_relative_path(file_path, project_folder):
@@ -224,22 +273,9 @@ def resolve_relative_path(file_path, project_folder):
     return resolved_path
 
 
-def normalize_path_for_comparison(file_path):
-    """
-    Normaliza una ruta de archivo para comparaciones consistentes.
-    Convierte barras a forward slashes y pone todo en minusculas.
-    """
-    if not file_path:
-        return ""
-
-    # Primero normalizar con os.path.normpath para manejar ./ ../ etc
-    normalized = os.path.normpath(file_path)
-    # Convertir todas las barras a forward slashes
-    normalized = normalized.replace("\\", "/")
-    # Convertir a minusculas para comparacion case-insensitive
-    normalized = normalized.lower()
-
-    return normalized
+# La normalizacion vive en LGA_MediaManager_pathkey, memorizada: el nombre
+# queda por los que la usan desde aca.
+normalize_path_for_comparison = mm_pathkey.normalize
 
 
 # ---------------------------------------------------------------------------
@@ -260,6 +296,13 @@ COL_STATUS = 2
 COL_FOLDER_DELETE = 3
 COL_SEQUENCE = 4
 COL_NUM = 5
+# Tamano y ultima modificacion. Van al final por lo mismo que el '#': agregar
+# una columna al final no corre ningun indice de los de arriba. En pantalla
+# quedan despues de Status porque Folder_Delete y Sequence van ocultas.
+COL_SIZE = 6
+COL_MODIFIED = 7
+# Los frames que le faltan a una secuencia adentro de su rango.
+COL_MISSING = 8
 
 # El aire a los costados del texto de la celda Read, el mismo `padding: 0 10`
 # que el prototipo le da a esa columna.
@@ -642,6 +685,9 @@ class PathResolveWorker(QRunnable):
         self.nk_dir = nk_dir
         self.signals = PathResolveSignals()
         self._cancelado = False
+        # Las claves que ya no interesan: su fila cambio de texto mientras
+        # esta tanda corria. Las demas se siguen resolviendo y se entregan.
+        self._descartadas = set()
         # Sin esto Qt destruye el objeto C++ apenas run() termina, y el
         # cancel() que la ventana hace al cerrarse tira RuntimeError sobre un
         # objeto que ya no existe.
@@ -651,6 +697,10 @@ class PathResolveWorker(QRunnable):
         """Deja de servir: el resultado ya no le interesa a nadie."""
         self._cancelado = True
 
+    def cancel_key(self, clave):
+        """Descarta UNA fila de la tanda; el resto sigue."""
+        self._descartadas.add(clave)
+
     def run(self):
         import LGA_MediaManager_paths as paths
 
@@ -658,11 +708,15 @@ class PathResolveWorker(QRunnable):
         for clave, ruta in self.pedidos:
             if self._cancelado:
                 return
+            if clave in self._descartadas:
+                continue
             try:
                 resultados[clave] = paths.resolve(ruta, self.nk_dir)
             except Exception as problema:  # el disco puede fallar de mil formas
                 debug_print("resolve fallo en %s: %s" % (ruta, problema))
                 resultados[clave] = paths.Resolution(paths.EMPTY)
+        for clave in self._descartadas:
+            resultados.pop(clave, None)
         if not self._cancelado:
             self.signals.resolved.emit(resultados)
 
@@ -835,8 +889,9 @@ class DeleteWorker(BatchWorker):
 
 # El rango de frames va SIEMPRE al final del nombre y acepta signo: un Read
 # offline puede traer origfirst negativo. Sin anclar al final, un '[' en el
-# propio nombre del archivo -"take[1-2]_####.exr"- partia mal la ruta.
-_RANGO_RE = re.compile(r"\[(-?\d+)-(-?\d+)\]\s*$")
+# propio nombre del archivo -"take[1-2]_####.exr"- partia mal la ruta. Es la
+# misma expresion con la que pathkey saca el rango de la clave.
+_RANGO_RE = mm_pathkey.RANGE_RE
 
 
 def expand_sequence(path):
@@ -892,6 +947,477 @@ def expand_sequence(path):
     return salida
 
 
+# La ruta de una fila partida en (base, rango), y su clave: la ruta
+# normalizada y SIN el rango. Una secuencia que gano frames sigue siendo la
+# misma fila: con el rango adentro de la clave se leeria como una borrada mas
+# una nueva.
+split_range = mm_pathkey.split_range
+row_key = mm_pathkey.key
+
+
+# ---------------------------------------------------------------------------
+#                 Tamano y fecha: lo que el listado ya trae
+# ---------------------------------------------------------------------------
+# El tamano de una fila y su ultima modificacion salen del MISMO listado que
+# arma el escaneo y no de una pasada aparte: una secuencia de tres mil frames
+# son tres mil stat contra el servidor, y pedirlos otra vez despues de haber
+# recorrido la carpeta es pagar el escaneo dos veces.
+#
+# os.walk no sirve para eso: usa os.scandir por dentro pero tira los DirEntry
+# y devuelve solo los nombres. walk_with_stats es el mismo recorrido de arriba
+# hacia abajo, quedandose con el stat de cada entrada. En Windows ese stat
+# viene gratis con el listado -FindNextFile ya lo trae- y en macOS y Linux es
+# uno por archivo adentro de la misma pasada, cacheado en el propio DirEntry.
+
+
+def walk_with_stats(carpeta, recursivo=True):
+    """
+    Como os.walk, pero con el stat de cada archivo.
+
+    Devuelve (root, dirs, files, stats) por carpeta, donde stats es
+    {nombre: (tamano en bytes, mtime)}. Una carpeta que no se puede leer se
+    saltea igual que en os.walk; un archivo cuyo stat falla queda en `files`
+    sin entrada en `stats`, asi que se lista igual y se muestra sin tamano.
+    Sin `recursivo` devuelve solo la carpeta pedida: es lo que re-lista el
+    modo Watch, que ya sabe cual de todas cambio.
+
+    Como os.walk con followlinks=False, un link a una carpeta aparece en
+    `dirs` pero no se recorre: un link que apunta hacia arriba daria vueltas
+    para siempre y un arbol linkeado se contaria dos veces.
+    """
+    pendientes = [carpeta]
+    while pendientes:
+        root = pendientes.pop()
+        dirs, files, stats = [], [], {}
+        # Las carpetas de verdad, las unicas que se recorren
+        bajar = set()
+        try:
+            with os.scandir(root) as entradas:
+                for entrada in entradas:
+                    try:
+                        es_carpeta = entrada.is_dir()
+                    except OSError:
+                        es_carpeta = False
+                    if es_carpeta:
+                        dirs.append(entrada.name)
+                        try:
+                            if entrada.is_dir(follow_symlinks=False):
+                                bajar.add(entrada.name)
+                        except OSError:
+                            pass
+                        continue
+                    files.append(entrada.name)
+                    try:
+                        dato = entrada.stat()
+                        stats[entrada.name] = (dato.st_size, dato.st_mtime)
+                    except OSError:
+                        pass
+        except OSError:
+            continue
+        yield root, dirs, files, stats
+        if not recursivo:
+            return
+        # Al reves para que el pop() las visite en el orden del listado,
+        # igual que os.walk.
+        for nombre in reversed(dirs):
+            if nombre in bajar:
+                pendientes.append(os.path.join(root, nombre))
+
+
+def disk_info(stats, nombres):
+    """
+    {"size", "mtime"} de un grupo de archivos de una misma carpeta.
+
+    Es el octavo elemento de cada tupla del escaneo. `size` es la suma y
+    `mtime` la mas reciente: en una secuencia, la fecha que importa es la del
+    ultimo frame que se escribio. Los dos quedan en None si no se conocio
+    ninguno, que no es lo mismo que cero bytes.
+
+    Las secuencias le suman "missing": los tramos de frames que faltan
+    adentro de su rango, en el formato de LGA_ToolPack_FrameRuns.
+    """
+    total = None
+    reciente = None
+    for nombre in nombres:
+        dato = stats.get(nombre)
+        if dato is None:
+            continue
+        total = (total or 0) + dato[0]
+        reciente = dato[1] if reciente is None else max(reciente, dato[1])
+    return {"size": total, "mtime": reciente}
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
+def format_size(bytes_):
+    """
+    "412 GB", "3.4 MB". En potencias de 1024, como lo muestran los sistemas.
+
+    None es "no se sabe" -un Offline, un stat que fallo- y se muestra como
+    raya, para que no se lea como un archivo vacio.
+    """
+    if bytes_ is None:
+        return "–"
+    valor = float(bytes_)
+    for unidad in _SIZE_UNITS:
+        if valor < 1024 or unidad == _SIZE_UNITS[-1]:
+            break
+        valor /= 1024.0
+    if unidad == "B":
+        return "%d B" % valor
+    # Un decimal solo mientras aporta: "3.4 MB" dice algo, "412.3 GB" no.
+    return ("%.1f %s" if valor < 10 else "%.0f %s") % (valor, unidad)
+
+
+def format_mtime(mtime):
+    """La fecha de modificacion como se muestra en la tabla."""
+    if mtime is None:
+        return "–"
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime))
+
+
+# ---------------------------------------------------------------------------
+#              Duplicados: el mismo contenido en dos lugares
+# ---------------------------------------------------------------------------
+# Copy to y los reingresos dejan el MISMO plate en mas de una location, con el
+# mismo nombre o con otro. remove_duplicates y las colisiones de _plan_copy
+# solo los ven por nombre; esto los ve por contenido.
+#
+# Leer todo para hashearlo seria leer el proyecto entero, asi que se descarta
+# en tres escalones, del mas barato al mas caro:
+#
+#   1. Tamano. Sale del escaneo, que ya lo trae: dos filas con distinto
+#      tamano o distinta cantidad de frames no pueden ser iguales, y sin tocar
+#      el disco se descarta casi todo.
+#   2. Hash PARCIAL: los primeros DUPLICATE_PARTIAL_BYTES de cada archivo.
+#      Dos renders distintos del mismo tamano -lo comun en EXR con la misma
+#      resolucion- casi siempre difieren en el header.
+#   3. Hash COMPLETO, solo de lo que sobrevivio a los dos anteriores.
+#
+# Los hashes van en un pool de hilos: el costo es esperar al servidor, no la
+# CPU, y hashlib suelta el GIL mientras digiere.
+
+# Lo que se lee de cada archivo en el hash parcial.
+DUPLICATE_PARTIAL_BYTES = 64 * 1024
+# Los hilos del pool. Mas que esto contra un NAS no suma: la cola se la lleva
+# el servidor y los pedidos de mas solo se estorban entre si.
+DUPLICATE_HASH_THREADS = 8
+_HASH_CHUNK = 1024 * 1024
+
+
+def file_digest(ruta, limite=None):
+    """
+    El hash de un archivo, o de sus primeros `limite` bytes.
+
+    blake2b y no md5 o sha1: es mas rapido que los dos en CPython y aca no se
+    firma nada, solo se compara. Devuelve None si no se pudo leer.
+    """
+    return _digest_y_fin(ruta, limite)[0]
+
+
+def _digest_y_fin(ruta, limite):
+    """
+    (hash, si se leyo el archivo entero).
+
+    Lo segundo es lo que le ahorra al hash completo volver a leer los
+    archivos chicos: si el parcial ya llego al final, ese hash ES el completo.
+    Se sabe en la misma lectura, sin un stat aparte por archivo.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    restante = limite
+    try:
+        with open(ruta, "rb") as handle:
+            while restante is None or restante > 0:
+                pedido = _HASH_CHUNK if restante is None else min(_HASH_CHUNK, restante)
+                bloque = handle.read(pedido)
+                if not bloque:
+                    return digest.digest(), True
+                digest.update(bloque)
+                if restante is not None:
+                    restante -= len(bloque)
+            entero = not handle.read(1)
+    except OSError:
+        return None, False
+    return digest.digest(), entero
+
+
+def _agrupar(filas, clave):
+    """Las filas agrupadas por `clave`, quedandose solo con lo que se repite."""
+    grupos = {}
+    for fila in filas:
+        valor = clave(fila)
+        if valor is None:
+            continue
+        grupos.setdefault(valor, []).append(fila)
+    return [grupo for grupo in grupos.values() if len(grupo) > 1]
+
+
+class DuplicateWorker(BatchWorker):
+    """
+    Busca filas con el mismo contenido byte a byte.
+
+    Cada item es (ruta de la fila, [archivos reales en orden], tamano). El
+    plan lo arma el hilo principal desde la tabla, igual que copia y borrado:
+    aca no se lee ningun widget. El resultado queda en `self.grupos`, una
+    lista de {"rutas", "tamano", "recuperable"}, y se avisa por el mismo
+    `finished` de las tandas.
+
+    Una secuencia es duplicada de otra solo si TODOS sus frames lo son y en
+    el mismo orden: la clave de la fila es la tupla de los hashes de sus
+    archivos, no la de un archivo suelto.
+    """
+
+    def __init__(self, items):
+        super(DuplicateWorker, self).__init__(items)
+        self.grupos = []
+        self._hechos = 0
+        self._total = 1
+
+    def _digests(self, pool, archivos, limite, enteros=None):
+        """
+        {archivo: hash} de todos los archivos, en el pool.
+
+        Si se pasa `enteros`, ahi se anotan los archivos que se leyeron hasta
+        el final.
+        """
+
+        def uno(ruta):
+            if self._cancelado:
+                return ruta, (None, False)
+            return ruta, _digest_y_fin(ruta, limite)
+
+        resultado = {}
+        for ruta, (digest, entero) in pool.map(uno, archivos):
+            resultado[ruta] = digest
+            if entero and enteros is not None:
+                enteros.add(ruta)
+            self._hechos += 1
+            if self.avisa(self._hechos):
+                self.signals.item.emit(os.path.basename(ruta))
+                self.signals.progress.emit(self._hechos, self._total)
+        return resultado
+
+    @staticmethod
+    def _clave(fila, digests):
+        """La clave de una fila, o None si algun archivo no se pudo leer."""
+        partes = tuple(digests.get(archivo) for archivo in fila[1])
+        if any(parte is None for parte in partes):
+            return None
+        return partes
+
+    @Slot()
+    def run(self):
+        errores = []
+        try:
+            # Cero bytes no cuenta: dos archivos vacios son "iguales" y no hay
+            # nada que recuperar borrando uno.
+            candidatos = _agrupar(
+                [fila for fila in self.items if fila[1] and fila[2]],
+                lambda fila: (len(fila[1]), fila[2]),
+            )
+            archivos = [a for grupo in candidatos for fila in grupo for a in fila[1]]
+            # Dos pasadas sobre los mismos archivos, en el peor caso.
+            self._total = max(1, 2 * len(archivos))
+            self.signals.progress.emit(0, self._total)
+
+            with ThreadPoolExecutor(max_workers=DUPLICATE_HASH_THREADS) as pool:
+                enteros = set()
+                parciales = self._digests(
+                    pool, archivos, DUPLICATE_PARTIAL_BYTES, enteros
+                )
+                sospechosos = []
+                for grupo in candidatos:
+                    sospechosos.extend(
+                        _agrupar(grupo, lambda fila: self._clave(fila, parciales))
+                    )
+                # Lo que entra entero en el parcial ya esta hasheado completo:
+                # no se vuelve a leer.
+                pendientes = [
+                    a
+                    for grupo in sospechosos
+                    for fila in grupo
+                    for a in fila[1]
+                    if a not in enteros
+                ]
+                self._total = max(1, len(archivos) + len(pendientes))
+                completos = dict(parciales)
+                if not self._cancelado:
+                    completos.update(self._digests(pool, pendientes, None))
+
+            if not self._cancelado:
+                for grupo in sospechosos:
+                    for iguales in _agrupar(
+                        grupo, lambda fila: self._clave(fila, completos)
+                    ):
+                        tamano = iguales[0][2]
+                        self.grupos.append(
+                            {
+                                "rutas": [fila[0] for fila in iguales],
+                                "tamano": tamano,
+                                # Se queda una copia; lo demas se puede borrar.
+                                "recuperable": tamano * (len(iguales) - 1),
+                            }
+                        )
+                self.grupos.sort(key=lambda grupo: -grupo["recuperable"])
+        except Exception as problema:
+            errores.append(str(problema))
+        self.signals.progress.emit(self._total, self._total)
+        self.signals.finished.emit(len(self.grupos), 0, errores, self._cancelado)
+
+
+# ---------------------------------------------------------------------------
+#              Que cambio desde el ultimo escaneo de este script
+# ---------------------------------------------------------------------------
+
+
+class SnapshotSignals(QObject):
+    """El diff contra la foto anterior, de vuelta en el hilo principal."""
+
+    # El dict de LGA_MediaManager_snapshot.diff mas "since": la hora de la
+    # foto anterior. None si no habia foto con que comparar.
+    diffed = Signal(object)
+
+
+class SnapshotWorker(QRunnable):
+    """
+    Compara el escaneo recien terminado contra el anterior y guarda el nuevo.
+
+    Recibe la foto de la tabla ya sacada en el hilo principal -(ruta de fila,
+    estado, read) por fila- igual que el escaneo recibe la foto del script:
+    aca no se lee ningun widget. Leer la foto vieja, compararla y escribir la
+    nueva es disco, y por eso va en el pool.
+    """
+
+    def __init__(self, nk_path, filas):
+        super(SnapshotWorker, self).__init__()
+        self.nk_path = nk_path
+        self.filas = list(filas)
+        self.signals = SnapshotSignals()
+        self.signals.moveToThread(QApplication.instance().thread())
+        self._cancelado = False
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancelado = True
+
+    @staticmethod
+    def keyed(filas):
+        """
+        {clave: [ruta, rango, estado, read]} a partir de las filas.
+
+        La clave es la ruta SIN el rango y normalizada: una secuencia que
+        gano frames tiene que caer en la misma clave para que se lea como
+        "cambio el rango" y no como una borrada mas una nueva.
+        """
+        import LGA_MediaManager_snapshot as snapshot
+
+        salida = {}
+        for ruta, estado, read in filas:
+            rango = _RANGO_RE.search(ruta)
+            entrada = [None] * 4
+            entrada[snapshot.RUTA] = ruta
+            entrada[snapshot.RANGO] = (
+                "%s-%s" % (rango.group(1), rango.group(2)) if rango else None
+            )
+            entrada[snapshot.ESTADO] = estado
+            entrada[snapshot.READ] = read
+            salida[row_key(ruta)] = entrada
+        return salida
+
+    @Slot()
+    def run(self):
+        import LGA_MediaManager_snapshot as snapshot
+
+        cambios = None
+        try:
+            actuales = self.keyed(self.filas)
+            ruta = snapshot.snapshot_path(self.nk_path, create_dir=True)
+            previa = snapshot.load(ruta)
+            if self._cancelado:
+                return
+            if previa is not None:
+                cambios = snapshot.diff(previa["rows"], actuales)
+                cambios["since"] = previa["time"]
+            snapshot.save(ruta, actuales)
+        except Exception as problema:
+            debug_print("No se pudo comparar contra el escaneo anterior: %s" % problema)
+            cambios = None
+        if not self._cancelado:
+            self.signals.diffed.emit(cambios)
+
+
+# ---------------------------------------------------------------------------
+#                               Modo Watch
+# ---------------------------------------------------------------------------
+# Cada cuanto se despierta el worker aunque no haya avisos: es lo que tarda en
+# atender un cancel() y en entregar una tanda que ya junto su silencio.
+WATCH_TICK_SECONDS = 0.5
+
+
+class WatchSignals(QObject):
+    # Un set con las carpetas que cambiaron, ya juntadas en una tanda.
+    changed = Signal(object)
+
+
+class WatchWorker(QRunnable):
+    """
+    Vigila las carpetas del escaneo y avisa cuales cambiaron.
+
+    No termina solo: corre hasta que se lo cancela, asi que no va en el pool
+    global -ocuparia para siempre un hilo de los que usan el escaneo y las
+    tandas- sino en uno propio de un hilo, que arma quien lo arranca.
+
+    Lo que emite ya viene juntado por mm_watch.Coalescer: tres mil frames que
+    aterrizan en la misma carpeta son UN aviso, no tres mil.
+    """
+
+    def __init__(self, carpetas):
+        super(WatchWorker, self).__init__()
+        self.carpetas = list(carpetas)
+        self.signals = WatchSignals()
+        self.signals.moveToThread(QApplication.instance().thread())
+        self._cancelado = False
+        self._vigilancia = None
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancelado = True
+
+    def add(self, carpetas):
+        """Suma carpetas a la vigilancia en curso. Se llama desde afuera."""
+        if self._vigilancia is not None:
+            self._vigilancia.add(carpetas)
+        else:
+            self.carpetas.extend(carpetas)
+
+    @Slot()
+    def run(self):
+        logger = configure_logger()
+        try:
+            self._vigilancia = mm_watch.DirectoryWatch(self.carpetas)
+        except Exception as problema:
+            debug_print("No se pudo arrancar el modo Watch: %s" % problema)
+            return
+        logger.debug(
+            "Watch: %d carpeta(s) por %s"
+            % (len(self._vigilancia), self._vigilancia.backend)
+        )
+        juntas = mm_watch.Coalescer()
+        try:
+            while not self._cancelado:
+                cambios = self._vigilancia.wait(WATCH_TICK_SECONDS)
+                ahora = time.time()
+                juntas.add(cambios, ahora)
+                tanda = juntas.due(ahora)
+                if tanda and not self._cancelado:
+                    self.signals.changed.emit(tanda)
+        except Exception:
+            logger.exception("El modo Watch se corto por un error")
+        finally:
+            self._vigilancia.close()
+
+
 class ProgressWindow(QWidget):
     """
     La ventana de progreso del pack: escaneo, copia y borrado.
@@ -1158,6 +1684,9 @@ class ScannerWorker(QRunnable):
         # La X de la ventana de escaneo puede llegar despues de que run()
         # termino: sin esto el objeto C++ ya no esta y cancel() explota.
         self.setAutoDelete(False)
+        # Todas las carpetas que recorrio find_files. Son las que vigila el
+        # modo Watch: las mismas que se escanearon, sin volver a listarlas.
+        self.carpetas_vistas = []
 
         # Definir los rangos de progreso para cada etapa
         self.Etapa1_inicio = 0
@@ -1453,8 +1982,9 @@ class ScannerWorker(QRunnable):
             self.signals.failed.emit("%s: %s" % (type(e).__name__, e))
             self.signals.finished.emit()
 
-    def find_files(self, folder, progress_callback=None):
-        # Encuentra los archivos en la carpeta del proyecto y determina si son secuencias
+    def find_files(self, folder, progress_callback=None, recursivo=True):
+        # Encuentra los archivos en la carpeta del proyecto y determina si son secuencias.
+        # Sin `recursivo` mira solo `folder`: es el re-listado del modo Watch.
         end_time = time.time()
         # logging.info(f"Scanning folder: {folder}")
         # logging.info("")
@@ -1471,8 +2001,26 @@ class ScannerWorker(QRunnable):
         processed_items = 0
         update_interval = 20  # Actualizar cada 20 archivos
 
-        # Primera pasada para contar archivos totales
-        for root, _, files in os.walk(folder):
+        # Primera pasada para contar archivos totales. El listado se guarda y la
+        # segunda pasada recorre ESTE y no otro os.walk: antes el disco se
+        # listaba dos veces enteras por location, y ahora ademas cada entrada
+        # trae su stat, que es de donde salen el tamano y la fecha de la fila.
+        listado = []
+        # Por carpeta: el stat de cada archivo y todo lo que hay adentro -
+        # archivos y subcarpetas-, que es lo que devolvia el os.listdir con el
+        # que se decidia si la carpeta de una secuencia se puede borrar entera.
+        stats_por_carpeta = {}
+        nombres_por_carpeta = {}
+        # Los archivos de cada secuencia, por nombre. Es lo que se suma para el
+        # tamano de la fila: `sequences` guarda solo los numeros de frame.
+        miembros = {}
+        for root, dirs, files, stats in walk_with_stats(folder, recursivo):
+            if self._cancelado:
+                break
+            listado.append((root, dirs, files))
+            self.carpetas_vistas.append(root)
+            stats_por_carpeta[root] = stats
+            nombres_por_carpeta[root] = set(dirs) | set(files)
             filtered_files = [
                 f
                 for f in files
@@ -1513,7 +2061,7 @@ class ScannerWorker(QRunnable):
             f"\n{self.get_timestamp()} Segunda fase ({self.Etapa2_inicio}-{self.Etapa2_fin}%):"
         )
 
-        for root, dirs, files in os.walk(folder):
+        for root, dirs, files in listado:
             if self._cancelado:
                 # Se corta acá y no en el medio de armar una secuencia: lo que
                 # se devuelve es lo que ya estaba completo.
@@ -1621,6 +2169,9 @@ class ScannerWorker(QRunnable):
                     if sequence_base not in sequences:
                         sequences[sequence_base] = []
                     sequences[sequence_base] = sorted(set(frames))
+                    miembros[sequence_base] = set(
+                        pair[1] for pair in frame_filename_pairs
+                    )
 
                     self.logger.debug(
                         f"[COPYCAT] Creado grupo UNICO de secuencia: {base_name} | archivos: {len(frame_filename_pairs)} | rango: [{first_frame}-{last_frame}]"
@@ -1691,6 +2242,9 @@ class ScannerWorker(QRunnable):
                                 sequences[sequence_base].extend(
                                     [frame_num1, frame_num2]
                                 )
+                                miembros.setdefault(sequence_base, set()).update(
+                                    (file1, file2)
+                                )
                             else:
                                 # logging.info(f"Frames {frame_num1} and {frame_num2} are not consecutive")
 
@@ -1727,6 +2281,9 @@ class ScannerWorker(QRunnable):
                                     sequences[sequence_base].extend(
                                         [frame_num1, frame_num2]
                                     )
+                                    miembros.setdefault(
+                                        sequence_base, set()
+                                    ).update((file1, file2))
                                 else:
                                     # logging.info(f"Frames {frame_num1} and {frame_num2} are not consecutive")
                                     pass
@@ -1797,6 +2354,7 @@ class ScannerWorker(QRunnable):
                                     False,
                                     False,
                                     False,
+                                    disk_info(stats_por_carpeta.get(root, {}), [file]),
                                 )
                             )
                         else:
@@ -1812,10 +2370,21 @@ class ScannerWorker(QRunnable):
 
         ##############################################
 
+        # Las claves de los Reads -%0Xd como numerales, normalizadas- son las
+        # mismas para todas las secuencias: se arman una vez y no una por
+        # secuencia.
+        normalized_read_files = {
+            mm_pathkey.read_key(path): nodes for path, nodes in all_read_files.items()
+        }
+
         # Procesar las secuencias identificadas y verificar carpetas borrables
         for base, frames in sequences.items():
             sequences[base] = sorted(set(frames))
-            frame_range = f"[{min(frames)}-{max(frames)}]"
+            # Los tramos salen de los MISMOS frames que ya se juntaron: el
+            # rango de la fila son sus puntas y los huecos, lo que hay entre
+            # tramo y tramo. Cero I/O y un solo recorrido.
+            tramos = frame_runs(sequences[base])
+            frame_range = f"[{tramos[0][0]}-{tramos[-1][1]}]"
             # logging.info (f"frame_range {frame_range}")
             # logging.info (f"min(frames) {min(frames)}")
             # logging.info (f"max(frames) {max(frames)}")
@@ -1828,15 +2397,6 @@ class ScannerWorker(QRunnable):
             # logging.info (f"base {base}")
             # logging.info (f"normalized_base {normalized_base}")
 
-            # Normalizar y resolver las rutas de los reads usando la funcion centralizada
-            normalized_read_files = {}
-            for path, nodes in all_read_files.items():
-                # Reemplazar %0Xd por la cantidad correspondiente de #
-                new_key = re.sub(r"%0(\d+)d", lambda m: "#" * int(m.group(1)), path)
-                # Usar la funcion de normalizacion centralizada
-                new_key = normalize_path_for_comparison(new_key)
-                normalized_read_files[new_key] = nodes
-
             # logging.info(f"normalized_base: {normalized_base}")
             # logging.info(f"normalized_read_files: {normalized_read_files}")
 
@@ -1853,7 +2413,11 @@ class ScannerWorker(QRunnable):
             # Verificar si la carpeta contiene solo archivos de la secuencia
             directory_path = os.path.dirname(base)
             # logging.info (f"directory_path {directory_path}")
-            all_files_in_directory = set(os.listdir(directory_path))
+            # Del listado del escaneo y no de otro os.listdir: la carpeta ya se
+            # leyo entera en esta misma pasada.
+            all_files_in_directory = nombres_por_carpeta.get(directory_path)
+            if all_files_in_directory is None:
+                all_files_in_directory = set(os.listdir(directory_path))
 
             sequence_files_set = set(
                 [
@@ -1881,6 +2445,13 @@ class ScannerWorker(QRunnable):
                         False,
                         is_folder_deletable,
                         True,
+                        dict(
+                            disk_info(
+                                stats_por_carpeta.get(directory_path, {}),
+                                miembros.get(base, ()),
+                            ),
+                            missing=missing_runs(tramos),
+                        ),
                     )
                 )
             else:
@@ -1899,15 +2470,7 @@ class ScannerWorker(QRunnable):
         editref_count = 0
 
         for i, item in enumerate(to_add):
-            (
-                file_path,
-                read_files,
-                is_sequence,
-                frame_range,
-                is_unmatched_read,
-                is_folder_deletable,
-                sequence_state,
-            ) = item
+            file_path = item[0]
             normalized_path = normalize_path_for_comparison(file_path)
 
             # Contar EditRef para debugging
@@ -1956,6 +2519,49 @@ class ScannerWorker(QRunnable):
         return self.file_scanner.get_read_files()
 
 
+class DirectoryRefreshWorker(ScannerWorker):
+    """
+    Re-lista solo algunas carpetas: las que el modo Watch vio cambiar, o las
+    que acaba de tocar una copia o un borrado.
+
+    Es un ScannerWorker para que las filas salgan de find_files, o sea
+    agrupadas en secuencias y con sus Reads igual que en el escaneo entero:
+    dos caminos para clasificar una fila terminan dando dos respuestas. Cada
+    carpeta se lista sola, sin bajar a las de adentro -si una de esas cambio,
+    llega como otra carpeta de la tanda-, y emite files_found con
+    [carpetas, filas]: el hilo principal cambia las filas de esas carpetas y
+    no toca las demas.
+    """
+
+    def __init__(self, file_scanner, carpetas):
+        super(DirectoryRefreshWorker, self).__init__(file_scanner)
+        self.carpetas = sorted(set(carpetas))
+        self._lecturas = None
+
+    def get_read_files(self):
+        # find_files la pide una vez por carpeta y es un viaje al hilo
+        # principal: por tanda alcanza con una foto del script.
+        if self._lecturas is None:
+            self._lecturas = super(DirectoryRefreshWorker, self).get_read_files()
+        return self._lecturas
+
+    @Slot()
+    def run(self):
+        try:
+            filas = []
+            for carpeta in self.carpetas:
+                if self._cancelado:
+                    break
+                if os.path.isdir(carpeta):
+                    filas.extend(self.find_files(carpeta, recursivo=False))
+            if not self._cancelado:
+                self.signals.files_found.emit([self.carpetas, filas])
+        except Exception as e:
+            self.logger.exception("El re-listado de carpetas se corto por un error")
+            self.signals.failed.emit("%s: %s" % (type(e).__name__, e))
+        self.signals.finished.emit()
+
+
 def main():
     app = QApplication.instance() or QApplication(sys.argv)
 
@@ -0,0 +1,333 @@
+"""
+_______________________________________
+
+  LGA_MediaManager_watch v2.53 | Lega
+  Que carpetas del escaneo cambiaron, sin volver a recorrerlas
+
+  El modo Watch del Media Manager necesita saber DONDE cambio algo,
+  no que cambio: de eso se encarga el re-listado de esas carpetas.
+  Este modulo vigila las carpetas que el escaneo ya conoce y devuelve
+  las que se tocaron.
+
+  En Linux usa inotify, por ctypes y sin dependencias: el kernel avisa
+  y no se mira nada. Donde no hay inotify -Windows, macOS- o cuando se
+  acaba el limite de watches del usuario, esas carpetas se vigilan
+  por la fecha de modificacion de la CARPETA, que cambia cuando algo
+  se crea, se borra o se renombra adentro: un stat por carpeta y por
+  vuelta, sin listar nada.
+
+  Coalescer junta los avisos: una secuencia de tres mil frames que
+  aterriza son tres mil avisos de la misma carpeta, y tienen que
+  llegar como UNA actualizacion.
+
+  No importa Qt a proposito, igual que LGA_MediaManager_paths: asi se
+  puede probar sin PySide.
+
+  v2.48: Modulo nuevo.
+_______________________________________
+
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+
+
+# Cada cuanto se mira la fecha de las carpetas que no tienen inotify. Es un
+# stat por carpeta: dos segundos no se notan ni contra un servidor.
+WATCH_POLL_SECONDS = 2.0
+# Cuanto silencio hace falta para dar una tanda por terminada. Un render o una
+# copia escriben frame tras frame: mientras sigan llegando avisos, se espera.
+WATCH_SETTLE_SECONDS = 1.5
+# Y el tope: un render de una hora no avisa nunca si se espera el silencio.
+# Pasado esto se entrega lo juntado aunque siga llegando.
+WATCH_MAX_WAIT_SECONDS = 10.0
+
+# Las constantes de <sys/inotify.h>. Se vigila lo que cambia el LISTADO de la
+# carpeta, mas IN_CLOSE_WRITE: un frame que se termino de escribir cambia el
+# tamano de su fila aunque el nombre ya estuviera.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_MASCARA = (
+    IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+# wd, mask, cookie, len: la cabecera de cada evento, seguida del nombre.
+_EVENTO = struct.Struct("iIII")
+
+
+def _libc_inotify():
+    """La libc con inotify, o None donde no la hay."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def _subcarpetas(carpeta):
+    """Las carpetas de adentro, a cualquier profundidad, incluida la propia."""
+    salida = [carpeta]
+    pendientes = [carpeta]
+    while pendientes:
+        actual = pendientes.pop()
+        try:
+            with os.scandir(actual) as entradas:
+                for entrada in entradas:
+                    try:
+                        if entrada.is_dir(follow_symlinks=False):
+                            salida.append(entrada.path)
+                            pendientes.append(entrada.path)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+    return salida
+
+
+def _fecha(carpeta):
+    """La fecha de modificacion de una carpeta, o None si ya no esta."""
+    try:
+        return os.stat(carpeta).st_mtime_ns
+    except OSError:
+        return None
+
+
+class DirectoryWatch(object):
+    """
+    Vigila un conjunto de carpetas y dice cuales cambiaron.
+
+    wait() bloquea hasta `timeout` segundos y devuelve un set con las
+    carpetas tocadas, vacio si no paso nada. Las carpetas nuevas que
+    aparecen adentro de una vigilada se suman solas -un render que crea su
+    carpeta tiene que verse- y las que desaparecen se informan una vez y se
+    dejan de mirar.
+
+    Todo lo que no es add() corre en el mismo hilo: el del worker.
+    """
+
+    def __init__(self, carpetas, usar_inotify=True):
+        self._lock = threading.Lock()
+        self._por_sumar = []
+        # Las que se vigilan por fecha: {carpeta: mtime}.
+        self._fechas = {}
+        self._proximo_sondeo = 0.0
+        # inotify: {wd: carpeta} y el descriptor.
+        self._wds = {}
+        self._fd = -1
+        # Todas las vigiladas, por una via o por la otra: se pregunta por cada
+        # carpeta que aparece y tiene que ser O(1).
+        self._carpetas = set()
+        self._libc = _libc_inotify() if usar_inotify else None
+        if self._libc is not None:
+            fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+            else:
+                self._libc = None
+        for carpeta in carpetas:
+            self._vigilar(carpeta)
+
+    @property
+    def backend(self):
+        """"inotify", "polling" o los dos, para el log."""
+        if self._fd < 0:
+            return "polling"
+        return "inotify+polling" if self._fechas else "inotify"
+
+    def __len__(self):
+        return len(self._wds) + len(self._fechas)
+
+    def add(self, carpetas):
+        """Suma carpetas desde otro hilo. Se aplican en el proximo wait()."""
+        with self._lock:
+            self._por_sumar.extend(carpetas)
+
+    def close(self):
+        if self._fd >= 0:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = -1
+        self._wds = {}
+        self._fechas = {}
+        self._carpetas = set()
+
+    # ------------------------------------------------------------------
+    def _vigilar(self, carpeta):
+        """Una carpeta mas: por inotify si se puede, si no por fecha."""
+        carpeta = os.path.normpath(carpeta)
+        if carpeta in self._carpetas:
+            return
+        if self._fd >= 0:
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(carpeta), _MASCARA
+            )
+            if wd >= 0:
+                self._wds[wd] = carpeta
+                self._carpetas.add(carpeta)
+                return
+            # ENOSPC es el limite de watches del usuario: esa carpeta se mira
+            # por fecha y las que ya tenian watch lo conservan.
+        fecha = _fecha(carpeta)
+        if fecha is not None:
+            self._fechas[carpeta] = fecha
+            self._carpetas.add(carpeta)
+
+    def _nuevas(self, carpeta, cambios):
+        """Una carpeta que aparecio: se vigila con todo lo que ya traiga."""
+        for sub in _subcarpetas(carpeta):
+            sub = os.path.normpath(sub)
+            if sub in self._carpetas:
+                continue
+            self._vigilar(sub)
+            cambios.add(sub)
+
+    def wait(self, timeout):
+        with self._lock:
+            por_sumar, self._por_sumar = self._por_sumar, []
+        for carpeta in por_sumar:
+            self._vigilar(carpeta)
+
+        cambios = set()
+        # Con carpetas por fecha, la espera se corta en el proximo sondeo.
+        espera = timeout
+        if self._fechas:
+            espera = max(0.0, min(timeout, self._proximo_sondeo - time.time()))
+        if self._fd >= 0:
+            self._leer_inotify(espera, cambios)
+        else:
+            time.sleep(espera)
+        if self._fechas and time.time() >= self._proximo_sondeo:
+            self._sondear(cambios)
+            self._proximo_sondeo = time.time() + WATCH_POLL_SECONDS
+        return cambios
+
+    def _leer_inotify(self, espera, cambios):
+        try:
+            listos, _, _ = select.select([self._fd], [], [], espera)
+        except (OSError, ValueError):
+            return
+        if not listos:
+            return
+        while True:
+            try:
+                datos = os.read(self._fd, 64 * 1024)
+            except OSError:
+                # BlockingIOError incluido: la cola quedo vacia.
+                return
+            if not datos:
+                return
+            desde = 0
+            while desde + _EVENTO.size <= len(datos):
+                wd, mascara, _cookie, largo = _EVENTO.unpack_from(datos, desde)
+                nombre = datos[desde + _EVENTO.size : desde + _EVENTO.size + largo]
+                desde += _EVENTO.size + largo
+                if mascara & IN_Q_OVERFLOW:
+                    # Se perdieron avisos: no se sabe donde, asi que todas.
+                    cambios.update(self._wds.values())
+                    continue
+                carpeta = self._wds.get(wd)
+                if carpeta is None:
+                    continue
+                if mascara & IN_IGNORED:
+                    del self._wds[wd]
+                    self._carpetas.discard(carpeta)
+                    continue
+                cambios.add(carpeta)
+                if mascara & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    # La carpeta misma se fue; la de arriba se entera por su
+                    # cuenta y el IN_IGNORED que sigue saca el watch.
+                    continue
+                if mascara & IN_ISDIR and mascara & (IN_CREATE | IN_MOVED_TO):
+                    nueva = os.path.join(carpeta, os.fsdecode(nombre.rstrip(b"\0")))
+                    self._nuevas(nueva, cambios)
+
+    def _sondear(self, cambios):
+        for carpeta, antes in list(self._fechas.items()):
+            ahora = _fecha(carpeta)
+            if ahora == antes:
+                continue
+            cambios.add(carpeta)
+            if ahora is None:
+                del self._fechas[carpeta]
+                self._carpetas.discard(carpeta)
+                continue
+            self._fechas[carpeta] = ahora
+            # La fecha dice que cambio el listado, no que: si entro una
+            # carpeta, se la busca y se la suma.
+            try:
+                with os.scandir(carpeta) as entradas:
+                    subs = [e.path for e in entradas if e.is_dir(follow_symlinks=False)]
+            except OSError:
+                continue
+            for sub in subs:
+                if os.path.normpath(sub) not in self._carpetas:
+                    self._nuevas(sub, cambios)
+
+
+class Coalescer(object):
+    """
+    Junta los avisos y los entrega de a tandas.
+
+    Una tanda sale cuando pasaron WATCH_SETTLE_SECONDS sin avisos nuevos, o
+    cuando el primer aviso ya tiene WATCH_MAX_WAIT_SECONDS aunque sigan
+    llegando. Recibe la hora de afuera para poder probarlo sin esperar.
+    """
+
+    def __init__(self, settle=WATCH_SETTLE_SECONDS, max_wait=WATCH_MAX_WAIT_SECONDS):
+        self.settle = settle
+        self.max_wait = max_wait
+        self.pendientes = set()
+        self._primero = None
+        self._ultimo = None
+
+    def add(self, carpetas, ahora):
+        if not carpetas:
+            return
+        if not self.pendientes:
+            self._primero = ahora
+        self.pendientes.update(carpetas)
+        self._ultimo = ahora
+
+    def due(self, ahora):
+        """La tanda lista para entregar, o None si hay que seguir esperando."""
+        if not self.pendientes:
+            return None
+        if (
+            ahora - self._ultimo < self.settle
+            and ahora - self._primero < self.max_wait
+        ):
+            return None
+        salida, self.pendientes = self.pendientes, set()
+        self._primero = self._ultimo = None
+        return salida
@@ -1,9 +1,11 @@
 """
 ________________________________________________________________________
 
-  LGA_RnW_ColorSpace_Favs v1.48 | Lega
+  LGA_RnW_ColorSpace_Favs v1.49 | Lega
   Tool for applying OCIO color spaces to selected Read and Write nodes
   
+  v1.49: El ini se lee y escribe con LGA_ToolPack_ConfigStore: abrir la
+         ventana ya no lo vuelve a parsear, y el save es atomico.
   v1.48: El look sale de LGA_UI_Style_ToolPack. La cruz de cerrar pasa
          de 20 a 26 px y se pinta al pasar por encima; la tabla deja de
          ser mas oscura que su propia ventana; y el alto de la ventana
@@ -40,7 +42,8 @@ import nuke
 import os
 import shutil
 import typing  # Importar typing para compatibilidad < 3.10
-import platform
+
+import LGA_ToolPack_ConfigStore as config_store
 
 # Variable global para controlar el debug
 DEBUG = False  # Poner en False para desactivar los mensajes de debug
@@ -101,27 +104,8 @@ def resolve_colorspace_for_context(requested_name, color_context):
 
 
 def get_user_config_dir():
-    """
-    Obtiene el directorio de configuracion del usuario segun el sistema operativo.
-    Windows: %APPDATA%
-    Mac: ~/Library/Application Support
-    """
-    system = platform.system()
-    if system == "Windows":
-        config_path = os.getenv("APPDATA")
-        if not config_path:
-            debug_print("Error: No se pudo encontrar la variable de entorno APPDATA.")
-            return None
-    elif system == "Darwin":  # macOS
-        config_path = os.path.expanduser("~/Library/Application Support")
-    else:
-        # Para otros sistemas, usar el directorio home como fallback
-        config_path = os.path.expanduser("~/.config")
-        debug_print(
-            f"Sistema no reconocido ({system}), usando ~/.config como fallback."
-        )
-
-    return config_path
+    """Directorio de configuracion del usuario: ver LGA_ToolPack_ConfigStore."""
+    return config_store.get_user_config_dir()
 
 
 # --- Constantes ---
@@ -141,20 +125,7 @@ def get_lga_toolpack_config_dir() -> typing.Optional[str]:
     Crea el directorio si no existe.
     Devuelve la ruta o None si no se puede obtener el directorio de configuracion del usuario o hay error al crear.
     """
-    user_config_dir = get_user_config_dir()
-    if not user_config_dir:
-        return None
-
-    config_dir = os.path.join(user_config_dir, CONFIG_DIR_NAME, TOOLPACK_SUBDIR_NAME)
-
-    if not os.path.exists(config_dir):
-        try:
-            os.makedirs(config_dir)
-            debug_print(f"Directorio de configuracion creado: {config_dir}")
-        except OSError as e:
-            debug_print(f"Error al crear el directorio {config_dir}: {e}")
-            return None
-    return config_dir
+    return config_store.get_config_dir(create=True)
 
 
 def get_colorspace_ini_path(create_if_missing: bool = True) -> typing.Optional[str]:
@@ -207,14 +178,12 @@ def read_colorspaces_from_ini(ini_path: typing.Optional[str]) -> typing.List[str
         debug_print(f"Error: Archivo INI no encontrado o ruta invalida: {ini_path}")
         return fallback_list
 
-    config = configparser.ConfigParser(allow_no_value=True)
     try:
         debug_print(f"Leyendo configuracion desde: {ini_path}")
-        config.optionxform = str  # Mantener mayusculas/minusculas
-        config.read(ini_path)
-        if config.has_section(COLORSPACE_SECTION):
+        sections = config_store.read_ini(ini_path)
+        if COLORSPACE_SECTION in sections:
             # Devolver solo las claves de la seccion
-            return list(config[COLORSPACE_SECTION].keys())
+            return list(sections[COLORSPACE_SECTION].keys())
         else:
             debug_print(
                 f"Advertencia: Seccion '{COLORSPACE_SECTION}' no encontrada en {ini_path}."
@@ -241,29 +210,15 @@ def save_colorspaces_to_ini(
         )
         return False  # Indicar fallo
 
-    config = configparser.ConfigParser(allow_no_value=True)
-    config.optionxform = str  # Mantener mayusculas/minusculas
-
     try:
-        # Leer el archivo existente para preservar otras secciones si las hubiera
-        if os.path.exists(ini_path):
-            config.read(ini_path)
-
-        # Eliminar la seccion existente si existe, para empezar de cero
-        if config.has_section(COLORSPACE_SECTION):
-            config.remove_section(COLORSPACE_SECTION)
-
-        # Anadir la nueva seccion
-        config.add_section(COLORSPACE_SECTION)
-
-        # Anadir cada colorspace como una clave sin valor
-        for cs in colorspaces_list:
-            if cs:  # Evitar guardar strings vacios
-                config.set(COLORSPACE_SECTION, cs, None)
-
-        # Escribir el archivo
-        with open(ini_path, "w") as configfile:
-            config.write(configfile)
+        # La seccion se reescribe de cero, cada colorspace como una clave sin
+        # valor; las otras secciones quedan como estaban
+        config_store.write_section(
+            ini_path,
+            COLORSPACE_SECTION,
+            {cs: None for cs in colorspaces_list if cs},  # Evitar strings vacios
+            replace=True,
+        )
         debug_print(f"Configuracion de ColorSpaces guardada en: {ini_path}")
         return True  # Indicar exito
 
@@ -1,12 +1,25 @@
 """
 ____________________________________________________________________
 
-  LGA_RnW_DuplicatePublish v1.02 | Lega
+  LGA_RnW_DuplicatePublish v1.05 | Lega
 
   Duplica en disco la secuencia de un Read renombrandola con el
   numero de version del script actual. Sirve para re-renderizar solo
   un rango corto sin tener que volver a procesar la secuencia entera.
 
+  v1.05: La copia muestra la velocidad y el tiempo restante. Al
+         terminar se puede verificar lo copiado: cada frame se hashea
+         contra el original, leyendo los dos a la vez, y se listan los
+         frames que no coinciden. Las velocidades de cada copia y
+         verificacion quedan en un historial por volumen.
+  v1.04: Antes de copiar se prueba con el primer frame que acepta el
+         destino: un clone copy-on-write, un hardlink si es el mismo
+         volumen, o si no una copia de varios frames a la vez. La
+         ventana final dice cual se uso.
+  v1.03: Los huecos de la secuencia salen de LGA_ToolPack_FrameRuns,
+         los mismos tramos que usa el Media Manager, y el cartel de
+         elegir rango dice QUE frames faltan en vez de solo avisar que
+         faltan algunos.
   v1.02: El look sale de LGA_UI_Style_ToolPack. Los botones dejan de
          ser todos iguales: el que ejecuta Enter va marcado en violeta
          y el resto grises, como en el resto del pack.
@@ -17,15 +30,27 @@ ____________________________________________________________________
 ____________________________________________________________________
 """
 
+import ctypes
+import errno
+import hashlib
 import os
+import platform
 import re
 import shutil
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 import nuke
 
 from LGA_QtAdapter_ToolPack import QtWidgets, QtCore
 from LGA_UI_Style_ToolPack import Color, Metric, Style
+from LGA_ToolPack_FrameRuns import frame_runs, has_gaps, missing_runs, format_runs
 
 QApplication = QtWidgets.QApplication
 QDialog = QtWidgets.QDialog
@@ -200,9 +225,12 @@ def format_frame_range(frames):
 
 def has_missing_frames(frames):
     """True si hay huecos dentro del rango de la secuencia."""
-    if len(frames) < 2:
-        return False
-    return len(frames) != (frames[-1][0] - frames[0][0] + 1)
+    return has_gaps(frame_runs(item[0] for item in frames))
+
+
+def missing_frames_text(frames, limite=6):
+    """Los frames que faltan adentro del rango, como "1011-1014, 1019"."""
+    return format_runs(missing_runs(frame_runs(item[0] for item in frames)), limite)
 
 
 def path_to_html(path):
@@ -252,6 +280,297 @@ def build_copy_jobs(context, source_frames):
     return jobs
 
 
+# ---------------------------------------------------------------------------
+#                           Estrategias de duplicado
+# ---------------------------------------------------------------------------
+# La version nueva casi siempre cae en el mismo volumen que la original, y
+# copiar 2000 frames 4K solo para re-renderizar diez tarda minutos y ocupa el
+# doble de disco. Por eso, antes de copiar, se prueba con el primer frame que
+# puede hacer el destino, de la mas barata a la mas cara:
+#
+# - clone: copy-on-write (Btrfs, XFS con reflink, APFS). Instantaneo, no ocupa
+#   espacio y cada archivo es independiente: es lo mejor que hay.
+# - hardlink: mismo volumen sin copy-on-write. Instantaneo y sin espacio, pero
+#   los dos nombres son EL MISMO archivo. El Write de Nuke renderiza a un
+#   temporal y renombra, asi que re-renderizar un frame corta el vinculo y el
+#   publish original no cambia; lo que escriba encima del archivo sin
+#   renombrar lo cambia en las dos versiones.
+# - copy: lo de siempre, pero varios frames a la vez: contra un servidor cada
+#   archivo es sobre todo espera.
+STRATEGY_CLONE = "clone"
+STRATEGY_HARDLINK = "hardlink"
+STRATEGY_COPY = "copy"
+
+STRATEGY_LABELS = {
+    STRATEGY_CLONE: "copy-on-write clone",
+    STRATEGY_HARDLINK: "hardlink",
+    STRATEGY_COPY: "copy",
+}
+
+# Cuantos frames se copian a la vez cuando hay que copiar de verdad
+COPY_THREADS = 4
+
+# ioctl FICLONE de Linux: clona un archivo entero en Btrfs y XFS
+_FICLONE = 0x40049409
+
+
+def _clone_file(source_path, destination_path):
+    """Clona con copy-on-write. Tira OSError si el volumen no sabe."""
+    if sys.platform == "darwin":
+        libc = ctypes.CDLL("libc.dylib", use_errno=True)
+        if libc.clonefile(
+            os.fsencode(source_path), os.fsencode(destination_path), 0
+        ):
+            number = ctypes.get_errno()
+            raise OSError(number, os.strerror(number), destination_path)
+    elif fcntl is not None and sys.platform.startswith("linux"):
+        source_fd = os.open(source_path, os.O_RDONLY)
+        try:
+            destination_fd = os.open(
+                destination_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644
+            )
+            try:
+                fcntl.ioctl(destination_fd, _FICLONE, source_fd)
+            except OSError:
+                os.close(destination_fd)
+                os.remove(destination_path)
+                raise
+            os.close(destination_fd)
+        finally:
+            os.close(source_fd)
+    else:
+        raise OSError(errno.EOPNOTSUPP, "clone not supported", destination_path)
+    shutil.copystat(source_path, destination_path)
+
+
+def _temporary_name(destination_path):
+    folder, name = os.path.split(destination_path)
+    return os.path.join(folder, ".%s.%d.tmp" % (name, os.getpid()))
+
+
+def duplicate_file(source_path, destination_path, strategy):
+    """
+    Duplica un frame con la estrategia dada, pisando el destino si existe.
+
+    El clone y el hardlink se crean con un nombre temporal y se mueven con
+    os.replace: ninguno de los dos puede escribir sobre un archivo existente,
+    y borrar primero deja un instante sin frame.
+    """
+    if strategy == STRATEGY_COPY:
+        shutil.copy2(source_path, destination_path)
+        return
+    try:
+        if os.path.samefile(source_path, destination_path):
+            # Ya es el mismo archivo: una corrida anterior con hardlink.
+            return
+    except OSError:
+        pass
+    temporary = _temporary_name(destination_path)
+    if os.path.lexists(temporary):
+        os.remove(temporary)
+    try:
+        if strategy == STRATEGY_CLONE:
+            _clone_file(source_path, temporary)
+        else:
+            os.link(source_path, temporary)
+        os.replace(temporary, destination_path)
+    except OSError:
+        if os.path.lexists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def format_methods(methods):
+    """Texto con cuantos frames se duplicaron de cada forma."""
+    if len(methods) == 1:
+        return STRATEGY_LABELS[list(methods)[0]]
+    parts = []
+    for strategy in (STRATEGY_CLONE, STRATEGY_HARDLINK, STRATEGY_COPY):
+        if methods.get(strategy):
+            parts.append("%s: %d frames" % (STRATEGY_LABELS[strategy], methods[strategy]))
+    return ", ".join(parts) or "-"
+
+
+def detect_strategy(source_path, destination_dir):
+    """
+    La estrategia mas barata que acepta el destino para este trabajo.
+
+    Se prueba de verdad con el primer frame y un nombre temporal que despues
+    se borra: si un volumen soporta clone o hardlink no se sabe mirando el
+    path, y probar un clone o un link no cuesta nada.
+    """
+    probe = _temporary_name(
+        os.path.join(destination_dir, "." + os.path.basename(source_path))
+    )
+    same_volume = False
+    try:
+        same_volume = os.stat(source_path).st_dev == os.stat(destination_dir).st_dev
+    except OSError:
+        pass
+    candidates = [STRATEGY_CLONE]
+    if same_volume:
+        candidates.append(STRATEGY_HARDLINK)
+    for strategy in candidates:
+        try:
+            if strategy == STRATEGY_CLONE:
+                _clone_file(source_path, probe)
+            else:
+                os.link(source_path, probe)
+        except (OSError, AttributeError, NotImplementedError) as error:
+            debug_print("Sin %s:" % strategy, error)
+            continue
+        try:
+            os.remove(probe)
+        except OSError:
+            pass
+        return strategy
+    return STRATEGY_COPY
+
+
+# ---------------------------------------------------------------------------
+#                        Velocidad, verificacion e historial
+# ---------------------------------------------------------------------------
+# Cada cuanto se actualizan la velocidad y el tiempo restante. Mas seguido
+# solo mueve los numeros sin que se puedan leer.
+THROUGHPUT_INTERVAL = 0.25
+
+# La verificacion lee cada frame de origen y de destino una sola vez, con
+# buffers grandes, y hashea los dos a la vez en hilos distintos: hashlib
+# suelta el GIL y casi todo el tiempo es espera de disco.
+VERIFY_THREADS = 4
+VERIFY_BUFFER = 4 * 1024 * 1024
+
+# Historial de velocidades: una linea por copia o verificacion, separada por
+# tabs, en la carpeta de config del usuario. Sirve para ver si un volumen
+# anda mas lento que de costumbre.
+CONFIG_DIR_PARTS = ("LGA", "ToolPack")
+HISTORY_FILE_NAME = "DuplicatePublish_throughput.tsv"
+HISTORY_HEADER = (
+    "date",
+    "operation",
+    "source_volume",
+    "destination_volume",
+    "frames",
+    "bytes",
+    "seconds",
+    "mb_per_second",
+)
+
+_MEGABYTE = 1024.0 * 1024.0
+
+
+def format_rate(bytes_per_second):
+    """Velocidad legible: "312 MB/s"."""
+    megabytes = bytes_per_second / _MEGABYTE
+    if megabytes >= 10:
+        return "%d MB/s" % round(megabytes)
+    return "%.1f MB/s" % megabytes
+
+
+def format_duration(seconds):
+    """Tiempo restante legible: "45 s", "3 min 20 s"."""
+    seconds = int(round(seconds))
+    if seconds < 1:
+        return "<1 s"
+    if seconds < 60:
+        return "%d s" % seconds
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return "%d min %02d s" % (minutes, seconds)
+    hours, minutes = divmod(minutes, 60)
+    return "%d h %02d min" % (hours, minutes)
+
+
+def throughput_text(rate, eta):
+    """La linea de velocidad del progreso. rate 0 es sin velocidad que mostrar."""
+    parts = []
+    if rate > 0:
+        parts.append(format_rate(rate))
+    if eta is not None and eta >= 0:
+        parts.append("%s left" % format_duration(eta))
+    return " · ".join(parts)
+
+
+def volume_of(path):
+    """
+    El volumen donde vive un path: la unidad o el share en Windows, el punto
+    de montaje en el resto. Es lo que se compara en el historial.
+    """
+    path = os.path.abspath(path)
+    drive, _rest = os.path.splitdrive(path)
+    if drive:
+        return drive.replace("\\", "/")
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path.replace("\\", "/")
+
+
+def get_history_path():
+    """El archivo de historial, o None si no hay carpeta de config."""
+    system = platform.system()
+    if system == "Windows":
+        base = os.getenv("APPDATA")
+    elif system == "Darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.path.expanduser("~/.config")
+    if not base:
+        return None
+    return os.path.join(base, *(CONFIG_DIR_PARTS + (HISTORY_FILE_NAME,)))
+
+
+def record_throughput(operation, source_path, destination_path, frames, size, seconds):
+    """
+    Agrega una linea al historial. Un historial que no se puede escribir no
+    es motivo para molestar a nadie: se avisa solo con DEBUG.
+    """
+    history_path = get_history_path()
+    if not history_path or seconds <= 0:
+        return
+    row = (
+        time.strftime("%Y-%m-%d %H:%M:%S"),
+        operation,
+        volume_of(source_path),
+        volume_of(destination_path),
+        str(frames),
+        str(size),
+        "%.3f" % seconds,
+        "%.1f" % (size / _MEGABYTE / seconds),
+    )
+    try:
+        os.makedirs(os.path.dirname(history_path), exist_ok=True)
+        is_new = not os.path.exists(history_path)
+        with open(history_path, "a", encoding="utf-8") as handle:
+            if is_new:
+                handle.write("\t".join(HISTORY_HEADER) + "\n")
+            handle.write("\t".join(row) + "\n")
+    except OSError as error:
+        debug_print("No se pudo escribir el historial:", error)
+
+
+def hash_file(path, buffer_size=VERIFY_BUFFER):
+    """
+    (digest, None) del contenido de un archivo, o (None, error) si no se
+    pudo leer. Lee con un solo buffer reusado, sin el buffer de Python.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    try:
+        with open(path, "rb", buffering=0) as handle:
+            while True:
+                read = handle.readinto(buffer)
+                if not read:
+                    break
+                digest.update(view[:read])
+    except OSError as error:
+        return None, error.strerror or str(error)
+    return digest.digest(), None
+
+
 # ---------------------------------------------------------------------------
 #                                  Ventanas
 # ---------------------------------------------------------------------------
@@ -315,6 +634,9 @@ class MessageDialog(BaseDialog):
     def __init__(self, title, blocks=None, note_html=None, buttons=None, parent=None):
         super(MessageDialog, self).__init__(title, parent)
 
+        # El rol del boton que cerro el dialogo, si no es accept ni reject
+        self.choice = None
+
         for block_title, block_value in blocks or []:
             self.add_block(block_title, block_value)
 
@@ -334,14 +656,22 @@ class MessageDialog(BaseDialog):
             )
             if role == "accept":
                 button.clicked.connect(self.accept)
-            else:
+            elif role == "reject":
                 button.clicked.connect(self.reject)
+            else:
+                button.clicked.connect(
+                    lambda _checked=False, choice=role: self._choose(choice)
+                )
             buttons_layout.addWidget(button)
 
         self.main_layout.addLayout(buttons_layout)
         self.setMinimumWidth(500)
         self.adjustSize()
 
+    def _choose(self, choice):
+        self.choice = choice
+        self.accept()
+
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
             self.reject()
@@ -439,6 +769,10 @@ class ProgressDialog(BaseDialog):
         self.detail_label.setStyleSheet("font-size:11px;")
         self.main_layout.addWidget(self.detail_label)
 
+        self.throughput_label = QLabel(plain_value(""))
+        self.throughput_label.setStyleSheet("font-size:11px;")
+        self.main_layout.addWidget(self.throughput_label)
+
         if show_cancel:
             buttons_layout = QHBoxLayout()
             buttons_layout.addStretch()
@@ -462,6 +796,11 @@ class ProgressDialog(BaseDialog):
         if detail:
             self.detail_label.setText(plain_value(detail))
 
+    def set_throughput(self, rate, eta):
+        """Velocidad en bytes por segundo -0 si no aplica- y segundos restantes."""
+        if not self.cancel_requested:
+            self.throughput_label.setText(plain_value(throughput_text(rate, eta)))
+
     def request_cancel(self):
         """Marca la cancelacion; el worker corta en el proximo frame."""
         if self.cancel_requested:
@@ -524,6 +863,19 @@ def ask_confirmation(title, blocks=None, note_html=None, confirm_label="Continue
     return dialog.exec_() == QDialog.Accepted
 
 
+def ask_action(title, blocks=None, note_html=None, action_label="Continue", ok_label="OK"):
+    """
+    Ventana informativa con una accion opcional al lado del OK. True si el
+    usuario eligio la accion; Enter y Escape cierran sin ella.
+    """
+    ensure_app()
+    dialog = MessageDialog(
+        title, blocks, note_html, [(action_label, "action"), (ok_label, "accept")]
+    )
+    dialog.exec_()
+    return dialog.choice == "action"
+
+
 def ask_choice(title, blocks=None, note_html=None, options=None, cancel_label="Cancel"):
     """
     Muestra una ventana con varias opciones. Devuelve el valor de la opcion
@@ -578,11 +930,50 @@ class ScanWorker(QThread):
             self.failed.emit(str(error))
 
 
+class _Throughput(object):
+    """Bytes hechos contra el tiempo, con el tiempo restante estimado."""
+
+    def __init__(self, total_bytes):
+        self.total_bytes = total_bytes
+        self.done_bytes = 0
+        self.start = time.time()
+        self.last_emit = 0.0
+
+    def add(self, size):
+        self.done_bytes += size
+
+    def elapsed(self):
+        return time.time() - self.start
+
+    def due(self):
+        """True si ya paso THROUGHPUT_INTERVAL desde la ultima vez."""
+        now = time.time()
+        if now - self.last_emit < THROUGHPUT_INTERVAL:
+            return False
+        self.last_emit = now
+        return True
+
+    def rate_and_eta(self):
+        elapsed = self.elapsed()
+        if elapsed <= 0 or not self.done_bytes:
+            return 0.0, -1.0
+        rate = self.done_bytes / elapsed
+        return rate, max(0.0, (self.total_bytes - self.done_bytes) / rate)
+
+
 class CopyWorker(QThread):
-    """Copia la secuencia frame por frame reportando progreso."""
+    """
+    Duplica la secuencia reportando progreso, velocidad y tiempo restante.
+    La estrategia -clone, hardlink o copia en paralelo- se elige al arrancar,
+    con el primer frame.
+    """
 
     progress = Signal(int, int, str)
-    done = Signal(int, bool)
+    # (bytes por segundo, segundos restantes). La velocidad va en 0 si no se
+    # copian bytes de verdad: un hardlink de 2 GB no es una velocidad.
+    throughput = Signal(float, float)
+    # (frames duplicados, cancelado, {estrategia: frames})
+    done = Signal(int, bool, object)
     failed = Signal(str)
 
     def __init__(self, jobs, destination_dir):
@@ -590,10 +981,37 @@ class CopyWorker(QThread):
         self.jobs = jobs
         self.destination_dir = destination_dir
         self.cancel_requested = False
+        self.methods = {}
+        # Lo que se copio de verdad: es lo unico que tiene sentido verificar
+        self.copied_jobs = []
+        self.copied_bytes = 0
+        self.copy_seconds = 0.0
 
     def request_cancel(self):
         self.cancel_requested = True
 
+    def _duplicate(self, source_path, destination_path, strategy):
+        """Un frame. Si el clone o el link fallan en ese frame, se copia."""
+        if strategy != STRATEGY_COPY:
+            try:
+                duplicate_file(source_path, destination_path, strategy)
+                return strategy
+            except OSError as error:
+                debug_print("%s fallo, se copia:" % strategy, error)
+        duplicate_file(source_path, destination_path, STRATEGY_COPY)
+        return STRATEGY_COPY
+
+    def _finished(self, job, size, method, meter, copied, total, show_rate):
+        self.methods[method] = self.methods.get(method, 0) + 1
+        meter.add(size)
+        if method == STRATEGY_COPY:
+            self.copied_jobs.append(job)
+            self.copied_bytes += size
+        self.progress.emit(copied, total, os.path.basename(job[1]))
+        if meter.due() or copied == total:
+            rate, eta = meter.rate_and_eta()
+            self.throughput.emit(rate if show_rate else 0.0, eta)
+
     def run(self):
         copied = 0
         try:
@@ -601,15 +1019,149 @@ class CopyWorker(QThread):
                 os.makedirs(self.destination_dir)
 
             total = len(self.jobs)
-            for source_path, destination_path in self.jobs:
-                if self.cancel_requested:
-                    self.done.emit(copied, True)
-                    return
-                shutil.copy2(source_path, destination_path)
-                copied += 1
-                self.progress.emit(copied, total, os.path.basename(destination_path))
-
-            self.done.emit(copied, False)
+            if not total:
+                self.done.emit(0, False, self.methods)
+                return
+            # El tamano de cada frame: un stat por archivo contra la copia
+            # entera, y sin el no hay tiempo restante que valga.
+            sizes = [os.path.getsize(source_path) for source_path, _d in self.jobs]
+            meter = _Throughput(sum(sizes))
+            strategy = detect_strategy(self.jobs[0][0], self.destination_dir)
+            debug_print("Estrategia:", strategy)
+            show_rate = strategy == STRATEGY_COPY
+
+            if strategy != STRATEGY_COPY:
+                # Un clone o un link son una operacion de metadata: en serie
+                # van mas rapido que lo que cuesta repartirlos.
+                for job, size in zip(self.jobs, sizes):
+                    if self.cancel_requested:
+                        self.done.emit(copied, True, self.methods)
+                        return
+                    method = self._duplicate(job[0], job[1], strategy)
+                    copied += 1
+                    self._finished(job, size, method, meter, copied, total, show_rate)
+                self.copy_seconds = meter.elapsed()
+                self.done.emit(copied, False, self.methods)
+                return
+
+            pool = ThreadPoolExecutor(max_workers=COPY_THREADS)
+            futures = dict(
+                (pool.submit(self._duplicate, job[0], job[1], strategy), (job, size))
+                for job, size in zip(self.jobs, sizes)
+            )
+            try:
+                for future in as_completed(futures):
+                    if self.cancel_requested:
+                        break
+                    method = future.result()
+                    copied += 1
+                    job, size = futures[future]
+                    self._finished(job, size, method, meter, copied, total, show_rate)
+            finally:
+                # Lo que no arranco no arranca; lo que esta copiando termina.
+                for future in futures:
+                    future.cancel()
+                pool.shutdown(wait=True)
+            self.copy_seconds = meter.elapsed()
+            if self.cancel_requested:
+                # Los que terminaron mientras se cancelaba tambien estan en disco
+                self.methods = {}
+                self.copied_jobs = []
+                self.copied_bytes = 0
+                for future, (job, size) in futures.items():
+                    if future.done() and not future.cancelled() and not future.exception():
+                        self.methods[future.result()] = (
+                            self.methods.get(future.result(), 0) + 1
+                        )
+                        self.copied_jobs.append(job)
+                        self.copied_bytes += size
+                self.done.emit(sum(self.methods.values()), True, self.methods)
+                return
+            self.done.emit(copied, False, self.methods)
+        except Exception as error:
+            self.failed.emit(str(error))
+
+
+class VerifyWorker(QThread):
+    """
+    Compara cada frame copiado contra su original por hash. El origen y el
+    destino de un frame se leen a la vez, en hilos distintos.
+    """
+
+    progress = Signal(int, int, str)
+    throughput = Signal(float, float)
+    # ([(origen, destino, motivo)], cancelado)
+    done = Signal(object, bool)
+    failed = Signal(str)
+
+    def __init__(self, jobs):
+        super(VerifyWorker, self).__init__()
+        self.jobs = jobs
+        self.cancel_requested = False
+        self.verified_bytes = 0
+        self.verify_seconds = 0.0
+
+    def request_cancel(self):
+        self.cancel_requested = True
+
+    def run(self):
+        mismatches = []
+        try:
+            total = len(self.jobs)
+            sizes = []
+            for source_path, _destination in self.jobs:
+                try:
+                    sizes.append(os.path.getsize(source_path))
+                except OSError:
+                    sizes.append(0)
+            # Se lee origen y destino: el doble de bytes
+            meter = _Throughput(2 * sum(sizes))
+            pool = ThreadPoolExecutor(max_workers=VERIFY_THREADS)
+            # Todo entra en la cola de una: el pool los toma en orden, asi
+            # que esperar los pares en orden no deja hilos parados.
+            pending = [
+                (
+                    pool.submit(hash_file, source_path),
+                    pool.submit(hash_file, destination_path),
+                    source_path,
+                    destination_path,
+                    size,
+                )
+                for (source_path, destination_path), size in zip(self.jobs, sizes)
+            ]
+            cancelled = False
+            try:
+                for checked, (source_future, destination_future, source_path,
+                              destination_path, size) in enumerate(pending, 1):
+                    if self.cancel_requested:
+                        cancelled = True
+                        break
+                    source_digest, source_error = source_future.result()
+                    destination_digest, destination_error = destination_future.result()
+                    if source_error:
+                        mismatches.append(
+                            (source_path, destination_path, "source: %s" % source_error)
+                        )
+                    elif destination_error:
+                        mismatches.append(
+                            (source_path, destination_path, destination_error)
+                        )
+                    elif source_digest != destination_digest:
+                        mismatches.append(
+                            (source_path, destination_path, "content differs")
+                        )
+                    meter.add(2 * size)
+                    self.progress.emit(checked, total, os.path.basename(destination_path))
+                    if meter.due() or checked == total:
+                        self.throughput.emit(*meter.rate_and_eta())
+            finally:
+                for source_future, destination_future, _s, _d, _z in pending:
+                    source_future.cancel()
+                    destination_future.cancel()
+                pool.shutdown(wait=True)
+            self.verified_bytes = meter.done_bytes
+            self.verify_seconds = meter.elapsed()
+            self.done.emit(mismatches, cancelled)
         except Exception as error:
             self.failed.emit(str(error))
 
@@ -629,14 +1181,17 @@ class DuplicateController(QObject):
         self.context = context
         self.scan_worker = None
         self.copy_worker = None
+        self.verify_worker = None
         self.scan_dialog = None
         self.scan_timer = None
         self.progress_dialog = None
         self.start_time = 0.0
+        # {destino: frame}, para decir que frames no coinciden
+        self.frame_by_destination = {}
 
     def wait_for_workers(self):
         """Espera a que los threads terminen antes de soltar el controlador."""
-        for worker in (self.scan_worker, self.copy_worker):
+        for worker in (self.scan_worker, self.copy_worker, self.verify_worker):
             try:
                 if worker is not None and worker.isRunning():
                     worker.wait(5000)
@@ -730,7 +1285,7 @@ class DuplicateController(QObject):
 
         disk_text = format_frame_range(source_frames)
         if gaps:
-            disk_text += " - with missing frames inside the range"
+            disk_text += " - missing %s" % missing_frames_text(source_frames)
 
         note = (
             "<span style='color:%s; font-weight:bold;'>The Read range does not match "
@@ -787,6 +1342,10 @@ class DuplicateController(QObject):
     # --- Copia ------------------------------------------------------------
     def _start_copy(self, source_frames):
         jobs = build_copy_jobs(self.context, source_frames)
+        self.frame_by_destination = dict(
+            (destination_path, item[0])
+            for (_source_path, destination_path), item in zip(jobs, source_frames)
+        )
 
         self.progress_dialog = ProgressDialog(
             "Duplicate Publish",
@@ -796,6 +1355,7 @@ class DuplicateController(QObject):
 
         self.copy_worker = CopyWorker(jobs, self.context["dst_dir"])
         self.copy_worker.progress.connect(self._on_copy_progress)
+        self.copy_worker.throughput.connect(self._on_throughput)
         self.copy_worker.done.connect(self._on_copy_done)
         self.copy_worker.failed.connect(self._on_copy_failed)
         self.progress_dialog.cancelled.connect(self.copy_worker.request_cancel)
@@ -813,15 +1373,30 @@ class DuplicateController(QObject):
         if self.progress_dialog is not None:
             self.progress_dialog.set_progress(done, total, detail)
 
+    def _on_throughput(self, rate, eta):
+        if self.progress_dialog is not None:
+            self.progress_dialog.set_throughput(rate, eta)
+
     def _on_copy_failed(self, message):
         self._close_progress_dialog()
         show_error("Error while copying the sequence:<br>%s" % message)
         _release_controller()
 
-    def _on_copy_done(self, copied, was_cancelled):
+    def _on_copy_done(self, copied, was_cancelled, methods):
         elapsed = time.time() - self.start_time
         self._close_progress_dialog()
 
+        worker = self.copy_worker
+        if worker.copied_jobs and not was_cancelled:
+            record_throughput(
+                "copy",
+                self.context["src_dir"],
+                self.context["dst_dir"],
+                len(worker.copied_jobs),
+                worker.copied_bytes,
+                worker.copy_seconds,
+            )
+
         if was_cancelled:
             note = (
                 "<span style='color:%s; font-weight:bold;'>Cancelled.</span><br>"
@@ -838,13 +1413,118 @@ class DuplicateController(QObject):
 
         note = (
             "<span style='color:%s; font-weight:bold;'>Sequence created.</span><br>"
-            "<span style='color:%s;'>%d frames copied in %.1f s.</span>"
+            "<span style='color:%s;'>%d frames in %.1f s.</span>"
         ) % (COLOR_OK, COLOR_VALUE, copied, elapsed)
+        if not methods.get(STRATEGY_COPY):
+            note += "<br><span style='color:%s;'>No extra disk space used.</span>" % (
+                COLOR_VALUE
+            )
+        else:
+            note += "<br><span style='color:%s;'>%s on average.</span>" % (
+                COLOR_VALUE,
+                format_rate(worker.copied_bytes / max(worker.copy_seconds, 1e-6)),
+            )
+        if methods.get(STRATEGY_HARDLINK):
+            note += (
+                "<br><span style='color:%s;'>Hardlinked frames share their data with "
+                "the original until they are re-rendered.</span>" % COLOR_VALUE
+            )
 
-        show_message(
-            "Duplicate Publish",
-            [("Created", path_to_html(self.context["dst_display"]))],
-            note,
+        blocks = [
+            ("Created", path_to_html(self.context["dst_display"])),
+            ("Method", plain_value(format_methods(methods))),
+        ]
+        # Un clone o un hardlink son los mismos datos: solo se ofrece verificar
+        # lo que se copio de verdad.
+        if not worker.copied_jobs:
+            show_message("Duplicate Publish", blocks, note)
+        elif ask_action("Duplicate Publish", blocks, note, action_label="Verify"):
+            self._start_verify(worker.copied_jobs)
+            return
+        _release_controller()
+
+    # --- Verificacion -----------------------------------------------------
+    def _start_verify(self, jobs):
+        self.progress_dialog = ProgressDialog(
+            "Duplicate Publish", "Verifying %d copied frames" % len(jobs)
+        )
+        self.progress_dialog.set_progress(0, len(jobs), "")
+
+        self.verify_worker = VerifyWorker(jobs)
+        self.verify_worker.progress.connect(self._on_copy_progress)
+        self.verify_worker.throughput.connect(self._on_throughput)
+        self.verify_worker.done.connect(self._on_verify_done)
+        self.verify_worker.failed.connect(self._on_verify_failed)
+        self.progress_dialog.cancelled.connect(self.verify_worker.request_cancel)
+
+        self.progress_dialog.show()
+        self.verify_worker.start()
+
+    def _on_verify_failed(self, message):
+        self._close_progress_dialog()
+        show_error("Error while verifying the copy:<br>%s" % message)
+        _release_controller()
+
+    def _on_verify_done(self, mismatches, was_cancelled):
+        self._close_progress_dialog()
+        worker = self.verify_worker
+        checked = len(worker.jobs)
+
+        if was_cancelled:
+            show_message(
+                "Duplicate Publish",
+                [("Destination", path_to_html(self.context["dst_display"]))],
+                "<span style='color:%s; font-weight:bold;'>Verification cancelled."
+                "</span>" % COLOR_WARNING,
+            )
+            _release_controller()
+            return
+
+        record_throughput(
+            "verify",
+            self.context["src_dir"],
+            self.context["dst_dir"],
+            checked,
+            worker.verified_bytes,
+            worker.verify_seconds,
+        )
+        speed = format_rate(worker.verified_bytes / max(worker.verify_seconds, 1e-6))
+
+        if not mismatches:
+            note = (
+                "<span style='color:%s; font-weight:bold;'>All %d copied frames match "
+                "the original.</span><br>"
+                "<span style='color:%s;'>Read at %s.</span>"
+            ) % (COLOR_OK, checked, COLOR_VALUE, speed)
+            show_message(
+                "Duplicate Publish",
+                [("Verified", path_to_html(self.context["dst_display"]))],
+                note,
+            )
+            _release_controller()
+            return
+
+        frames = sorted(
+            self.frame_by_destination[destination_path]
+            for _source_path, destination_path, _reason in mismatches
+            if destination_path in self.frame_by_destination
+        )
+        reasons = {}
+        for _source_path, _destination_path, reason in mismatches:
+            reasons[reason] = reasons.get(reason, 0) + 1
+        reasons_text = "<br>".join(
+            "%d: %s" % (count, reason) for reason, count in sorted(reasons.items())
+        )
+        show_error(
+            "%d of %d copied frames do not match the original.<br>"
+            "Copy them again before rendering over this version." % (
+                len(mismatches), checked
+            ),
+            [
+                ("Destination", path_to_html(self.context["dst_display"])),
+                ("Mismatched frames", plain_value(format_runs(frame_runs(frames), 20))),
+                ("Reason", plain_value(reasons_text)),
+            ],
         )
         _release_controller()
 
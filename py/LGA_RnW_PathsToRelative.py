@@ -1,7 +1,7 @@
 """
 ____________________________________________________________________
 
-  LGA_RnW_PathsToRelative v1.02 | Lega
+  LGA_RnW_PathsToRelative v1.07 | Lega
 
   Convierte a rutas relativas las rutas absolutas de los nodos que
   apuntan a archivos. Nuke resuelve los relativos contra el Project
@@ -10,6 +10,23 @@ ____________________________________________________________________
   Si hay nodos seleccionados actua solo sobre esos; si no, recorre
   todo el script. Nunca toca knobs con expresiones TCL o Python.
 
+  v1.07: La cache vuelve a la clave (clase, cantidad de knobs): armar la
+         de v1.06 pedia todos los knobs de cada nodo, justo lo que la cache
+         ahorra. Una entrada se usa si sus nombres siguen siendo File_Knob
+         en el nodo; si no, se calcula de nuevo.
+  v1.06: La cache de File_Knob por clase usa los nombres de los knobs y
+         no su cantidad: un knob de usuario cambiado por otro dejaba la
+         entrada vieja y la ruta nueva no se convertia.
+  v1.05: Las clases de la tool salen de FILE_KNOBS de la tanda, asi
+         la ventana y la tanda no pueden trabajar sobre clases distintas.
+  v1.04: Las reglas -que ruta se convierte, contra que carpeta y que
+         queda afuera- pasan a LGA_RnW_PathsToRelative_batch, que las
+         usa para convertir carpetas enteras de .nk sin abrir Nuke.
+  v1.03: Un solo recorrido junta todas las rutas como KnobValue -nodo,
+         knob, texto crudo y Group- y build_rows y apply_rows trabajan
+         sobre eso. Los nombres de los File_Knob se calculan una vez por
+         clase y no mirando cada knob de cada nodo, y la ubicacion sale
+         del recorrido y no del fullName de cada nodo.
   v1.02: El look sale de LGA_UI_Style_ToolPack. La barra de estado de
          cada fila se pinta como fondo del item: como cell widget el
          padding de la tabla la dejaba en 0 px de ancho y nunca se vio.
@@ -23,14 +40,32 @@ ____________________________________________________________________
 ____________________________________________________________________
 """
 
+import collections
 import os
-import re
 
 import nuke
 
 from LGA_QtAdapter_ToolPack import QtWidgets, QtGui, QtCore
 from LGA_UI_Style_ToolPack import Color, Metric, Style, colorize_path
 
+# Las reglas de que se convierte y como son las mismas de la tanda sin Nuke.
+from LGA_RnW_PathsToRelative_batch import (
+    FILE_KNOBS,
+    PROJECT_DIRECTORY_EXPRESSION,
+    PROJECT_DIR_EMPTY,
+    PROJECT_DIR_OK,
+    PROJECT_DIR_UNRESOLVED,
+    SKIP_EMPTY,
+    SKIP_EXPRESSION,
+    SKIP_RELATIVE,
+    STATUS_BLOCKED,
+    STATUS_CONVERT,
+    STATUS_DEEP,
+    anchor_from,
+    classify,
+    format_skipped,
+)
+
 QApplication = QtWidgets.QApplication
 QDialog = QtWidgets.QDialog
 QWidget = QtWidgets.QWidget
@@ -59,47 +94,15 @@ def debug_print(*message):
 # ---------------------------------------------------------------------------
 #                               Configuracion
 # ---------------------------------------------------------------------------
-# Clases sobre las que trabaja la tool. Dentro de cada nodo se recorren todos
-# sus File_Knob, asi que quedan cubiertos "file", "proxy" y equivalentes.
-TARGET_CLASSES = (
-    "Read",
-    "Write",
-    "DeepRead",
-    "DeepWrite",
-    "ReadGeo",
-    "ReadGeo2",
-    "WriteGeo",
-    "Precomp",
-    "Vectorfield",
-    "OCIOFileTransform",
-)
-
-# A partir de cuantos "../" se marca la ruta como profunda (amarillo)
-DEEP_LEVEL_WARNING = 3
-
-# Expresion que usa el boton "Script Directory" de Project Settings. Es la que
-# hace que Nuke resuelva los relativos contra la carpeta del script.
-PROJECT_DIRECTORY_EXPRESSION = "[python {nuke.script_directory()}]"
-
-# Estado del knob project_directory
-PROJECT_DIR_EMPTY = "empty"
-PROJECT_DIR_OK = "ok"
-PROJECT_DIR_UNRESOLVED = "unresolved"
-
-# Estados de cada fila
-STATUS_CONVERT = "convert"
-STATUS_DEEP = "deep"
-STATUS_BLOCKED = "blocked"
+# Clases sobre las que trabaja la tool: las mismas de la tanda, que ademas
+# sabe que knobs de archivo tiene cada una. Dentro de cada nodo se recorren
+# todos sus File_Knob, asi que quedan cubiertos "file", "proxy" y equivalentes.
+TARGET_CLASSES = tuple(FILE_KNOBS)
 
 # Techo de tamano de Qt. Es el valor con el que se SUELTA un setMaximumHeight
 # puesto solo para el adjustSize de apertura; Qt no lo exporta a Python.
 QWIDGETSIZE_MAX = 16777215
 
-# Motivos por los que un knob no entra en la tabla
-SKIP_RELATIVE = "already relative"
-SKIP_EXPRESSION = "expression"
-SKIP_EMPTY = "empty"
-
 
 # ---------------------------------------------------------------------------
 #                                  Estilos
@@ -123,51 +126,6 @@ BTN_SMALL = Style.BTN_SMALL
 # ---------------------------------------------------------------------------
 #                            Helpers de rutas
 # ---------------------------------------------------------------------------
-# Unidad de Windows al principio del path (T:/ o T:\)
-DRIVE_RE = re.compile(r"^[a-zA-Z]:[\\/]")
-
-
-def is_expression_value(value):
-    """
-    True si el knob tiene una expresion TCL/Python en vez de una ruta literal.
-    Los Writes creados con Write Presets caen aca y no se tocan nunca.
-    """
-    return "[" in value or "]" in value
-
-
-def is_absolute_path(value):
-    """True si la ruta es absoluta en cualquiera de las dos plataformas."""
-    if not value:
-        return False
-    if DRIVE_RE.match(value):
-        return True
-    if value.startswith("//") or value.startswith("\\\\"):
-        return True
-    return os.path.isabs(value)
-
-
-def to_relative(path, anchor_dir):
-    """
-    Convierte una ruta absoluta en relativa al directorio ancla.
-
-    Retorna (relative_path, up_levels). Si no existe ruta relativa posible
-    (otra unidad o mount) retorna (None, 0).
-    """
-    try:
-        relative = os.path.relpath(path, anchor_dir)
-    except ValueError:
-        return None, 0
-
-    relative = relative.replace("\\", "/")
-
-    up_levels = 0
-    for part in relative.split("/"):
-        if part == "..":
-            up_levels += 1
-        else:
-            break
-
-    return relative, up_levels
 
 
 def get_project_directory_knob():
@@ -198,22 +156,14 @@ def resolve_anchor(script_dir):
         except Exception:
             raw_value = ""
 
-    if not raw_value:
-        return script_dir, "", PROJECT_DIR_EMPTY
-
     evaluated = ""
-    try:
-        evaluated = (knob.evaluate() or "").strip()
-    except Exception as error:
-        debug_print("No se pudo evaluar project_directory: %s" % error)
-
-    evaluated = evaluated.replace("\\", "/").rstrip("/")
-
-    if evaluated and is_absolute_path(evaluated):
-        return evaluated, raw_value, PROJECT_DIR_OK
+    if raw_value:
+        try:
+            evaluated = knob.evaluate() or ""
+        except Exception as error:
+            debug_print("No se pudo evaluar project_directory: %s" % error)
 
-    # Tiene algo cargado pero no resuelve a una carpeta real: no se pisa solo
-    return script_dir, raw_value, PROJECT_DIR_UNRESOLVED
+    return anchor_from(raw_value, evaluated, script_dir)
 
 
 def set_project_directory():
@@ -234,6 +184,44 @@ def knob_raw_value(knob):
     return (value or "").strip()
 
 
+# Los nombres de los File_Knob de cada clase: {(clase, cantidad de knobs):
+# (nombres, ...)}. Un Read tiene un centenar de knobs y solo "file" y "proxy"
+# son rutas; mirarlos todos con isinstance, nodo por nodo, era lo que mas
+# tardaba en abrir la ventana sobre un script grande. La cantidad de knobs va
+# en la clave porque un nodo puede tener knobs agregados a mano: ese arma su
+# propia entrada y no ensucia la de su clase. Un knob de usuario cambiado por
+# otro no cambia la cantidad, asi que cada nombre de la entrada se confirma
+# con node.knob antes de usarla.
+_file_knob_names = {}
+
+# Una ruta encontrada en el recorrido: el nodo, el nombre del knob, el knob,
+# su texto crudo y el Group donde vive el nodo.
+KnobValue = collections.namedtuple("KnobValue", "node name knob value location")
+
+
+def file_knob_names(node):
+    """Los nombres de los File_Knob del nodo, ordenados, una vez por clase."""
+    try:
+        key = (node.Class(), node.numKnobs())
+    except Exception:
+        key = None
+    names = _file_knob_names.get(key) if key is not None else None
+    if names is not None and _still_file_knobs(node, names):
+        return names
+    names = tuple(name for name, _knob in file_knobs(node))
+    if key is not None:
+        _file_knob_names[key] = names
+    return names
+
+
+def _still_file_knobs(node, names):
+    """Si cada nombre de una entrada de la cache sigue siendo un File_Knob del nodo."""
+    for name in names:
+        if not isinstance(node.knob(name), nuke.File_Knob):
+            return False
+    return True
+
+
 def file_knobs(node):
     """Devuelve [(nombre, knob)] de todos los File_Knob del nodo."""
     result = []
@@ -265,92 +253,114 @@ def node_location(node):
     return "Root"
 
 
-def collect_nodes():
+def _knob_values(node, location, collected):
+    """Suma a `collected` un KnobValue por cada File_Knob del nodo."""
+    for knob_name in file_knob_names(node):
+        knob = node.knob(knob_name)
+        if knob is None:
+            continue
+        collected.append(
+            KnobValue(node, knob_name, knob, knob_raw_value(knob), location)
+        )
+
+
+def collect_knobs():
     """
-    Junta los nodos a procesar. Si hay seleccion, trabaja solo sobre ella.
+    Junta, en un solo recorrido, todas las rutas a procesar: un KnobValue por
+    File_Knob. Si hay seleccion, trabaja solo sobre ella.
 
     No entra en Precomps ni LiveGroups: sus nodos internos vienen de otro .nk
     y modificarlos aca no tiene efecto real. El nodo Precomp si se procesa,
     porque su propio knob apunta a un archivo.
+
+    Retorna (knob_values, from_selection).
     """
+    collected = []
     selected = [
         node for node in nuke.selectedNodes() if node.Class() in TARGET_CLASSES
     ]
     if selected:
         debug_print("Trabajando sobre la seleccion: %d nodos" % len(selected))
-        return selected, True
+        for node in selected:
+            _knob_values(node, node_location(node), collected)
+        return collected, True
 
-    collected = []
-    _walk_group(nuke.root(), collected)
-    debug_print("Trabajando sobre todo el script: %d nodos" % len(collected))
+    node_count = _walk_group(nuke.root(), "Root", collected)
+    debug_print("Trabajando sobre todo el script: %d nodos" % node_count)
     return collected, False
 
 
-def _walk_group(group, collected):
-    """Recorre el grupo y sus Groups anidados juntando nodos objetivo."""
+def _walk_group(group, location, collected):
+    """
+    Recorre el grupo y sus Groups anidados juntando las rutas de los nodos
+    objetivo. La ubicacion de cada nodo sale del Group que se esta
+    recorriendo, sin preguntarle a Nuke el fullName de cada uno.
+
+    Retorna cuantos nodos objetivo encontro.
+    """
     try:
         children = group.nodes()
     except Exception as error:
         debug_print("No se pudo recorrer el grupo: %s" % error)
-        return
+        return 0
 
+    node_count = 0
     for node in children:
         node_class = node.Class()
         if node_class in TARGET_CLASSES:
-            collected.append(node)
+            node_count += 1
+            _knob_values(node, location, collected)
         if node_class == "Group":
-            _walk_group(node, collected)
+            name = node.name()
+            node_count += _walk_group(
+                node, name if location == "Root" else location + "/" + name, collected
+            )
+    return node_count
 
 
-def build_rows(nodes, anchor_dir):
+def build_rows(knob_values, anchor_dir):
     """
-    Arma las filas de la tabla y cuenta lo que queda afuera.
+    Arma las filas de la tabla a partir del recorrido y cuenta lo que queda
+    afuera. No le pregunta nada a Nuke: todo sale de los KnobValue.
 
     Retorna (rows, skipped) donde skipped es un dict motivo -> cantidad.
     """
     rows = []
     skipped = {SKIP_RELATIVE: 0, SKIP_EXPRESSION: 0, SKIP_EMPTY: 0}
+    # El file y el proxy de un nodo, o un Read y su Write, suelen compartir
+    # carpeta y a veces la ruta entera: cada ruta se clasifica una vez.
+    classified = {}
 
-    for node in nodes:
-        for knob_name, knob in file_knobs(node):
-            value = knob_raw_value(knob)
-
-            if not value:
-                skipped[SKIP_EMPTY] += 1
-                continue
-
-            if is_expression_value(value):
-                skipped[SKIP_EXPRESSION] += 1
-                continue
-
-            if not is_absolute_path(value):
-                skipped[SKIP_RELATIVE] += 1
-                continue
-
-            relative, up_levels = to_relative(value, anchor_dir)
-
-            if relative is None:
-                status = STATUS_BLOCKED
-                target = "path is on another drive"
-            elif up_levels >= DEEP_LEVEL_WARNING:
-                status = STATUS_DEEP
-                target = relative
-            else:
-                status = STATUS_CONVERT
-                target = relative
-
-            rows.append(
-                {
-                    "node": node,
-                    "knob": knob_name,
-                    "location": node_location(node),
-                    "current": value.replace("\\", "/"),
-                    "relative": relative,
-                    "target_text": target,
-                    "up_levels": up_levels,
-                    "status": status,
-                }
-            )
+    for entry in knob_values:
+        value = entry.value
+
+        result = classified.get(value)
+        if result is None:
+            result = classified[value] = classify(value, anchor_dir)
+        reason, relative, up_levels, status = result
+
+        if reason is not None:
+            skipped[reason] += 1
+            continue
+
+        if status == STATUS_BLOCKED:
+            target = "path is on another drive"
+        else:
+            target = relative
+
+        rows.append(
+            {
+                "node": entry.node,
+                "knob": entry.name,
+                "knob_object": entry.knob,
+                "location": entry.location,
+                "current": value.replace("\\", "/"),
+                "relative": relative,
+                "target_text": target,
+                "up_levels": up_levels,
+                "status": status,
+            }
+        )
 
     return rows, skipped
 
@@ -360,6 +370,9 @@ def apply_rows(rows, set_project_dir=False):
     Escribe las rutas relativas en los knobs y, si corresponde, deja el
     Project Directory apuntando al script. Todo en un solo bloque de undo.
 
+    Escribe sobre los knobs que guardo el recorrido: no vuelve a buscar cada
+    knob por nombre en su nodo.
+
     Retorna (aplicadas, errores, project_dir_aplicado).
     """
     applied = 0
@@ -375,8 +388,11 @@ def apply_rows(rows, set_project_dir=False):
                 errors.append("project_directory: %s" % error)
 
         for row in rows:
+            knob = row.get("knob_object")
+            if knob is None:
+                knob = row["node"][row["knob"]]
             try:
-                row["node"][row["knob"]].setValue(row["relative"])
+                knob.setValue(row["relative"])
                 applied += 1
             except Exception as error:
                 errors.append("%s.%s: %s" % (row["node"].name(), row["knob"], error))
@@ -386,18 +402,6 @@ def apply_rows(rows, set_project_dir=False):
     return applied, errors, project_dir_applied
 
 
-def format_skipped(skipped):
-    """Texto con lo que quedo afuera de la tabla."""
-    parts = []
-    if skipped.get(SKIP_RELATIVE):
-        parts.append("%d already relative" % skipped[SKIP_RELATIVE])
-    if skipped.get(SKIP_EXPRESSION):
-        parts.append("%d with expressions" % skipped[SKIP_EXPRESSION])
-    if skipped.get(SKIP_EMPTY):
-        parts.append("%d empty" % skipped[SKIP_EMPTY])
-    return " · ".join(parts)
-
-
 # ---------------------------------------------------------------------------
 #                                  Ventanas
 # ---------------------------------------------------------------------------
@@ -866,8 +870,8 @@ def main():
     debug_print("Directorio del script:", script_dir)
     debug_print("Ancla de los relativos:", anchor_dir, "| estado:", project_state)
 
-    nodes, from_selection = collect_nodes()
-    if not nodes:
+    knob_values, from_selection = collect_knobs()
+    if not knob_values:
         show_info(
             "Paths to Relative",
             "<span style='color:%s;'>No nodes with file paths were found.</span>"
@@ -875,7 +879,7 @@ def main():
         )
         return
 
-    rows, skipped = build_rows(nodes, anchor_dir)
+    rows, skipped = build_rows(knob_values, anchor_dir)
 
     if not rows:
         _handle_nothing_to_convert(skipped, project_state, project_raw)
@@ -0,0 +1,409 @@
+"""
+____________________________________________________________________
+
+  LGA_RnW_PathsToRelative_batch v1.04 | Lega
+
+  Paths to Relative sin Nuke, sobre todos los .nk de una carpeta.
+
+  Para entregar un paquete, cada script tiene que quedar con rutas
+  relativas a SU Project Directory. La ventana solo trabaja sobre el
+  script abierto; esto recorre cada .nk como texto, con
+  LGA_ToolPack_NkScript, y convierte los knobs de archivo de las
+  mismas clases con las mismas reglas: las que deciden que se
+  convierte viven aca y la ventana las importa.
+
+  El Project Directory se lee del Root de cada script. Sin Nuke no se
+  puede evaluar cualquier expresion, asi que se reconocen las que pone
+  Nuke -[python {nuke.script_directory()}] y [file dirname [value
+  root.name]]- y las rutas absolutas escritas a mano. Un script con
+  otra expresion no se toca: convertirlo contra la carpeta equivocada
+  rompe todos sus paths. Un Project Directory vacio se trata como en
+  la ventana -se convierte contra la carpeta del script y se avisa-, y
+  con --set-project-dir se le escribe la expresion de Script Directory.
+
+  Cada script va a un proceso del pool. Por script se informa lo mismo
+  que la ventana: cuantas rutas se convierten y lo que queda afuera.
+
+  Uso:
+    python LGA_RnW_PathsToRelative_batch.py --dry-run /entregas/SHOW
+    python LGA_RnW_PathsToRelative_batch.py --set-project-dir
+        --report cambios.diff /entregas/SHOW
+
+  No importa Qt ni Nuke a proposito.
+
+  v1.04: Modulo nuevo. Las reglas de conversion salen de
+         LGA_RnW_PathsToRelative.
+____________________________________________________________________
+"""
+
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import LGA_ToolPack_NkScript as nkscript
+
+
+# ---------------------------------------------------------------------------
+#                               Configuracion
+# ---------------------------------------------------------------------------
+# Los knobs de archivo de cada clase de la tool. La ventana los descubre en
+# el nodo vivo; en el .nk hay que saberlos de antemano.
+FILE_KNOBS = {
+    "Read": ("file", "proxy"),
+    "Write": ("file", "proxy"),
+    "DeepRead": ("file",),
+    "DeepWrite": ("file",),
+    "ReadGeo": ("file",),
+    "ReadGeo2": ("file",),
+    "WriteGeo": ("file",),
+    "Precomp": ("file",),
+    "Vectorfield": ("vfield_file",),
+    "OCIOFileTransform": ("file",),
+}
+
+# A partir de cuantos "../" se marca la ruta como profunda (amarillo)
+DEEP_LEVEL_WARNING = 3
+
+# Expresion que usa el boton "Script Directory" de Project Settings. Es la que
+# hace que Nuke resuelva los relativos contra la carpeta del script.
+PROJECT_DIRECTORY_EXPRESSION = "[python {nuke.script_directory()}]"
+
+# Estado del knob project_directory
+PROJECT_DIR_EMPTY = "empty"
+PROJECT_DIR_OK = "ok"
+PROJECT_DIR_UNRESOLVED = "unresolved"
+
+# Estados de cada fila
+STATUS_CONVERT = "convert"
+STATUS_DEEP = "deep"
+STATUS_BLOCKED = "blocked"
+
+# Motivos por los que un knob no entra en la tabla
+SKIP_RELATIVE = "already relative"
+SKIP_EXPRESSION = "expression"
+SKIP_EMPTY = "empty"
+
+# Unidad de Windows al principio del path (T:/ o T:\)
+DRIVE_RE = re.compile(r"^[a-zA-Z]:[\\/]")
+
+# Las expresiones de project_directory que dan la carpeta del script, sin
+# espacios: asi las escribe Nuke y asi las escribe casi todo el mundo.
+_SCRIPT_DIR_EXPRESSIONS = (
+    "[python{nuke.script_directory()}]",
+    "[pythonnuke.script_directory()]",
+    "[filedirname[valueroot.name]]",
+    "[filedirname[knobroot.name]]",
+)
+
+
+# ---------------------------------------------------------------------------
+#                            Helpers de rutas
+# ---------------------------------------------------------------------------
+
+
+def is_expression_value(value):
+    """
+    True si el knob tiene una expresion TCL/Python en vez de una ruta literal.
+    Los Writes creados con Write Presets caen aca y no se tocan nunca.
+    """
+    return "[" in value or "]" in value
+
+
+def is_absolute_path(value):
+    """True si la ruta es absoluta en cualquiera de las dos plataformas."""
+    if not value:
+        return False
+    if DRIVE_RE.match(value):
+        return True
+    if value.startswith("//") or value.startswith("\\\\"):
+        return True
+    return os.path.isabs(value)
+
+
+def to_relative(path, anchor_dir):
+    """
+    Convierte una ruta absoluta en relativa al directorio ancla.
+
+    Retorna (relative_path, up_levels). Si no existe ruta relativa posible
+    (otra unidad o mount) retorna (None, 0).
+    """
+    # relpath solo conoce las unidades de Windows corriendo en Windows: en
+    # Linux "C:/x" contra "/show" sale como una carpeta "C:" relativa.
+    drive = DRIVE_RE.match(path)
+    anchor_drive = DRIVE_RE.match(anchor_dir)
+    if bool(drive) != bool(anchor_drive) or (
+        drive and drive.group(0)[0].lower() != anchor_drive.group(0)[0].lower()
+    ):
+        return None, 0
+    try:
+        relative = os.path.relpath(path, anchor_dir)
+    except ValueError:
+        return None, 0
+
+    relative = relative.replace("\\", "/")
+
+    up_levels = 0
+    for part in relative.split("/"):
+        if part == "..":
+            up_levels += 1
+        else:
+            break
+
+    return relative, up_levels
+
+
+def anchor_from(raw_value, evaluated, script_dir):
+    """
+    Contra que carpeta se calculan las rutas, a partir del Project Directory
+    crudo y evaluado. La ventana lo evalua con Nuke; la tanda, con
+    evaluate_project_directory.
+
+    Retorna (anchor_dir, raw_value, state).
+    """
+    raw_value = (raw_value or "").strip()
+    if not raw_value:
+        return script_dir, "", PROJECT_DIR_EMPTY
+
+    evaluated = (evaluated or "").strip().replace("\\", "/").rstrip("/")
+    if evaluated and is_absolute_path(evaluated):
+        return evaluated, raw_value, PROJECT_DIR_OK
+
+    # Tiene algo cargado pero no resuelve a una carpeta real: no se pisa solo
+    return script_dir, raw_value, PROJECT_DIR_UNRESOLVED
+
+
+def evaluate_project_directory(raw_value, script_dir):
+    """
+    El Project Directory evaluado sin Nuke, o "" si no se puede saber.
+
+    Solo entiende lo que no depende de Nuke: una ruta escrita tal cual y
+    las expresiones que dan la carpeta del script.
+    """
+    raw_value = (raw_value or "").strip()
+    if not raw_value:
+        return ""
+    if not is_expression_value(raw_value):
+        return raw_value
+    if "".join(raw_value.split()) in _SCRIPT_DIR_EXPRESSIONS:
+        return script_dir
+    return ""
+
+
+def classify(value, anchor_dir):
+    """
+    Que hacer con el valor de un knob de archivo.
+
+    Retorna (motivo, None, 0, None) si queda afuera -un SKIP_*- o
+    (None, relativa, niveles, estado) si entra en la tabla.
+    """
+    if not value:
+        return SKIP_EMPTY, None, 0, None
+    if is_expression_value(value):
+        return SKIP_EXPRESSION, None, 0, None
+    if not is_absolute_path(value):
+        return SKIP_RELATIVE, None, 0, None
+
+    relative, up_levels = to_relative(value, anchor_dir)
+    if relative is None:
+        status = STATUS_BLOCKED
+    elif up_levels >= DEEP_LEVEL_WARNING:
+        status = STATUS_DEEP
+    else:
+        status = STATUS_CONVERT
+    return None, relative, up_levels, status
+
+
+def format_skipped(skipped):
+    """Texto con lo que quedo afuera de la tabla."""
+    parts = []
+    if skipped.get(SKIP_RELATIVE):
+        parts.append("%d already relative" % skipped[SKIP_RELATIVE])
+    if skipped.get(SKIP_EXPRESSION):
+        parts.append("%d with expressions" % skipped[SKIP_EXPRESSION])
+    if skipped.get(SKIP_EMPTY):
+        parts.append("%d empty" % skipped[SKIP_EMPTY])
+    return " · ".join(parts)
+
+
+# ---------------------------------------------------------------------------
+#                               Un script entero
+# ---------------------------------------------------------------------------
+
+
+class _RelativeEdit(nkscript.NkEdit):
+    """
+    Convierte los knobs de archivo de un script contra su Project Directory.
+
+    El Root va primero en el .nk, asi que cuando llega el primer knob de
+    archivo el ancla ya se sabe.
+    """
+
+    def __init__(self, script_path, set_project_dir=False):
+        self.script_dir = os.path.dirname(os.path.abspath(script_path)).replace(
+            "\\", "/"
+        )
+        self.set_project_dir = set_project_dir
+        self.knobs = dict(FILE_KNOBS)
+        self.knobs["Root"] = ("project_directory",)
+        self.anchor, self.project_raw, self.project_state = anchor_from(
+            "", "", self.script_dir
+        )
+        self.project_dir_applied = False
+        self.skipped = {SKIP_RELATIVE: 0, SKIP_EXPRESSION: 0, SKIP_EMPTY: 0}
+        self.counts = {STATUS_CONVERT: 0, STATUS_DEEP: 0, STATUS_BLOCKED: 0}
+        # Igual que en build_rows: cada ruta se clasifica una vez.
+        self.classified = {}
+
+    def knob(self, node, name, value):
+        if node.node_class == "Root":
+            self.anchor, self.project_raw, self.project_state = anchor_from(
+                value, evaluate_project_directory(value, self.script_dir), self.script_dir
+            )
+            self.classified = {}
+            return None
+        # Lo de adentro de un LiveGroup viene de otro .nk: igual que la
+        # ventana, no se toca.
+        if any(cls == "LiveGroup" for cls, _name in node.groups):
+            return None
+        value = value.strip()
+        result = self.classified.get(value)
+        if result is None:
+            result = self.classified[value] = classify(value, self.anchor)
+        reason, relative, _up_levels, status = result
+        if reason is not None:
+            self.skipped[reason] += 1
+            return None
+        self.counts[status] += 1
+        if self.project_state == PROJECT_DIR_UNRESOLVED or relative is None:
+            return None
+        return relative
+
+    def end_node(self, node, seen):
+        if (
+            node.node_class == "Root"
+            and self.set_project_dir
+            and self.project_state == PROJECT_DIR_EMPTY
+            and "project_directory" not in seen
+        ):
+            self.project_dir_applied = True
+            return [("project_directory", PROJECT_DIRECTORY_EXPRESSION)]
+        return ()
+
+
+def convert_script(path, set_project_dir=False, dry_run=False):
+    """
+    Convierte un .nk. Devuelve el dict de LGA_ToolPack_NkScript.rewrite_script
+    mas lo que la ventana muestra: skipped, counts, anchor, project_state y
+    project_dir_applied.
+
+    Un script con un Project Directory que no se puede evaluar sin Nuke se
+    lee igual -para informar- pero no se escribe.
+    """
+    edit = _RelativeEdit(path, set_project_dir)
+    result = nkscript.rewrite_script(path, edit, dry_run)
+    result.update(
+        {
+            "skipped": edit.skipped,
+            "counts": edit.counts,
+            "anchor": edit.anchor,
+            "project_state": edit.project_state,
+            "project_raw": edit.project_raw,
+            "project_dir_applied": edit.project_dir_applied,
+        }
+    )
+    return result
+
+
+def run_batch(scripts, set_project_dir=False, dry_run=False, jobs=None):
+    """Los resultados de convert_script, en el orden de `scripts`."""
+    if not scripts:
+        return []
+    if jobs == 1 or len(scripts) == 1:
+        return [convert_script(s, set_project_dir, dry_run) for s in scripts]
+    count = len(scripts)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(
+            pool.map(
+                convert_script,
+                scripts,
+                [set_project_dir] * count,
+                [dry_run] * count,
+                chunksize=nkscript.pool_chunksize(count, jobs),
+            )
+        )
+
+
+def script_summary(result):
+    """Una linea por script, con los mismos contadores que la ventana."""
+    if result["error"]:
+        return "%s: ERROR %s" % (result["path"], result["error"])
+    counts = result["counts"]
+    if result["project_state"] == PROJECT_DIR_UNRESOLVED:
+        text = "not modified, the Project Directory does not resolve without Nuke (%s)" % (
+            result["project_raw"]
+        )
+    else:
+        converted = counts[STATUS_CONVERT] + counts[STATUS_DEEP]
+        text = "%d paths to relative" % converted
+        if counts[STATUS_DEEP]:
+            text += " (%d %d+ levels up)" % (counts[STATUS_DEEP], DEEP_LEVEL_WARNING)
+    if counts[STATUS_BLOCKED]:
+        text += " · %d on another drive" % counts[STATUS_BLOCKED]
+    skipped_text = format_skipped(result["skipped"])
+    if skipped_text:
+        text += " · %s (not modified)" % skipped_text
+    if result["project_dir_applied"]:
+        text += " · Project Directory set to %s" % PROJECT_DIRECTORY_EXPRESSION
+    elif result["project_state"] == PROJECT_DIR_EMPTY and (
+        counts[STATUS_CONVERT] or counts[STATUS_DEEP] or result["skipped"][SKIP_RELATIVE]
+    ):
+        text += " · the Project Directory is empty, relative paths will not resolve"
+    return "%s: %s" % (result["path"], text)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Convert the absolute file paths of .nk scripts to paths "
+        "relative to each script's Project Directory."
+    )
+    parser.add_argument("paths", nargs="+", help=".nk files or folders to search")
+    parser.add_argument(
+        "--set-project-dir",
+        action="store_true",
+        help="set an empty Project Directory to %s" % PROJECT_DIRECTORY_EXPRESSION,
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report only")
+    parser.add_argument("--jobs", type=int, default=None, help="processes")
+    parser.add_argument("--report", help="write the diff here instead of stdout")
+    args = parser.parse_args(argv)
+
+    scripts = nkscript.find_scripts(args.paths)
+    results = run_batch(scripts, args.set_project_dir, args.dry_run, args.jobs)
+
+    report = nkscript.diff_report(results)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8", errors="surrogateescape") as handle:
+            handle.write(report)
+    else:
+        sys.stdout.write(report)
+
+    for result in results:
+        sys.stderr.write(script_summary(result) + "\n")
+    changed = sum(1 for r in results if r["changes"])
+    errors = [r for r in results if r["error"]]
+    sys.stderr.write(
+        "%d scripts, %d with changes%s%s\n"
+        % (
+            len(results),
+            changed,
+            " (dry run, nothing written)" if args.dry_run else "",
+            ", %d errors" % len(errors) if errors else "",
+        )
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
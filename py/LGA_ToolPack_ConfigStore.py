@@ -0,0 +1,295 @@
+"""
+____________________________________________________________________________________
+
+  LGA_ToolPack_ConfigStore v1.00 | Lega
+  Lectura y escritura de los archivos de configuracion del usuario, con cache
+
+  Cada tool tenia su copia de get_user_config_dir, get_config_path y
+  ensure_config_exists, y volvia a abrir y parsear su archivo en cada
+  lectura: Render_Complete leia RenderComplete.dat tres veces por render
+  -sonido, wav y render time- y una cuarta si habia mail.
+
+  Aca esta una sola copia de todo eso:
+  - Las rutas: la carpeta de datos del sistema + LGA/ToolPack, la misma de
+    siempre. Cada tool sigue con su archivo; el nombre del archivo y la
+    seccion del ini son su espacio propio.
+  - Una cache en memoria por archivo, validada con el mtime y el tamano:
+    una lectura sin cambios es un os.stat. Si otro Nuke edita el archivo,
+    la proxima lectura lo ve.
+  - Escrituras atomicas: temporal en la misma carpeta y os.replace. Un
+    Nuke que se cierra a mitad de un save no deja el archivo por la mitad.
+  - Avisos de cambio: add_listener registra una funcion que recibe la ruta
+    cada vez que un archivo cambia, por un save de este Nuke o porque la
+    cache lo encontro cambiado en disco.
+
+  Hay dos formatos, los dos que ya usaba el pack:
+  - ini: {seccion: {clave: valor}}. Sin interpolacion -un % en un ini
+    editado a mano no rompe nada- y respetando mayusculas, como necesita
+    ColorSpace Favs. get_value busca la clave tambien sin mayusculas, como
+    hacia configparser por defecto.
+  - lineas: los .dat con un valor por linea de RenderComplete y ShowInFlow.
+
+  Lo que devuelve la cache se comparte: no modificarlo, escribir con
+  write_section o write_lines.
+
+  Scripts que utilizan este modulo:
+  - LGA_Write_Focus.py
+  - LGA_Write_RenderComplete.py
+  - LGA_showInlFlow.py
+  - LGA_viewer_SnapShot_Gallery.py
+  - LGA_RnW_ColorSpace_Favs.py
+____________________________________________________________________________________
+"""
+
+import configparser
+import io
+import os
+import platform
+import threading
+
+
+CONFIG_DIR_PARTS = ("LGA", "ToolPack")
+
+DEBUG = False
+
+
+def debug_print(*message):
+    if DEBUG:
+        print(*message)
+
+
+# {ruta: (stamp, datos)}. datos es el dict del ini o la tupla de lineas.
+_cache = {}
+_listeners = []
+# El hilo de la bandeja de mails lee RenderComplete.dat
+_lock = threading.RLock()
+
+
+def get_user_config_dir():
+    """
+    Obtiene el directorio de configuracion del usuario segun el sistema operativo.
+    Windows: %APPDATA%
+    Mac: ~/Library/Application Support
+    """
+    system = platform.system()
+    if system == "Windows":
+        config_path = os.getenv("APPDATA")
+        if not config_path:
+            debug_print("Error: No se pudo encontrar la variable de entorno APPDATA.")
+            return None
+    elif system == "Darwin":  # macOS
+        config_path = os.path.expanduser("~/Library/Application Support")
+    else:
+        # Para otros sistemas, usar el directorio home como fallback
+        config_path = os.path.expanduser("~/.config")
+        debug_print(
+            f"Sistema no reconocido ({system}), usando ~/.config como fallback."
+        )
+
+    return config_path
+
+
+def get_config_dir(create=False):
+    """La carpeta LGA/ToolPack del usuario, o None. Con create, la crea."""
+    user_config_dir = get_user_config_dir()
+    if not user_config_dir:
+        return None
+    config_dir = os.path.join(user_config_dir, *CONFIG_DIR_PARTS)
+    if create:
+        try:
+            os.makedirs(config_dir, exist_ok=True)
+        except OSError as e:
+            debug_print(f"Error al crear el directorio {config_dir}: {e}")
+            return None
+    return config_dir
+
+
+def get_config_path(file_name):
+    """La ruta de un archivo de configuracion del usuario, exista o no."""
+    config_dir = get_config_dir()
+    if not config_dir:
+        return None
+    return os.path.join(config_dir, file_name)
+
+
+# ---------------------------------------------------------------------------
+#                                   Avisos
+# ---------------------------------------------------------------------------
+
+
+def add_listener(callback):
+    """callback(ruta) se llama cada vez que cambia un archivo de configuracion."""
+    with _lock:
+        if callback not in _listeners:
+            _listeners.append(callback)
+
+
+def remove_listener(callback):
+    with _lock:
+        if callback in _listeners:
+            _listeners.remove(callback)
+
+
+def _notify(path):
+    with _lock:
+        listeners = list(_listeners)
+    for callback in listeners:
+        try:
+            callback(path)
+        except Exception as e:
+            debug_print(f"Error en un aviso de cambio de {path}: {e}")
+
+
+# ---------------------------------------------------------------------------
+#                                   Cache
+# ---------------------------------------------------------------------------
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def invalidate(path=None):
+    """Olvida un archivo -o todos- de la cache."""
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(path, None)
+
+
+def _cached(path, parse):
+    """
+    Los datos de un archivo, parseados con parse(texto). Solo se vuelve a
+    leer si cambio el stamp. Un archivo que no existe es None.
+    """
+    stamp = _stamp(path)
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+    if stamp is None:
+        data = None
+    else:
+        with open(path, "r", encoding="utf-8") as handle:
+            data = parse(handle.read())
+    with _lock:
+        _cache[path] = (stamp, data)
+    if entry is not None:
+        # Ya lo habiamos leido y cambio en disco
+        _notify(path)
+    return data
+
+
+def _write(path, text, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    temp_path = "%s.%d.tmp" % (path, os.getpid())
+    try:
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    with _lock:
+        _cache[path] = (_stamp(path), data)
+    _notify(path)
+
+
+# ---------------------------------------------------------------------------
+#                                    Ini
+# ---------------------------------------------------------------------------
+
+
+def _new_parser():
+    parser = configparser.ConfigParser(allow_no_value=True, interpolation=None)
+    parser.optionxform = str  # Mantener mayusculas/minusculas
+    return parser
+
+
+def _parse_ini(text):
+    parser = _new_parser()
+    parser.read_string(text)
+    return {
+        section: dict(parser.items(section, raw=True))
+        for section in parser.sections()
+    }
+
+
+def read_ini(path):
+    """
+    {seccion: {clave: valor}} del ini, {} si no existe. Tira
+    configparser.Error si el ini esta roto, como configparser.
+    """
+    return _cached(path, _parse_ini) or {}
+
+
+def get_value(path, section, key, fallback=None):
+    """El valor de una clave, o fallback si no esta o el ini no se puede leer."""
+    try:
+        values = read_ini(path).get(section)
+    except (configparser.Error, OSError, UnicodeDecodeError) as e:
+        debug_print(f"Error al leer {path}: {e}")
+        return fallback
+    if not values:
+        return fallback
+    if key in values:
+        return values[key]
+    lowered = key.lower()
+    for name, value in values.items():
+        if name.lower() == lowered:
+            return value
+    return fallback
+
+
+def write_section(path, section, values, replace=False):
+    """
+    Guarda {clave: valor} en una seccion del ini; None es una clave sin valor.
+    Las demas secciones quedan como estaban. Con replace, la seccion queda
+    solo con `values`; si no, se actualizan esas claves.
+    """
+    with _lock:
+        try:
+            current = read_ini(path)
+        except (configparser.Error, UnicodeDecodeError) as e:
+            debug_print(f"Ini ilegible, se reescribe: {path}: {e}")
+            current = {}
+        data = {name: dict(items) for name, items in current.items()}
+        if replace or section not in data:
+            data[section] = {}
+        for key, value in values.items():
+            data[section][key] = None if value is None else str(value)
+        parser = _new_parser()
+        for name, items in data.items():
+            parser.add_section(name)
+            for key, value in items.items():
+                parser.set(name, key, value)
+        buffer = io.StringIO()
+        parser.write(buffer)
+        _write(path, buffer.getvalue(), data)
+
+
+# ---------------------------------------------------------------------------
+#                                   Lineas
+# ---------------------------------------------------------------------------
+
+
+def _parse_lines(text):
+    return tuple(line.strip() for line in text.splitlines())
+
+
+def read_lines(path):
+    """Las lineas del archivo sin espacios a los costados, () si no existe."""
+    return _cached(path, _parse_lines) or ()
+
+
+def write_lines(path, lines):
+    """Reescribe el archivo con una linea por valor."""
+    lines = tuple(lines)
+    with _lock:
+        _write(path, "".join(f"{line}\n" for line in lines), lines)
@@ -0,0 +1,65 @@
+"""
+____________________________________________________________________________________
+
+  LGA_ToolPack_FrameRuns v1.0 | Lega
+  Los frames de una secuencia como tramos continuos, y los huecos entre ellos
+
+  Una secuencia de tres mil frames sin huecos es UN tramo, (1001, 4000), y
+  una con dos frames faltantes son tres. Guardar tramos y no la lista de
+  frames es lo que deja tener los huecos de cada secuencia del escaneo en
+  memoria sin pagar una lista por secuencia, y compararlas sin recorrerlas.
+
+  Scripts que utilizan este modulo:
+  - LGA_MediaManager_utils.py / LGA_MediaManager_FileScanner.py
+  - LGA_RnW_DuplicatePublish.py
+
+  No importa Qt ni Nuke: son cuentas sobre enteros.
+____________________________________________________________________________________
+"""
+
+
+def frame_runs(frames):
+    """
+    Los tramos continuos de una lista de frames: [(primero, ultimo), ...].
+
+    Acepta frames repetidos y desordenados. Si ya vienen ordenados -como los
+    deja el escaneo- el sorted() de Python lo detecta y el recorrido es O(n).
+    """
+    tramos = []
+    for frame in sorted(set(frames)):
+        if tramos and frame == tramos[-1][1] + 1:
+            tramos[-1][1] = frame
+        else:
+            tramos.append([frame, frame])
+    return [tuple(tramo) for tramo in tramos]
+
+
+def missing_runs(runs):
+    """Los huecos ENTRE los tramos, con el mismo formato. Sin tramos, nada."""
+    return [(a[1] + 1, b[0] - 1) for a, b in zip(runs, runs[1:])]
+
+
+def count_frames(runs):
+    """Cuantos frames cubren los tramos."""
+    return sum(ultimo - primero + 1 for primero, ultimo in runs)
+
+
+def has_gaps(runs):
+    """Si hay huecos: mas de un tramo es, por definicion, un hueco."""
+    return len(runs) > 1
+
+
+def format_runs(runs, limite=None):
+    """
+    "1011-1014, 1019, 1030-1032". Un tramo de un frame va sin guion.
+
+    Con `limite` se muestran solo los primeros tramos y el resto se resume:
+    una secuencia con cientos de huecos no entra en un tooltip.
+    """
+    partes = [
+        "%d" % primero if primero == ultimo else "%d-%d" % (primero, ultimo)
+        for primero, ultimo in (runs if limite is None else runs[:limite])
+    ]
+    if limite is not None and len(runs) > limite:
+        partes.append("... (%d more)" % (len(runs) - limite))
+    return ", ".join(partes)
@@ -0,0 +1,390 @@
+"""
+____________________________________________________________________________________
+
+  LGA_ToolPack_NkScript v1.0 | Lega
+  Leer y reescribir knobs de un .nk sin abrir Nuke
+
+  Un .nk es TCL: cada nodo es "Clase {" en su linea, sus knobs uno por
+  linea adentro, y "}" al final. Los nodos de un Group van despues de
+  su bloque, hasta un "end_group". Este modulo recorre un script linea
+  por linea, le pregunta a quien llama que hacer con los knobs que le
+  interesan y deja todo lo demas byte por byte como estaba.
+
+  La escritura es atomica -un temporal al lado y os.replace-: un
+  script a medio escribir es un script roto. El temporal se abre recien
+  con el primer cambio, asi que un script sin nada que cambiar no se
+  copia. Con dry_run no se escribe nada y los cambios salen como un
+  diff unificado que se puede aplicar con patch.
+
+  Quien llama hereda de NkEdit y pisa lo que necesite: que knobs mirar
+  por clase, que hacer con cada valor y que knobs agregar al cerrar un
+  nodo.
+
+  Scripts que utilizan este modulo:
+  - LGA_mediaPathReplacer_batch.py
+  - LGA_RnW_PathsToRelative_batch.py
+
+  No importa Qt ni Nuke a proposito.
+____________________________________________________________________________________
+"""
+
+import os
+import re
+import shutil
+import tempfile
+
+
+# La cabecera de un nodo en un .nk: "Read {" sola en su linea.
+NODE_RE = re.compile(r"^\s*([A-Za-z_][\w.]*) \{\s*$")
+# Un knob de primer nivel adentro del nodo: " file <valor>".
+KNOB_RE = re.compile(r"^(\s*)([A-Za-z_]\w*) (.*?)\s*$")
+# Las clases cuyos nodos hijos van despues de su bloque, hasta un end_group.
+GROUP_CLASSES = ("Group", "LiveGroup")
+# Lo unico que puede cambiar la profundidad de llaves o abrir una cadena.
+_SPECIAL_RE = re.compile(r'[\\"{}]')
+# Lo que obliga a escribir un valor entre comillas y no pelado.
+_NEEDS_QUOTES_RE = re.compile(r'[\s"{}\[\]$\\;]')
+
+
+# ---------------------------------------------------------------------------
+#                          Valores de knob (TCL)
+# ---------------------------------------------------------------------------
+
+
+def parse_knob_value(text):
+    """
+    (valor, estilo, resto) de un valor de knob tal como esta en el .nk.
+
+    estilo es '"', '{' o '' (pelado). Devuelve None si el valor no cierra en
+    la misma linea: esa linea no se toca.
+    """
+    if text.startswith('"'):
+        chars = []
+        i = 1
+        while i < len(text):
+            ch = text[i]
+            if ch == "\\" and i + 1 < len(text):
+                chars.append(text[i + 1])
+                i += 2
+                continue
+            if ch == '"':
+                return "".join(chars), '"', text[i + 1 :]
+            chars.append(ch)
+            i += 1
+        return None
+    if text.startswith("{"):
+        depth = 0
+        for i, ch in enumerate(text):
+            if ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[1:i], "{", text[i + 1 :]
+        return None
+    # Pelado: hasta el primer espacio, con los escapes de TCL resueltos.
+    word = text.split(None, 1)
+    if not word:
+        return "", "", ""
+    rest = text[len(word[0]) :]
+    return re.sub(r"\\(.)", r"\1", word[0]), "", rest
+
+
+def format_knob_value(value, style=""):
+    """
+    El valor listo para el .nk, en el mismo estilo que tenia si se puede.
+
+    Entre comillas se escapan los caracteres que TCL evaluaria: un path con
+    [value root.name] tiene que llegar a Nuke como texto, igual que lo
+    guarda Nuke.
+    """
+    if style == "{" and value.count("{") == value.count("}") and "\\" not in value:
+        return "{%s}" % value
+    if style == "" and value and not _NEEDS_QUOTES_RE.search(value):
+        return value
+    escaped = re.sub(r'([\\"\[$])', r"\\\1", value)
+    return '"%s"' % escaped
+
+
+def split_newline(line):
+    if line.endswith("\r\n"):
+        return line[:-2], "\r\n"
+    if line.endswith("\n") or line.endswith("\r"):
+        return line[:-1], line[-1]
+    return line, ""
+
+
+class BraceState(object):
+    """La profundidad de llaves del .nk, fuera de las cadenas, linea a linea."""
+
+    def __init__(self):
+        self.depth = 0
+        self.in_quote = False
+
+    def feed(self, line):
+        # Solo se miran los caracteres que pueden cambiar algo: la mayoria de
+        # las lineas no tiene ninguno.
+        escaped_at = -1
+        for match in _SPECIAL_RE.finditer(line):
+            pos = match.start()
+            if pos == escaped_at:
+                continue
+            ch = match.group()
+            if ch == "\\":
+                escaped_at = pos + 1
+            elif ch == '"':
+                self.in_quote = not self.in_quote
+            elif not self.in_quote:
+                self.depth += 1 if ch == "{" else -1
+
+
+# ---------------------------------------------------------------------------
+#                               Un script entero
+# ---------------------------------------------------------------------------
+
+
+class NkNode(object):
+    """
+    El nodo que se esta leyendo: su clase, su nombre -que en el .nk suele
+    venir DESPUES de los knobs de archivo- y los Groups que lo contienen,
+    de afuera hacia adentro, como (clase, nombre).
+    """
+
+    __slots__ = ("node_class", "name", "groups")
+
+    def __init__(self, node_class, groups):
+        self.node_class = node_class
+        self.name = ""
+        self.groups = groups
+
+    @property
+    def location(self):
+        """"Root" o la ruta de Groups, igual que la muestran las tools."""
+        if not self.groups:
+            return "Root"
+        return "/".join(name for _cls, name in self.groups)
+
+
+class NkEdit(object):
+    """
+    Lo que rewrite_script le pregunta a quien llama. Se hereda y se pisa.
+
+    knobs: {clase: nombres de knob} que interesan. Solo esos llegan a knob().
+    """
+
+    knobs = {}
+
+    def knob(self, node, name, value):
+        """El valor nuevo del knob, o None para dejarlo como esta."""
+        return None
+
+    def end_node(self, node, seen):
+        """
+        Knobs para agregar al final del nodo, como [(nombre, valor)].
+
+        `seen` son los nombres de knob que el nodo ya tenia: un knob que
+        vale lo que vale por defecto no se guarda en el .nk, asi que para
+        ponerle un valor hay que agregar la linea.
+        """
+        return ()
+
+
+def rewrite_script(path, edit, dry_run=False):
+    """
+    Recorre un .nk y aplica `edit`, un NkEdit.
+
+    Devuelve un dict con path, changes -[(linea, nodo, clase, knob, viejo,
+    nuevo, linea vieja, linea nueva)], con linea vieja None si la linea se
+    agrego-, written y error. Pensada para correr en un proceso de un pool:
+    no tira excepciones, las devuelve.
+    """
+    result = {"path": path, "changes": [], "written": False, "error": None}
+    knobs_by_class = edit.knobs
+    tmp_path = None
+    out = None
+    # Hasta el primer cambio las lineas se juntan aca y no se abre ningun
+    # temporal: la mayoria de los scripts de una carpeta no tiene nada que
+    # cambiar, y copiarlos enteros para despues borrar la copia es I/O de mas.
+    head = []
+    try:
+        state = BraceState()
+        node = None
+        wanted = ()
+        track = False
+        seen = set()
+        groups = []
+        pending = []
+        # surrogateescape y newline="": lo que no se toca sale byte por byte
+        # igual, aunque el .nk traiga un acento en latin-1 o CRLF.
+        with open(path, "r", encoding="utf-8", errors="surrogateescape", newline="") as src:
+            for lineno, line in enumerate(src, 1):
+                body, newline = split_newline(line)
+                at_top = state.depth == 0 and not state.in_quote
+                if at_top:
+                    header = NODE_RE.match(body)
+                    if header:
+                        node = NkNode(header.group(1), tuple(groups))
+                        wanted = knobs_by_class.get(node.node_class, ())
+                        # De un nodo que no interesa solo hace falta el nombre,
+                        # y solo si es un Group: es la ubicacion de sus hijos.
+                        track = bool(wanted) or node.node_class in GROUP_CLASSES
+                        seen = set()
+                        pending = []
+                    else:
+                        node = None
+                        if body.strip() == "end_group" and groups:
+                            groups.pop()
+                elif track and node is not None and state.depth == 1 and not state.in_quote:
+                    # El nombre del knob se mira antes de la regex: de los
+                    # cien knobs de un Read, interesan uno o dos.
+                    first = body.split(None, 1)
+                    if first and (first[0] == "name" or first[0] in wanted):
+                        knob = KNOB_RE.match(body)
+                        if knob is not None:
+                            line = _edit_knob(
+                                edit, node, seen, knob, body, newline, lineno, pending
+                            )
+                state.feed(body)
+                if not at_top and node is not None and state.depth == 0 and not state.in_quote:
+                    # Se cerro el nodo: ahora se sabe su nombre.
+                    if wanted and body.strip() == "}":
+                        line = _add_knobs(
+                            edit, node, seen, body, newline, lineno, pending
+                        )
+                    for i, change in enumerate(pending):
+                        pending[i] = change[:1] + (node.name,) + change[2:]
+                    result["changes"].extend(pending)
+                    pending = []
+                    if node.node_class in GROUP_CLASSES:
+                        groups.append((node.node_class, node.name))
+                    node = None
+                if dry_run:
+                    continue
+                if out is None:
+                    head.append(line)
+                    if not (pending or result["changes"]):
+                        continue
+                    fd, tmp_path = tempfile.mkstemp(
+                        prefix=".%s." % os.path.basename(path),
+                        suffix=".tmp",
+                        dir=os.path.dirname(os.path.abspath(path)),
+                    )
+                    out = open(
+                        fd, "w", encoding="utf-8", errors="surrogateescape", newline=""
+                    )
+                    out.writelines(head)
+                    head = []
+                else:
+                    out.write(line)
+        result["changes"].extend(pending)
+        if out is None:
+            return result
+        out.close()
+        out = None
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+        tmp_path = None
+        result["written"] = True
+    except (OSError, UnicodeError) as problem:
+        result["error"] = str(problem)
+    finally:
+        if out is not None:
+            out.close()
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    return result
+
+
+def _edit_knob(edit, node, seen, knob, body, newline, lineno, pending):
+    indent, name, raw = knob.groups()
+    parsed = parse_knob_value(raw)
+    if parsed is None:
+        return body + newline
+    value, style, rest = parsed
+    if name == "name":
+        node.name = value
+        return body + newline
+    seen.add(name)
+    new_value = edit.knob(node, name, value)
+    if new_value is None or new_value == value:
+        return body + newline
+    new_body = "%s%s %s%s" % (indent, name, format_knob_value(new_value, style), rest)
+    pending.append((lineno, "", node.node_class, name, value, new_value, body, new_body))
+    return new_body + newline
+
+
+def _add_knobs(edit, node, seen, body, newline, lineno, pending):
+    added = []
+    for name, value in edit.end_node(node, seen):
+        new_body = " %s %s" % (name, format_knob_value(value))
+        added.append(new_body + newline)
+        pending.append((lineno, "", node.node_class, name, "", value, None, new_body))
+    return "".join(added) + body + newline
+
+
+# ---------------------------------------------------------------------------
+#                                  Tandas
+# ---------------------------------------------------------------------------
+
+
+def find_scripts(paths):
+    """Los .nk de una lista de archivos y carpetas, sin repetir."""
+    found = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _dirs, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(".nk"):
+                        found.append(os.path.join(root, name))
+        else:
+            found.append(path)
+    unique = []
+    for path in found:
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen:
+            seen.add(key)
+            unique.append(path)
+    return unique
+
+
+def pool_chunksize(count, jobs):
+    """El chunksize de pool.map para repartir `count` scripts en `jobs` procesos."""
+    return max(1, count // (4 * (jobs or os.cpu_count() or 1)))
+
+
+def diff_report(results):
+    """
+    Un diff unificado, sin contexto, de las lineas que cambian.
+
+    Se puede leer o aplicar con patch: cada cambio es un hunk de una linea.
+    Una linea agregada corre los numeros de las que siguen en el nuevo.
+    """
+    lines = []
+    for result in results:
+        if result["error"]:
+            lines.append("# %s: ERROR %s" % (result["path"], result["error"]))
+            continue
+        if not result["changes"]:
+            continue
+        lines.append("--- %s" % result["path"])
+        lines.append("+++ %s" % result["path"])
+        offset = 0
+        for change in result["changes"]:
+            lineno, node, node_class, knob, _old, _new, old_line, new_line = change
+            title = " ".join(part for part in (node_class, node, knob) if part)
+            if old_line is None:
+                lines.append(
+                    "@@ -%d,0 +%d @@ %s" % (lineno - 1, lineno + offset, title)
+                )
+                offset += 1
+            else:
+                lines.append(
+                    "@@ -%d +%d @@ %s" % (lineno, lineno + offset, title)
+                )
+                lines.append("-" + old_line)
+            lines.append("+" + new_line)
+    return "\n".join(lines) + ("\n" if lines else "")
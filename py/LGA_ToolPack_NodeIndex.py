@@ -0,0 +1,218 @@
+"""
+____________________________________________________________________________________
+
+  LGA_ToolPack_NodeIndex v1.02 | Lega
+  Indice de nodos por clase y por nombre, mantenido con callbacks de Nuke
+
+  Las tools que buscan un nodo por nombre -Write Focus, por ejemplo-
+  recorrian nuke.allNodes() y comparaban nombre por nombre en cada
+  busqueda. En un script de 10000 nodos eso es pedirle a Nuke 10000
+  nodos y 10000 nombres por atajo de teclado.
+
+  Este modulo guarda dos mapas: clase -> nodos y nombre -> nodos. Se
+  arman la primera vez que alguien pregunta y despues se mantienen solos
+  con los callbacks de Nuke: onCreate, onDestroy y el knobChanged del
+  knob name. Al abrir o cerrar un script solo se marca el indice como
+  viejo; se vuelve a armar en la proxima busqueda, no durante la carga.
+
+  Lo que se guarda son fullNames, no objetos nuke.Node: un objeto de un
+  nodo borrado no sirve para nada. Cada resultado se resuelve con
+  nuke.toNode, y si el nodo ya no esta -o el nombre ahora es de otro
+  nodo- la entrada se tira ahi mismo. Asi un rename que no paso por el
+  knobChanged (hecho desde Python, por ejemplo) nunca devuelve un nodo
+  equivocado.
+
+  Ese rename tampoco anota el nombre nuevo: quien renombra desde Python
+  avisa con renamed(). El indice solo se rearma cuando esta marcado como
+  viejo, nunca porque una busqueda no encontro nada.
+
+  Los nodos de adentro de Groups tambien estan, con su fullName
+  ("Group1.Write1"). Renombrar o borrar un Group cambia el fullName de
+  todo lo de adentro, asi que eso marca el indice como viejo.
+
+  Scripts que utilizan este modulo:
+  - LGA_Write_Focus.py
+  - LGA_Write_Presets.py (avisa sus renames)
+
+  v1.02: renamed() anota un rename hecho desde Python. Reemplaza el
+         rearmado de v1.01 ante cualquier busqueda sin resultados: Write
+         Focus busca primero un nombre que muchas veces no existe, y eso
+         recorria el script entero en cada atajo.
+____________________________________________________________________________________
+"""
+
+import nuke
+
+
+# {fullName: (clase, nombre)}
+_entries = {}
+# {clase: {fullName: None}}. Un dict y no un set: conserva el orden en que se
+# crearon los nodos, que es el orden de nuke.allNodes().
+_by_class = {}
+# {nombre: {fullName: None}}. El nombre es el corto, sin los Groups.
+_by_name = {}
+
+_state = {"installed": False, "stale": True}
+
+
+def _add(full_name, node_class):
+    _remove(full_name)
+    name = full_name.rpartition(".")[2]
+    _entries[full_name] = (node_class, name)
+    _by_class.setdefault(node_class, {})[full_name] = None
+    _by_name.setdefault(name, {})[full_name] = None
+
+
+def _remove(full_name):
+    entry = _entries.pop(full_name, None)
+    if entry is None:
+        return
+    _by_class.get(entry[0], {}).pop(full_name, None)
+    _by_name.get(entry[1], {}).pop(full_name, None)
+
+
+def invalidate():
+    """Marca el indice como viejo: se vuelve a armar en la proxima busqueda."""
+    _state["stale"] = True
+
+
+def rebuild():
+    """Arma el indice de cero con todos los nodos del script."""
+    _entries.clear()
+    _by_class.clear()
+    _by_name.clear()
+    for node in nuke.allNodes(recurseGroups=True):
+        _add(node.fullName(), node.Class())
+    _state["stale"] = False
+
+
+# ---------------------------------------------------------------------------
+#                                 Callbacks
+# ---------------------------------------------------------------------------
+
+
+def _on_create():
+    # Con el indice viejo no hace falta anotar nada: se arma entero despues.
+    # Es lo que pasa durante la carga de un script, nodo por nodo.
+    if _state["stale"]:
+        return
+    node = nuke.thisNode()
+    if node.Class() != "Root":
+        _add(node.fullName(), node.Class())
+
+
+def _on_destroy():
+    if _state["stale"]:
+        return
+    node = nuke.thisNode()
+    if isinstance(node, nuke.Group):
+        invalidate()
+        return
+    _remove(node.fullName())
+
+
+def _on_knob_changed():
+    if _state["stale"]:
+        return
+    knob = nuke.thisKnob()
+    if knob is None or knob.name() != "name":
+        return
+    # El nombre viejo no llega: esa entrada se tira cuando una busqueda la
+    # encuentra y nuke.toNode ya no la resuelve.
+    renamed(nuke.thisNode())
+
+
+def renamed(node, old_full_name=None):
+    """
+    Anota el nombre actual de `node`. Para los renames hechos desde Python,
+    que no pasan por el knobChanged. Con old_full_name la entrada vieja se
+    tira ya; si no, cuando una busqueda la encuentre.
+    """
+    if _state["stale"]:
+        return
+    if isinstance(node, nuke.Group):
+        invalidate()
+        return
+    if old_full_name:
+        _remove(old_full_name)
+    _add(node.fullName(), node.Class())
+
+
+def _on_script_change():
+    invalidate()
+
+
+def install():
+    """Registra los callbacks. Se llama solo en la primera busqueda."""
+    if _state["installed"]:
+        return
+    nuke.addOnCreate(_on_create)
+    nuke.addOnDestroy(_on_destroy)
+    nuke.addKnobChanged(_on_knob_changed)
+    nuke.addOnScriptLoad(_on_script_change)
+    nuke.addOnScriptClose(_on_script_change)
+    _state["installed"] = True
+
+
+def _ensure():
+    install()
+    if _state["stale"]:
+        rebuild()
+
+
+# ---------------------------------------------------------------------------
+#                                 Busquedas
+# ---------------------------------------------------------------------------
+
+
+def resolve(full_name, node_class=None):
+    """
+    El nodo de una entrada, o None si ya no existe. Una entrada que no
+    resuelve -o que ahora es un nodo de otra clase- se tira.
+    """
+    node = nuke.toNode(full_name)
+    if node is None or (node_class is not None and node.Class() != node_class):
+        _remove(full_name)
+        return None
+    return node
+
+
+def _resolve_all(full_names, node_class, top_level):
+    nodes = []
+    for full_name in list(full_names):
+        if top_level and "." in full_name:
+            continue
+        node = resolve(full_name, node_class or _entries[full_name][0])
+        if node is not None:
+            nodes.append(node)
+    return nodes
+
+
+def nodes_of_class(node_class, top_level=False):
+    """Los nodos de una clase. Con top_level, solo los que no estan en un Group."""
+    _ensure()
+    return _resolve_all(_by_class.get(node_class, ()), node_class, top_level)
+
+
+def find(name, node_class=None, top_level=False):
+    """Los nodos que se llaman exactamente `name`, opcionalmente de una clase."""
+    _ensure()
+    full_names = [
+        full_name
+        for full_name in _by_name.get(name, ())
+        if node_class is None or _entries[full_name][0] == node_class
+    ]
+    return _resolve_all(full_names, node_class, top_level)
+
+
+def names_of_class(node_class, top_level=False):
+    """
+    [(fullName, nombre), ...] de una clase, sin resolver los nodos: para
+    busquedas parciales que comparan texto y resuelven solo lo que eligen.
+    """
+    _ensure()
+    return [
+        (full_name, _entries[full_name][1])
+        for full_name in _by_class.get(node_class, ())
+        if not (top_level and "." in full_name)
+    ]
@@ -1,23 +1,24 @@
 """
 _____________________________________________________________________________________________________
 
-  LGA_ToolPack_settings v0.47 | Lega
+  LGA_ToolPack_settings v0.48 | Lega
   Configuracion de la herramienta LGA_ToolPack
 
   v0.47: El look sale de LGA_UI_Style_ToolPack. Era la unica ventana
          del pack sin ninguna hoja de estilo, asi que heredaba el tema
          de Nuke y no se parecia a las demas.
+  v0.48: El ini de Write Focus se guarda con LGA_ToolPack_ConfigStore, atomico y
+         avisando el cambio.
 _____________________________________________________________________________________________________
 """
 
 import sys
-import os
-import configparser
 import typing  # Importar typing
 from typing import Optional, Tuple
 
 from LGA_QtAdapter_ToolPack import QtWidgets, QtCore, QtGui, QGuiApplication
 from LGA_UI_Style_ToolPack import Metric, Style
+import LGA_ToolPack_ConfigStore as config_store
 
 QApplication = QtWidgets.QApplication
 QWidget = QtWidgets.QWidget
@@ -455,20 +456,15 @@ class SettingsWindow(QWidget):
             except Exception:
                 self.write_focus_secondary_input.setText(WF_DEFAULT_SECONDARY_NODE_NAME)
             return
-        config = configparser.ConfigParser()
         try:
-            if os.path.exists(config_file_path):
-                config.read(config_file_path)
-            if not config.has_section(WF_CONFIG_SECTION):
-                config.add_section(WF_CONFIG_SECTION)
-            config.set(WF_CONFIG_SECTION, WF_CONFIG_NODE_NAME_KEY, new_node_name)
-            config.set(
+            config_store.write_section(
+                config_file_path,
                 WF_CONFIG_SECTION,
-                WF_CONFIG_SECONDARY_NODE_NAME_KEY,
-                new_secondary_node_name,
+                {
+                    WF_CONFIG_NODE_NAME_KEY: new_node_name,
+                    WF_CONFIG_SECONDARY_NODE_NAME_KEY: new_secondary_node_name,
+                },
             )
-            with open(config_file_path, "w") as configfile:
-                config.write(configfile)
             debug_print(
                 f"Configuracion de Write Focus guardada: {new_node_name}, {new_secondary_node_name}"
             )
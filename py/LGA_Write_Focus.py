@@ -1,17 +1,33 @@
 """
 ____________________________________________________________________________________
 
-  LGA_Write_Focus v1.60 | Lega
+  LGA_Write_Focus v1.65 | Lega
   Script para buscar, enfocar, centrar y hacer zoom a un nodo con nombre definido
   en el archivo de configuracion. Por defecto es Write_Pub.
+
+  v1.61: La busqueda usa LGA_ToolPack_NodeIndex en lugar de recorrer
+         nuke.allNodes() en cada atajo.
+  v1.62: El ini se lee con LGA_ToolPack_ConfigStore: cada atajo ya no lo vuelve a parsear.
+  v1.63: Si la busqueda no encuentra nada, el indice se rearma y se busca otra vez: un
+         Write renombrado desde Python -Write Presets- se encuentra enseguida.
+  v1.64: Se ignoran los Writes con SKIP_KNOB, como el de captura de
+         LGA_viewer_SnapShot, que queda en el script entre snapshots.
+  v1.65: Sin el rearmado del indice de v1.63: el principal no existe cada vez que
+         solo hay secundario, y cada atajo recorria el script entero. Los renames
+         de Write Presets llegan al indice con node_index.renamed.
 ____________________________________________________________________________________
 """
 
 import nuke
 import time
 import os
-import configparser
-import platform
+
+import LGA_ToolPack_ConfigStore as config_store
+import LGA_ToolPack_NodeIndex as node_index
+
+# El mismo nombre que LGA_Write_RenderComplete.SKIP_KNOB. Lo lleva el Write de
+# captura de LGA_viewer_SnapShot, que no es un Write al que se quiera ir.
+SKIP_KNOB = "lga_render_complete_skip"
 
 # Variable global para activar o desactivar los prints de depuracion
 DEBUG = False  # Cambiar a True para ver los mensajes detallados
@@ -37,6 +53,12 @@ def find_write_node_flexible(target_name):
     2. Busqueda parcial si no hay match exacto
     Excluye nodos Write que esten actualmente seleccionados.
     Devuelve el primer nodo encontrado o None.
+
+    Busca en LGA_ToolPack_NodeIndex, solo entre los Writes que no estan en
+    un Group: la exacta es un acceso al indice y la parcial compara texto
+    sobre los nombres de los Writes, sin pedirle a Nuke todos los nodos.
+    Los nombres de nodo no tienen espacios, asi que solo se normaliza el
+    target.
     """
     if not target_name:
         return None
@@ -45,42 +67,26 @@ def find_write_node_flexible(target_name):
     debug_print(f"Buscando nodo: '{target_name}' (normalizado: '{normalized_target}')")
 
     # Obtener nodos Write actualmente seleccionados para excluirlos
-    selected_writes = [n for n in nuke.selectedNodes() if n.Class() == "Write"]
-    debug_print(
-        f"Nodos Write seleccionados a excluir: {[n.name() for n in selected_writes]}"
-    )
-
-    # Obtener todos los nodos Write del script (excluyendo los seleccionados)
-    all_writes = [
-        n for n in nuke.allNodes() if n.Class() == "Write" and n not in selected_writes
-    ]
-    debug_print(
-        f"Total nodos Write encontrados (excluyendo seleccionados): {len(all_writes)}"
-    )
+    selected_writes = {
+        n.fullName() for n in nuke.selectedNodes() if n.Class() == "Write"
+    }
+    debug_print(f"Nodos Write seleccionados a excluir: {sorted(selected_writes)}")
 
     # 1. Busqueda exacta con nombres normalizados
-    for node in all_writes:
-        normalized_node_name = normalize_name(node.name())
-        if normalized_node_name == normalized_target:
-            debug_print(
-                f"Match exacto encontrado: '{node.name()}' -> '{normalized_node_name}'"
-            )
+    for node in node_index.find(normalized_target, "Write", top_level=True):
+        if node.fullName() not in selected_writes and node.knob(SKIP_KNOB) is None:
+            debug_print(f"Match exacto encontrado: '{node.name()}'")
             return node
 
-    # 2. Busqueda parcial: el nombre del nodo contiene el target normalizado
-    partial_matches = []
-    for node in all_writes:
-        normalized_node_name = normalize_name(node.name())
-        if normalized_target in normalized_node_name:
-            partial_matches.append(node)
-            debug_print(
-                f"Match parcial encontrado: '{node.name()}' -> '{normalized_node_name}'"
-            )
-
-    # Devolver el primer match parcial si existe
-    if partial_matches:
-        debug_print(f"Usando match parcial: '{partial_matches[0].name()}'")
-        return partial_matches[0]
+    # 2. Busqueda parcial: el nombre del nodo contiene el target normalizado.
+    # Se devuelve el primer match que todavia exista.
+    for full_name, name in node_index.names_of_class("Write", top_level=True):
+        if full_name in selected_writes or normalized_target not in name:
+            continue
+        node = node_index.resolve(full_name, "Write")
+        if node is not None and node.knob(SKIP_KNOB) is None:
+            debug_print(f"Usando match parcial: '{name}'")
+            return node
 
     debug_print(
         f"No se encontro ningun nodo Write que coincida con '{target_name}' (excluyendo seleccionados)"
@@ -89,27 +95,8 @@ def find_write_node_flexible(target_name):
 
 
 def get_user_config_dir():
-    """
-    Obtiene el directorio de configuracion del usuario segun el sistema operativo.
-    Windows: %APPDATA%
-    Mac: ~/Library/Application Support
-    """
-    system = platform.system()
-    if system == "Windows":
-        config_path = os.getenv("APPDATA")
-        if not config_path:
-            debug_print("Error: No se pudo encontrar la variable de entorno APPDATA.")
-            return None
-    elif system == "Darwin":  # macOS
-        config_path = os.path.expanduser("~/Library/Application Support")
-    else:
-        # Para otros sistemas, usar el directorio home como fallback
-        config_path = os.path.expanduser("~/.config")
-        debug_print(
-            f"Sistema no reconocido ({system}), usando ~/.config como fallback."
-        )
-
-    return config_path
+    """Directorio de configuracion del usuario: ver LGA_ToolPack_ConfigStore."""
+    return config_store.get_user_config_dir()
 
 
 # Constante para el nombre del archivo de configuracion
@@ -128,15 +115,7 @@ DEFAULT_SECONDARY_NODE_NAME = "Write_EXR_Publish_DWAA"
 
 def get_config_path():
     """Devuelve la ruta completa al archivo de configuracion."""
-    try:
-        user_config_dir = get_user_config_dir()
-        if not user_config_dir:
-            return None
-        config_dir = os.path.join(user_config_dir, "LGA", "ToolPack")
-        return os.path.join(config_dir, CONFIG_FILE_NAME)
-    except Exception as e:
-        debug_print(f"Error al obtener la ruta de configuracion: {e}")
-        return None
+    return config_store.get_config_path(CONFIG_FILE_NAME)
 
 
 def ensure_config_exists():
@@ -145,31 +124,20 @@ def ensure_config_exists():
     Si no existen, los crea con los valores predeterminados.
     """
     config_file_path = get_config_path()
-    if not config_file_path:
-        return  # Salir si no se pudo obtener la ruta
-
-    config_dir = os.path.dirname(config_file_path)
-
+    if not config_file_path or os.path.exists(config_file_path):
+        return
     try:
-        # Crear el directorio si no existe
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
-            debug_print(f"Directorio creado: {config_dir}")
-
-        # Crear el archivo .ini si no existe
-        if not os.path.exists(config_file_path):
-            config = configparser.ConfigParser()
-            config[CONFIG_SECTION] = {
+        config_store.write_section(
+            config_file_path,
+            CONFIG_SECTION,
+            {
                 CONFIG_NODE_NAME_KEY: DEFAULT_NODE_NAME,
                 CONFIG_SECONDARY_NODE_NAME_KEY: DEFAULT_SECONDARY_NODE_NAME,
-            }
-            with open(config_file_path, "w") as configfile:
-                config.write(configfile)
-            debug_print(
-                f"Archivo de configuración creado: {config_file_path} con valores predeterminados '{DEFAULT_NODE_NAME}' y '{DEFAULT_SECONDARY_NODE_NAME}'"
-            )
-        # else:
-        #     debug_print(f"Archivo de configuración ya existe: {config_file_path}")
+            },
+        )
+        debug_print(
+            f"Archivo de configuración creado: {config_file_path} con valores predeterminados '{DEFAULT_NODE_NAME}' y '{DEFAULT_SECONDARY_NODE_NAME}'"
+        )
     except Exception as e:
         debug_print(f"Error al asegurar la configuración: {e}")
 
@@ -181,62 +149,26 @@ def get_node_names_from_config():
     Los nombres se normalizan al leerlos.
     """
     config_file_path = get_config_path()
-    if not config_file_path or not os.path.exists(config_file_path):
-        debug_print(
-            "Archivo de configuración no encontrado, usando valores por defecto."
-        )
-        return (
-            normalize_name(DEFAULT_NODE_NAME),
-            normalize_name(DEFAULT_SECONDARY_NODE_NAME),
-        )
-    try:
-        config = configparser.ConfigParser()
-        config.read(config_file_path)
-        if config.has_section(CONFIG_SECTION):
-            node_name = config.get(
-                CONFIG_SECTION, CONFIG_NODE_NAME_KEY, fallback=DEFAULT_NODE_NAME
-            )
-            secondary_node_name = config.get(
-                CONFIG_SECTION,
-                CONFIG_SECONDARY_NODE_NAME_KEY,
-                fallback=DEFAULT_SECONDARY_NODE_NAME,
-            )
-            return (
-                (
-                    normalize_name(node_name.strip())
-                    if node_name
-                    else normalize_name(DEFAULT_NODE_NAME)
-                ),
-                (
-                    normalize_name(secondary_node_name.strip())
-                    if secondary_node_name
-                    else normalize_name(DEFAULT_SECONDARY_NODE_NAME)
-                ),
-            )
-        else:
-            debug_print(
-                f"Sección [{CONFIG_SECTION}] no encontrada en {config_file_path}. Usando valores por defecto."
-            )
-            return (
-                normalize_name(DEFAULT_NODE_NAME),
-                normalize_name(DEFAULT_SECONDARY_NODE_NAME),
-            )
-    except configparser.Error as e:
-        debug_print(
-            f"Error al leer el archivo de configuración {config_file_path}: {e}. Usando valores por defecto."
-        )
-        return (
-            normalize_name(DEFAULT_NODE_NAME),
-            normalize_name(DEFAULT_SECONDARY_NODE_NAME),
-        )
-    except Exception as e:
-        debug_print(
-            f"Error inesperado al leer la configuración: {e}. Usando valores por defecto."
-        )
+    if not config_file_path:
         return (
             normalize_name(DEFAULT_NODE_NAME),
             normalize_name(DEFAULT_SECONDARY_NODE_NAME),
         )
+    node_name = config_store.get_value(
+        config_file_path, CONFIG_SECTION, CONFIG_NODE_NAME_KEY, DEFAULT_NODE_NAME
+    )
+    secondary_node_name = config_store.get_value(
+        config_file_path,
+        CONFIG_SECTION,
+        CONFIG_SECONDARY_NODE_NAME_KEY,
+        DEFAULT_SECONDARY_NODE_NAME,
+    )
+    return (
+        normalize_name((node_name or "").strip() or DEFAULT_NODE_NAME),
+        normalize_name(
+            (secondary_node_name or "").strip() or DEFAULT_SECONDARY_NODE_NAME
+        ),
+    )
 
 
 # Asegurarse de que el archivo de configuracion existe al iniciar
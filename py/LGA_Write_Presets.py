@@ -1,11 +1,19 @@
 """
 _____________________________________________________________________________
 
-  LGA_Write_Presets v2.76 | Lega
+  LGA_Write_Presets v2.81 | Lega
 
   Creates Write nodes with predefined settings for different purposes.
   Supports both script-based and Read node-based path generation.
 
+  v2.81: Los renames del Write avisan a LGA_ToolPack_NodeIndex: no pasan
+         por el knobChanged de name y Write Focus no encontraba el Write
+         nuevo hasta volver a abrir el script.
+
+  v2.78: El .ini se lee una sola vez: los presets quedan en memoria ya
+         ajustados para los dos formatos de shotname y se vuelven a leer
+         solo si el archivo cambio. El formato se recuerda por script.
+
   v2.76: El look sale de LGA_UI_Style_ToolPack. La cruz de cerrar pasa de
          20 a 26 px y se pinta al pasar por encima, la tabla deja de ser mas
          oscura que su propia ventana, y el alto se calcula midiendo cada
@@ -96,6 +104,8 @@ import posixpath
 import unicodedata
 import re
 
+import LGA_ToolPack_NodeIndex as node_index
+
 # Variable global para activar o desactivar los debug_prints
 DEBUG = True
 
@@ -496,13 +506,29 @@ def detect_shotname_format_local():
         return False
 
 
+# {path del script: has_description}. El formato sale solo del nombre del
+# script, asi que no cambia mientras el script sea el mismo.
+_shotname_format_cache = {}
+
+
 def detect_shotname_format_from_script():
     """
     Detecta el formato del shotname basado en el script actual de Nuke.
     Usa el modulo compartido LGA_ToolPack_NamingUtils si esta disponible.
     Retorna True si es formato con descripcion (5 bloques), False si es simplificado (3 bloques).
     Si no hay script guardado, asume formato simplificado.
+    El resultado se recuerda por script: abrir otra vez la ventana no lo recalcula.
     """
+    try:
+        script_path = nuke.root().name()
+    except Exception:
+        return _detect_shotname_format()
+    if script_path not in _shotname_format_cache:
+        _shotname_format_cache[script_path] = _detect_shotname_format()
+    return _shotname_format_cache[script_path]
+
+
+def _detect_shotname_format():
     if naming_utils_available:
         try:
             base_name = get_script_base_name()
@@ -538,6 +564,11 @@ def detect_shotname_format_from_script():
         return detect_shotname_format_local()
 
 
+# El ultimo indice de un lrange: "] 0 X]" o "] 0 X ]", con espacios opcionales
+# antes del ultimo ].
+TCL_INDEX_RE = re.compile(r"\] 0 (\d+)\s*\]")
+
+
 def adjust_tcl_formulas(presets, has_description):
     """
     Ajusta las formulas TCL en los presets segun el formato detectado.
@@ -573,10 +604,7 @@ def adjust_tcl_formulas(presets, has_description):
                 has_space = match.group(0).endswith(" ]")
                 return f"] 0 {new_index} ]" if has_space else f"] 0 {new_index}]"
 
-            # Regex que acepta espacios opcionales antes del ultimo ]
-            adjusted_pattern = re.sub(
-                r"\] 0 (\d+)\s*\]", adjust_index, original_pattern
-            )
+            adjusted_pattern = TCL_INDEX_RE.sub(adjust_index, original_pattern)
             adjusted_preset["file_pattern"] = adjusted_pattern
 
             if original_pattern != adjusted_pattern:
@@ -587,14 +615,48 @@ def adjust_tcl_formulas(presets, has_description):
     return adjusted_presets
 
 
+PRESETS_INI = os.path.join(os.path.dirname(__file__), "LGA_Write_Presets.ini")
+
+
 def load_presets():
     """Lee el archivo .ini y retorna un diccionario con los presets"""
     config = configparser.ConfigParser(interpolation=None)  # Desactivar interpolación
-    ini_path = os.path.join(os.path.dirname(__file__), "LGA_Write_Presets.ini")
-    config.read(ini_path)
+    config.read(PRESETS_INI)
     return {section: dict(config[section]) for section in config.sections()}
 
 
+# Los presets ya leidos: la firma del .ini (mtime y tamaño) y los presets
+# ajustados para cada formato, {has_description: presets}.
+_preset_repository = {"stamp": None, "variants": None}
+
+
+def _ini_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_presets(has_description):
+    """
+    Los presets ajustados para el formato pedido.
+
+    El .ini se lee y se ajusta para los dos formatos una sola vez; despues
+    solo se mira su mtime, y si alguien lo edito se vuelve a leer. Los dicts
+    son compartidos entre aperturas de la ventana: no se modifican.
+    """
+    stamp = _ini_stamp(PRESETS_INI)
+    if stamp is None or stamp != _preset_repository["stamp"]:
+        base_presets = load_presets()
+        _preset_repository["variants"] = {
+            False: adjust_tcl_formulas(base_presets, False),
+            True: adjust_tcl_formulas(base_presets, True),
+        }
+        _preset_repository["stamp"] = stamp
+    return _preset_repository["variants"][bool(has_description)]
+
+
 def create_write_from_preset(preset, user_text=None, modified_file_pattern=None):
     """
     Crea un Write node y nodos adicionales según el preset
@@ -785,7 +847,9 @@ def create_write_from_preset(preset, user_text=None, modified_file_pattern=None)
 
     write_node["file"].setValue(file_pattern)
 
-    # Configurar nombre del Write
+    # Configurar nombre del Write. El rename desde Python no pasa por el
+    # knobChanged: se avisa al indice de nodos
+    old_full_name = write_node.fullName()
     if preset["button_type"] == "read":
         write_node["name"].setValue(get_write_name_from_read(current_node, "Denoised"))
     else:
@@ -794,6 +858,7 @@ def create_write_from_preset(preset, user_text=None, modified_file_pattern=None)
         normalized_text = normalize_node_name(text_to_normalize)
         base_write_name = "Write_" + normalized_text
         write_node["name"].setValue(get_unique_node_name(base_write_name))
+    node_index.renamed(write_node, old_full_name)
 
     # Añadir knobs personalizados
     write_node.addKnob(nuke.Tab_Knob("User", "User"))
@@ -1043,9 +1108,8 @@ class SelectedNodeInfo(QWidget):
         )
         has_description = detect_shotname_format_from_script()
 
-        # Cargar presets base y ajustarlos segun el formato detectado
-        base_presets = load_presets()
-        self.presets = adjust_tcl_formulas(base_presets, has_description)
+        # Presets ya ajustados segun el formato detectado
+        self.presets = get_presets(has_description)
 
         debug_print(
             f"[Write_Presets] Formato detectado: {'CON DESCRIPCION (5 bloques)' if has_description else 'SIMPLIFICADO (3 bloques)'}"
@@ -1593,7 +1657,9 @@ def check_and_fix_selected_write():
         if current_name != normalized_name:
             # Verificar que el nombre normalizado sea unico
             unique_name = get_unique_node_name(normalized_name)
+            old_full_name = selected_node.fullName()
             selected_node.setName(unique_name)
+            node_index.renamed(selected_node, old_full_name)
             debug_print(
                 f"Nombre del Write corregido: '{current_name}' -> '{unique_name}'"
             )
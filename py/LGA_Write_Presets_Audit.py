@@ -0,0 +1,565 @@
+"""
+_____________________________________________________________________________
+
+  LGA_Write_Presets_Audit v2.80 | Lega
+
+  Revisa de una vez todos los Writes del script contra los presets de
+  LGA_Write_Presets.ini, antes de publicar.
+
+  Hasta ahora la unica forma de ver si un Write respetaba su preset era
+  abrir la ventana de chequeo nodo por nodo. Aca se recorren todos los
+  Writes -tambien los de adentro de Groups- y para cada uno se busca el
+  preset del que salio y se compara contra el:
+
+    - el file_type y la extension del path final,
+    - Naming Segments y Folder Up Levels, los dos numeros que la ventana
+      de chequeo deja tocar,
+    - el colorspace, con la misma regla que usa el preset al crearlo,
+    - que el path no herede la extension del Read de arriba ni salga de
+      la carpeta del shot: lo mismo que la ventana marca en rojo y en
+      violeta.
+
+  Los file se evaluan con LGA_Write_Presets_tcl y su cache: cien Writes
+  que comparten pattern y Read son una sola evaluacion. Lo que ese
+  modulo no sabe lo evalua Nuke sobre el mismo Write, sin temporales.
+
+  El preset de un Write se reconoce por su file: el pattern del preset
+  con el texto del usuario en lugar de "****" y cualquier indice o
+  cantidad de "../". Si varios presets lo reconocen -hay presets con el
+  mismo pattern- se queda el que menos problemas da.
+
+  v2.80: No se revisa el Write de captura de LGA_viewer_SnapShot: no
+         sale de ningun preset y se informaba como sin preset.
+  v2.79: Modulo nuevo.
+_____________________________________________________________________________
+"""
+
+import os
+import re
+
+import nuke
+
+from LGA_QtAdapter_ToolPack import QtWidgets, QtGui, QtCore
+from LGA_UI_Style_ToolPack import Color, Metric, Style
+
+import LGA_Write_Presets as write_presets
+import LGA_Write_Presets_Check as check
+
+QApplication = QtWidgets.QApplication
+QDialog = QtWidgets.QDialog
+QVBoxLayout = QtWidgets.QVBoxLayout
+QHBoxLayout = QtWidgets.QHBoxLayout
+QLabel = QtWidgets.QLabel
+QPushButton = QtWidgets.QPushButton
+QTableWidget = QtWidgets.QTableWidget
+QTableWidgetItem = QtWidgets.QTableWidgetItem
+QHeaderView = QtWidgets.QHeaderView
+QAbstractItemView = QtWidgets.QAbstractItemView
+QColor = QtGui.QColor
+Qt = QtCore.Qt
+
+
+# Variable global para activar o desactivar los debug_prints
+DEBUG = False
+
+
+def debug_print(*message):
+    if DEBUG:
+        print("[LGA_Write_Presets_Audit]", *message)
+
+
+# ---------------------------------------------------------------------------
+#                               Configuracion
+# ---------------------------------------------------------------------------
+# Las extensiones que corresponden a cada file_type. Los que no estan usan
+# "." + file_type.
+FILE_EXTENSIONS = {
+    "tiff": (".tif", ".tiff"),
+    "jpeg": (".jpg", ".jpeg"),
+    "targa": (".tga",),
+}
+
+# Mismo zoom que LGA_Write_Focus al ir a un nodo.
+ZOOM_LEVEL = 1.0
+
+# El mismo nombre que LGA_Write_RenderComplete.SKIP_KNOB. Lo lleva el Write
+# de captura de LGA_viewer_SnapShot, que no sale de ningun preset.
+SKIP_KNOB = "lga_render_complete_skip"
+
+NO_PRESET = "No preset matches the file pattern"
+
+COLOR_TEXT = Color.TEXT
+COLOR_TEXT_DIM = Color.TEXT_DIM
+COLOR_TITLE = Color.TEXT_STRONG
+COLOR_OK = Color.OK
+COLOR_NO_PRESET = Color.WARNING
+COLOR_ISSUES = Color.ERROR
+
+
+# ---------------------------------------------------------------------------
+#                          Que preset hizo cada Write
+# ---------------------------------------------------------------------------
+# Las partes de un pattern que el usuario puede cambiar: el texto del dialogo,
+# los "../" de Folder Up Levels y el indice de Naming Segments.
+_VARIABLE_PARTS_RE = re.compile(r"(\*\*\*\*|(?:\.\./)+|\] 0 \d+\s*\])")
+
+
+def pattern_regex(file_pattern):
+    """El regex que reconoce los file de los Writes creados con este pattern."""
+    pieces = []
+    for position, piece in enumerate(_VARIABLE_PARTS_RE.split(file_pattern)):
+        if position % 2 == 0:
+            pieces.append(re.escape(piece))
+        elif piece == "****":
+            pieces.append(r".+?")
+        elif piece.startswith("../"):
+            pieces.append(r"(?:\.\./)*")
+        else:
+            pieces.append(r"\] 0 \d+\s*\]")
+    return re.compile("".join(pieces) + r"\Z")
+
+
+# Los regex de los presets que devolvio get_presets por ultima vez. Mientras
+# el .ini no cambie get_presets devuelve el mismo dict, asi que alcanza con
+# comparar identidad.
+_matchers = {"presets": None, "matchers": ()}
+
+
+def preset_matchers(presets):
+    """[(preset, regex), ...] en el orden del .ini."""
+    if _matchers["presets"] is not presets:
+        _matchers["matchers"] = tuple(
+            (preset, pattern_regex(preset["file_pattern"]))
+            for preset in presets.values()
+            if preset.get("file_pattern")
+        )
+        _matchers["presets"] = presets
+    return _matchers["matchers"]
+
+
+# ---------------------------------------------------------------------------
+#                                   Reglas
+# ---------------------------------------------------------------------------
+
+
+def _levels(file_pattern):
+    has_levels, levels = check.has_directory_levels(file_pattern)
+    return levels if has_levels else 0
+
+
+def colorspace_issue(write, preset, color_context):
+    """
+    El problema de color del Write contra su preset, o None. La regla es la
+    de apply_colorspace_settings: "default" no toca nada, Output - Rec.709
+    con OCIO v2 va por display/view, y el resto por el knob colorspace.
+    """
+    wanted = preset.get("colorspace", "default")
+    transform = write.knob("transformType")
+    colorspace = write.knob("colorspace")
+    display = write.knob("display")
+    view = write.knob("view")
+
+    if wanted == "Output - Rec.709" and color_context["is_ocio_v2"]:
+        if transform is not None and display is not None and view is not None:
+            if transform.value() != "display":
+                return "Transform %s, preset display" % transform.value()
+            current = (display.value(), view.value())
+            project = (color_context["display"], color_context["view"])
+            if current != project:
+                return "Display %s | %s, project %s | %s" % (current + project)
+            return None
+
+    if colorspace is None:
+        return None
+    if wanted in ("", "default"):
+        if colorspace.notDefault():
+            return "Colorspace %s, preset default" % colorspace.value()
+        return None
+    if transform is not None and transform.value() != "colorspace":
+        return "Transform %s, preset colorspace" % transform.value()
+    if colorspace.value() != wanted:
+        return "Colorspace %s, preset %s" % (colorspace.value(), wanted)
+    return None
+
+
+def preset_issues(write, file_pattern, path, preset, color_context):
+    """Lo que el Write tiene distinto de su preset."""
+    issues = []
+
+    wanted_type = preset.get("file_type", "")
+    file_type = write["file_type"].value()
+    if wanted_type and file_type != wanted_type:
+        issues.append("File type %s, preset %s" % (file_type or "none", wanted_type))
+
+    if path and wanted_type:
+        extension = os.path.splitext(path)[1].lower()
+        expected = FILE_EXTENSIONS.get(wanted_type, ("." + wanted_type,))
+        if extension not in expected:
+            issues.append("Extension %s, preset %s" % (extension or "none", expected[0]))
+
+    has_index, index = check.has_adjustable_indices(file_pattern)
+    preset_index = check.has_adjustable_indices(preset["file_pattern"])[1]
+    if has_index and preset_index is not None and index != preset_index:
+        issues.append("Naming Segments %d, preset %d" % (index, preset_index))
+
+    levels = _levels(file_pattern)
+    preset_levels = _levels(preset["file_pattern"])
+    if levels != preset_levels:
+        issues.append("Folder Up Levels %d, preset %d" % (levels, preset_levels))
+
+    if path and preset.get("button_type") == "script":
+        # Un preset de script escribe adentro del shot: la parte violeta de
+        # la ventana de chequeo tiene que llegar hasta el final del shot.
+        shot_folder_parts = color_context["shot_folder_parts"]
+        parts = path.split("/")
+        if shot_folder_parts and check.violet_end_index(parts, shot_folder_parts) < len(
+            shot_folder_parts
+        ):
+            issues.append("Outside the shot folder")
+
+    issue = colorspace_issue(write, preset, color_context)
+    if issue:
+        issues.append(issue)
+    return issues
+
+
+def path_issues(path, original_extensions):
+    """Lo que esta mal en el path sin importar el preset."""
+    if not path:
+        return ["File pattern does not evaluate"]
+    issues = []
+    parts = path.split("/")
+    for position, part in enumerate(parts):
+        is_final_file = position == len(parts) - 1
+        for ext in check.inherited_extensions(part, original_extensions, is_final_file):
+            issues.append("Inherited %s in %s" % (ext, part))
+    return issues
+
+
+# ---------------------------------------------------------------------------
+#                                  La pasada
+# ---------------------------------------------------------------------------
+
+
+def evaluate_write(write, file_pattern):
+    """
+    El path final del Write, normalizado. Primero LGA_Write_Presets_tcl con
+    su cache; si no alcanza, Nuke sobre el mismo Write.
+    """
+    path = check.evaluate_without_nuke(file_pattern, write)
+    if path is None:
+        try:
+            path = nuke.filename(write)
+        except Exception as error:
+            debug_print("No se pudo evaluar %s: %s" % (write.fullName(), error))
+            path = None
+    return check.normalize_path_preserve_case(path) if path else None
+
+
+def audit_write(write, matchers, color_context, extensions_by_file):
+    """
+    Una fila del informe: {"name", "preset", "path", "issues"}. preset es el
+    button_name del preset o None si ninguno reconoce el file.
+    """
+    file_pattern = write["file"].value()
+    path = evaluate_write(write, file_pattern)
+
+    # Las extensiones del Read de arriba: muchos Writes cuelgan del mismo
+    topnode_file = check.get_topnode_file_path(write.input(0))
+    if topnode_file not in extensions_by_file:
+        extensions_by_file[topnode_file] = check.extract_original_extension(
+            topnode_file
+        )
+    issues = path_issues(path, extensions_by_file[topnode_file])
+
+    best = None
+    for preset, regex in matchers:
+        if not regex.match(file_pattern):
+            continue
+        candidate = preset_issues(write, file_pattern, path, preset, color_context)
+        if best is None or len(candidate) < len(best[1]):
+            best = (preset, candidate)
+            if not candidate:
+                break
+
+    if best is None:
+        return {
+            "name": write.fullName(),
+            "preset": None,
+            "path": path,
+            "issues": [NO_PRESET] + issues,
+        }
+    # Con el prefijo del panel: hay presets de script y de Read con el mismo
+    # nombre
+    preset = best[0]
+    return {
+        "name": write.fullName(),
+        "preset": "[%s] %s" % (preset["button_type"].capitalize(), preset["button_name"]),
+        "path": path,
+        "issues": best[1] + issues,
+    }
+
+
+def audit_script(writes=None):
+    """Las filas del informe para `writes`, o para todos los Writes del script."""
+    if writes is None:
+        writes = nuke.allNodes("Write", recurseGroups=True)
+    writes = [write for write in writes if write.knob(SKIP_KNOB) is None]
+
+    script_path = nuke.root().name()
+    if not script_path or script_path == "Root":
+        script_path = None
+
+    # Las variantes de presets ya ajustadas y el formato del shotname salen
+    # de los caches de LGA_Write_Presets: no se lee el .ini por cada Write.
+    has_description = write_presets.detect_shotname_format_from_script()
+    matchers = preset_matchers(write_presets.get_presets(has_description))
+    color_context = dict(write_presets.get_color_management_context())
+    color_context["shot_folder_parts"] = check.get_shot_folder_parts(script_path)
+
+    extensions_by_file = {}
+    rows = []
+    for write in writes:
+        try:
+            rows.append(audit_write(write, matchers, color_context, extensions_by_file))
+        except Exception as error:
+            debug_print("Error revisando %s: %s" % (write.fullName(), error))
+            rows.append(
+                {
+                    "name": write.fullName(),
+                    "preset": None,
+                    "path": None,
+                    "issues": ["Could not be checked: %s" % error],
+                }
+            )
+    return rows
+
+
+# ---------------------------------------------------------------------------
+#                                 Ventana
+# ---------------------------------------------------------------------------
+
+
+def focus_node(full_name):
+    """Selecciona el Write, lo centra en el DAG y abre su panel."""
+    node = nuke.toNode(full_name)
+    if node is None:
+        return False
+    try:
+        for selected in nuke.selectedNodes():
+            selected.setSelected(False)
+        node.setSelected(True)
+        nuke.zoom(
+            ZOOM_LEVEL,
+            [
+                node.xpos() + node.screenWidth() / 2,
+                node.ypos() + node.screenHeight() / 2,
+            ],
+        )
+    except Exception as error:
+        # Un Write adentro de un Group no se puede centrar desde el Root
+        debug_print("No se pudo centrar %s: %s" % (full_name, error))
+    node.showControlPanel()
+    return True
+
+
+class _CountItem(QTableWidgetItem):
+    """Celda que ordena por numero y no por texto."""
+
+    def __lt__(self, other):
+        return self.data(Qt.UserRole) < other.data(Qt.UserRole)
+
+
+class AuditWindow(QDialog):
+    """El informe: una fila por Write, ordenable por cualquier columna."""
+
+    COL_BAR = 0
+    COL_WRITE = 1
+    COL_PRESET = 2
+    COL_COUNT = 3
+    COL_ISSUES = 4
+    COL_PATH = 5
+
+    WINDOW_WIDTH = 1150
+    TABLE_MIN_HEIGHT = 120
+    TABLE_MAX_HEIGHT = 520
+
+    def __init__(self, rows, parent=None):
+        super(AuditWindow, self).__init__(parent)
+        self.rows = rows
+
+        self.setWindowTitle("Write Presets Audit")
+        self.setStyleSheet(Style.WINDOW)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(*([Metric.WINDOW_MARGIN] * 4))
+        layout.setSpacing(Metric.SPACING)
+
+        self.summary_label = QLabel("")
+        self.summary_label.setStyleSheet("font-size:13px;")
+        layout.addWidget(self.summary_label)
+
+        layout.addWidget(self._build_table())
+        layout.addLayout(self._build_footer())
+
+        self._fill()
+        self.resize(self.WINDOW_WIDTH, self._opening_height())
+
+    def _opening_height(self):
+        content = (
+            len(self.rows) * Metric.ROW_HEIGHT
+            + self.table.horizontalHeader().height()
+            + 2 * self.table.frameWidth()
+        )
+        table_height = max(self.TABLE_MIN_HEIGHT, min(content, self.TABLE_MAX_HEIGHT))
+        return table_height + 110
+
+    def _build_table(self):
+        headers = ["", "Write", "Preset", "Issues", "Details", "Final path"]
+
+        table = QTableWidget()
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.verticalHeader().setVisible(False)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.setSelectionMode(QAbstractItemView.SingleSelection)
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setShowGrid(False)
+        table.setStyleSheet(Style.TABLE)
+
+        header = table.horizontalHeader()
+        header.setMinimumSectionSize(1)
+        header.setSectionResizeMode(self.COL_BAR, QHeaderView.Fixed)
+        table.setColumnWidth(self.COL_BAR, 5)
+        header.setSectionResizeMode(self.COL_WRITE, QHeaderView.Interactive)
+        table.setColumnWidth(self.COL_WRITE, 180)
+        header.setSectionResizeMode(self.COL_PRESET, QHeaderView.Interactive)
+        table.setColumnWidth(self.COL_PRESET, 170)
+        header.setSectionResizeMode(self.COL_COUNT, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(self.COL_ISSUES, QHeaderView.Stretch)
+        header.setSectionResizeMode(self.COL_PATH, QHeaderView.Stretch)
+
+        table.cellDoubleClicked.connect(self._on_double_click)
+        self.table = table
+        return table
+
+    def _build_footer(self):
+        footer = QHBoxLayout()
+        footer.setSpacing(8)
+
+        hint = QLabel(
+            "<span style='color:%s;'>Double-click a row to go to the Write.</span>"
+            % COLOR_TEXT_DIM
+        )
+        hint.setStyleSheet("font-size:12px;")
+        footer.addWidget(hint)
+        footer.addStretch()
+
+        refresh_button = QPushButton("Refresh")
+        refresh_button.setStyleSheet(Style.BTN_SECONDARY)
+        refresh_button.clicked.connect(self.refresh)
+        footer.addWidget(refresh_button)
+
+        close_button = QPushButton("Close")
+        close_button.setStyleSheet(Style.BTN_PRIMARY)
+        close_button.clicked.connect(self.close)
+        footer.addWidget(close_button)
+        return footer
+
+    def _fill(self):
+        table = self.table
+        # Con el orden prendido cada setItem reubicaria la fila a mitad de
+        # armarla
+        table.setSortingEnabled(False)
+        table.setRowCount(len(self.rows))
+        for row_index, row in enumerate(self.rows):
+            self._fill_row(row_index, row)
+        table.setSortingEnabled(True)
+        table.sortItems(self.COL_COUNT, Qt.DescendingOrder)
+
+        with_issues = sum(1 for row in self.rows if row["issues"])
+        color = COLOR_ISSUES if with_issues else COLOR_OK
+        self.summary_label.setText(
+            "<span style='color:%s;'>%d Writes checked against the presets · </span>"
+            "<span style='color:%s; font-weight:bold;'>%d with issues</span>"
+            % (COLOR_TITLE, len(self.rows), color, with_issues)
+        )
+
+    def _fill_row(self, row_index, row):
+        table = self.table
+        issues = row["issues"]
+        if row["preset"] is None:
+            color = COLOR_NO_PRESET
+        elif issues:
+            color = COLOR_ISSUES
+        else:
+            color = COLOR_OK
+
+        bar_item = QTableWidgetItem("")
+        bar_item.setBackground(QColor(color))
+        table.setItem(row_index, self.COL_BAR, bar_item)
+
+        write_item = QTableWidgetItem(row["name"])
+        write_item.setForeground(QColor(COLOR_TEXT))
+        write_item.setData(Qt.UserRole + 1, row["name"])
+        table.setItem(row_index, self.COL_WRITE, write_item)
+
+        preset_item = QTableWidgetItem(row["preset"] or "—")
+        preset_item.setForeground(
+            QColor(COLOR_TEXT if row["preset"] else COLOR_TEXT_DIM)
+        )
+        table.setItem(row_index, self.COL_PRESET, preset_item)
+
+        count_item = _CountItem(str(len(issues)) if issues else "OK")
+        count_item.setData(Qt.UserRole, len(issues))
+        count_item.setForeground(QColor(color))
+        count_item.setTextAlignment(Qt.AlignCenter)
+        table.setItem(row_index, self.COL_COUNT, count_item)
+
+        details = " · ".join(issues)
+        issues_item = QTableWidgetItem(details)
+        issues_item.setForeground(QColor(color if issues else COLOR_TEXT_DIM))
+        issues_item.setToolTip("<br>".join(issues))
+        table.setItem(row_index, self.COL_ISSUES, issues_item)
+
+        path_item = QTableWidgetItem(row["path"] or "")
+        path_item.setForeground(QColor(COLOR_TEXT_DIM))
+        path_item.setToolTip(row["path"] or "")
+        table.setItem(row_index, self.COL_PATH, path_item)
+
+        table.setRowHeight(row_index, Metric.ROW_HEIGHT)
+
+    def _on_double_click(self, row_index, column):
+        item = self.table.item(row_index, self.COL_WRITE)
+        if item is not None:
+            focus_node(item.data(Qt.UserRole + 1))
+
+    def refresh(self):
+        """Vuelve a revisar: para despues de corregir algun Write."""
+        self.rows = audit_script()
+        self._fill()
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.close()
+        else:
+            super(AuditWindow, self).keyPressEvent(event)
+
+
+# Referencias globales para que la ventana no la junte el GC
+app = None
+_window = None
+
+
+def main():
+    global app, _window
+
+    app = QApplication.instance() or QApplication([])
+    rows = audit_script()
+    debug_print("Writes revisados: %d" % len(rows))
+
+    if _window is not None:
+        _window.close()
+    # No modal: se corrige un Write, se vuelve a la ventana y Refresh
+    _window = AuditWindow(rows)
+    _window.show()
@@ -1,10 +1,18 @@
 """
 _______________________________________________________________________________________________________________________________
 
-  LGA_Write_Presets_Check v2.71 | Lega
+  LGA_Write_Presets_Check v2.79 | Lega
   Script para mostrar una ventana de verificación del path normalizado antes de crear un Write node.
   Se usa cuando el usuario hace Shift+Click sobre un preset o edita Writes existentes.
 
+  v2.79: Que extension es heredada y donde termina la parte violeta se
+         calcula en inherited_extensions y violet_end_index, aparte del
+         HTML, para que LGA_Write_Presets_Audit use las mismas reglas.
+
+  v2.77: El path final se evalua con LGA_Write_Presets_tcl, sin crear un
+         Write temporal: las flechas de Naming Segments y Folder Up Levels
+         actualizan al instante y ya no crean y borran un nodo por click.
+         El Write temporal queda solo para el TCL que ese modulo no sabe.
 
   v2.71: bug fixes.
   v2.70: bug fixes.
@@ -50,6 +58,7 @@ import nuke
 import os
 import re
 from LGA_QtAdapter_ToolPack import QtWidgets, QtCore
+import LGA_Write_Presets_tcl as tcl
 
 QApplication = QtWidgets.QApplication
 QWidget = QtWidgets.QWidget
@@ -155,18 +164,16 @@ def debug_print(*message):
         print("[LGA_Write_Presets_Check]", *message)
 
 
-def get_topnode_file_path(temp_write):
+def get_topnode_file_path(input_node):
     """
-    Obtiene el path del archivo del topnode desde un Write temporal.
-    Busca recursivamente el nodo Read mas alto en las dependencias.
+    Obtiene el path del archivo del Read mas alto desde el nodo al que se
+    conectaria el Write. Busca recursivamente en las dependencias.
     Retorna el path del archivo o None si no se puede obtener.
     """
     try:
-        if not temp_write.input(0):
+        if input_node is None:
             return None
 
-        input_node = temp_write.input(0)
-
         # Buscar recursivamente el Read mas alto en las dependencias
         def find_read(node):
             if node is None:
@@ -238,27 +245,50 @@ def extract_original_extension(file_path):
     return extensions
 
 
-def evaluate_file_pattern(file_pattern):
+def find_topnode(node):
     """
-    Evalua una expresion TCL file_pattern sin crear un Write node permanente.
-    Crea un Write temporal solo para evaluar el path y luego lo elimina.
-    Retorna una tupla (evaluated_path, original_extensions) donde:
-    - evaluated_path: el path evaluado o None si hay error
-    - original_extensions: lista de extensiones originales del topnode o lista vacia
+    El nodo que devuelve [topnode] para un Write conectado a `node`: se sube
+    siempre por el input 0, igual que Nuke.
     """
-    if not file_pattern:
-        return None, []
+    visited = set()
+    while node is not None and node.input(0) is not None:
+        if id(node) in visited:
+            return None
+        visited.add(id(node))
+        node = node.input(0)
+    return node
 
-    try:
-        # Obtener el nodo seleccionado o crear un NoOp temporal para tener contexto
-        selected_node = None
+
+def evaluate_without_nuke(file_pattern, selected_node=None):
+    """
+    El pattern evaluado por LGA_Write_Presets_tcl, o None si hace falta Nuke.
+    Sin selected_node se usa el nodo seleccionado.
+    """
+    if selected_node is None:
         try:
             selected_node = nuke.selectedNode()
         except ValueError:
             pass
+    topnode = find_topnode(selected_node) if selected_node else None
+    topnode_name = None
+    topnode_file = None
+    if topnode is not None:
+        topnode_name = topnode.fullName()
+        file_knob = topnode.knob("file")
+        topnode_file = file_knob.value() if file_knob is not None else None
+    return tcl.evaluate_cached(
+        file_pattern, nuke.root().name(), topnode_name, topnode_file
+    )
+
 
-        # Crear un Write temporal solo para evaluar el path
-        # Esto es necesario porque algunas expresiones TCL de Nuke requieren un nodo para evaluarse
+def _evaluate_with_nuke(file_pattern, selected_node):
+    """
+    Evalua el pattern con un Write temporal. Es el camino para lo que
+    LGA_Write_Presets_tcl no sabe evaluar.
+    """
+    temp_write = None
+    try:
+        # Algunas expresiones TCL de Nuke requieren un nodo para evaluarse
         temp_write = nuke.nodes.Write()
 
         # Conectar el Write temporal al nodo seleccionado si existe
@@ -268,21 +298,53 @@ def evaluate_file_pattern(file_pattern):
 
         temp_write["file"].setValue(file_pattern)
 
-        # Obtener el path del topnode ANTES de evaluar (necesitamos el Write conectado)
-        topnode_file_path = get_topnode_file_path(temp_write)
+        # Evaluar el path usando nuke.filename()
+        evaluated_path = nuke.filename(temp_write)
+        return evaluated_path or None
+    except Exception as e:
+        debug_print(f"Error al evaluar file_pattern con Nuke: {e}")
+        return None
+    finally:
+        # Eliminar el Write temporal incluso si hay error
+        if temp_write is not None:
+            try:
+                nuke.delete(temp_write)
+            except Exception:
+                pass
+
+
+def evaluate_file_pattern(file_pattern):
+    """
+    Evalua una expresion TCL file_pattern sin crear un Write node permanente.
+
+    Lo comun -root.name, el file del topnode, file/split/lrange/join- se
+    evalua en LGA_Write_Presets_tcl, sin tocar el node graph. Solo lo que ese
+    modulo no sabe pasa por un Write temporal que despues se borra.
+
+    Retorna una tupla (evaluated_path, original_extensions) donde:
+    - evaluated_path: el path evaluado o None si hay error
+    - original_extensions: lista de extensiones originales del topnode o lista vacia
+    """
+    if not file_pattern:
+        return None, []
+
+    try:
+        selected_node = None
+        try:
+            selected_node = nuke.selectedNode()
+        except ValueError:
+            pass
+
+        # Las extensiones originales salen del Read de mas arriba
+        topnode_file_path = get_topnode_file_path(selected_node)
         original_extensions = []
         if topnode_file_path:
             original_extensions = extract_original_extension(topnode_file_path)
 
-        # Evaluar el path usando nuke.filename()
-        evaluated_path = nuke.filename(temp_write)
-
-        # Si evaluated_path es None, usar cadena vacia
+        evaluated_path = evaluate_without_nuke(file_pattern, selected_node)
         if evaluated_path is None:
-            evaluated_path = ""
-
-        # Eliminar el Write temporal inmediatamente
-        nuke.delete(temp_write)
+            debug_print("Pattern fuera del subconjunto TCL, se evalua con Nuke")
+            evaluated_path = _evaluate_with_nuke(file_pattern, selected_node)
 
         debug_print(f"File pattern original: {file_pattern}")
         debug_print(f"Path evaluado: {evaluated_path}")
@@ -291,12 +353,6 @@ def evaluate_file_pattern(file_pattern):
         return (evaluated_path if evaluated_path else None, original_extensions)
     except Exception as e:
         debug_print(f"Error al evaluar file_pattern: {e}")
-        # Asegurarse de eliminar el Write temporal incluso si hay error
-        try:
-            if "temp_write" in locals():
-                nuke.delete(temp_write)
-        except:
-            pass
         return None, []
 
 
@@ -434,6 +490,31 @@ def replace_directory_levels(file_pattern, new_level):
     return modified_pattern
 
 
+def _inherited_zone(part, is_final_file=False):
+    """
+    Divide una parte del path en (zona, extension propia). Una extension
+    original que aparece en la zona es heredada; la propia del archivo final
+    -su frame y su extension- no cuenta.
+    """
+    if is_final_file:
+        # Primero un frame propio seguido de extension (como _%04d.exr al
+        # final), y si no hay, solo la extension.
+        own = re.search(r"[._]%0\d+d\.([^.]+)$", part) or re.search(
+            r"\.([^.]+)$", part
+        )
+        if own:
+            return part[: own.start()], part[own.start() :]
+    return part, ""
+
+
+def inherited_extensions(part, original_extensions, is_final_file=False):
+    """Las extensiones originales del topnode que quedaron heredadas en `part`."""
+    if not part or not original_extensions:
+        return []
+    zone = _inherited_zone(part, is_final_file)[0].lower()
+    return [ext for ext in original_extensions if ext.lower() in zone]
+
+
 def mark_original_extension_in_part(part, original_extensions, is_final_file=False):
     """
     Marca en rojo solo la parte específica que contiene extensiones originales heredadas.
@@ -451,73 +532,32 @@ def mark_original_extension_in_part(part, original_extensions, is_final_file=Fal
     if not part or not original_extensions:
         return part
 
-    # Si es el archivo final, verificar si tiene su propia extensión/frame
-    # En ese caso, solo marcar extensiones heredadas que aparezcan ANTES de la extensión propia
-    if is_final_file:
-        # Buscar el último patrón de frame propio seguido de extensión (como _%04d.exr al final)
-        # Esto identifica la extensión propia del archivo final
-        # Buscamos un guion bajo o punto, seguido de %0Xd, seguido de .ext al final
-        own_ext_pattern = re.search(r"[._]%0\d+d\.([^.]+)$", part)
-
-        if own_ext_pattern:
-            # Encontrar donde empieza la extensión propia (el frame pattern antes de la extensión)
-            own_ext_start = own_ext_pattern.start()
-
-            # Solo buscar extensiones heredadas antes de la extensión propia
-            part_before_own = part[:own_ext_start]
-            part_own = part[own_ext_start:]
-
-            # Marcar extensiones heredadas en la parte antes de la extensión propia
-            marked_part = part_before_own
-            for ext in original_extensions:
-                if ext.lower() in part_before_own.lower():
-                    # Encontrar todas las ocurrencias y marcarlas en rojo
-                    pattern = re.escape(ext)
-                    marked_part = re.sub(
-                        pattern,
-                        lambda m: f"<span style='color: #ff0000;'>{m.group(0)}</span>",
-                        marked_part,
-                        flags=re.IGNORECASE,
-                    )
+    # En el archivo final solo se marcan las extensiones heredadas que aparecen
+    # ANTES de la extension propia
+    zone, own = _inherited_zone(part, is_final_file)
+    marked_part = zone
+    for ext in inherited_extensions(part, original_extensions, is_final_file):
+        # Encontrar todas las ocurrencias y marcarlas en rojo
+        marked_part = re.sub(
+            re.escape(ext),
+            lambda m: f"<span style='color: #ff0000;'>{m.group(0)}</span>",
+            marked_part,
+            flags=re.IGNORECASE,
+        )
 
-            # Retornar la parte marcada + la parte propia sin modificar
-            return marked_part + part_own
-        else:
-            # Si no tiene patrón de frame propio, buscar solo extensión al final
-            own_ext_match = re.search(r"\.([^.]+)$", part)
-            if own_ext_match:
-                ext_start = own_ext_match.start()
-                part_before_own = part[:ext_start]
-                part_own = part[ext_start:]
-
-                # Marcar extensiones heredadas en la parte antes de la extensión propia
-                marked_part = part_before_own
-                for ext in original_extensions:
-                    if ext.lower() in part_before_own.lower():
-                        pattern = re.escape(ext)
-                        marked_part = re.sub(
-                            pattern,
-                            lambda m: f"<span style='color: #ff0000;'>{m.group(0)}</span>",
-                            marked_part,
-                            flags=re.IGNORECASE,
-                        )
-
-                return marked_part + part_own
-
-    # Si no es archivo final o no tiene extensión propia, marcar todas las extensiones heredadas
-    marked_part = part
-    for ext in original_extensions:
-        if ext.lower() in part.lower():
-            # Encontrar todas las ocurrencias y marcarlas en rojo
-            pattern = re.escape(ext)
-            marked_part = re.sub(
-                pattern,
-                lambda m: f"<span style='color: #ff0000;'>{m.group(0)}</span>",
-                marked_part,
-                flags=re.IGNORECASE,
-            )
+    # La parte propia va sin modificar
+    return marked_part + own
 
-    return marked_part
+
+def violet_end_index(parts, shot_folder_parts):
+    """
+    Hasta que parte del path coincide con la carpeta del shot: la parte
+    violeta. Si es menor que len(shot_folder_parts), el path sale del shot.
+    """
+    for i in range(min(len(parts) - 1, len(shot_folder_parts))):
+        if parts[i].lower() != shot_folder_parts[i]:
+            return i
+    return len(shot_folder_parts)
 
 
 def split_path_at_violet_end(
@@ -547,20 +587,15 @@ def split_path_at_violet_end(
         original_extensions = []
 
     parts = path.replace("\\", "/").split("/")
-    parts_lower = [part.lower() for part in parts]
 
     # Encontrar donde termina la parte violeta (donde coinciden con shot_folder_parts)
-    violet_end_index = len(shot_folder_parts)
-    for i in range(min(len(parts) - 1, len(shot_folder_parts))):
-        if parts_lower[i] != shot_folder_parts[i]:
-            violet_end_index = i
-            break
+    violet_end = violet_end_index(parts, shot_folder_parts)
 
     # Construir parte violeta hasta donde termina EXACTAMENTE (sin incluir el siguiente directorio)
     # La parte violeta va desde el inicio hasta violet_end_index (sin incluir el siguiente)
-    if violet_end_index < len(parts) - 1:
-        violet_parts = parts[:violet_end_index]
-        rest_parts = parts[violet_end_index:]
+    if violet_end < len(parts) - 1:
+        violet_parts = parts[:violet_end]
+        rest_parts = parts[violet_end:]
     else:
         # Si toda la parte violeta incluye todo hasta el archivo, no hay resto
         violet_parts = parts
@@ -1424,9 +1459,7 @@ Verifica que el Write esté conectado correctamente y que el pattern TCL sea vá
                 )
             self.original_label.setText(tcl_display)
 
-        # Programar actualizacion de paths (con debounce)
-        self.update_timer.stop()
-        self.update_timer.start(200)  # Esperar 200ms antes de actualizar
+        self.schedule_update_paths()
 
     def set_index_value(self, new_value):
         """Establece el nuevo valor del indice y actualiza todo."""
@@ -1523,9 +1556,19 @@ Verifica que el Write esté conectado correctamente y que el pattern TCL sea vá
                 )
             self.original_label.setText(tcl_display)
 
-        # Programar actualizacion de paths (con debounce)
+        self.schedule_update_paths()
+
+    def schedule_update_paths(self):
+        """
+        Actualiza el path final. Si lo evalua LGA_Write_Presets_tcl sale en el
+        momento; si hace falta el Write temporal, se espera a que se dejen de
+        apretar las flechas para no crear un nodo por click.
+        """
         self.update_timer.stop()
-        self.update_timer.start(200)  # Esperar 200ms antes de actualizar
+        if evaluate_without_nuke(self.current_file_pattern) is not None:
+            self.update_paths()
+        else:
+            self.update_timer.start(200)  # Esperar 200ms antes de actualizar
 
     def update_paths(self):
         """Actualiza el path final normalizado basado en el file_pattern actual."""
@@ -0,0 +1,357 @@
+"""
+_____________________________________________________________________________
+
+  LGA_Write_Presets_tcl v2.77 | Lega
+
+  Evalua sin Nuke el TCL de los file_pattern de LGA_Write_Presets.ini.
+
+  Para mostrar el path final, LGA_Write_Presets_Check creaba un Write
+  temporal, lo conectaba, le cargaba el pattern, le pedia
+  nuke.filename y lo borraba. Cada +/- de Naming Segments o Folder Up
+  Levels era un nodo creado y borrado: el node graph se movia y el undo
+  se llenaba. Los presets usan muy poco TCL -file dirname, tail y
+  rootname, split, lrange y join sobre root.name o el file del
+  topnode-, y eso se evalua aca en microsegundos.
+
+  Lo que no esta en ese subconjunto no se adivina: evaluate tira
+  Unsupported y quien llama vuelve al Write temporal. Tampoco se evalua
+  un path que tenga su propio TCL, un $ o una barra invertida.
+
+  Los resultados se recuerdan por pattern y contexto: volver a un
+  indice que ya se vio no evalua nada.
+
+  No importa Qt ni Nuke a proposito.
+
+  v2.77: Modulo nuevo.
+_____________________________________________________________________________
+"""
+
+import threading
+
+
+# Cuantos resultados se recuerdan. Pasado, se empieza de cero: en una sesion
+# se ven unas decenas de patterns.
+CACHE_MAX = 512
+
+_WHITESPACE = " \t\r\n"
+
+
+class Unsupported(ValueError):
+    """El pattern usa algo que este evaluador no sabe: lo evalua Nuke."""
+
+
+class _TclList(list):
+    """El resultado de split o lrange: una lista, no un texto."""
+
+
+# ---------------------------------------------------------------------------
+#                                   Listas
+# ---------------------------------------------------------------------------
+
+
+def _list_element(text):
+    """Un elemento como lo escribe TCL al pasar una lista a texto."""
+    if text == "":
+        return "{}"
+    if any(c in text for c in _WHITESPACE + '{}[]$;"\\'):
+        if "{" in text or "}" in text or "\\" in text:
+            raise Unsupported("list element %r" % text)
+        return "{%s}" % text
+    return text
+
+
+def _as_text(value):
+    if isinstance(value, _TclList):
+        return " ".join(_list_element(item) for item in value)
+    return value
+
+
+def _as_list(value):
+    if isinstance(value, _TclList):
+        return value
+    if any(c in value for c in '{}"\\'):
+        # Una lista con llaves o comillas necesita el parser de listas de TCL
+        raise Unsupported("list %r" % value)
+    return _TclList(value.split())
+
+
+def _index(text, length):
+    """Un indice de lrange/lindex: un numero, end o end-N."""
+    text = text.strip()
+    if text == "end":
+        return length - 1
+    if text.startswith("end-"):
+        return length - 1 - int(text[4:])
+    try:
+        return int(text)
+    except ValueError:
+        raise Unsupported("index %r" % text)
+
+
+# ---------------------------------------------------------------------------
+#                                  Comandos
+# ---------------------------------------------------------------------------
+
+
+def _file_dirname(path):
+    # Como TCL: sin barra es ".", y la raiz sigue siendo la raiz.
+    stripped = path.rstrip("/")
+    if not stripped:
+        return "/" if path else "."
+    cut = stripped.rfind("/")
+    if cut < 0:
+        return "."
+    head = stripped[:cut].rstrip("/")
+    if not head:
+        return "/"
+    if len(head) == 2 and head[1] == ":":
+        return head + "/"
+    return head
+
+
+def _file_tail(path):
+    stripped = path.rstrip("/")
+    return stripped[stripped.rfind("/") + 1 :]
+
+
+def _file_rootname(path):
+    dot = path.rfind(".")
+    if dot < 0 or dot < path.rfind("/"):
+        return path
+    return path[:dot]
+
+
+def _file_extension(path):
+    rootname = _file_rootname(path)
+    return path[len(rootname) :]
+
+
+_FILE_COMMANDS = {
+    "dirname": _file_dirname,
+    # TCL acepta el subcomando abreviado si no es ambiguo, y los presets
+    # escriben "file dir".
+    "dir": _file_dirname,
+    "tail": _file_tail,
+    "rootname": _file_rootname,
+    "extension": _file_extension,
+}
+
+
+def _cmd_file(args, context):
+    if len(args) != 2 or _as_text(args[0]) not in _FILE_COMMANDS:
+        raise Unsupported("file %s" % " ".join(_as_text(a) for a in args))
+    return _FILE_COMMANDS[_as_text(args[0])](_as_text(args[1]))
+
+
+def _cmd_split(args, context):
+    if len(args) not in (1, 2):
+        raise Unsupported("split")
+    text = _as_text(args[0])
+    chars = _as_text(args[1]) if len(args) == 2 else _WHITESPACE
+    if chars == "":
+        return _TclList(text)
+    parts = []
+    start = 0
+    for position, char in enumerate(text):
+        if char in chars:
+            parts.append(text[start:position])
+            start = position + 1
+    parts.append(text[start:])
+    return _TclList(parts)
+
+
+def _cmd_lrange(args, context):
+    if len(args) != 3:
+        raise Unsupported("lrange")
+    items = _as_list(args[0])
+    first = max(0, _index(_as_text(args[1]), len(items)))
+    last = _index(_as_text(args[2]), len(items))
+    return _TclList(items[first : last + 1])
+
+
+def _cmd_lindex(args, context):
+    if len(args) != 2:
+        raise Unsupported("lindex")
+    items = _as_list(args[0])
+    index = _index(_as_text(args[1]), len(items))
+    return items[index] if 0 <= index < len(items) else ""
+
+
+def _cmd_join(args, context):
+    if len(args) not in (1, 2):
+        raise Unsupported("join")
+    separator = _as_text(args[1]) if len(args) == 2 else " "
+    return separator.join(_as_list(args[0]))
+
+
+def _cmd_string(args, context):
+    if len(args) == 2 and _as_text(args[0]) == "tolower":
+        return _as_text(args[1]).lower()
+    if len(args) == 2 and _as_text(args[0]) == "toupper":
+        return _as_text(args[1]).upper()
+    raise Unsupported("string")
+
+
+def _cmd_value(args, context):
+    if len(args) != 1:
+        raise Unsupported("value")
+    reference = _as_text(args[0])
+    value = context["knobs"].get(reference)
+    if value is None:
+        raise Unsupported("knob %s" % reference)
+    return value
+
+
+def _cmd_topnode(args, context):
+    if args or not context.get("topnode"):
+        raise Unsupported("topnode")
+    return context["topnode"]
+
+
+_COMMANDS = {
+    "file": _cmd_file,
+    "split": _cmd_split,
+    "lrange": _cmd_lrange,
+    "lindex": _cmd_lindex,
+    "join": _cmd_join,
+    "string": _cmd_string,
+    # Con los knobs que se dan aca -root.name y el file de un Read sin
+    # expresiones- value y knob devuelven lo mismo.
+    "value": _cmd_value,
+    "knob": _cmd_value,
+    "topnode": _cmd_topnode,
+}
+
+
+# ---------------------------------------------------------------------------
+#                                   Parser
+# ---------------------------------------------------------------------------
+
+
+def _command(text, position, context):
+    """
+    Evalua el comando que empieza despues de un "[" y devuelve (valor,
+    posicion despues del "]").
+    """
+    words = []
+    while True:
+        while position < len(text) and text[position] in _WHITESPACE:
+            position += 1
+        if position >= len(text):
+            raise Unsupported("unclosed [")
+        if text[position] == "]":
+            break
+        word, position = _word(text, position, context)
+        words.append(word)
+    if not words:
+        raise Unsupported("empty command")
+    name = _as_text(words[0])
+    handler = _COMMANDS.get(name)
+    if handler is None:
+        raise Unsupported("command %s" % name)
+    return handler(words[1:], context), position + 1
+
+
+def _word(text, position, context):
+    """Una palabra de un comando: {literal} o texto con [sustituciones]."""
+    if text[position] == "{":
+        depth = 0
+        for end in range(position, len(text)):
+            if text[end] == "{":
+                depth += 1
+            elif text[end] == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[position + 1 : end], end + 1
+        raise Unsupported("unclosed {")
+    if text[position] == '"':
+        raise Unsupported("quoted word")
+    parts = []
+    while position < len(text):
+        char = text[position]
+        if char in _WHITESPACE or char == "]":
+            break
+        if char == "[":
+            value, position = _command(text, position + 1, context)
+            parts.append(value)
+            continue
+        if char in "$\\;{}":
+            raise Unsupported("character %r" % char)
+        start = position
+        while position < len(text) and text[position] not in _WHITESPACE + "[]$\\;{}":
+            position += 1
+        parts.append(text[start:position])
+    if len(parts) == 1:
+        # Una sustitucion sola conserva la lista: [lrange [split ...] 0 2]
+        return parts[0], position
+    return "".join(_as_text(part) for part in parts), position
+
+
+def evaluate(pattern, knobs, topnode=None):
+    """
+    El pattern evaluado. `knobs` es {referencia: valor} -"root.name" y, si
+    hay topnode, "<topnode>.file"-; `topnode` es el nombre que devuelve
+    [topnode]. Tira Unsupported si el pattern usa algo que no esta aca.
+
+    Fuera de los corchetes el texto va tal cual, espacios incluidos: es lo
+    que hace Nuke con un knob file.
+    """
+    context = {"knobs": knobs, "topnode": topnode}
+    parts = []
+    position = 0
+    while position < len(pattern):
+        bracket = pattern.find("[", position)
+        literal = pattern[position:] if bracket < 0 else pattern[position:bracket]
+        if "]" in literal or "$" in literal or "\\" in literal:
+            raise Unsupported("literal %r" % literal)
+        parts.append(literal)
+        if bracket < 0:
+            break
+        value, position = _command(pattern, bracket + 1, context)
+        parts.append(_as_text(value))
+    return "".join(parts)
+
+
+# {(pattern, knobs, topnode): path o None}. None es "no se pudo": tambien se
+# recuerda, asi el siguiente +/- va directo a Nuke sin volver a intentar.
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _plain(value):
+    return value and not any(c in value for c in "[]$\\")
+
+
+def evaluate_cached(pattern, script_path, topnode=None, topnode_file=None):
+    """
+    evaluate con cache, para el caso de los presets: root.name es el script y
+    el topnode, si hay, es un nodo con un file sin expresiones.
+
+    Devuelve el path o None si lo tiene que evaluar Nuke.
+    """
+    if not _plain(script_path) or script_path == "Root":
+        return None
+    knobs = {"root.name": script_path}
+    if topnode:
+        if topnode_file is not None and not _plain(topnode_file):
+            topnode, topnode_file = None, None
+        elif topnode_file is not None:
+            knobs["%s.file" % topnode] = topnode_file
+    key = (pattern, script_path, topnode, topnode_file)
+    with _cache_lock:
+        if key in _cache:
+            return _cache[key]
+    try:
+        result = evaluate(pattern, knobs, topnode)
+    except (Unsupported, ValueError, IndexError):
+        result = None
+    with _cache_lock:
+        if len(_cache) >= CACHE_MAX:
+            _cache.clear()
+        _cache[key] = result
+    return result
@@ -1,9 +1,17 @@
 """
 _______________________________________________________________________________________________________________
 
-  LGA_Write_RenderComplete v1.35 | Lega
+  LGA_Write_RenderComplete v1.39 | Lega
   Calcula la duracion al finalizar el render y la agrega en un knob en el tab User del nodo write
   Reproduce un sonido y envia un correo con los detalles del render si la opcion 'Send Mail' esta activada
+
+  v1.36: El correo ya no se manda dentro del afterRender: se encola en la bandeja de
+         LGA_Write_RenderComplete_outbox y lo manda un hilo, juntando los renders que terminan juntos.
+  v1.37: Mide cada frame con before/afterFrameRender, deja las estadisticas en el knob render_stats
+         y agrega cada render al historial de LGA_Write_RenderComplete_stats.
+  v1.38: El .dat se lee y escribe con LGA_ToolPack_ConfigStore: un render ya no lo parsea tres veces.
+  v1.39: Los Writes con el knob SKIP_KNOB -el de captura de LGA_viewer_SnapShot- no suenan, no suman
+         knobs ni entran al historial.
 _______________________________________________________________________________________________________________
 
 """
@@ -24,12 +32,15 @@ except ImportError:
     except ImportError:
         QSound = None
 
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+import atexit
 import base64
 import binascii
-import platform
+import time
+
+import LGA_ToolPack_ConfigStore as config_store
+
+from LGA_Write_RenderComplete_outbox import MailOutbox
+import LGA_Write_RenderComplete_stats as render_stats
 
 # Variable global para controlar el debug
 DEBUG = False  # Poner en False para desactivar los mensajes de debug
@@ -66,27 +77,8 @@ def play_sound(sound_file_path):
 
 
 def get_user_config_dir():
-    """
-    Obtiene el directorio de configuracion del usuario segun el sistema operativo.
-    Windows: %APPDATA%
-    Mac: ~/Library/Application Support
-    """
-    system = platform.system()
-    if system == "Windows":
-        config_path = os.getenv("APPDATA")
-        if not config_path:
-            debug_print("Error: No se pudo encontrar la variable de entorno APPDATA.")
-            return None
-    elif system == "Darwin":  # macOS
-        config_path = os.path.expanduser("~/Library/Application Support")
-    else:
-        # Para otros sistemas, usar el directorio home como fallback
-        config_path = os.path.expanduser("~/.config")
-        debug_print(
-            f"Sistema no reconocido ({system}), usando ~/.config como fallback."
-        )
-
-    return config_path
+    """Directorio de configuracion del usuario: ver LGA_ToolPack_ConfigStore."""
+    return config_store.get_user_config_dir()
 
 
 # --- Configuración de archivo DAT para settings de mail ---
@@ -97,6 +89,11 @@ CONFIG_TO_KEY = "to_email"
 CONFIG_WAV_KEY = "sound_wav_path"  # Nueva clave para referencia
 CONFIG_SOUND_ENABLED_KEY = "sound_enabled"  # Nuevo setting para ON/OFF
 CONFIG_RENDER_TIME_ENABLED_KEY = "render_time_enabled"  # Nuevo setting para ON/OFF
+# Carpeta de la bandeja de salida, al lado del .dat
+OUTBOX_DIR_NAME = "RenderComplete_outbox"
+# Segundos que un render por linea de comandos espera al salir a que salgan sus mails.
+# Lo que no salga queda en la bandeja para la proxima sesion.
+EXIT_FLUSH_SECONDS = 15
 # Exportar constantes para uso externo
 __all__ = [
     "get_config_path",
@@ -118,17 +115,18 @@ __all__ = [
 ]
 
 
+# Una linea del .dat por setting, cada una en base64, en este orden
+MAIL_LINES = 3
+WAV_LINE = 3
+SOUND_ENABLED_LINE = 4
+RENDER_TIME_ENABLED_LINE = 5
+
+_EMPTY_ENCODED = base64.b64encode(b"").decode("utf-8")
+
+
 def get_config_path():
     """Devuelve la ruta completa al archivo de configuración de mail (.dat)."""
-    try:
-        user_config_dir = get_user_config_dir()
-        if not user_config_dir:
-            return None
-        config_dir = os.path.join(user_config_dir, "LGA", "ToolPack")
-        return os.path.join(config_dir, CONFIG_FILE_NAME)
-    except Exception as e:
-        debug_print(f"Error al obtener la ruta de configuración: {e}")
-        return None
+    return config_store.get_config_path(CONFIG_FILE_NAME)
 
 
 def ensure_config_exists():
@@ -137,69 +135,67 @@ def ensure_config_exists():
     Si no existen, los crea con valores vacíos codificados.
     """
     config_file_path = get_config_path()
-    if not config_file_path:
+    if not config_file_path or os.path.exists(config_file_path):
         return
-    config_dir = os.path.dirname(config_file_path)
     try:
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
-            debug_print(f"Directorio de configuración creado: {config_dir}")
-        if not os.path.exists(config_file_path):
-            # Crear archivo .dat con lineas vacias codificadas
-            empty_encoded = base64.b64encode("".encode("utf-8")).decode("utf-8")
-            with open(config_file_path, "w", encoding="utf-8") as configfile:
-                configfile.write(f"{empty_encoded}\\n")  # From Email
-                configfile.write(f"{empty_encoded}\\n")  # Password
-                configfile.write(f"{empty_encoded}\\n")  # To Email
-            debug_print(
-                f"Archivo de configuración de mail creado: {config_file_path}. Complételo usando LGA_ToolPack_settings."
-            )
+        config_store.write_lines(config_file_path, [_EMPTY_ENCODED] * MAIL_LINES)
+        debug_print(
+            f"Archivo de configuración de mail creado: {config_file_path}. Complételo usando LGA_ToolPack_settings."
+        )
     except Exception as e:
         debug_print(f"Error al asegurar la configuración de mail: {e}")
 
 
-def get_mail_settings_from_config():
+def _read_config_line(index):
     """
-    Lee los datos de mail desde el archivo .dat codificado.
-    Devuelve (from_email, from_password, to_email) decodificados o (None, None, None).
+    La linea `index` del .dat decodificada, o None si el archivo no existe o
+    todavia no tiene esa linea. Tira binascii.Error o UnicodeDecodeError si
+    la linea esta rota.
     """
     config_file_path = get_config_path()
-    if not config_file_path or not os.path.exists(config_file_path):
-        debug_print(
-            f"Archivo de configuración de mail (.dat) no encontrado: {config_file_path}"
-        )
-        return None, None, None
+    if not config_file_path:
+        return None
+    lines = config_store.read_lines(config_file_path)
+    if len(lines) <= index:
+        return None
+    return base64.b64decode(lines[index]).decode("utf-8")
+
+
+def _save_config_lines(first_index, values):
+    """
+    Guarda `values` codificados desde la linea `first_index`, completando con
+    lineas vacias las que falten antes. Devuelve True si se pudo.
+    """
+    config_file_path = get_config_path()
+    if not config_file_path:
+        debug_print("No se pudo obtener la ruta del archivo de configuración de mail.")
+        return False
     try:
-        with open(config_file_path, "r", encoding="utf-8") as configfile:
-            lines = configfile.readlines()
+        lines = list(config_store.read_lines(config_file_path))
+        while len(lines) < first_index:
+            lines.append(_EMPTY_ENCODED)
+        for offset, value in enumerate(values):
+            encoded = base64.b64encode(value.encode("utf-8")).decode("utf-8")
+            if first_index + offset < len(lines):
+                lines[first_index + offset] = encoded
+            else:
+                lines.append(encoded)
+        config_store.write_lines(config_file_path, lines)
+        return True
+    except Exception as e:
+        debug_print(f"Error al guardar la configuración de mail codificada: {e}")
+        return False
 
-        if len(lines) < 3:
-            debug_print(
-                f"Archivo de configuración de mail {config_file_path} está incompleto o corrupto."
-            )
-            return None, None, None
-
-        # Decodificar cada linea
-        from_email_encoded = lines[0].strip()
-        from_password_encoded = lines[1].strip()
-        to_email_encoded = lines[2].strip()
-
-        from_email = base64.b64decode(from_email_encoded).decode("utf-8")
-        from_password = base64.b64decode(from_password_encoded).decode("utf-8")
-        to_email = base64.b64decode(to_email_encoded).decode("utf-8")
-
-        if from_email and from_password and to_email:
-            return from_email, from_password, to_email
-        else:
-            debug_print(
-                f"Uno o más datos de mail en {config_file_path} están vacíos (después de decodificar)."
-            )
-            return None, None, None
 
+def get_mail_settings_from_config():
+    """
+    Lee los datos de mail desde el archivo .dat codificado.
+    Devuelve (from_email, from_password, to_email) decodificados o (None, None, None).
+    """
+    try:
+        values = [_read_config_line(index) for index in range(MAIL_LINES)]
     except (binascii.Error, UnicodeDecodeError) as e:  # Usar binascii.Error
-        debug_print(
-            f"Error al decodificar el archivo de configuración de mail {config_file_path}: {e}"
-        )
+        debug_print(f"Error al decodificar el archivo de configuración de mail: {e}")
         return None, None, None
     except Exception as e:
         debug_print(
@@ -207,62 +203,33 @@ def get_mail_settings_from_config():
         )
         return None, None, None
 
+    if all(values):
+        return tuple(values)
+    debug_print(
+        f"Datos de mail incompletos o vacíos en {get_config_path()} (después de decodificar)."
+    )
+    return None, None, None
+
 
 def save_mail_settings_to_config(from_email, from_password, to_email):
     """
     Guarda los datos de mail codificados en base64 en el archivo .dat.
     """
-    config_file_path = get_config_path()
-    if not config_file_path:
-        debug_print("No se pudo obtener la ruta del archivo de configuración de mail.")
-        return False
-    try:
-        # Codificar los valores
-        from_email_encoded = base64.b64encode(from_email.encode("utf-8")).decode(
-            "utf-8"
-        )
-        password_encoded = base64.b64encode(from_password.encode("utf-8")).decode(
-            "utf-8"
-        )
-        to_email_encoded = base64.b64encode(to_email.encode("utf-8")).decode("utf-8")
-
-        # Escribir las lineas codificadas usando writelines
-        lines_to_write = [
-            f"{from_email_encoded}\n",
-            f"{password_encoded}\n",
-            f"{to_email_encoded}\n",
-        ]
-        with open(config_file_path, "w", encoding="utf-8") as configfile:
-            configfile.writelines(lines_to_write)
-
-        debug_print("Configuración de mail guardada de forma segura (writelines).")
-        return True
-    except Exception as e:
-        debug_print(f"Error al guardar la configuración de mail codificada: {e}")
-        return False
+    saved = _save_config_lines(0, [from_email, from_password, to_email])
+    if saved:
+        debug_print("Configuración de mail guardada de forma segura.")
+    return saved
 
 
 def get_wav_path_from_config():
     """
     Lee la ruta del wav desde el archivo .dat codificado. Si no existe, devuelve la ruta por defecto (en la carpeta del script).
     """
-    config_file_path = get_config_path()
     default_wav_path = os.path.join(
         os.path.dirname(__file__), "LGA_Write_RenderComplete.wav"
     )
-    if not config_file_path or not os.path.exists(config_file_path):
-        return default_wav_path
     try:
-        with open(config_file_path, "r", encoding="utf-8") as configfile:
-            lines = configfile.readlines()
-        if len(lines) < 4:
-            # No hay setting guardado, usar default
-            return default_wav_path
-        wav_path_encoded = lines[3].strip()
-        wav_path = base64.b64decode(wav_path_encoded).decode("utf-8")
-        if wav_path:
-            return wav_path
-        return default_wav_path
+        return _read_config_line(WAV_LINE) or default_wav_path
     except Exception as e:
         debug_print(f"Error al leer la ruta del wav: {e}")
         return default_wav_path
@@ -273,160 +240,74 @@ def save_wav_path_to_config(wav_path):
     Guarda la ruta del wav codificada en base64 en el archivo .dat (cuarta línea).
     Si el archivo no existe, lo crea con los otros campos vacíos.
     """
-    config_file_path = get_config_path()
-    if not config_file_path:
-        debug_print(
-            "No se pudo obtener la ruta del archivo de configuración de mail para guardar wav."
-        )
-        return False
-    try:
-        # Leer las líneas existentes (o crear vacías si no existen)
-        if os.path.exists(config_file_path):
-            with open(config_file_path, "r", encoding="utf-8") as configfile:
-                lines = configfile.readlines()
-        else:
-            empty_encoded = base64.b64encode("".encode("utf-8")).decode("utf-8")
-            lines = [f"{empty_encoded}\n" for _ in range(3)]
-        # Asegurar que hay al menos 3 líneas para mail
-        while len(lines) < 3:
-            empty_encoded = base64.b64encode("".encode("utf-8")).decode("utf-8")
-            lines.append(f"{empty_encoded}\n")
-        # Codificar la ruta del wav
-        wav_path_encoded = base64.b64encode(wav_path.encode("utf-8")).decode("utf-8")
-        if len(lines) >= 4:
-            lines[3] = f"{wav_path_encoded}\n"
-        else:
-            lines.append(f"{wav_path_encoded}\n")
-        with open(config_file_path, "w", encoding="utf-8") as configfile:
-            configfile.writelines(lines)
+    saved = _save_config_lines(WAV_LINE, [wav_path])
+    if saved:
         debug_print(f"Ruta del wav guardada en config: {wav_path}")
-        return True
+    return saved
+
+
+def _read_enabled(index, label):
+    # ON/OFF en base64. Por defecto ON si no existe.
+    try:
+        value = _read_config_line(index)
     except Exception as e:
-        debug_print(f"Error al guardar la ruta del wav: {e}")
-        return False
+        debug_print(f"Error al leer el setting de {label}: {e}")
+        return True
+    return value is None or value.upper() == "ON"
 
 
 def get_sound_enabled_from_config():
     """
     Lee el setting de sonido habilitado desde el archivo .dat (quinta línea, ON/OFF, base64). Por defecto ON si no existe.
     """
-    config_file_path = get_config_path()
-    if not config_file_path or not os.path.exists(config_file_path):
-        return True  # Por defecto ON
-    try:
-        with open(config_file_path, "r", encoding="utf-8") as configfile:
-            lines = configfile.readlines()
-        if len(lines) < 5:
-            return True  # Por defecto ON
-        enabled_encoded = lines[4].strip()
-        enabled_str = base64.b64decode(enabled_encoded).decode("utf-8")
-        return enabled_str.upper() == "ON"
-    except Exception as e:
-        debug_print(f"Error al leer el setting de sonido: {e}")
-        return True
+    return _read_enabled(SOUND_ENABLED_LINE, "sonido")
 
 
 def save_sound_enabled_to_config(enabled):
     """
     Guarda el setting de sonido habilitado (ON/OFF, base64) en la quinta línea del .dat.
     """
-    config_file_path = get_config_path()
-    if not config_file_path:
-        debug_print(
-            "No se pudo obtener la ruta del archivo de configuración para guardar sound_enabled."
-        )
-        return False
-    try:
-        # Leer las líneas existentes (o crear vacías si no existen)
-        if os.path.exists(config_file_path):
-            with open(config_file_path, "r", encoding="utf-8") as configfile:
-                lines = configfile.readlines()
-        else:
-            empty_encoded = base64.b64encode("".encode("utf-8")).decode("utf-8")
-            lines = [f"{empty_encoded}\n" for _ in range(4)]
-        # Asegurar que hay al menos 4 líneas para los otros settings
-        while len(lines) < 4:
-            empty_encoded = base64.b64encode("".encode("utf-8")).decode("utf-8")
-            lines.append(f"{empty_encoded}\n")
-        # Codificar el valor ON/OFF
-        value = "ON" if enabled else "OFF"
-        value_encoded = base64.b64encode(value.encode("utf-8")).decode("utf-8")
-        if len(lines) >= 5:
-            lines[4] = f"{value_encoded}\n"
-        else:
-            lines.append(f"{value_encoded}\n")
-        with open(config_file_path, "w", encoding="utf-8") as configfile:
-            configfile.writelines(lines)
+    value = "ON" if enabled else "OFF"
+    saved = _save_config_lines(SOUND_ENABLED_LINE, [value])
+    if saved:
         debug_print(f"Sound enabled guardado en config: {value}")
-        return True
-    except Exception as e:
-        debug_print(f"Error al guardar el setting de sonido: {e}")
-        return False
+    return saved
 
 
 def get_render_time_enabled_from_config():
     """
     Lee el setting de render time habilitado desde el archivo .dat (sexta línea, ON/OFF, base64). Por defecto ON si no existe.
     """
-    config_file_path = get_config_path()
-    if not config_file_path or not os.path.exists(config_file_path):
-        return True  # Por defecto ON
-    try:
-        with open(config_file_path, "r", encoding="utf-8") as configfile:
-            lines = configfile.readlines()
-        if len(lines) < 6:
-            return True  # Por defecto ON
-        enabled_encoded = lines[5].strip()
-        enabled_str = base64.b64decode(enabled_encoded).decode("utf-8")
-        return enabled_str.upper() == "ON"
-    except Exception as e:
-        debug_print(f"Error al leer el setting de render time: {e}")
-        return True
+    return _read_enabled(RENDER_TIME_ENABLED_LINE, "render time")
 
 
 def save_render_time_enabled_to_config(enabled):
     """
     Guarda el setting de render time habilitado (ON/OFF, base64) en la sexta línea del .dat.
     """
-    config_file_path = get_config_path()
-    if not config_file_path:
-        debug_print(
-            "No se pudo obtener la ruta del archivo de configuración para guardar render_time_enabled."
-        )
-        return False
-    try:
-        # Leer las líneas existentes (o crear vacías si no existen)
-        if os.path.exists(config_file_path):
-            with open(config_file_path, "r", encoding="utf-8") as configfile:
-                lines = configfile.readlines()
-        else:
-            empty_encoded = base64.b64encode("".encode("utf-8")).decode("utf-8")
-            lines = [f"{empty_encoded}\n" for _ in range(5)]
-        # Asegurar que hay al menos 5 líneas para los otros settings
-        while len(lines) < 5:
-            empty_encoded = base64.b64encode("".encode("utf-8")).decode("utf-8")
-            lines.append(f"{empty_encoded}\n")
-        # Codificar el valor ON/OFF
-        value = "ON" if enabled else "OFF"
-        value_encoded = base64.b64encode(value.encode("utf-8")).decode("utf-8")
-        if len(lines) >= 6:
-            lines[5] = f"{value_encoded}\n"
-        else:
-            lines.append(f"{value_encoded}\n")
-        with open(config_file_path, "w", encoding="utf-8") as configfile:
-            configfile.writelines(lines)
+    value = "ON" if enabled else "OFF"
+    saved = _save_config_lines(RENDER_TIME_ENABLED_LINE, [value])
+    if saved:
         debug_print(f"Render time enabled guardado en config: {value}")
-        return True
-    except Exception as e:
-        debug_print(f"Error al guardar el setting de render time: {e}")
-        return False
+    return saved
 
 
 # Asegurarse de que el archivo de configuración existe al iniciar
 ensure_config_exists()
 
 
+# Un Write con este knob no es un render del usuario: el snapshot del viewer,
+# por ejemplo. Los callbacks lo ignoran.
+SKIP_KNOB = "lga_render_complete_skip"
+
+
+def _skipped():
+    return nuke.thisNode().knob(SKIP_KNOB) is not None
+
+
 def start_time():
+    if _skipped():
+        return
     knob = nuke.root().knob("Km_Render_Start_Time")
     if not knob:
         nuke.root().addKnob(nuke.EvalString_Knob("Km_Render_Start_Time"))
@@ -451,7 +332,28 @@ def total_time():
     return f"{int(hours):02}:{int(minutes):02}:{int(seconds):02}"
 
 
+_outbox = None
+
+
+def get_outbox():
+    """La bandeja de salida de los mails, o None si no hay carpeta de configuracion."""
+    global _outbox
+    if _outbox is None:
+        config_dir = config_store.get_config_dir()
+        if not config_dir:
+            return None
+        _outbox = MailOutbox(
+            os.path.join(config_dir, OUTBOX_DIR_NAME),
+            get_mail_settings_from_config,
+        )
+    return _outbox
+
+
 def send_email(subject, body, to_email=None):
+    """
+    Encola el correo y vuelve enseguida: lo manda el hilo de la bandeja, sin
+    frenar el afterRender.
+    """
     from_email, password, default_to_email = get_mail_settings_from_config()
     if not from_email or not password or not default_to_email:
         config_path = get_config_path() or "LGA/ToolPack/RenderComplete.dat"
@@ -461,20 +363,28 @@ def send_email(subject, body, to_email=None):
         return
     if to_email is None:
         to_email = default_to_email
-    msg = MIMEMultipart()
-    msg["From"] = from_email
-    msg["To"] = to_email
-    msg["Subject"] = subject
-    msg.attach(MIMEText(body, "plain"))
+    outbox = get_outbox()
+    if outbox is None:
+        debug_print("No hay carpeta de configuración para la bandeja de mails.")
+        return
     try:
-        server = smtplib.SMTP("smtp.office365.com", 587)
-        server.starttls()
-        server.login(from_email, password)
-        server.sendmail(from_email, to_email, msg.as_string())
-        server.close()
-        debug_print("Correo enviado exitosamente.")
+        outbox.enqueue(subject, body, to_email)
+        debug_print("Correo encolado.")
     except Exception as e:
-        debug_print(f"Error al enviar correo: {e}")
+        debug_print(f"Error al encolar correo: {e}")
+
+
+def resume_outbox():
+    """
+    Al cargar el modulo: manda lo que haya quedado en la bandeja. En un render por
+    linea de comandos, ademas, intenta mandar lo pendiente antes de salir.
+    """
+    outbox = get_outbox()
+    if outbox is None:
+        return
+    outbox.resume()
+    if not nuke.env.get("gui"):
+        atexit.register(outbox.flush, EXIT_FLUSH_SECONDS)
 
 
 def add_render_time_knob(write_node, render_time):
@@ -484,7 +394,80 @@ def add_render_time_knob(write_node, render_time):
     write_node["render_time"].setValue(render_time)
 
 
+def add_render_stats_knob(write_node, stats_text):
+    if not write_node.knobs().get("render_stats"):
+        render_stats_knob = nuke.String_Knob("render_stats", "Render Stats")
+        write_node.addKnob(render_stats_knob)
+    write_node["render_stats"].setValue(stats_text)
+
+
+# {fullName del Write: {"started": t, "open": {frame: t}, "frames": [(frame, segundos)]}}
+# Se mide por Write: un Render All corre varios a la vez.
+_frame_times = {}
+
+
+def start_frame_stats():
+    if _skipped():
+        return
+    _frame_times[nuke.thisNode().fullName()] = {
+        "started": time.perf_counter(),
+        "open": {},
+        "frames": [],
+    }
+
+
+def frame_start():
+    entry = _frame_times.get(nuke.thisNode().fullName())
+    if entry is not None:
+        entry["open"][nuke.frame()] = time.perf_counter()
+
+
+def frame_end():
+    entry = _frame_times.get(nuke.thisNode().fullName())
+    if entry is None:
+        return
+    frame = nuke.frame()
+    started = entry["open"].pop(frame, None)
+    if started is not None:
+        entry["frames"].append((frame, time.perf_counter() - started))
+
+
+def get_history_path():
+    return config_store.get_config_path(render_stats.HISTORY_FILE_NAME)
+
+
+def finish_frame_stats(write_node, render_file):
+    """
+    Cierra la medicion del Write: devuelve las estadisticas, o None si no hubo
+    frames medidos, y agrega el render al historial.
+    """
+    entry = _frame_times.pop(write_node.fullName(), None)
+    if entry is None:
+        return None
+    stats = render_stats.frame_stats(
+        entry["frames"], time.perf_counter() - entry["started"]
+    )
+    history_path = get_history_path()
+    if stats and history_path:
+        try:
+            render_stats.append_history(
+                history_path,
+                render_stats.history_record(
+                    stats,
+                    nuke.root().name(),
+                    write_node.fullName(),
+                    render_file,
+                    datetime.datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+        except Exception as e:
+            debug_print(f"Error al guardar el historial de render: {e}")
+    return stats
+
+
 def Render_Complete():
+    if _skipped():
+        return
     render_time = total_time()
 
     # Reproducir el sonido solo si el setting está en ON
@@ -498,9 +481,21 @@ def Render_Complete():
     if "send_mail" in write_node.knobs():
         send_mail_state = write_node["send_mail"].value()
 
+    file_knob = write_node.knob("file")
+    # Usar nuke.filename(write_node) si es posible, sino fallback a file_knob.value()
+    try:
+        render_file = nuke.filename(write_node) if file_knob else ""
+    except Exception:
+        render_file = file_knob.value() if file_knob else ""
+
+    stats = finish_frame_stats(write_node, render_file)
+    stats_text = render_stats.format_stats(stats) if stats else ""
+
     # Agregar o actualizar el knob con el tiempo de render solo si el setting está en ON
     if get_render_time_enabled_from_config():
         add_render_time_knob(write_node, render_time)
+        if stats_text:
+            add_render_stats_knob(write_node, stats_text)
 
     if send_mail_state:
         # Obtener el destinatario del correo electronico de las variables de entorno
@@ -508,19 +503,14 @@ def Render_Complete():
 
         # Formatear el cuerpo del correo
         script_name = os.path.basename(nuke.root().name())
-        file_knob = write_node.knob("file")
         render_directory = os.path.dirname(file_knob.value()) if file_knob else ""
-        # Usar nuke.filename(write_node) si es posible, sino fallback a file_knob.value()
-        try:
-            render_file = nuke.filename(write_node) if file_knob else ""
-        except Exception:
-            render_file = file_knob.value() if file_knob else ""
         body = (
             f"Script Name: {script_name}\n"
             f"Render Directory: {render_directory}\n"
             f"Render File: {render_file}\n"
             f"Render Time: {render_time}\n"
-            "El render ha finalizado exitosamente."
+            + (f"Render Stats: {stats_text}\n" if stats_text else "")
+            + "El render ha finalizado exitosamente."
         )
 
         # Enviar correo electronico
@@ -529,4 +519,8 @@ def Render_Complete():
 
 # Agregar callbacks de Nuke
 nuke.addBeforeRender(start_time)
+nuke.addBeforeRender(start_frame_stats)
+nuke.addBeforeFrameRender(frame_start)
+nuke.addAfterFrameRender(frame_end)
 nuke.addAfterRender(Render_Complete)
+resume_outbox()
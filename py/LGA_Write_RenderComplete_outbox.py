@@ -0,0 +1,486 @@
+"""
+_______________________________________________________________________________________________________________
+
+  LGA_Write_RenderComplete_outbox v1.40 | Lega
+  Bandeja de salida de los mails de fin de render: los guarda en disco y los manda un hilo aparte
+
+  Render_Complete corre dentro del afterRender. Antes abria ahi mismo una
+  conexion a smtp.office365.com, hacia STARTTLS, login y mandaba: Nuke -o
+  el proceso de render- quedaba colgado unos segundos por mail, y sin red
+  el mail se perdia.
+
+  Ahora el afterRender solo escribe el mail como un .json en la bandeja y
+  vuelve. Un hilo lo manda despues:
+  - Espera COALESCE_SECONDS desde el ultimo mail encolado: los renders que
+    terminan juntos salen en un solo mail, un resumen por destinatario.
+  - Usa una sola conexion para todo lo que tenga para mandar, y la deja
+    abierta IDLE_SECONDS por si llega otro.
+  - Si falla, el mail queda en la bandeja y se reintenta con espera
+    creciente, hasta MAX_ATTEMPTS. Despues pasa a failed/.
+  - Lo que no se llego a mandar -Nuke se cerro, no habia red- sale cuando
+    vuelve a arrancar el ToolPack.
+
+  La contrasena no se guarda en la bandeja: se lee del .dat al mandar.
+  El hilo no toca Nuke. Host, puerto y TLS son parametros de MailOutbox,
+  asi se puede probar contra un SMTP local.
+
+  v1.40: El login no se hacia nunca: has_extn("auth") se miraba sin EHLO
+         y despues del STARTTLS, que borra lo anunciado. Ahora hay un EHLO
+         antes y otro despues. `python LGA_Write_RenderComplete_outbox.py
+         --self-check` lo prueba contra un SMTP local que exige AUTH.
+
+  Scripts que utilizan este modulo:
+  - LGA_Write_RenderComplete.py
+_______________________________________________________________________________________________________________
+
+"""
+
+import json
+import os
+import smtplib
+import sys
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+
+SMTP_HOST = "smtp.office365.com"
+SMTP_PORT = 587
+
+# Segundos sin mails nuevos antes de mandar: lo que llega en ese lapso sale junto
+COALESCE_SECONDS = 20
+# Tope de espera para un mail aunque sigan llegando otros
+COALESCE_MAX_SECONDS = 120
+# Segundos que la conexion y el hilo esperan otro mail antes de cerrar
+IDLE_SECONDS = 60
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 1800
+SMTP_TIMEOUT = 30
+# Un mail tomado por un proceso que murio vuelve a la bandeja pasado este tiempo
+STALE_CLAIM_SECONDS = 600
+
+MESSAGE_SUFFIX = ".json"
+CLAIM_SUFFIX = ".sending"
+FAILED_DIR = "failed"
+
+DIGEST_SEPARATOR = "\n" + "-" * 60 + "\n\n"
+
+DEBUG = False
+
+
+def debug_print(*message):
+    if DEBUG:
+        print(*message)
+
+
+def _write_json(path, data):
+    # Escritura atomica: un mail a medio escribir nunca se lee ni se manda
+    temp_path = "%s.%d.tmp" % (path, os.getpid())
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        json.dump(data, handle)
+    os.replace(temp_path, path)
+
+
+def backoff_seconds(attempts):
+    """Espera antes del intento siguiente: se duplica hasta BACKOFF_MAX_SECONDS."""
+    return min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+
+
+def digest(messages):
+    """
+    (subject, body) de un grupo de mails para el mismo destinatario. Uno solo
+    sale tal cual; varios, en un resumen con los cuerpos en orden.
+    """
+    if len(messages) == 1:
+        return messages[0]["subject"], messages[0]["body"]
+    subjects = {message["subject"] for message in messages}
+    subject = subjects.pop() if len(subjects) == 1 else "Renders Finished"
+    subject = f"{subject} ({len(messages)})"
+    header = f"{len(messages)} renders finalizados:\n\n"
+    return subject, header + DIGEST_SEPARATOR.join(m["body"] for m in messages)
+
+
+class MailOutbox(object):
+    """
+    Bandeja en `directory`. `credentials` devuelve (from_email, password,
+    default_to) o (None, None, None); se llama en el hilo, al mandar.
+    """
+
+    def __init__(
+        self,
+        directory,
+        credentials,
+        host=SMTP_HOST,
+        port=SMTP_PORT,
+        starttls=True,
+        coalesce_seconds=COALESCE_SECONDS,
+        idle_seconds=IDLE_SECONDS,
+    ):
+        self.directory = directory
+        self.credentials = credentials
+        self.host = host
+        self.port = port
+        self.starttls = starttls
+        self.coalesce_seconds = coalesce_seconds
+        self.idle_seconds = idle_seconds
+        self._condition = threading.Condition()
+        self._thread = None
+        self._last_enqueue = 0.0
+        self._hurry = False
+        self._counter = 0
+        self._server = None
+        self._server_login = None
+
+    # --- Bandeja -------------------------------------------------------------
+
+    def _message_paths(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(
+            os.path.join(self.directory, name)
+            for name in names
+            if name.endswith(MESSAGE_SUFFIX)
+        )
+
+    def pending(self):
+        """Cuantos mails hay en la bandeja, sin contar los que fallaron."""
+        return len(self._message_paths())
+
+    def enqueue(self, subject, body, to_email):
+        """Guarda el mail en la bandeja y despierta al hilo. Vuelve enseguida."""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._condition:
+            self._counter += 1
+            name = "%d_%d_%d%s" % (
+                time.time_ns(),
+                os.getpid(),
+                self._counter,
+                MESSAGE_SUFFIX,
+            )
+        message = {
+            "subject": subject,
+            "body": body,
+            "to": to_email,
+            "created": time.time(),
+            "attempts": 0,
+            "next_attempt": 0,
+        }
+        _write_json(os.path.join(self.directory, name), message)
+        with self._condition:
+            self._last_enqueue = time.monotonic()
+            self._condition.notify_all()
+        self._start()
+
+    def resume(self):
+        """
+        Al arrancar: devuelve a la bandeja lo que quedo tomado por un proceso
+        que murio y, si hay algo pendiente, arranca el hilo.
+        """
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        now = time.time()
+        for name in names:
+            if not name.endswith(CLAIM_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                if now - os.path.getmtime(path) > STALE_CLAIM_SECONDS:
+                    os.replace(path, path[: -len(CLAIM_SUFFIX)].rsplit(".", 1)[0])
+            except OSError:
+                pass
+        if self._message_paths():
+            self._start()
+
+    def flush(self, timeout):
+        """
+        Manda lo pendiente sin esperar a juntar mas y espera al hilo hasta
+        `timeout` segundos. Lo que no salga queda en la bandeja.
+        """
+        with self._condition:
+            self._hurry = True
+            self._condition.notify_all()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _claim(self, path):
+        """Toma un mail para mandarlo. None si otro proceso lo tomo antes."""
+        claimed = "%s.%d%s" % (path, os.getpid(), CLAIM_SUFFIX)
+        try:
+            os.replace(path, claimed)
+            # El rename conserva el mtime del mail: resume lo mide desde aca
+            os.utime(claimed)
+            with open(claimed, "r", encoding="utf-8") as handle:
+                return claimed, json.load(handle)
+        except OSError as e:
+            debug_print(f"No se pudo tomar {path}: {e}")
+            return None
+        except ValueError as e:
+            debug_print(f"Mail ilegible, pasa a {FAILED_DIR}: {path}: {e}")
+            failed_dir = os.path.join(self.directory, FAILED_DIR)
+            os.makedirs(failed_dir, exist_ok=True)
+            os.replace(claimed, os.path.join(failed_dir, os.path.basename(path)))
+            return None
+
+    def _release(self, claimed, message, error):
+        """Devuelve un mail que no salio, con el intento anotado."""
+        path = claimed[: -len(CLAIM_SUFFIX)].rsplit(".", 1)[0]
+        message["attempts"] += 1
+        message["last_error"] = str(error)
+        if message["attempts"] >= MAX_ATTEMPTS:
+            failed_dir = os.path.join(self.directory, FAILED_DIR)
+            os.makedirs(failed_dir, exist_ok=True)
+            path = os.path.join(failed_dir, os.path.basename(path))
+        else:
+            message["next_attempt"] = time.time() + backoff_seconds(
+                message["attempts"]
+            )
+        _write_json(path, message)
+        os.remove(claimed)
+
+    # --- SMTP ----------------------------------------------------------------
+
+    def _connection(self, from_email, password):
+        """La conexion abierta si sigue viva y es del mismo usuario, o una nueva."""
+        if self._server is not None and self._server_login == from_email:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+        self._close()
+        server = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
+        try:
+            # has_extn lee lo que anuncio el EHLO, y starttls lo borra: hace
+            # falta un EHLO antes y otro despues del STARTTLS
+            server.ehlo()
+            if self.starttls:
+                server.starttls()
+                server.ehlo()
+            if password and server.has_extn("auth"):
+                server.login(from_email, password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self._server_login = from_email
+        return server
+
+    def _close(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+        self._server_login = None
+
+    def _send(self, from_email, password, to_email, subject, body):
+        msg = MIMEMultipart()
+        msg["From"] = from_email
+        msg["To"] = to_email
+        msg["Subject"] = subject
+        msg.attach(MIMEText(body, "plain"))
+        try:
+            server = self._connection(from_email, password)
+            server.sendmail(from_email, to_email, msg.as_string())
+        except smtplib.SMTPServerDisconnected:
+            # La conexion guardada se corto entre el noop y el envio: una vez mas
+            self._close()
+            server = self._connection(from_email, password)
+            server.sendmail(from_email, to_email, msg.as_string())
+
+    # --- Hilo ----------------------------------------------------------------
+
+    def _start(self):
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="LGA_RenderComplete_outbox", daemon=True
+            )
+            self._thread.start()
+
+    def _wait_for_quiet(self, first_seen):
+        """Espera a que pasen coalesce_seconds sin mails nuevos, con tope."""
+        with self._condition:
+            while not self._hurry:
+                now = time.monotonic()
+                quiet_at = self._last_enqueue + self.coalesce_seconds
+                limit_at = first_seen + COALESCE_MAX_SECONDS
+                wake_at = min(quiet_at, limit_at)
+                if now >= wake_at:
+                    return
+                self._condition.wait(wake_at - now)
+
+    def _due_messages(self):
+        now = time.time()
+        due = []
+        next_retry = None
+        for path in self._message_paths():
+            try:
+                with open(path, "r", encoding="utf-8") as handle:
+                    next_attempt = json.load(handle).get("next_attempt", 0)
+            except (OSError, ValueError):
+                continue
+            if next_attempt <= now:
+                due.append(path)
+            elif next_retry is None or next_attempt < next_retry:
+                next_retry = next_attempt
+        return due, next_retry
+
+    def _send_due(self, paths):
+        claimed = [c for c in (self._claim(path) for path in paths) if c]
+        if not claimed:
+            return
+        from_email, password, default_to = self.credentials()
+        groups = {}
+        for claim in claimed:
+            to_email = claim[1].get("to") or default_to
+            groups.setdefault(to_email, []).append(claim)
+        for to_email, group in groups.items():
+            messages = [message for _, message in group]
+            try:
+                if not from_email or not password or not to_email:
+                    raise ValueError("Faltan los datos de mail en RenderComplete.dat")
+                subject, body = digest(messages)
+                self._send(from_email, password, to_email, subject, body)
+            except Exception as e:
+                debug_print(f"Error al enviar correo a {to_email}: {e}")
+                self._close()
+                for claim_path, message in group:
+                    self._release(claim_path, message, e)
+                continue
+            for claim_path, _ in group:
+                os.remove(claim_path)
+            debug_print(f"Correo enviado a {to_email} ({len(messages)} renders).")
+
+    def _run(self):
+        try:
+            first_seen = time.monotonic()
+            while True:
+                self._wait_for_quiet(first_seen)
+                due, next_retry = self._due_messages()
+                if due:
+                    self._send_due(due)
+                    continue
+                if next_retry is not None:
+                    # Hasta el reintento falta: no vale la pena tener la conexion
+                    self._close()
+                # Nada para mandar ahora: esperar un mail nuevo, el proximo
+                # reintento o el fin del tiempo ocioso. La salida se decide con
+                # el lock tomado, asi un enqueue nunca encuentra un hilo que ya
+                # no va a mirar la bandeja.
+                with self._condition:
+                    idle_from = self._last_enqueue
+                    if not self._hurry:
+                        timeout = self.idle_seconds
+                        if next_retry is not None:
+                            timeout = max(next_retry - time.time(), 1)
+                        self._condition.wait(timeout)
+                    if self._last_enqueue != idle_from:
+                        first_seen = time.monotonic()
+                        continue
+                    if self._hurry or next_retry is None:
+                        self._thread = None
+                        return
+        finally:
+            self._close()
+
+
+# ---------------------------------------------------------------------------
+#                                 Self check
+# ---------------------------------------------------------------------------
+
+
+def _auth_server():
+    """
+    Un SMTP local minimo que anuncia AUTH PLAIN LOGIN y rechaza con 530 todo
+    mail sin login, como office365. Devuelve (server, comandos recibidos).
+    """
+    import socketserver
+
+    commands = []
+
+    class Handler(socketserver.StreamRequestHandler):
+        def reply(self, line):
+            self.wfile.write(line.encode("ascii") + b"\r\n")
+
+        def handle(self):
+            authenticated = False
+            self.reply("220 localhost")
+            while True:
+                line = self.rfile.readline().decode("ascii", "replace").strip()
+                if not line:
+                    return
+                verb = line.split(" ", 1)[0].upper()
+                commands.append(verb)
+                if verb == "EHLO":
+                    self.reply("250-localhost")
+                    self.reply("250 AUTH PLAIN LOGIN")
+                elif verb == "AUTH":
+                    authenticated = True
+                    self.reply("235 ok")
+                elif verb in ("MAIL", "RCPT") and not authenticated:
+                    self.reply("530 authentication required")
+                elif verb == "DATA":
+                    self.reply("354 go")
+                    while self.rfile.readline().rstrip(b"\r\n") != b".":
+                        pass
+                    self.reply("250 queued")
+                elif verb == "QUIT":
+                    self.reply("221 bye")
+                    return
+                else:
+                    self.reply("250 ok")
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, commands
+
+
+def self_check():
+    """
+    Manda un mail por la bandeja a un SMTP local que exige AUTH. Devuelve
+    True si salio autenticado; sin login el servidor lo rechaza y el mail
+    queda en la bandeja.
+    """
+    import tempfile
+
+    server, commands = _auth_server()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            outbox = MailOutbox(
+                directory,
+                lambda: ("from@example.com", "secret", "to@example.com"),
+                host="127.0.0.1",
+                port=server.server_address[1],
+                starttls=False,
+                coalesce_seconds=0,
+            )
+            outbox.enqueue("Render Finished", "self check", None)
+            outbox.flush(SMTP_TIMEOUT)
+            sent = outbox.pending() == 0 and not os.path.isdir(
+                os.path.join(directory, FAILED_DIR)
+            )
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("SMTP:", " ".join(commands))
+    return sent and "AUTH" in commands
+
+
+if __name__ == "__main__" and "--self-check" in sys.argv:
+    ok = self_check()
+    print("OK" if ok else "FALLO: el mail no salio autenticado")
+    sys.exit(0 if ok else 1)
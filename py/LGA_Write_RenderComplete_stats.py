@@ -0,0 +1,145 @@
+"""
+_______________________________________________________________________________________________________________
+
+  LGA_Write_RenderComplete_stats v1.37 | Lega
+  Estadisticas por frame de un render y el historial de renders
+
+  Render_Complete solo guardaba la duracion total. Con los tiempos de cada
+  frame -los mide LGA_Write_RenderComplete con los callbacks before y
+  afterFrameRender- aca se calculan minimo, maximo, promedio, percentiles,
+  frames por segundo y los frames mas lentos.
+
+  Cada render agrega una linea a RenderComplete_history.jsonl, en la
+  carpeta de configuracion del usuario: script, version, Write, frames y
+  tiempos. read_history la devuelve agrupada por shot y version, para ver
+  como cambia el costo del comp de una version a otra.
+
+  No importa Nuke a proposito.
+
+  Scripts que utilizan este modulo:
+  - LGA_Write_RenderComplete.py
+_______________________________________________________________________________________________________________
+
+"""
+
+import json
+import os
+import re
+
+
+HISTORY_FILE_NAME = "RenderComplete_history.jsonl"
+PERCENTILES = (50, 90, 95)
+SLOWEST_FRAMES = 5
+
+VERSION_RE = re.compile(r"_v(\d+)", re.IGNORECASE)
+
+
+def percentile(sorted_values, p):
+    """Percentil p (0-100) de valores ya ordenados, interpolando entre vecinos."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * p / 100.0
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    fraction = position - low
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * fraction
+
+
+def frame_stats(frame_times, wall_seconds=None):
+    """
+    Estadisticas de [(frame, segundos), ...]. `wall_seconds` es el tiempo del
+    render de punta a punta; sin el, los fps salen de la suma de los frames.
+    Devuelve None si no hay frames.
+    """
+    if not frame_times:
+        return None
+    seconds = sorted(s for _, s in frame_times)
+    total = sum(seconds)
+    elapsed = wall_seconds if wall_seconds else total
+    stats = {
+        "frames": len(seconds),
+        "first": min(f for f, _ in frame_times),
+        "last": max(f for f, _ in frame_times),
+        "total": total,
+        "wall": elapsed,
+        "min": seconds[0],
+        "max": seconds[-1],
+        "mean": total / len(seconds),
+        "fps": len(seconds) / elapsed if elapsed > 0 else 0.0,
+        "slowest": sorted(frame_times, key=lambda item: -item[1])[:SLOWEST_FRAMES],
+    }
+    for p in PERCENTILES:
+        stats["p%d" % p] = percentile(seconds, p)
+    return stats
+
+
+def format_stats(stats):
+    """Una linea para el knob del Write. Sin corchetes: el knob evaluaria TCL."""
+    slowest = ", ".join("%d (%.2fs)" % (f, s) for f, s in stats["slowest"])
+    percentiles = " ".join(
+        "p%d %.2fs" % (p, stats["p%d" % p]) for p in PERCENTILES
+    )
+    return (
+        f"{stats['frames']} frames | {stats['fps']:.2f} fps | "
+        f"min {stats['min']:.2f}s  mean {stats['mean']:.2f}s  {percentiles}  "
+        f"max {stats['max']:.2f}s | slowest: {slowest}"
+    )
+
+
+def script_version(script_path):
+    """(shot, version) del nombre del script: el nombre sin su _vNN y el NN."""
+    name = os.path.splitext(os.path.basename(script_path or ""))[0]
+    matches = list(VERSION_RE.finditer(name))
+    if not matches:
+        return name, None
+    match = matches[-1]
+    return name[: match.start()] + name[match.end() :], int(match.group(1))
+
+
+def history_record(stats, script_path, write_name, render_file, timestamp):
+    """La linea del historial de un render, con los tiempos redondeados a ms."""
+    shot, version = script_version(script_path)
+    record = {
+        "time": timestamp,
+        "script": script_path,
+        "shot": shot,
+        "version": version,
+        "write": write_name,
+        "file": render_file,
+        "range": [stats["first"], stats["last"]],
+    }
+    for key in ("frames", "total", "wall", "min", "mean", "max", "fps"):
+        record[key] = round(stats[key], 3)
+    for p in PERCENTILES:
+        record["p%d" % p] = round(stats["p%d" % p], 3)
+    record["slowest"] = [[f, round(s, 3)] for f, s in stats["slowest"]]
+    return record
+
+
+def append_history(path, record):
+    """Agrega una linea al historial. Una linea por write: append sin reescribir."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    line = json.dumps(record, separators=(",", ":"), ensure_ascii=False)
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(line + "\n")
+
+
+def read_history(path, shot=None):
+    """
+    Los renders del historial, opcionalmente de un shot, ordenados por version
+    y fecha. Las lineas rotas se saltean.
+    """
+    records = []
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if shot is None or record.get("shot") == shot:
+                    records.append(record)
+    except OSError:
+        return []
+    records.sort(key=lambda r: (r.get("shot") or "", r.get("version") or 0, r["time"]))
+    return records
@@ -1,7 +1,7 @@
 """
 _______________________________________________________________________
 
-  LGA_mediaManager v2.43 | Lega
+  LGA_mediaManager v2.53 | Lega
 
   Ventana del Media Manager: escaneo del shot, estado de cada media,
   relink, copia de archivos y borrado.
@@ -14,6 +14,9 @@ _______________________________________________________________________
     LGA_MediaManager_config.py       donde vive el .ini del usuario
     LGA_MediaManager_paths.py        resolucion de rutas e inclusiones
     LGA_MediaManager_logging.py      logger a logs/LGA_mediaManager.log
+    LGA_MediaManager_snapshot.py     la foto del ultimo escaneo y su diff
+    LGA_MediaManager_watch.py        que carpetas del escaneo cambiaron
+    LGA_MediaManager_pathkey.py      la clave con la que se comparan rutas
 
   Donde mas se ve esta version, y hay que moverla junto con el header:
     - La ventana de ajustes, abajo a la izquierda. Esa sale sola: la lee
@@ -23,6 +26,48 @@ _______________________________________________________________________
     - El titulo de la seccion "Media manager" del README.md. Ese SI es
       un numero a mano y hay que cambiarlo en la misma pasada.
 
+  v2.53: La columna "Resolves to" de los ajustes vuelve a mirar el
+         disco pasados unos segundos: una carpeta creada con la
+         ventana abierta no aparecia. El detalle esta en el header de
+         LGA_MediaManager_settings.
+  v2.52: El escaneo ya no entra a las carpetas que son links, como
+         os.walk: un link circular lo colgaba y un arbol linkeado se
+         contaba dos veces. El detalle esta en el header de
+         LGA_MediaManager_utils.
+  v2.51: Una sola normalizacion de rutas para todos los modulos,
+         memorizada, en el modulo nuevo LGA_MediaManager_pathkey.
+         Habia tres y no coincidian. Se saca la de este archivo, que
+         nadie usaba. El detalle esta en los headers de
+         LGA_MediaManager_pathkey, LGA_MediaManager_utils y
+         LGA_MediaManager_FileScanner.
+  v2.50: Los comodines de las locations se resuelven listando en
+         paralelo las ramas de cada nivel. El detalle esta en el
+         header de LGA_MediaManager_paths.
+  v2.49: La columna "Resolves to" de los ajustes deja de ir atras de
+         lo que se escribe: cada tecla resuelve solo la fila que
+         cambio, y los listados de disco se recuerdan unos segundos
+         y se comparten entre filas y con el escaneo. El detalle esta
+         en los headers de LGA_MediaManager_paths y
+         LGA_MediaManager_settings.
+  v2.48: Modo Watch: con el boton del pie prendido, lo que cambia en
+         las carpetas del escaneo se ve sin Rescan, re-listando solo
+         esas carpetas. Copy to y Delete re-listan al terminar lo que
+         tocaron. Modulo nuevo LGA_MediaManager_watch; el detalle esta
+         en su header y en los de LGA_MediaManager_utils y
+         LGA_MediaManager_FileScanner.
+  v2.47: Columna Missing: los frames que le faltan a cada secuencia,
+         con los huecos en el tooltip. El detalle esta en los headers
+         de LGA_MediaManager_utils y LGA_MediaManager_FileScanner.
+  v2.46: Pastilla Changed: lo que cambio desde el escaneo anterior
+         del mismo script. Modulo nuevo LGA_MediaManager_snapshot; el
+         detalle esta en su header y en el de LGA_MediaManager_FileScanner.
+  v2.45: Boton Duplicates: archivos y secuencias iguales byte a byte
+         entre locations, y cuanto se recupera. El detalle esta en los
+         headers de LGA_MediaManager_utils y LGA_MediaManager_FileScanner.
+  v2.44: Columnas Size y Modified, y totales de disco en el pie. Salen
+         del mismo listado del escaneo, que ademas deja de recorrer
+         el disco dos veces. El detalle esta en los headers de
+         LGA_MediaManager_utils y LGA_MediaManager_FileScanner.
   v2.43: El escaneo volvia vacio por un NameError adentro del worker
          que el except se comia. El detalle esta en el header de
          LGA_MediaManager_utils.
@@ -251,14 +296,6 @@ QThreadPool = QtCore.QThreadPool
 from LGA_MediaManager_logging import configure_logger, debug_print
 
 
-def normalize_path_for_comparison(file_path):
-    """
-    Normaliza una ruta de archivo para comparacion
-    Convierte a minusculas y reemplaza barras invertidas por barras normales
-    """
-    return file_path.replace("\\", "/").lower()
-
-
 # Agrega el directorio send2trash a sys.path
 script_dir = os.path.dirname(
     __file__
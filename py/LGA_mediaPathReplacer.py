@@ -1,9 +1,37 @@
 """
 _______________________________________________
 
-  LGA_mediaPathReplacer v2.05 | Lega
+  LGA_mediaPathReplacer v2.10 | Lega
   Search and replace for Read and Write nodes
 
+  v2.09 - Columna Target: si el path renombrado existe en disco. La
+          busqueda corre en un worker aparte con
+          LGA_mediaPathReplacer_targets, que lista cada carpeta una vez y
+          busca las secuencias por su patron en el listado; los estados
+          van llegando a la columna a medida que se listan las carpetas.
+          Skip Missing hace que Replace Paths no toque los nodos cuyo
+          path nuevo no existe.
+  v2.08 - Las etapas de Search & Replace y la lectura de presets pasan
+          a LGA_mediaPathReplacer_batch, que tambien reescribe muchos .nk
+          desde una terminal sin abrir Nuke. La ventana y la tanda
+          aplican exactamente lo mismo. _buildNewPath ya no arma el HTML
+          del preview solo para tirarlo.
+  v2.07 - El preview se calcula en un worker. Los nodos se leen de Nuke
+          una sola vez -normalized_nodes guarda nombre, clase, el path tal
+          cual y en minusculas- y cada cambio en los campos espera 120 ms
+          de silencio antes de lanzar una tanda, cancelando la anterior.
+          El worker compara cada fila contra la que ya se muestra y
+          devuelve solo las que cambiaron. Una etapa que no encuentra lo
+          buscado en una fila ya no copia sus mapas caracter por caracter.
+  v2.06 - El preview pasa a un modelo con un delegado que lo pinta. Antes
+          cada fila eran tres widgets puestos con setCellWidget -el nodo,
+          el tipo y los dos paths- y cada tecla los volvia a armar todos:
+          con unos miles de Reads y Writes la ventana se trababa al
+          escribir. Ahora una tecla cambia la lista de filas, el modelo
+          avisa solo las que cambiaron y la vista pinta solo las que se
+          ven. Los paths coloreados se arman una vez como QStaticText y
+          se recuerdan por su HTML. El path original se sigue pudiendo
+          seleccionar y copiar: doble click sobre la celda.
   v2.05 - El look sale de LGA_UI_Style_ToolPack. La ventana pasa al
           fondo de la app: iba mas clara que su propia tabla, asi que
           la tabla se veia hundida. Textos de UI al ingles.
@@ -14,8 +42,8 @@ _______________________________________________
 
 """
 
-from LGA_QtAdapter_ToolPack import QtWidgets, QtGui, QtCore
-from LGA_UI_Style_ToolPack import Color, Metric, Style
+from LGA_QtAdapter_ToolPack import QtWidgets, QtGui, QtCore, horizontal_advance
+from LGA_UI_Style_ToolPack import Color, Metric, Style, semibold
 
 QApplication = QtWidgets.QApplication
 QWidget = QtWidgets.QWidget
@@ -25,7 +53,7 @@ QPushButton = QtWidgets.QPushButton
 QCheckBox = QtWidgets.QCheckBox
 QHBoxLayout = QtWidgets.QHBoxLayout
 QLabel = QtWidgets.QLabel
-QTableWidget = QtWidgets.QTableWidget
+QTableView = QtWidgets.QTableView
 QFrame = QtWidgets.QFrame
 QComboBox = QtWidgets.QComboBox
 QListView = QtWidgets.QListView
@@ -33,14 +61,19 @@ QStyledItemDelegate = QtWidgets.QStyledItemDelegate
 QStyle = QtWidgets.QStyle
 QHeaderView = QtWidgets.QHeaderView
 QKeySequence = QtGui.QKeySequence
+QStaticText = QtGui.QStaticText
 Qt = QtCore.Qt
 
+import collections
 import configparser
 import os
-import re
+import time
 
 import nuke
 
+import LGA_mediaPathReplacer_batch as path_batch
+import LGA_mediaPathReplacer_targets as path_targets
+
 # Solo se necesita una instancia de QApplication por script
 app = QApplication.instance() or QApplication([])
 
@@ -64,9 +97,35 @@ _OPTIONS_SR_COL_WIDTH = 455
 _OPTIONS_PRESET_COL_WIDTH = 310
 _WINDOW_WIDTH = 1360
 
+# Filas del preview: todas miden lo mismo, dos lineas de path.
+_PREVIEW_ROW_HEIGHT = 46
+_PREVIEW_ICON = 18
+# Lo que iba entre "Original:" y el path.
+_PREVIEW_LABEL_GAP = 20
+_PREVIEW_LABELS = ("Original:", "Renamed:")
+# Cuantos paths ya armados recuerda el delegado. Son varias pantallas de
+# filas; pasado el tope se olvidan los que hace mas que no se pintan.
+_PREVIEW_CACHE_MAX = 2048
+_COL_NODE, _COL_TYPE, _COL_TARGET, _COL_PATHS = range(4)
+# Cuanto silencio hace falta en los campos para recalcular el preview: una
+# palabra tipeada de corrido es una sola tanda y no una por letra.
+_PREVIEW_DEBOUNCE_MS = 120
+# La fila entera, para el delegado.
+_ROW_ROLE = Qt.UserRole + 1
+# El estado en disco del path renombrado: None mientras no se sabe.
+_TARGET_ROLE = Qt.UserRole + 2
+# Cada cuanto se entregan los estados que van llegando. Uno por carpeta seria
+# una senal por carpeta; juntarlos de a un decimo de segundo se ve igual de
+# vivo y repinta la columna muchas veces menos.
+_TARGET_EMIT_SECONDS = 0.1
+# Lo que se lee de cada nodo, una sola vez: nombre, clase, el path tal cual y
+# en minusculas para el filtro.
+_NodePath = collections.namedtuple("_NodePath", "name node_class path normalized")
+
 # Todo el look sale de LGA_UI_Style_ToolPack. Los alias conservan los nombres
-# con los que el resto del archivo ya llamaba a cada estilo.
-_TABLE_STYLE = Style.TABLE
+# con los que el resto del archivo ya llamaba a cada estilo. La hoja de la
+# tabla esta escrita para QTableWidget, y el preview es un QTableView.
+_TABLE_STYLE = Style.TABLE.replace("QTableWidget", "QTableView")
 _BTN_PRIMARY = Style.BTN_PRIMARY
 _BTN_SMALL = Style.BTN_SMALL
 _BTN_SMALL_TIGHT = Style.BTN_ICON
@@ -100,6 +159,9 @@ def _html_escape(text):
 def _colorize_with_map(text, color_by_index):
     if not text:
         return ""
+    if not color_by_index:
+        # La mayoria de las filas: nada que colorear, un solo tramo.
+        return "<span style='color:%s;'>%s</span>" % (Color.TEXT, _html_escape(text))
     chunks = []
     cur_chars = []
     cur_color = None
@@ -134,67 +196,31 @@ def _colorize_with_map(text, color_by_index):
     return "".join(chunks)
 
 
-def _cell_html_label(html, bg=Color.SURFACE):
-    lbl = QLabel()
-    lbl.setTextFormat(Qt.RichText)
-    lbl.setText(html)
-    lbl.setStyleSheet("background:%s; padding:2px 6px;" % bg)
-    lbl.setAttribute(Qt.WA_TransparentForMouseEvents, True)
-    return lbl
-
-
-def _path_preview_cell(original_html, renamed_html, bg=Color.SURFACE):
-    w = QWidget()
-    w.setStyleSheet("background:%s;" % bg)
-
-    layout = QtWidgets.QGridLayout(w)
-    layout.setContentsMargins(6, 2, 6, 2)
-    layout.setHorizontalSpacing(0)
-    layout.setVerticalSpacing(0)
-
-    original_lbl = QLabel(
-        "<span style='color:%s; font-weight:600;'>Original:</span>" % Color.TEXT
-    )
-    original_lbl.setTextFormat(Qt.RichText)
-    original_lbl.setStyleSheet("background:%s;" % bg)
-    original_lbl.setAttribute(Qt.WA_TransparentForMouseEvents, True)
-
-    renamed_lbl = QLabel(
-        "<span style='color:%s; font-weight:600;'>Renamed:</span>" % Color.TEXT
-    )
-    renamed_lbl.setTextFormat(Qt.RichText)
-    renamed_lbl.setStyleSheet("background:%s;" % bg)
-    renamed_lbl.setAttribute(Qt.WA_TransparentForMouseEvents, True)
-
-    original_path_lbl = QLabel(original_html)
-    original_path_lbl.setTextFormat(Qt.RichText)
-    original_path_lbl.setStyleSheet(
-        "background:%s; selection-background-color:%s; selection-color:%s;"
-        % (bg, Color.ACCENT, Color.TEXT_STRONG)
-    )
-    original_path_lbl.setTextInteractionFlags(Qt.TextSelectableByMouse)
-    original_path_lbl.setCursor(Qt.IBeamCursor)
-
-    renamed_path_lbl = QLabel(renamed_html)
-    renamed_path_lbl.setTextFormat(Qt.RichText)
-    renamed_path_lbl.setStyleSheet("background:%s;" % bg)
-    renamed_path_lbl.setAttribute(Qt.WA_TransparentForMouseEvents, True)
-
-    spacer_top = QWidget()
-    spacer_top.setFixedWidth(20)
-    spacer_top.setStyleSheet("background:%s;" % bg)
-    spacer_bottom = QWidget()
-    spacer_bottom.setFixedWidth(20)
-    spacer_bottom.setStyleSheet("background:%s;" % bg)
-
-    layout.addWidget(original_lbl, 0, 0)
-    layout.addWidget(spacer_top, 0, 1)
-    layout.addWidget(original_path_lbl, 0, 2)
-    layout.addWidget(renamed_lbl, 1, 0)
-    layout.addWidget(spacer_bottom, 1, 1)
-    layout.addWidget(renamed_path_lbl, 1, 2)
-    layout.setColumnStretch(2, 1)
-    return w
+def _target_label(node_class, state):
+    """
+    (texto, color) de la columna Target.
+
+    Un Write que todavia no se rendereo no tiene archivos y esta bien: solo
+    falta si no esta ni la carpeta. Un Read sin archivos es un path roto.
+    """
+    if state is None:
+        return "...", Color.TEXT_DIM
+    if state == path_targets.FOUND:
+        return "Found", Color.OK_TEXT
+    if state == path_targets.NO_FOLDER:
+        return "No folder", Color.ERROR_TEXT
+    if state == path_targets.NO_FILES:
+        if node_class == "Write":
+            return "New", Color.TEXT_DIM
+        return "Missing", Color.ERROR_TEXT
+    return "-", Color.TEXT_DIM
+
+
+def _target_is_missing(node_class, state):
+    """Si la fila cuenta como rota, para el resumen y para Skip Missing."""
+    if state == path_targets.NO_FOLDER:
+        return True
+    return state == path_targets.NO_FILES and node_class != "Write"
 
 
 def _show_save_preset_dialog(parent=None):
@@ -416,11 +442,412 @@ class _PresetDelegate(QStyledItemDelegate):
         return sh.expandedTo(QtCore.QSize(0, 24))
 
 
+class _PreviewModel(QtCore.QAbstractTableModel):
+    """
+    Las filas del preview como datos: un dict por nodo, sin widgets.
+
+    setRows() compara contra las filas que ya tenia: si son los mismos nodos
+    en el mismo orden -lo normal al tipear- solo avisa el tramo que cambio,
+    y la vista repinta de ese tramo lo que esta a la vista. Una fila que no
+    cambio tiene que llegar como el mismo dict.
+
+    El estado en disco de cada path renombrado va aparte, en `targets`, por
+    path: llega despues que la fila, de a tandas, y no cambia con el texto
+    de los campos sino con el disco.
+    """
+
+    HEADERS = ("Node", "Type", "Target", "Paths")
+
+    def __init__(self, parent=None):
+        super(_PreviewModel, self).__init__(parent)
+        self._rows = []
+        # {path renombrado: estado de path_targets}
+        self.targets = {}
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation != Qt.Horizontal:
+            return None
+        if role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignLeft | Qt.AlignVCenter)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        # Editable solo para que el doble click abra el campo de solo lectura
+        # del path original: el delegado nunca escribe en el modelo.
+        if index.column() == _COL_PATHS:
+            return Qt.ItemIsEnabled | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        if role == _ROW_ROLE:
+            return row
+        if role == _TARGET_ROLE:
+            return self.targets.get(row["new_path"])
+        if role == Qt.DisplayRole:
+            if index.column() == _COL_NODE:
+                return row["node_name"]
+            if index.column() == _COL_TYPE:
+                return row["node_type"]
+            if index.column() == _COL_TARGET:
+                return _target_label(
+                    row["node_type"], self.targets.get(row["new_path"])
+                )[0]
+            return row["original_path"]
+        return None
+
+    def setRows(self, rows):
+        old = self._rows
+        same_nodes = len(old) == len(rows) and all(
+            a["node_name"] == b["node_name"] for a, b in zip(old, rows)
+        )
+        if not same_nodes:
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+            return
+        self._rows = rows
+        first = last = None
+        # Por identidad: una fila que no cambio es el MISMO dict que ya estaba,
+        # y compararla por contenido costaria tanto como recalcularla.
+        for row_idx, (a, b) in enumerate(zip(old, rows)):
+            if a is not b:
+                if first is None:
+                    first = row_idx
+                last = row_idx
+        if first is not None:
+            self.dataChanged.emit(
+                self.index(first, 0), self.index(last, len(self.HEADERS) - 1)
+            )
+
+    def setTargets(self, states):
+        """Suma estados que llegaron y repinta solo la columna Target."""
+        self.targets.update(states)
+        first = last = None
+        for row_idx, row in enumerate(self._rows):
+            if row["new_path"] in states:
+                if first is None:
+                    first = row_idx
+                last = row_idx
+        if first is not None:
+            self.dataChanged.emit(
+                self.index(first, _COL_TARGET), self.index(last, _COL_TARGET)
+            )
+
+    def clearTargets(self):
+        self.targets = {}
+        if self._rows:
+            self.dataChanged.emit(
+                self.index(0, _COL_TARGET),
+                self.index(len(self._rows) - 1, _COL_TARGET),
+            )
+
+
+class _PreviewDelegate(QStyledItemDelegate):
+    """
+    Pinta las cuatro columnas del preview: icono y nombre del nodo, tipo,
+    si el path renombrado existe, y el path original y el renombrado,
+    coloreados por etapa.
+
+    Cada path coloreado se arma una vez como QStaticText, que guarda el
+    layout ya calculado, y se recuerda por su HTML. Al scrollear no se arma
+    nada; al tipear se arman solo las filas visibles cuyo HTML cambio.
+    """
+
+    def __init__(self, pix_read, pix_write, parent=None):
+        super(_PreviewDelegate, self).__init__(parent)
+        # Los iconos se escalan una vez y no una por fila.
+        self._icons = {}
+        for node_type, pix in (("Read", pix_read), ("Write", pix_write)):
+            if pix and not pix.isNull():
+                self._icons[node_type] = pix.scaled(
+                    _PREVIEW_ICON,
+                    _PREVIEW_ICON,
+                    Qt.KeepAspectRatio,
+                    Qt.SmoothTransformation,
+                )
+        self._texts = collections.OrderedDict()
+        self._label_widths = {}
+
+    def _staticText(self, html):
+        text = self._texts.get(html)
+        if text is not None:
+            self._texts.move_to_end(html)
+            return text
+        text = QStaticText(html)
+        text.setTextFormat(Qt.RichText)
+        text.setTextWidth(-1)
+        self._texts[html] = text
+        if len(self._texts) > _PREVIEW_CACHE_MAX:
+            self._texts.popitem(last=False)
+        return text
+
+    @staticmethod
+    def _boldFont(font):
+        # El 600 del font-weight que llevaban las etiquetas en HTML.
+        return semibold(QtGui.QFont(font))
+
+    def _labelWidth(self, font):
+        key = font.key()
+        width = self._label_widths.get(key)
+        if width is None:
+            metrics = QtGui.QFontMetrics(self._boldFont(font))
+            width = (
+                max(horizontal_advance(metrics, lbl) for lbl in _PREVIEW_LABELS)
+                + _PREVIEW_LABEL_GAP
+            )
+            self._label_widths[key] = width
+        return width
+
+    def paint(self, painter, option, index):
+        row = index.data(_ROW_ROLE)
+        if row is None:
+            return super(_PreviewDelegate, self).paint(painter, option, index)
+        painter.save()
+        painter.fillRect(option.rect, QtGui.QColor(Color.SURFACE))
+        painter.setClipRect(option.rect)
+        rect = option.rect.adjusted(6, 2, -6, -2)
+        painter.setPen(QtGui.QColor(Color.TEXT))
+        painter.setFont(option.font)
+
+        column = index.column()
+        if column == _COL_NODE:
+            x = rect.left()
+            icon = self._icons.get(row["node_type"])
+            if icon is not None:
+                painter.drawPixmap(
+                    x, rect.top() + (rect.height() - icon.height()) // 2, icon
+                )
+                x += icon.width() + 6
+            painter.drawText(
+                QtCore.QRect(x, rect.top(), rect.right() - x, rect.height()),
+                Qt.AlignVCenter | Qt.AlignLeft,
+                row["node_name"],
+            )
+        elif column == _COL_TYPE:
+            painter.drawText(rect, Qt.AlignVCenter | Qt.AlignLeft, row["node_type"])
+        elif column == _COL_TARGET:
+            text, color = _target_label(row["node_type"], index.data(_TARGET_ROLE))
+            painter.setPen(QtGui.QColor(color))
+            painter.drawText(rect, Qt.AlignVCenter | Qt.AlignLeft, text)
+        else:
+            label_w = self._labelWidth(option.font)
+            line_h = rect.height() / 2.0
+            bold = self._boldFont(option.font)
+            for line, (label, html) in enumerate(
+                zip(_PREVIEW_LABELS, (row["original_html"], row["renamed_html"]))
+            ):
+                top = rect.top() + line * line_h
+                painter.setFont(bold)
+                painter.drawText(
+                    QtCore.QRectF(rect.left(), top, label_w, line_h),
+                    Qt.AlignVCenter | Qt.AlignLeft,
+                    label,
+                )
+                painter.setFont(option.font)
+                static = self._staticText(html)
+                painter.drawStaticText(
+                    QtCore.QPointF(
+                        rect.left() + label_w,
+                        top + (line_h - static.size().height()) / 2.0,
+                    ),
+                    static,
+                )
+        painter.restore()
+
+    # --- Path original seleccionable --------------------------------------
+    # Un campo de solo lectura encima de la primera linea, con el path sin
+    # colorear: se selecciona y se copia como antes se hacia sobre el label.
+    def createEditor(self, parent, option, index):
+        if index.column() != _COL_PATHS:
+            return None
+        editor = QLineEdit(parent)
+        editor.setReadOnly(True)
+        editor.setFrame(False)
+        editor.setStyleSheet(
+            "background:%s; color:%s; padding:0px;"
+            " selection-background-color:%s; selection-color:%s;"
+            % (Color.SURFACE, Color.TEXT, Color.ACCENT, Color.TEXT_STRONG)
+        )
+        return editor
+
+    def setEditorData(self, editor, index):
+        row = index.data(_ROW_ROLE)
+        editor.setText(row["original_path"] if row else "")
+        editor.setCursorPosition(0)
+
+    def setModelData(self, editor, model, index):
+        pass
+
+    def updateEditorGeometry(self, editor, option, index):
+        rect = option.rect.adjusted(6, 2, -6, -2)
+        label_w = self._labelWidth(option.font)
+        editor.setGeometry(
+            rect.left() + label_w,
+            rect.top(),
+            rect.width() - label_w,
+            rect.height() // 2,
+        )
+
+
+class _PreviewSignals(QtCore.QObject):
+    """El resultado de una tanda del preview, de vuelta en el hilo principal."""
+
+    # (indices visibles en orden, {indice: fila} de las que cambiaron)
+    ready = QtCore.Signal(object, object)
+
+
+class _PreviewWorker(QtCore.QRunnable):
+    """
+    Calcula el preview fuera del hilo de la ventana.
+
+    Recibe la FOTO de los nodos -nombre, clase y path, sacados una sola vez
+    en el hilo principal- y la de los campos, asi que no toca ni Nuke ni un
+    widget. Compara cada fila contra la que ya se mostro y entrega solo las
+    que cambiaron, que son las que la vista tiene que repintar.
+    """
+
+    def __init__(self, entries, classes, stages, filter_on, previous):
+        super(_PreviewWorker, self).__init__()
+        self.entries = entries
+        self.classes = classes
+        self.stages = stages
+        self.filter_on = filter_on
+        # Las filas que ya tiene la vista, por indice de nodo. El hilo
+        # principal no modifica este dict: cuando llega un resultado arma uno
+        # nuevo.
+        self.previous = previous
+        self.signals = _PreviewSignals()
+        self._cancelled = False
+        # Sin esto Qt destruye el objeto C++ apenas run() termina, y el
+        # cancel() de la tanda siguiente tira RuntimeError.
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        """La tanda ya no sirve: los campos cambiaron mientras corria."""
+        self._cancelled = True
+
+    def run(self):
+        visible = []
+        changed = {}
+        # Varios nodos suelen leer el mismo path: se calcula una vez.
+        previews = {}
+        for node_idx, entry in enumerate(self.entries):
+            if self._cancelled:
+                return
+            if entry.node_class not in self.classes:
+                continue
+            if not SearchAndReplaceWidget._passesFilter(
+                entry.path, entry.normalized, self.stages, self.filter_on
+            ):
+                continue
+            visible.append(node_idx)
+            preview = previews.get(entry.path)
+            if preview is None:
+                preview = SearchAndReplaceWidget._previewFor(entry.path, self.stages)
+                previews[entry.path] = preview
+            new_path, original_html, renamed_html = preview
+            previous = self.previous.get(node_idx)
+            if (
+                previous is not None
+                and previous["original_path"] == entry.path
+                and previous["original_html"] == original_html
+                and previous["renamed_html"] == renamed_html
+            ):
+                continue
+            changed[node_idx] = {
+                "node_name": entry.name,
+                "node_type": entry.node_class,
+                "original_path": entry.path,
+                "new_path": new_path,
+                "original_html": original_html,
+                "renamed_html": renamed_html,
+                "changed": new_path != entry.path,
+            }
+        if not self._cancelled:
+            self.signals.ready.emit(visible, changed)
+
+
+class _TargetSignals(QtCore.QObject):
+    """Estados en disco que van llegando: {path renombrado: estado}."""
+
+    found = QtCore.Signal(object)
+
+
+class _TargetWorker(QtCore.QRunnable):
+    """
+    Busca en disco los paths renombrados, fuera del hilo de la ventana.
+
+    path_targets lista cada carpeta una vez y devuelve los estados de a una
+    carpeta; aca se juntan y se entregan cada _TARGET_EMIT_SECONDS, asi la
+    columna se va llenando mientras las carpetas lentas siguen listando.
+    """
+
+    def __init__(self, paths, base_dir):
+        super(_TargetWorker, self).__init__()
+        self.paths = paths
+        self.base_dir = base_dir
+        self.signals = _TargetSignals()
+        self._cancelled = False
+        # Igual que en _PreviewWorker: cancel() puede llegar despues de run().
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        pending = {}
+        last_emit = time.time()
+        for states in path_targets.check(
+            self.paths, self.base_dir, lambda: self._cancelled
+        ):
+            if self._cancelled:
+                return
+            pending.update(states)
+            if time.time() - last_emit >= _TARGET_EMIT_SECONDS:
+                self.signals.found.emit(pending)
+                pending = {}
+                last_emit = time.time()
+        if pending and not self._cancelled:
+            self.signals.found.emit(pending)
+
+
 class SearchAndReplaceWidget(QWidget):
     def __init__(self, nodes):
         super(SearchAndReplaceWidget, self).__init__()
         self.nodes = nodes
-        self.normalized_nodes = [node["file"].getValue().lower() for node in self.nodes]
+        self.normalized_nodes = self._captureNodes(self.nodes)
+        # Las filas que ya muestra la vista, por indice de nodo, y la tanda
+        # que esta calculando las proximas.
+        self._preview_rows = {}
+        self._preview_visible = []
+        self._preview_worker = None
+        # Un hilo: una tanda vieja cancelada sale enseguida, y dos tandas
+        # de Python a la vez solo se pelearian el GIL.
+        self._preview_pool = QtCore.QThreadPool(self)
+        self._preview_pool.setMaxThreadCount(1)
+        self._preview_timer = QtCore.QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(_PREVIEW_DEBOUNCE_MS)
+        self._preview_timer.timeout.connect(self.updatePreviews)
+        # La busqueda en disco va en su propio pool: no espera detras del
+        # preview ni lo frena. Adentro lista varias carpetas a la vez.
+        self._base_dir = self._projectDirectory()
+        self._target_worker = None
+        self._target_pool = QtCore.QThreadPool(self)
+        self._target_pool.setMaxThreadCount(1)
         self.ini_path = self.get_ini_path()
         self.icon_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), "icons")
         self.pix_read = QtGui.QPixmap(os.path.join(self.icon_dir, "node_read.svg"))
@@ -430,6 +857,7 @@ class SearchAndReplaceWidget(QWidget):
         self.filter_list_enabled = True
         self.reads_enabled = True
         self.writes_enabled = True
+        self.skip_missing_enabled = False
         self.loadPresets()
         self.initUI()
 
@@ -445,12 +873,19 @@ class SearchAndReplaceWidget(QWidget):
         self.layout.setSpacing(8)
 
         # Tabla superior (filas dobles): Node / Type / Paths (Original + New)
-        self.preview_table = QTableWidget()
-        self.preview_table.setColumnCount(3)
-        self.preview_table.setHorizontalHeaderLabels(["Node", "Type", "Paths"])
+        self.preview_model = _PreviewModel(self)
+        self.preview_table = QTableView()
+        self.preview_table.setModel(self.preview_model)
+        self.preview_table.setItemDelegate(
+            _PreviewDelegate(self.pix_read, self.pix_write, self.preview_table)
+        )
         self.preview_table.verticalHeader().setVisible(False)
+        # Todas las filas miden lo mismo: la vista no le pregunta el alto a
+        # cada una.
+        self.preview_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.preview_table.verticalHeader().setDefaultSectionSize(_PREVIEW_ROW_HEIGHT)
         self.preview_table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
-        self.preview_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.preview_table.setEditTriggers(QtWidgets.QAbstractItemView.DoubleClicked)
         self.preview_table.setFocusPolicy(Qt.NoFocus)
         self.preview_table.setShowGrid(True)
         self.preview_table.setStyleSheet(_TABLE_STYLE)
@@ -463,13 +898,11 @@ class SearchAndReplaceWidget(QWidget):
         self.preview_table.setColumnWidth(0, 160)
         header.setSectionResizeMode(1, QHeaderView.Fixed)
         self.preview_table.setColumnWidth(1, 80)
-        header.setSectionResizeMode(2, QHeaderView.Interactive)
-        self.preview_table.setColumnWidth(2, 860)
+        header.setSectionResizeMode(2, QHeaderView.Fixed)
+        self.preview_table.setColumnWidth(2, 80)
+        header.setSectionResizeMode(3, QHeaderView.Interactive)
+        self.preview_table.setColumnWidth(3, 780)
         header.setStretchLastSection(True)
-        for col_idx in range(3):
-            hdr_item = self.preview_table.horizontalHeaderItem(col_idx)
-            if hdr_item:
-                hdr_item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
         self.layout.addWidget(self.preview_table, 1)
 
         self.summary_label = QLabel("")
@@ -624,6 +1057,15 @@ class SearchAndReplaceWidget(QWidget):
         self.write_checkbox.setToolTip("Include Write nodes in search and replace.")
         footer.addWidget(self.write_checkbox)
 
+        footer.addWidget(_separator("v"))
+
+        self.skip_missing_checkbox = QCheckBox("Skip Missing")
+        self.skip_missing_checkbox.setChecked(self.skip_missing_enabled)
+        self.skip_missing_checkbox.setToolTip(
+            "Leave nodes unchanged when their renamed path is missing on disk."
+        )
+        footer.addWidget(self.skip_missing_checkbox)
+
         footer.addStretch()
 
         self.run_button = QPushButton("Replace Paths", self)
@@ -644,6 +1086,7 @@ class SearchAndReplaceWidget(QWidget):
         self.filter_checkbox.stateChanged.connect(self._onFooterOptionsChanged)
         self.read_checkbox.stateChanged.connect(self._onFooterOptionsChanged)
         self.write_checkbox.stateChanged.connect(self._onFooterOptionsChanged)
+        self.skip_missing_checkbox.stateChanged.connect(self._onSkipMissingChanged)
         self.preset_combo.currentIndexChanged.connect(self.onPresetSelected)
 
         self.run_button.setShortcut(QKeySequence(Qt.Key_Return))
@@ -659,6 +1102,14 @@ class SearchAndReplaceWidget(QWidget):
             self.close()
         super(SearchAndReplaceWidget, self).keyPressEvent(event)
 
+    def closeEvent(self, event):
+        self._preview_timer.stop()
+        if self._preview_worker is not None:
+            self._preview_worker.cancel()
+            self._preview_worker = None
+        self._cancelTargets()
+        super(SearchAndReplaceWidget, self).closeEvent(event)
+
     def get_ini_path(self):
         dir_path = os.path.dirname(os.path.realpath(__file__))
         return os.path.join(dir_path, "LGA_mediaPathReplacer_presets.ini")
@@ -672,40 +1123,11 @@ class SearchAndReplaceWidget(QWidget):
         )
         self.reads_enabled = self._configBool(config, "Options", "reads", True)
         self.writes_enabled = self._configBool(config, "Options", "writes", True)
+        self.skip_missing_enabled = self._configBool(
+            config, "Options", "skip_missing", False
+        )
 
-        presets_by_index = {}
-        if config.has_section("Presets"):
-            for key, value in config.items("Presets"):
-                match = re.match(
-                    r"^(name|search|replace|sr1_search|sr1_replace|sr1_case|sr2_search|sr2_replace|sr2_case)_preset_(\d+)$",
-                    key.lower(),
-                )
-                if not match:
-                    continue
-                field = match.group(1)
-                index = int(match.group(2))
-                if index not in presets_by_index:
-                    presets_by_index[index] = {
-                        "name": "",
-                        "sr1_search": "",
-                        "sr1_replace": "",
-                        "sr1_case": "false",
-                        "sr2_search": "",
-                        "sr2_replace": "",
-                        "sr2_case": "false",
-                    }
-                if field == "search":
-                    presets_by_index[index]["sr1_search"] = value
-                elif field == "replace":
-                    presets_by_index[index]["sr1_replace"] = value
-                else:
-                    presets_by_index[index][field] = value
-
-        self.presets = []
-        for index in sorted(presets_by_index.keys()):
-            if not presets_by_index[index].get("name", "").strip():
-                presets_by_index[index]["name"] = "Preset %d" % index
-            self.presets.append(presets_by_index[index])
+        self.presets = path_batch.presets_from_config(config)
 
     @staticmethod
     def _configBool(config, section, option, default):
@@ -722,9 +1144,11 @@ class SearchAndReplaceWidget(QWidget):
             self.filter_list_enabled = self.filter_checkbox.isChecked()
             self.reads_enabled = self.read_checkbox.isChecked()
             self.writes_enabled = self.write_checkbox.isChecked()
+            self.skip_missing_enabled = self.skip_missing_checkbox.isChecked()
         config.set("Options", "filter_list", str(self.filter_list_enabled).lower())
         config.set("Options", "reads", str(self.reads_enabled).lower())
         config.set("Options", "writes", str(self.writes_enabled).lower())
+        config.set("Options", "skip_missing", str(self.skip_missing_enabled).lower())
 
     def _writePresets(self):
         config = configparser.ConfigParser()
@@ -857,7 +1281,8 @@ class SearchAndReplaceWidget(QWidget):
         self.sr2_replace_input.setText("")
 
     def _onSettingsChanged(self, *_):
-        self.updatePreviews()
+        # Un preset cambia seis campos de una: con el timer es una tanda.
+        self._preview_timer.start()
         if not self._applying_preset:
             self._updatePresetComboSelection()
 
@@ -865,18 +1290,69 @@ class SearchAndReplaceWidget(QWidget):
         self.updatePreviews()
         self._writePresets()
 
+    def _onSkipMissingChanged(self, *_):
+        # No cambia el preview: solo lo que hace Replace.
+        self._writePresets()
+
     def _swap_sr(self, search_edit, replace_edit):
         a = search_edit.text()
         b = replace_edit.text()
         search_edit.setText(b)
         replace_edit.setText(a)
 
+    def _allowedClasses(self):
+        classes = set()
+        if self.read_checkbox.isChecked():
+            classes.add("Read")
+        if self.write_checkbox.isChecked():
+            classes.add("Write")
+        return classes
+
     def _isNodeAllowedByFilters(self, node):
-        if node.Class() == "Read":
-            return self.read_checkbox.isChecked()
-        if node.Class() == "Write":
-            return self.write_checkbox.isChecked()
-        return False
+        return node.Class() in self._allowedClasses()
+
+    @staticmethod
+    def _projectDirectory():
+        """
+        Contra que carpeta resuelve Nuke los paths relativos: el Project
+        Directory evaluado, o la carpeta del script si esta vacio.
+        """
+        try:
+            project_dir = (nuke.root()["project_directory"].evaluate() or "").strip()
+        except Exception:
+            project_dir = ""
+        if project_dir:
+            return project_dir
+        try:
+            return nuke.script_directory() or ""
+        except Exception:
+            return ""
+
+    @staticmethod
+    def _captureNodes(nodes):
+        """Nombre, clase y path de cada nodo, leidos de Nuke una sola vez."""
+        captured = []
+        for node in nodes:
+            path = node["file"].getValue()
+            captured.append(_NodePath(node.name(), node.Class(), path, path.lower()))
+        return captured
+
+    def _stageSettings(self):
+        """Las dos etapas como datos: (search, replace, case, stage_id)."""
+        return (
+            (
+                self.sr1_search_input.text(),
+                self.sr1_replace_input.text(),
+                self.sr1_case_checkbox.isChecked(),
+                1,
+            ),
+            (
+                self.sr2_search_input.text(),
+                self.sr2_replace_input.text(),
+                self.sr2_case_checkbox.isChecked(),
+                2,
+            ),
+        )
 
     @staticmethod
     def _containsLiteral(text, normalized_text, needle, case_sensitive):
@@ -886,91 +1362,21 @@ class SearchAndReplaceWidget(QWidget):
             return needle in text
         return needle.lower() in normalized_text
 
-    @staticmethod
-    def _findLiteral(haystack, needle, start_idx, case_sensitive):
-        if case_sensitive:
-            return haystack.find(needle, start_idx)
-        return haystack.lower().find(needle.lower(), start_idx)
+    # Las etapas viven en LGA_mediaPathReplacer_batch, que no importa ni Qt ni
+    # Nuke: la tanda sobre los .nk usa exactamente las mismas.
+    _applySearchReplaceStageMeta = staticmethod(path_batch.apply_stage_meta)
 
     @staticmethod
-    def _applySearchReplaceStageMeta(
-        cur_text,
-        cur_orig_map,
-        cur_tags,
-        search_text,
-        replace_text,
-        case_sensitive,
-        stage_id,
-    ):
-        if not search_text:
-            return cur_text, cur_orig_map, cur_tags, set()
-
-        out_text_parts = []
-        out_map = []
-        out_tags = []
-        changed_orig = set()
-        idx = 0
-
-        while True:
-            pos = SearchAndReplaceWidget._findLiteral(
-                cur_text, search_text, idx, case_sensitive
-            )
-            if pos < 0:
-                break
-            end = pos + len(search_text)
-
-            out_text_parts.append(cur_text[idx:pos])
-            out_map.extend(cur_orig_map[idx:pos])
-            out_tags.extend([set(x) for x in cur_tags[idx:pos]])
-
-            src_slice_map = cur_orig_map[pos:end]
-            src_slice_tags = [set(x) for x in cur_tags[pos:end]]
-            matched_text = cur_text[pos:end]
-            if replace_text == matched_text:
-                out_text_parts.append(matched_text)
-                out_map.extend(src_slice_map)
-                out_tags.extend(src_slice_tags)
-            else:
-                for oi in src_slice_map:
-                    if oi is not None:
-                        changed_orig.add(oi)
-                out_text_parts.append(replace_text)
-                out_map.extend([None] * len(replace_text))
-                out_tags.extend([{stage_id} for _ in replace_text])
-            idx = end
-
-        out_text_parts.append(cur_text[idx:])
-        out_map.extend(cur_orig_map[idx:])
-        out_tags.extend([set(x) for x in cur_tags[idx:]])
-        return "".join(out_text_parts), out_map, out_tags, changed_orig
-
-    def _computePathPreview(self, original_path):
-        cur_text = original_path
-        cur_orig_map = list(range(len(cur_text)))
-        cur_tags = [set() for _ in cur_text]
-        orig_stage_marks = {1: set(), 2: set()}
-
-        cur_text, cur_orig_map, cur_tags, changed_orig = self._applySearchReplaceStageMeta(
-            cur_text,
-            cur_orig_map,
-            cur_tags,
-            self.sr1_search_input.text(),
-            self.sr1_replace_input.text(),
-            self.sr1_case_checkbox.isChecked(),
-            stage_id=1,
-        )
-        orig_stage_marks[1].update(changed_orig)
-
-        cur_text, cur_orig_map, cur_tags, changed_orig = self._applySearchReplaceStageMeta(
-            cur_text,
-            cur_orig_map,
-            cur_tags,
-            self.sr2_search_input.text(),
-            self.sr2_replace_input.text(),
-            self.sr2_case_checkbox.isChecked(),
-            stage_id=2,
+    def _previewFor(original_path, stages):
+        """
+        (path nuevo, HTML del original, HTML del renombrado) para unas etapas.
+
+        No lee ningun widget: corre igual en el hilo de la ventana que en el
+        worker del preview.
+        """
+        cur_text, cur_tags, orig_stage_marks = path_batch.apply_stages(
+            original_path, stages
         )
-        orig_stage_marks[2].update(changed_orig)
 
         orig_colors = {}
         for stage_id in (1, 2):
@@ -993,139 +1399,186 @@ class SearchAndReplaceWidget(QWidget):
         renamed_html = _colorize_with_map(cur_text, renamed_colors)
         return cur_text, original_html, renamed_html
 
+    def _computePathPreview(self, original_path):
+        return self._previewFor(original_path, self._stageSettings())
+
     def _buildNewPath(self, original_path):
-        new_path, _orig_html, _ren_html = self._computePathPreview(original_path)
-        return new_path
+        # Sin el HTML: para escribir el knob solo hace falta el texto.
+        return path_batch.build_new_path(original_path, self._stageSettings())
 
-    def _rowPassesFilter(self, original_path, normalized_path):
-        if not self.filter_checkbox.isChecked():
+    @staticmethod
+    def _passesFilter(original_path, normalized_path, stages, filter_on):
+        if not filter_on:
             return True
-
-        sr1_search = self.sr1_search_input.text()
-        sr2_search = self.sr2_search_input.text()
-        if not sr1_search and not sr2_search:
+        searches = [stage for stage in stages if stage[0]]
+        if not searches:
             return True
+        for search_text, _replace, case_sensitive, _stage_id in searches:
+            if SearchAndReplaceWidget._containsLiteral(
+                original_path, normalized_path, search_text, case_sensitive
+            ):
+                return True
+        return False
 
-        if self._containsLiteral(
-            original_path,
-            normalized_path,
-            sr1_search,
-            self.sr1_case_checkbox.isChecked(),
-        ):
-            return True
-        if self._containsLiteral(
+    def _rowPassesFilter(self, original_path, normalized_path):
+        return self._passesFilter(
             original_path,
             normalized_path,
-            sr2_search,
-            self.sr2_case_checkbox.isChecked(),
-        ):
-            return True
-        return False
-
-    def _buildNodeCell(self, node_name, node_type):
-        w = QWidget()
-        w.setStyleSheet("background-color:%s;" % Color.SURFACE)
-        layout = QHBoxLayout(w)
-        layout.setContentsMargins(6, 2, 6, 2)
-        layout.setSpacing(6)
-
-        icon_lbl = QLabel()
-        icon_lbl.setStyleSheet("background-color:%s;" % Color.SURFACE)
-        pix = self.pix_read if node_type == "Read" else self.pix_write
-        if pix and not pix.isNull():
-            icon_lbl.setPixmap(
-                pix.scaled(
-                    18,
-                    18,
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation,
-                )
-            )
-        icon_lbl.setAttribute(Qt.WA_TransparentForMouseEvents, True)
-        layout.addWidget(icon_lbl, 0)
-
-        txt_lbl = QLabel(node_name)
-        txt_lbl.setStyleSheet(
-            "color:%s; background-color:%s;" % (Color.TEXT, Color.SURFACE)
+            self._stageSettings(),
+            self.filter_checkbox.isChecked(),
         )
-        txt_lbl.setAttribute(Qt.WA_TransparentForMouseEvents, True)
-        layout.addWidget(txt_lbl, 1)
-        return w
 
     def replacePaths(self):
-        changed_count = 0
+        pending = []
+        for node in self.nodes:
+            if not self._isNodeAllowedByFilters(node):
+                continue
+            original_path = node["file"].getValue()
+            new_path = self._buildNewPath(original_path)
+            if new_path != original_path:
+                pending.append((node, new_path))
+
+        skipped_count = 0
+        if self.skip_missing_checkbox.isChecked() and pending:
+            # Se vuelve a preguntar por todos, no solo por los que el preview no
+            # llego a ver: el disco pudo cambiar desde que se abrio la ventana.
+            # Las carpetas listadas hace menos de LISTING_TTL_SECONDS salen del
+            # cache, asi que casi siempre no cuesta nada.
+            targets = path_targets.states(
+                [new_path for _node, new_path in pending], self._base_dir
+            )
+            self.preview_model.setTargets(targets)
+            kept = []
+            for node, new_path in pending:
+                if _target_is_missing(node.Class(), targets.get(new_path)):
+                    skipped_count += 1
+                else:
+                    kept.append((node, new_path))
+            pending = kept
+
         nuke.Undo().begin("Replace All Paths")
         try:
-            for node in self.nodes:
-                if not self._isNodeAllowedByFilters(node):
-                    continue
-                original_path = node["file"].getValue()
-                new_path = self._buildNewPath(original_path)
-                if new_path != original_path:
-                    node["file"].setValue(new_path)
-                    changed_count += 1
+            for node, new_path in pending:
+                node["file"].setValue(new_path)
         finally:
             nuke.Undo().end()
 
-        self.normalized_nodes = [node["file"].getValue().lower() for node in self.nodes]
+        self.normalized_nodes = self._captureNodes(self.nodes)
         self.updatePreviews()
-        print("Updated %d node paths." % changed_count)
+        if skipped_count:
+            print(
+                "Updated %d node paths, skipped %d with missing targets."
+                % (len(pending), skipped_count)
+            )
+        else:
+            print("Updated %d node paths." % len(pending))
 
     def updateNodes(self, new_nodes):
         self.nodes = new_nodes
-        self.normalized_nodes = [node["file"].getValue().lower() for node in self.nodes]
+        self.normalized_nodes = self._captureNodes(self.nodes)
+        # Los indices ahora son de otros nodos: lo que ya se mostro y lo que
+        # estaba en camino no sirven.
+        self._preview_rows = {}
+        if self._preview_worker is not None:
+            self._preview_worker.cancel()
+            self._preview_worker = None
+        # Otro script puede tener otro Project Directory.
+        self._cancelTargets()
+        self._base_dir = self._projectDirectory()
+        self.preview_model.clearTargets()
 
     def updatePreviews(self):
-        preview_rows = []
-        for node, normalized_path in zip(self.nodes, self.normalized_nodes):
-            if not self._isNodeAllowedByFilters(node):
-                continue
-
-            original_path = node["file"].getValue()
-            if not self._rowPassesFilter(original_path, normalized_path):
-                continue
-
-            new_path, original_html, renamed_html = self._computePathPreview(original_path)
-            changed = new_path != original_path
-            preview_rows.append(
-                {
-                    "node_name": node.name(),
-                    "node_type": node.Class(),
-                    "original_html": original_html,
-                    "renamed_html": renamed_html,
-                    "changed": changed,
-                }
-            )
+        """
+        Lanza el calculo del preview en el worker, cancelando el anterior.
+
+        Los campos se leen aca, en el hilo de la ventana; el worker recibe
+        datos y devuelve solo las filas que cambiaron.
+        """
+        self._preview_timer.stop()
+        if self._preview_worker is not None:
+            self._preview_worker.cancel()
+        worker = _PreviewWorker(
+            self.normalized_nodes,
+            self._allowedClasses(),
+            self._stageSettings(),
+            self.filter_checkbox.isChecked(),
+            self._preview_rows,
+        )
+        worker.signals.ready.connect(
+            lambda visible, changed, w=worker: self._onPreviewReady(w, visible, changed)
+        )
+        self._preview_worker = worker
+        self._preview_pool.start(worker)
 
-        self.preview_table.setRowCount(len(preview_rows))
+    def _onPreviewReady(self, worker, visible, changed):
+        if worker is not self._preview_worker:
+            # Una tanda vieja que termino antes de ver el cancel.
+            return
+        self._preview_worker = None
+        if changed:
+            rows = dict(self._preview_rows)
+            rows.update(changed)
+            self._preview_rows = rows
+        rows = self._preview_rows
+        preview_rows = [rows[node_idx] for node_idx in visible]
+        self.preview_model.setRows(preview_rows)
+        self._preview_visible = preview_rows
+        self._checkTargets(preview_rows)
+        self._updateSummary()
+
+    def _updateSummary(self):
+        preview_rows = self._preview_visible
+        targets = self.preview_model.targets
         changed_count = 0
-        for row_idx, row_data in enumerate(preview_rows):
+        missing_count = 0
+        for row_data in preview_rows:
             if row_data["changed"]:
                 changed_count += 1
-            self.preview_table.setCellWidget(
-                row_idx,
-                0,
-                self._buildNodeCell(row_data["node_name"], row_data["node_type"]),
-            )
-            self.preview_table.setCellWidget(
-                row_idx,
-                1,
-                _cell_html_label(
-                    "<span style='color:%s;'>%s</span>"
-                    % (Color.TEXT, _html_escape(row_data["node_type"]))
-                ),
-            )
-            self.preview_table.setCellWidget(
-                row_idx,
-                2,
-                _path_preview_cell(row_data["original_html"], row_data["renamed_html"]),
-            )
-            self.preview_table.setRowHeight(row_idx, 46)
-
+            state = targets.get(row_data["new_path"])
+            if _target_is_missing(row_data["node_type"], state):
+                missing_count += 1
         self.summary_label.setText(
-            "Rows: %d | With changes: %d | Nodes total: %d"
-            % (len(preview_rows), changed_count, len(self.nodes))
+            "Rows: %d | With changes: %d | Missing targets: %d | Nodes total: %d"
+            % (len(preview_rows), changed_count, missing_count, len(self.nodes))
+        )
+
+    def _checkTargets(self, preview_rows):
+        """
+        Lanza la busqueda en disco de los paths renombrados que todavia no se
+        saben. Si la tanda que esta corriendo ya los tiene todos, sigue.
+        """
+        targets = self.preview_model.targets
+        paths = set(
+            row_data["new_path"]
+            for row_data in preview_rows
+            if row_data["new_path"] not in targets
         )
+        if not paths:
+            return
+        running = self._target_worker
+        if running is not None and paths <= running.paths:
+            return
+        self._cancelTargets()
+        worker = _TargetWorker(paths, self._base_dir)
+        worker.signals.found.connect(
+            lambda states, w=worker: self._onTargetsFound(w, states)
+        )
+        self._target_worker = worker
+        self._target_pool.start(worker)
+
+    def _cancelTargets(self):
+        if self._target_worker is not None:
+            self._target_worker.cancel()
+            self._target_worker = None
+
+    def _onTargetsFound(self, worker, states):
+        # Un estado es del path, no de la tanda: aunque la tanda ya se haya
+        # reemplazado por otra, lo que encontro sigue valiendo. Solo no vale si
+        # cambio la carpeta contra la que se resuelven los relativos.
+        if worker.base_dir != self._base_dir:
+            return
+        self.preview_model.setTargets(states)
+        self._updateSummary()
 
 
 def show_search_replace_widget():
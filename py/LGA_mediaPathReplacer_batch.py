@@ -0,0 +1,371 @@
+"""
+_______________________________________________
+
+  LGA_mediaPathReplacer_batch v2.10 | Lega
+  Search and replace de paths sin Nuke: la logica de las etapas y la
+  pasada en tanda sobre muchos .nk
+
+  Cuando un proyecto se muda de N: a T: -lo que guardan justamente los
+  presets del replacer- habia que abrir cada script en Nuke y correr
+  la ventana a mano. Este modulo aplica una cadena de presets a los
+  knobs file de los Read y Write de muchos .nk sin abrir Nuke: lee el
+  script linea por linea, reescribe solo las lineas `file` de esos
+  nodos y deja todo lo demas byte por byte como estaba.
+
+  Las etapas son las MISMAS que usa la ventana: apply_stage_meta y
+  build_new_path viven aca y LGA_mediaPathReplacer las llama, asi que
+  un preset da el mismo path en la ventana y en la tanda.
+
+  Cada script va a un proceso del pool: el trabajo es leer, partir y
+  escribir texto, y con hilos el GIL lo haria de a uno. La escritura es
+  atomica -un temporal al lado y os.replace-: un script a medio
+  escribir es un script roto. Con --dry-run no se escribe nada y sale
+  un diff unificado de las lineas que cambiarian.
+
+  Uso:
+    python LGA_mediaPathReplacer_batch.py --preset "N -> T:" --dry-run
+        /proyectos/SHOW/comp
+    python LGA_mediaPathReplacer_batch.py --preset "N -> T:"
+        --report cambios.diff a.nk b.nk
+
+  Una carpeta se recorre entera buscando .nk; los autosave (.nk~,
+  .autosave) no se tocan.
+
+  No importa Qt ni Nuke a proposito.
+
+  v2.10: La lectura y escritura del .nk pasa a LGA_ToolPack_NkScript,
+         compartida con LGA_RnW_PathsToRelative_batch. El diff nombra
+         el knob de cada cambio.
+  v2.08: Modulo nuevo.
+_______________________________________________
+
+"""
+
+import argparse
+import configparser
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import LGA_ToolPack_NkScript as nkscript
+
+
+# Los nodos cuyo knob file toca la ventana: los mismos checkboxes Reads/Writes.
+DEFAULT_CLASSES = ("Read", "Write")
+DEFAULT_PRESETS_INI = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "LGA_mediaPathReplacer_presets.ini"
+)
+
+_PRESET_KEY_RE = re.compile(
+    r"^(name|search|replace|sr1_search|sr1_replace|sr1_case|sr2_search|sr2_replace|sr2_case)_preset_(\d+)$"
+)
+# Las filas sin ninguna etapa encima comparten este tag vacio en vez de crear
+# un set por caracter.
+NO_TAGS = frozenset()
+
+
+# ---------------------------------------------------------------------------
+#                            Etapas de search & replace
+# ---------------------------------------------------------------------------
+
+
+def apply_stage_meta(
+    cur_text,
+    cur_orig_map,
+    cur_tags,
+    search_text,
+    replace_text,
+    case_sensitive,
+    stage_id,
+):
+    """
+    Una etapa de search & replace, llevando la cuenta de que caracter vino
+    de donde: el mapa al original y las etapas que tocaron cada caracter son
+    lo que la ventana usa para colorear.
+
+    Devuelve (texto, mapa, tags, indices del original que cambiaron).
+    """
+    if not search_text:
+        return cur_text, cur_orig_map, cur_tags, set()
+
+    # El texto donde se busca se arma una vez por etapa y no una por
+    # coincidencia.
+    haystack = cur_text if case_sensitive else cur_text.lower()
+    needle = search_text if case_sensitive else search_text.lower()
+    if needle not in haystack:
+        # Lo normal: el path no tiene lo buscado. Se devuelve lo mismo que
+        # entro, sin copiar los mapas caracter por caracter.
+        return cur_text, cur_orig_map, cur_tags, set()
+
+    out_text_parts = []
+    out_map = []
+    out_tags = []
+    changed_orig = set()
+    idx = 0
+
+    while True:
+        pos = haystack.find(needle, idx)
+        if pos < 0:
+            break
+        end = pos + len(search_text)
+
+        out_text_parts.append(cur_text[idx:pos])
+        out_map.extend(cur_orig_map[idx:pos])
+        out_tags.extend([set(x) for x in cur_tags[idx:pos]])
+
+        src_slice_map = cur_orig_map[pos:end]
+        src_slice_tags = [set(x) for x in cur_tags[pos:end]]
+        matched_text = cur_text[pos:end]
+        if replace_text == matched_text:
+            out_text_parts.append(matched_text)
+            out_map.extend(src_slice_map)
+            out_tags.extend(src_slice_tags)
+        else:
+            for oi in src_slice_map:
+                if oi is not None:
+                    changed_orig.add(oi)
+            out_text_parts.append(replace_text)
+            out_map.extend([None] * len(replace_text))
+            out_tags.extend([{stage_id} for _ in replace_text])
+        idx = end
+
+    out_text_parts.append(cur_text[idx:])
+    out_map.extend(cur_orig_map[idx:])
+    out_tags.extend([set(x) for x in cur_tags[idx:]])
+    return "".join(out_text_parts), out_map, out_tags, changed_orig
+
+
+def apply_stages(original_path, stages):
+    """
+    Todas las etapas en orden: (texto, tags, {stage_id: indices cambiados}).
+
+    stages: [(search, replace, case_sensitive, stage_id), ...].
+    """
+    cur_text = original_path
+    cur_orig_map = list(range(len(cur_text)))
+    cur_tags = [NO_TAGS] * len(cur_text)
+    orig_stage_marks = {}
+    for search_text, replace_text, case_sensitive, stage_id in stages:
+        cur_text, cur_orig_map, cur_tags, changed_orig = apply_stage_meta(
+            cur_text,
+            cur_orig_map,
+            cur_tags,
+            search_text,
+            replace_text,
+            case_sensitive,
+            stage_id,
+        )
+        orig_stage_marks.setdefault(stage_id, set()).update(changed_orig)
+    return cur_text, cur_tags, orig_stage_marks
+
+
+def build_new_path(original_path, stages):
+    """El path despues de todas las etapas."""
+    return apply_stages(original_path, stages)[0]
+
+
+# ---------------------------------------------------------------------------
+#                                   Presets
+# ---------------------------------------------------------------------------
+
+
+def presets_from_config(config):
+    """
+    Los presets de un ConfigParser ya leido, en orden.
+
+    Acepta las claves viejas search/replace_preset_N como la etapa 1.
+    """
+    presets_by_index = {}
+    if config.has_section("Presets"):
+        for key, value in config.items("Presets"):
+            match = _PRESET_KEY_RE.match(key.lower())
+            if not match:
+                continue
+            field = match.group(1)
+            index = int(match.group(2))
+            if index not in presets_by_index:
+                presets_by_index[index] = {
+                    "name": "",
+                    "sr1_search": "",
+                    "sr1_replace": "",
+                    "sr1_case": "false",
+                    "sr2_search": "",
+                    "sr2_replace": "",
+                    "sr2_case": "false",
+                }
+            if field == "search":
+                presets_by_index[index]["sr1_search"] = value
+            elif field == "replace":
+                presets_by_index[index]["sr1_replace"] = value
+            else:
+                presets_by_index[index][field] = value
+
+    presets = []
+    for index in sorted(presets_by_index.keys()):
+        if not presets_by_index[index].get("name", "").strip():
+            presets_by_index[index]["name"] = "Preset %d" % index
+        presets.append(presets_by_index[index])
+    return presets
+
+
+def load_presets(ini_path=DEFAULT_PRESETS_INI):
+    config = configparser.ConfigParser()
+    config.read(ini_path, encoding="utf-8")
+    return presets_from_config(config)
+
+
+def preset_stages(preset):
+    """Las dos etapas de un preset, con el formato de apply_stages."""
+    return (
+        (
+            preset.get("sr1_search", ""),
+            preset.get("sr1_replace", ""),
+            preset.get("sr1_case", "false").lower() == "true",
+            1,
+        ),
+        (
+            preset.get("sr2_search", ""),
+            preset.get("sr2_replace", ""),
+            preset.get("sr2_case", "false").lower() == "true",
+            2,
+        ),
+    )
+
+
+def chain_stages(presets, names):
+    """
+    Las etapas de varios presets en cadena, en el orden pedido.
+
+    Un nombre que no existe es un error y no se saltea: aplicar media
+    cadena deja los scripts en un estado que nadie pidio.
+    """
+    by_name = {}
+    for preset in presets:
+        by_name.setdefault(preset.get("name", "").strip(), preset)
+    stages = []
+    for name in names:
+        preset = by_name.get(name.strip())
+        if preset is None:
+            raise KeyError(name)
+        stages.extend(preset_stages(preset))
+    return tuple(stages)
+
+
+# ---------------------------------------------------------------------------
+#                               Un script entero
+# ---------------------------------------------------------------------------
+# Leer y reescribir el .nk es de LGA_ToolPack_NkScript, que comparte con
+# LGA_RnW_PathsToRelative_batch. Aca solo se dice que knob mirar y que hacer
+# con su valor.
+parse_knob_value = nkscript.parse_knob_value
+format_knob_value = nkscript.format_knob_value
+find_scripts = nkscript.find_scripts
+diff_report = nkscript.diff_report
+
+
+class _StagesEdit(nkscript.NkEdit):
+    """El knob file de las clases pedidas, pasado por las etapas."""
+
+    def __init__(self, stages, classes):
+        self.stages = stages
+        self.knobs = dict((node_class, ("file",)) for node_class in classes)
+
+    def knob(self, node, name, value):
+        return build_new_path(value, self.stages)
+
+
+def rewrite_script(path, stages, classes=DEFAULT_CLASSES, dry_run=False):
+    """
+    Aplica las etapas a los knobs file de un .nk.
+
+    Devuelve el dict de LGA_ToolPack_NkScript.rewrite_script. Corre en un
+    proceso del pool: no tira excepciones, las devuelve.
+    """
+    return nkscript.rewrite_script(path, _StagesEdit(stages, classes), dry_run)
+
+
+# ---------------------------------------------------------------------------
+#                                  La tanda
+# ---------------------------------------------------------------------------
+
+
+def run_batch(scripts, stages, classes=DEFAULT_CLASSES, dry_run=False, jobs=None):
+    """Los resultados de rewrite_script, en el orden de `scripts`."""
+    if not scripts:
+        return []
+    if jobs == 1 or len(scripts) == 1:
+        return [rewrite_script(s, stages, classes, dry_run) for s in scripts]
+    count = len(scripts)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(
+            pool.map(
+                rewrite_script,
+                scripts,
+                [stages] * count,
+                [tuple(classes)] * count,
+                [dry_run] * count,
+                chunksize=nkscript.pool_chunksize(count, jobs),
+            )
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Apply Media Path Replacer presets to the file knobs of .nk scripts."
+    )
+    parser.add_argument("paths", nargs="+", help=".nk files or folders to search")
+    parser.add_argument(
+        "--preset",
+        action="append",
+        required=True,
+        help="preset name; repeat to chain presets in order",
+    )
+    parser.add_argument("--ini", default=DEFAULT_PRESETS_INI, help="presets .ini")
+    parser.add_argument(
+        "--classes",
+        default=",".join(DEFAULT_CLASSES),
+        help="node classes whose file knob is rewritten (default Read,Write)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="report only")
+    parser.add_argument("--jobs", type=int, default=None, help="processes")
+    parser.add_argument("--report", help="write the diff here instead of stdout")
+    args = parser.parse_args(argv)
+
+    presets = load_presets(args.ini)
+    try:
+        stages = chain_stages(presets, args.preset)
+    except KeyError as missing:
+        parser.error(
+            "unknown preset %s. Available: %s"
+            % (missing, ", ".join(p["name"] for p in presets) or "none")
+        )
+    classes = tuple(c.strip() for c in args.classes.split(",") if c.strip())
+    scripts = find_scripts(args.paths)
+    results = run_batch(scripts, stages, classes, args.dry_run, args.jobs)
+
+    report = diff_report(results)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8", errors="surrogateescape") as handle:
+            handle.write(report)
+    else:
+        sys.stdout.write(report)
+
+    changed = sum(1 for r in results if r["changes"])
+    knobs = sum(len(r["changes"]) for r in results)
+    errors = [r for r in results if r["error"]]
+    sys.stderr.write(
+        "%d scripts, %d with changes, %d file knobs%s%s\n"
+        % (
+            len(results),
+            changed,
+            knobs,
+            " (dry run, nothing written)" if args.dry_run else "",
+            ", %d errors" % len(errors) if errors else "",
+        )
+    )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
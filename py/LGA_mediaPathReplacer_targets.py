@@ -0,0 +1,266 @@
+"""
+_______________________________________
+
+  LGA_mediaPathReplacer_targets v2.10 | Lega
+  Si el path renombrado de cada nodo existe en disco
+
+  Despues de un Replace, un path roto se descubria recien en el Media
+  Manager. Este modulo contesta, para cada path nuevo del preview, si
+  ahi hay algo: el archivo, alguna frame de la secuencia, o al menos
+  la carpeta.
+
+  No se pregunta archivo por archivo. Los paths se agrupan por
+  carpeta y cada carpeta se lista UNA vez: dos mil Reads renombrados
+  que viven en cuarenta carpetas son cuarenta listados, no dos mil
+  stats. Una secuencia se busca en el listado por su patron -el
+  "####" o el "%04d" como digitos-, asi que no hace falta saber el
+  rango ni tocar la primera frame.
+
+  Los listados se guardan unos segundos en un cache del modulo, igual
+  que los de LGA_MediaManager_paths: lo comparten todas las tandas y
+  todos los hilos, y tipear en los campos no vuelve a listar las
+  carpetas que ya se vieron.
+
+  No importa Qt ni Nuke a proposito, igual que
+  LGA_mediaPathReplacer_batch: asi se puede probar sin PySide.
+
+  v2.09: Modulo nuevo.
+_______________________________________
+
+"""
+
+import bisect
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# Cuanto vale el listado de una carpeta. Es corto a proposito: mientras la
+# ventana esta abierta puede terminar un render o una copia, y lo nuevo tiene
+# que aparecer sin reabrirla.
+LISTING_TTL_SECONDS = 10.0
+# Tope de carpetas recordadas. Pasado, se tiran las vencidas, y si no alcanza
+# se empieza de cero: es un cache, no un indice del servidor.
+LISTING_CACHE_MAX = 4096
+# Cuantas carpetas se listan a la vez. Contra un servidor cada listado es
+# sobre todo espera; mas hilos que esto solo le suman carga.
+CHECK_THREADS = 8
+
+# Lo que se puede contestar de un path.
+FOUND = "found"  # el archivo, o alguna frame de la secuencia
+NO_FILES = "no_files"  # la carpeta esta, pero adentro no hay nada que coincida
+NO_FOLDER = "no_folder"  # ni la carpeta
+UNKNOWN = "unknown"  # vacio, o con una expresion que solo Nuke evalua
+
+# Unidad de Windows al principio del path (T:/ o T:\).
+_DRIVE_RE = re.compile(r"^[a-zA-Z]:[\\/]")
+# Las marcas de frame y de vista de Nuke dentro del nombre de un archivo.
+_TOKEN_RE = re.compile(r"#+|%0?(\d*)d|%[Vv]")
+# En Windows el disco no distingue mayusculas; en Linux si.
+_FLAGS = re.IGNORECASE if os.name == "nt" else 0
+
+
+# {carpeta: (hora, nombres)}. nombres es una tupla ordenada con normcase, o
+# None si la carpeta no se pudo leer. Va con lock: la poda lo recorre.
+_listing_cache = {}
+_listing_lock = threading.Lock()
+
+
+def clear_cache():
+    """Olvida todos los listados. La proxima consulta va a disco."""
+    with _listing_lock:
+        _listing_cache.clear()
+
+
+def _listing(carpeta, max_age=LISTING_TTL_SECONDS):
+    """
+    Los nombres de lo que hay en `carpeta`, ordenados y con normcase.
+
+    None si la carpeta no existe o no se puede leer. Se guarda igual: una
+    unidad que no responde es justo la que mas tarda en decir que no.
+    """
+    clave = os.path.normcase(carpeta)
+    ahora = time.time()
+    if max_age > 0:
+        with _listing_lock:
+            guardado = _listing_cache.get(clave)
+        if guardado is not None and ahora - guardado[0] < max_age:
+            return guardado[1]
+    try:
+        nombres = tuple(sorted(os.path.normcase(n) for n in os.listdir(carpeta)))
+    except (OSError, ValueError):
+        nombres = None
+    with _listing_lock:
+        if len(_listing_cache) >= LISTING_CACHE_MAX:
+            for vieja in [
+                c for c, (hora, _) in _listing_cache.items()
+                if ahora - hora >= LISTING_TTL_SECONDS
+            ]:
+                del _listing_cache[vieja]
+            if len(_listing_cache) >= LISTING_CACHE_MAX:
+                _listing_cache.clear()
+        _listing_cache[clave] = (ahora, nombres)
+    return nombres
+
+
+def absolute(path, base_dir=""):
+    """
+    El path listo para buscar en disco, o None si no se puede saber.
+
+    Un path relativo se resuelve contra `base_dir`, que es el Project
+    Directory: es contra lo que Nuke resuelve los relativos. Un path con
+    corchetes es una expresion TCL y solo Nuke sabe a donde apunta.
+    """
+    path = (path or "").strip()
+    if not path or "[" in path:
+        return None
+    absoluto = (
+        _DRIVE_RE.match(path)
+        or path.startswith("//")
+        or path.startswith("\\\\")
+        or os.path.isabs(path)
+    )
+    if not absoluto:
+        if not base_dir:
+            return None
+        path = os.path.join(base_dir, path)
+    return os.path.normpath(path)
+
+
+def _sub_token(match):
+    texto = match.group(0)
+    if texto.startswith("#"):
+        return r"-?\d{%d,}" % len(texto)
+    if texto in ("%V", "%v"):
+        return r".+?" if texto == "%V" else r"."
+    ancho = match.group(1)
+    return r"-?\d{%s,}" % ancho if ancho else r"-?\d+"
+
+
+def _frame_width(token):
+    """Cuantos digitos pide una marca de frame, o None si es de vista."""
+    if token.startswith("#"):
+        return len(token)
+    if token in ("%V", "%v"):
+        return None
+    ancho = token[1:-1].lstrip("0")
+    return int(ancho) if ancho else 1
+
+
+def _is_frame(texto, ancho):
+    if texto.startswith("-"):
+        texto = texto[1:]
+    return len(texto) >= ancho and texto.isdigit()
+
+
+def _state_in(nombres, nombre):
+    """
+    El estado de un nombre de archivo contra el listado de su carpeta.
+
+    El listado esta ordenado, asi que los candidatos son los que empiezan
+    con lo que va antes de la primera marca: se llega con bisect. Lo comun
+    -una sola marca de frame- se resuelve comparando texto; solo un nombre
+    con varias marcas o con la vista arma una regex.
+    """
+    if nombres is None:
+        return NO_FOLDER
+    # Las marcas se buscan en el nombre tal cual: en Windows normcase pasa
+    # a minusculas, y "%V" no es "%v".
+    tokens = list(_TOKEN_RE.finditer(nombre))
+    if not tokens:
+        clave = os.path.normcase(nombre)
+        desde = bisect.bisect_left(nombres, clave)
+        hay = desde < len(nombres) and nombres[desde] == clave
+        return FOUND if hay else NO_FILES
+
+    prefijo = os.path.normcase(nombre[: tokens[0].start()])
+    ancho = _frame_width(tokens[0].group(0)) if len(tokens) == 1 else None
+    if ancho is not None:
+        sufijo = os.path.normcase(nombre[tokens[0].end() :])
+        patron = None
+    else:
+        partes = []
+        desde = 0
+        for token in tokens:
+            partes.append(re.escape(nombre[desde : token.start()]))
+            partes.append(_sub_token(token))
+            desde = token.end()
+        partes.append(re.escape(nombre[desde:]))
+        patron = re.compile("".join(partes) + r"\Z", _FLAGS)
+
+    for candidato in nombres[bisect.bisect_left(nombres, prefijo) :]:
+        if not candidato.startswith(prefijo):
+            break
+        if patron is not None:
+            if patron.match(candidato):
+                return FOUND
+        elif candidato.endswith(sufijo) and _is_frame(
+            candidato[len(prefijo) : len(candidato) - len(sufijo)], ancho
+        ):
+            return FOUND
+    return NO_FILES
+
+
+def _check_folder(carpeta, nombres_por_path, cancelled):
+    if cancelled():
+        return {}
+    listado = _listing(carpeta)
+    return {
+        path: _state_in(listado, nombre) for path, nombre in nombres_por_path.items()
+    }
+
+
+def check(paths, base_dir="", cancelled=None, threads=CHECK_THREADS):
+    """
+    El estado de cada path, de a una carpeta por vez: un generador de dicts
+    {path: estado} que se pueden ir mostrando a medida que llegan.
+
+    Cada carpeta distinta se lista una sola vez, con hasta `threads` a la
+    vez. `cancelled` es una funcion sin argumentos: cuando da True se dejan
+    de lanzar listados y el generador termina.
+    """
+    cancelled = cancelled or (lambda: False)
+    por_carpeta = {}
+    desconocidos = {}
+    for path in set(paths):
+        absoluto = absolute(path, base_dir)
+        if absoluto is None:
+            desconocidos[path] = UNKNOWN
+            continue
+        carpeta, nombre = os.path.split(absoluto)
+        por_carpeta.setdefault(carpeta, {})[path] = nombre
+    if desconocidos:
+        yield desconocidos
+    if not por_carpeta:
+        return
+    if threads <= 1 or len(por_carpeta) == 1:
+        for carpeta, nombres in por_carpeta.items():
+            if cancelled():
+                return
+            yield _check_folder(carpeta, nombres, cancelled)
+        return
+    pool = ThreadPoolExecutor(max_workers=min(threads, len(por_carpeta)))
+    futuros = [
+        pool.submit(_check_folder, carpeta, nombres, cancelled)
+        for carpeta, nombres in por_carpeta.items()
+    ]
+    try:
+        for futuro in as_completed(futuros):
+            if cancelled():
+                return
+            yield futuro.result()
+    finally:
+        # Lo que no arranco no arranca; lo que esta listando termina solo.
+        for futuro in futuros:
+            futuro.cancel()
+        pool.shutdown(wait=False)
+
+
+def states(paths, base_dir=""):
+    """Todos los estados de una vez: {path: estado}."""
+    salida = {}
+    for tanda in check(paths, base_dir):
+        salida.update(tanda)
+    return salida
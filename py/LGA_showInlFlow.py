@@ -1,8 +1,10 @@
 """
 _____________________________________________________________________________________________________
 
-  LGA_showInFlow v2.51 | Lega
+  LGA_showInFlow v2.52 | Lega
   Abre la URL de la task Comp del shot, tomando la informacion del nombre del script
+
+  v2.52: ShowInFlow.dat se lee y escribe con LGA_ToolPack_ConfigStore.
 _____________________________________________________________________________________________________
 """
 
@@ -17,6 +19,8 @@ import subprocess
 import base64  # Importar base64
 import binascii  # Importar binascii para la excepcion
 
+import LGA_ToolPack_ConfigStore as config_store
+
 # Variable global para controlar el debug
 DEBUG = False  # Poner en False para desactivar los mensajes de debug
 
@@ -28,27 +32,8 @@ def debug_print(*message):
 
 
 def get_user_config_dir():
-    """
-    Obtiene el directorio de configuracion del usuario segun el sistema operativo.
-    Windows: %APPDATA%
-    Mac: ~/Library/Application Support
-    """
-    system = platform.system()
-    if system == "Windows":
-        config_path = os.getenv("APPDATA")
-        if not config_path:
-            debug_print("Error: No se pudo encontrar la variable de entorno APPDATA.")
-            return None
-    elif system == "Darwin":  # macOS
-        config_path = os.path.expanduser("~/Library/Application Support")
-    else:
-        # Para otros sistemas, usar el directorio home como fallback
-        config_path = os.path.expanduser("~/.config")
-        debug_print(
-            f"Sistema no reconocido ({system}), usando ~/.config como fallback."
-        )
-
-    return config_path
+    """Directorio de configuracion del usuario: ver LGA_ToolPack_ConfigStore."""
+    return config_store.get_user_config_dir()
 
 
 # Agregar la ruta de la carpeta shotgun_api3 al sys.path
@@ -71,15 +56,7 @@ CONFIG_PASSWORD_KEY = "shotgrid_password"
 
 def get_config_path():
     """Devuelve la ruta completa al archivo de configuracion."""
-    try:
-        user_config_dir = get_user_config_dir()
-        if not user_config_dir:
-            return None
-        config_dir = os.path.join(user_config_dir, "LGA", "ToolPack")
-        return os.path.join(config_dir, CONFIG_FILE_NAME)
-    except Exception as e:
-        debug_print(f"Error al obtener la ruta de configuracion: {e}")
-        return None
+    return config_store.get_config_path(CONFIG_FILE_NAME)
 
 
 def ensure_config_exists():
@@ -88,31 +65,15 @@ def ensure_config_exists():
     Si no existen, los crea con valores vacios codificados.
     """
     config_file_path = get_config_path()
-    if not config_file_path:
+    if not config_file_path or os.path.exists(config_file_path):
         return
-
-    config_dir = os.path.dirname(config_file_path)
-
     try:
-        # Crear el directorio si no existe
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
-            debug_print(f"Directorio de configuracion creado: {config_dir}")
-
-        # Crear el archivo .dat si no existe, con lineas vacias codificadas
-        if not os.path.exists(config_file_path):
-            # Escribir lineas vacias codificadas para mantener estructura
-            empty_encoded = base64.b64encode("".encode("utf-8")).decode("utf-8")
-            with open(config_file_path, "w", encoding="utf-8") as configfile:
-                configfile.write(f"{empty_encoded}\\n")  # URL
-                configfile.write(f"{empty_encoded}\\n")  # Login
-                configfile.write(f"{empty_encoded}\\n")  # Password
-            debug_print(
-                f"Archivo de configuración creado: {config_file_path}. Por favor, complételo usando LGA_ToolPack_settings."
-            )
-        # else: # Debugging opcional
-        #     debug_print(f"Archivo de configuración ya existe: {config_file_path}")
-
+        # Lineas vacias codificadas para mantener estructura: URL, login, password
+        empty_encoded = base64.b64encode("".encode("utf-8")).decode("utf-8")
+        config_store.write_lines(config_file_path, [empty_encoded] * 3)
+        debug_print(
+            f"Archivo de configuración creado: {config_file_path}. Por favor, complételo usando LGA_ToolPack_settings."
+        )
     except Exception as e:
         debug_print(f"Error al asegurar la configuración: {e}")
 
@@ -123,30 +84,22 @@ def get_credentials_from_config():
     Devuelve (url, login, password) decodificados o (None, None, None) si hay errores.
     """
     config_file_path = get_config_path()
-    if not config_file_path or not os.path.exists(config_file_path):
-        debug_print(
-            f"Archivo de configuración (.dat) no encontrado en la ruta esperada: {config_file_path}"
-        )
+    if not config_file_path:
         return None, None, None
 
     try:
-        with open(config_file_path, "r", encoding="utf-8") as configfile:
-            lines = configfile.readlines()
+        lines = config_store.read_lines(config_file_path)
 
         if len(lines) < 3:
             debug_print(
-                f"Archivo de configuración {config_file_path} está incompleto o corrupto."
+                f"Archivo de configuración {config_file_path} no encontrado, incompleto o corrupto."
             )
             return None, None, None
 
         # Decodificar cada linea
-        sg_url_encoded = lines[0].strip()
-        sg_login_encoded = lines[1].strip()
-        sg_password_encoded = lines[2].strip()
-
-        sg_url = base64.b64decode(sg_url_encoded).decode("utf-8")
-        sg_login = base64.b64decode(sg_login_encoded).decode("utf-8")
-        sg_password = base64.b64decode(sg_password_encoded).decode("utf-8")
+        sg_url = base64.b64decode(lines[0]).decode("utf-8")
+        sg_login = base64.b64decode(lines[1]).decode("utf-8")
+        sg_password = base64.b64decode(lines[2]).decode("utf-8")
 
         # Validar que los valores no esten vacios despues de decodificar
         # (La contraseña podria ser valida aunque este vacia conceptualmente,
@@ -184,17 +137,10 @@ def save_credentials_to_config(url, login, password):
         login_encoded = base64.b64encode(login.encode("utf-8")).decode("utf-8")
         password_encoded = base64.b64encode(password.encode("utf-8")).decode("utf-8")
 
-        # Escribir las lineas codificadas usando writelines
-        lines_to_write = [
-            f"{url_encoded}\n",
-            f"{login_encoded}\n",
-            f"{password_encoded}\n",
-        ]
-        with open(config_file_path, "w", encoding="utf-8") as configfile:
-            configfile.writelines(lines_to_write)
-        debug_print(
-            "Credenciales de ShowInFlow guardadas de forma segura (writelines)."
+        config_store.write_lines(
+            config_file_path, [url_encoded, login_encoded, password_encoded]
         )
+        debug_print("Credenciales de ShowInFlow guardadas de forma segura.")
         return True
     except Exception as e:
         debug_print(f"Error al guardar la configuración codificada: {e}")
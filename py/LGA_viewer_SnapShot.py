@@ -1,8 +1,21 @@
 """
 ______________________________________________________________________________
 
-  LGA_viewer_SnapShot v0.65 - Lega
+  LGA_viewer_SnapShot v0.68 - Lega
   Crea un snapshot de la imagen actual del viewer y lo copia al portapapeles
+
+  v0.66 - Un solo Write de captura, deshabilitado entre snapshots, en vez
+          de crear y borrar uno en cada toma. Se crea con nuke.nodes, sin
+          deseleccionar todo el script, y no entra al undo ni al .nk. El
+          numero y el ultimo snapshot quedan en memoria: no se lista la
+          carpeta temporal y la galeria se escribe con los bytes ya leidos.
+          Render Complete ignora el Write de captura, asi que ya no se
+          cambia el wav por el de silencio en cada snapshot. El Read del
+          hold tambien se crea con nuke.nodes, sin tocar la seleccion.
+  v0.68 - El Write de captura tambien se borra antes de cada autosave:
+          onScriptSave no corre en los autosaves y quedaba en el
+          .autosave. El Audit de Write Presets y Write Focus ignoran los
+          Writes con CAPTURE_KNOB.
 ______________________________________________________________________________
 
 """
@@ -21,9 +34,19 @@ QEventLoop = QtCore.QEventLoop
 
 DEBUG = False
 
+CAPTURE_NODE_NAME = "LGA_SnapShot_Capture"
+# El mismo nombre que LGA_Write_RenderComplete.SKIP_KNOB: un render de este
+# Write no suena, no suma knobs ni entra al historial de renders.
+CAPTURE_KNOB = "lga_render_complete_skip"
+
 # Variable global para mantener el estado del snapshot hold
 _lga_snapshot_hold_state = None
 
+# El Write de captura (fullName) y el ultimo snapshot de esta sesion
+_snapshot_state = {"capture": None, "number": None, "path": None, "installed": False}
+# {(carpeta, proyecto): (mtime_ns de la carpeta, proximo numero)}
+_gallery_numbers = {}
+
 
 def debug_print(*message):
     if DEBUG:
@@ -96,6 +119,42 @@ def cleanup_old_snapshots(current_number):
         debug_print("No habia snapshots antiguos para eliminar")
 
 
+def next_snapshot_path():
+    """
+    (numero, ruta) del proximo snapshot. El numero sale de memoria; solo el
+    primer snapshot de la sesion lista la carpeta temporal.
+    """
+    number = _snapshot_state["number"]
+    if number is None:
+        number = get_next_snapshot_number()
+    else:
+        number += 1
+    temp_dir = tempfile.gettempdir()
+    output_path = os.path.join(temp_dir, f"LGA_snapshot_{number}.jpg")
+    # Otro Nuke abierto usa la misma carpeta temporal
+    while os.path.exists(output_path):
+        number += 1
+        output_path = os.path.join(temp_dir, f"LGA_snapshot_{number}.jpg")
+    return number, output_path
+
+
+def remember_snapshot(number, output_path):
+    """
+    Guarda el snapshot nuevo en memoria y borra el anterior. Sin uno anterior
+    en memoria, limpia la carpeta temporal como antes.
+    """
+    previous_path = _snapshot_state["path"]
+    _snapshot_state.update(number=number, path=output_path)
+    if previous_path is None:
+        cleanup_old_snapshots(number)
+    elif previous_path != output_path:
+        try:
+            os.remove(previous_path)
+            debug_print(f"Eliminado snapshot antiguo: {previous_path}")
+        except OSError as e:
+            debug_print(f"Error al eliminar {previous_path}: {e}")
+
+
 def get_latest_snapshot_path():
     """
     Obtiene la ruta del snapshot con el numero mas alto.
@@ -104,6 +163,11 @@ def get_latest_snapshot_path():
     import glob
     import re
 
+    # El de esta sesion, si sigue en disco: sin listar la carpeta temporal
+    last_path = _snapshot_state["path"]
+    if last_path and os.path.exists(last_path):
+        return last_path
+
     temp_dir = tempfile.gettempdir()
     pattern = os.path.join(temp_dir, "LGA_snapshot_*.jpg")
     existing_files = glob.glob(pattern)
@@ -186,6 +250,11 @@ def get_next_gallery_number(project_dir, project_name):
         import glob
         import re
 
+        # La carpeta no cambio desde el ultimo snapshot: el numero ya se sabe
+        cached = _gallery_numbers.get((project_dir, project_name))
+        if cached and cached[0] == os.stat(project_dir).st_mtime_ns:
+            return cached[1]
+
         # Buscar archivos existentes con el patron del proyecto
         pattern = os.path.join(project_dir, f"{project_name}_*.jpg")
         existing_files = glob.glob(pattern)
@@ -222,10 +291,11 @@ def get_next_gallery_number(project_dir, project_name):
         return 1
 
 
-def save_snapshot_to_gallery(snapshot_path):
+def save_snapshot_to_gallery(snapshot_path, data=None):
     """
     Guarda una copia del snapshot en la carpeta snapshot_gallery.
     Crea subcarpetas por proyecto y numera los archivos secuencialmente.
+    Con data -los bytes del jpg ya leidos- no vuelve a leer el snapshot.
     """
     try:
         # Obtener informacion del proyecto
@@ -254,9 +324,17 @@ def save_snapshot_to_gallery(snapshot_path):
         gallery_path = os.path.join(project_dir, gallery_filename)
 
         # Copiar el archivo a la galeria
-        import shutil
+        if data is not None:
+            with open(gallery_path, "wb") as handle:
+                handle.write(data)
+        else:
+            import shutil
 
-        shutil.copy2(snapshot_path, gallery_path)
+            shutil.copy2(snapshot_path, gallery_path)
+        _gallery_numbers[(project_dir, full_project_name)] = (
+            os.stat(project_dir).st_mtime_ns,
+            next_number + 1,
+        )
 
         debug_print(f"✅ Snapshot guardado en galeria: {gallery_filename}")
         print(
@@ -272,86 +350,6 @@ def save_snapshot_to_gallery(snapshot_path):
         return None
 
 
-def check_render_complete_module():
-    """
-    Verifica si el modulo LGA_Write_RenderComplete esta disponible y si el sonido esta activado.
-    Retorna True si ambas condiciones se cumplen, False en caso contrario.
-    """
-    try:
-        # Intentar importar las funciones necesarias del modulo RenderComplete
-        from LGA_Write_RenderComplete import (
-            get_sound_enabled_from_config,
-            get_wav_path_from_config,
-            save_wav_path_to_config,
-        )
-
-        # Verificar si el sonido esta activado en la configuracion
-        sound_enabled = get_sound_enabled_from_config()
-        debug_print(f"RenderComplete encontrado. Sonido activado: {sound_enabled}")
-        return sound_enabled
-
-    except ImportError as e:
-        debug_print(f"Modulo LGA_Write_RenderComplete no encontrado: {e}")
-        return False
-    except Exception as e:
-        debug_print(f"Error al verificar RenderComplete: {e}")
-        return False
-
-
-def set_silence_wav_temporarily():
-    """
-    Guarda el wav actual y lo reemplaza temporalmente por el archivo de silencio.
-    Retorna el path del wav original para poder restaurarlo despues.
-    """
-    try:
-        from LGA_Write_RenderComplete import (
-            get_wav_path_from_config,
-            save_wav_path_to_config,
-        )
-
-        # Obtener el wav actual
-        original_wav_path = get_wav_path_from_config()
-        debug_print(f"WAV original: {original_wav_path}")
-
-        # Crear el path del archivo de silencio (en la misma carpeta que este script)
-        silence_wav_path = os.path.join(
-            os.path.dirname(__file__), "LGA_Write_RenderComplete_silence.wav"
-        )
-
-        # Verificar que el archivo de silencio existe
-        if not os.path.exists(silence_wav_path):
-            debug_print(f"Archivo de silencio no encontrado: {silence_wav_path}")
-            return original_wav_path
-
-        # Guardar temporalmente el wav de silencio
-        save_wav_path_to_config(silence_wav_path)
-        debug_print(f"WAV cambiado temporalmente a: {silence_wav_path}")
-
-        return original_wav_path
-
-    except Exception as e:
-        debug_print(f"Error al configurar wav de silencio: {e}")
-        return None
-
-
-def restore_original_wav(original_wav_path):
-    """
-    Restaura el wav original en la configuracion.
-    """
-    if not original_wav_path:
-        debug_print("No hay wav original para restaurar")
-        return
-
-    try:
-        from LGA_Write_RenderComplete import save_wav_path_to_config
-
-        save_wav_path_to_config(original_wav_path)
-        debug_print(f"WAV restaurado a: {original_wav_path}")
-
-    except Exception as e:
-        debug_print(f"Error al restaurar wav original: {e}")
-
-
 def get_viewer_info():
     """
     Obtiene informacion del viewer activo y el nodo conectado.
@@ -420,6 +418,131 @@ def get_viewer_info_for_show():
     return viewer, view_node, input_index, input_node
 
 
+def _group_name(node):
+    """El fullName del Group del nodo, "" en el root."""
+    return node.fullName().rpartition(".")[0]
+
+
+def _find_capture_node(group_name):
+    candidates = [
+        _snapshot_state["capture"],
+        f"{group_name}.{CAPTURE_NODE_NAME}" if group_name else CAPTURE_NODE_NAME,
+    ]
+    with nuke.root():
+        for full_name in candidates:
+            if not full_name:
+                continue
+            node = nuke.toNode(full_name)
+            if (
+                node is not None
+                and node.knob(CAPTURE_KNOB) is not None
+                and _group_name(node) == group_name
+            ):
+                return node
+    return None
+
+
+def delete_capture_node():
+    """Borra el Write de captura, si hay uno. Se vuelve a crear en el proximo snapshot."""
+    full_name = _snapshot_state["capture"]
+    _snapshot_state["capture"] = None
+    if not full_name:
+        return
+    with nuke.root():
+        node = nuke.toNode(full_name)
+    if node is None or node.knob(CAPTURE_KNOB) is None:
+        return
+    nuke.Undo.disable()
+    try:
+        nuke.delete(node)
+        debug_print(f"Write de captura eliminado: {full_name}")
+    finally:
+        nuke.Undo.enable()
+
+
+def _forget_capture_node():
+    # El Write se cierra con el script
+    _snapshot_state["capture"] = None
+
+
+def _before_autosave(filename):
+    # Los autosaves no pasan por onScriptSave; el filtro recibe y devuelve
+    # el nombre del .autosave
+    delete_capture_node()
+    return filename
+
+
+def install_callbacks():
+    """
+    El Write de captura se borra antes de cada save y de cada autosave:
+    nunca queda en el .nk ni en el .autosave.
+    """
+    if _snapshot_state["installed"]:
+        return
+    nuke.addOnScriptSave(delete_capture_node)
+    nuke.addAutoSaveFilter(_before_autosave)
+    nuke.addOnScriptClose(_forget_capture_node)
+    _snapshot_state["installed"] = True
+
+
+def get_capture_node(input_node):
+    """
+    El Write de captura del Group de input_node; lo crea la primera vez. Se
+    crea con nuke.nodes: no depende de la seleccion ni la cambia. Llamar con
+    el undo deshabilitado.
+    """
+    group_name = _group_name(input_node)
+    node = _find_capture_node(group_name)
+    if node is not None:
+        _snapshot_state["capture"] = node.fullName()
+        return node
+
+    # Uno de otro Group no sirve: no se puede conectar entre Groups
+    delete_capture_node()
+    install_callbacks()
+    with nuke.root():
+        group = nuke.toNode(group_name) if group_name else nuke.root()
+    with group:
+        node = nuke.nodes.Write(
+            name=CAPTURE_NODE_NAME,
+            file_type="jpeg",
+            postage_stamp=False,
+            hide_input=True,
+            disable=True,
+            label="LGA_SNAPSHOT",
+            xpos=input_node.xpos(),
+            ypos=input_node.ypos() + input_node.screenHeight() + 10,
+        )
+    knob = nuke.Boolean_Knob(CAPTURE_KNOB, "")
+    knob.setFlag(nuke.INVISIBLE)
+    node.addKnob(knob)
+    _snapshot_state["capture"] = node.fullName()
+    debug_print(f"Write de captura creado: {node.fullName()}")
+    return node
+
+
+def render_capture(input_node, output_path, frame):
+    """
+    Renderiza un frame de input_node a output_path con el Write de captura.
+    Entre snapshots el Write queda deshabilitado y sin input: un Render All
+    no lo ve. Nada de esto entra al undo.
+    """
+    nuke.Undo.disable()
+    try:
+        capture = get_capture_node(input_node)
+        # Blindaje: convertir path a forward slashes para evitar problemas de escapes
+        capture["file"].setValue(output_path.replace("\\", "/"))
+        capture.setInput(0, input_node)
+        capture["disable"].setValue(False)
+        try:
+            nuke.execute(capture, frame, frame)
+        finally:
+            capture["disable"].setValue(True)
+            capture.setInput(0, None)
+    finally:
+        nuke.Undo.enable()
+
+
 def take_snapshot(save_to_gallery=False):
     # --- Comprobaciones iniciales del viewer de Nuke ---
     viewer_info = get_viewer_info()
@@ -466,134 +589,59 @@ def take_snapshot(save_to_gallery=False):
         nuke.message(error_msg)
         return
 
-    # --- Una vez que las comprobaciones iniciales son satisfactorias, proceder con la lógica RenderComplete ---
-    render_complete_active = check_render_complete_module()
-    original_wav_path = None
-
-    # Si RenderComplete esta activo, cambiar temporalmente el wav
-    if render_complete_active:
-        original_wav_path = set_silence_wav_temporarily()
+    # --- Una vez que las comprobaciones iniciales son satisfactorias, generar el snapshot ---
+    snapshot_number, output_path = next_snapshot_path()
+    frame = int(nuke.frame())
+    debug_print("Generando snapshot temporal en:", output_path)
 
     try:
-        # Obtener el siguiente numero para el snapshot
-        snapshot_number = get_next_snapshot_number()
-        temp_dir = tempfile.gettempdir()
-        output_path = os.path.join(temp_dir, f"LGA_snapshot_{snapshot_number}.jpg")
-
-        frame = int(nuke.frame())
-
-        # Obtener la posicion del nodo de entrada
-        input_node_xpos = input_node.xpos()
-        input_node_ypos = input_node.ypos()
+        render_capture(input_node, output_path, frame)
+    except Exception as e:
+        error_msg = f"Error al ejecutar el Write: {str(e)}"
+        debug_print(f"ERROR: {error_msg}")
+        nuke.message(error_msg)
+        return
 
-        # 1. Recordar el nodo seleccionado actualmente
-        originally_selected_nodes = list(nuke.selectedNodes())
-        debug_print(
-            f"Nodos originalmente seleccionados: {[n.name() for n in originally_selected_nodes]}"
+    if not os.path.exists(output_path):
+        nuke.message(
+            "Error: el archivo del snapshot no se generó. Por favor, verifica los permisos o la ruta temporal."
         )
+        return
 
-        try:
-            # 2. Deseleccionar todos los nodos y seleccionar solo el nodo conectado al viewer
-            for node in nuke.allNodes():
-                node.setSelected(False)
-            input_node.setSelected(True)
-            debug_print(f"Nodo seleccionado temporalmente: {input_node.name()}")
-
-            # Calcular el offset Y basado en la altura del nodo de entrada
-            dynamic_y_offset = input_node.screenHeight() + 10
-            debug_print(f"Offset Y dinamico: {dynamic_y_offset}")
-
-            # 3. Crear el Write temporal (ahora se creara conectado al nodo correcto)
-            write_node = nuke.createNode(
-                "Write",
-                "file_type jpeg postage_stamp false hide_input true label 'LGA_TEMP'",
-                inpanel=False,
-            )
-
-            # Mover el nodo Write a la posicion del nodo de entrada
-            write_node.setXpos(input_node_xpos)
-            write_node.setYpos(input_node_ypos + dynamic_y_offset)
-
-            # Blindaje: convertir path a forward slashes para evitar problemas de escapes
-            safe_path = output_path.replace("\\", "/")
-            write_node["file"].setValue(safe_path)
-
-            debug_print("Generando snapshot temporal en:", safe_path)
-
-            try:
-                nuke.execute(write_node, frame, frame)
-            except Exception as e:
-                # Mejorar el manejo de errores del Write
-                error_msg = f"Error al ejecutar el Write: {str(e)}"
-                debug_print(f"ERROR: {error_msg}")
-
-                # Limpiar el nodo Write antes de mostrar error
-                if nuke.exists(write_node.name()):
-                    nuke.delete(write_node)
-
-                nuke.message(error_msg)
-                return
-            finally:
-                # Asegurar que el nodo Write se elimine incluso si hay error
-                if nuke.exists(write_node.name()):
-                    nuke.delete(write_node)
-                    debug_print("Nodo Write temporal eliminado correctamente")
-
-        finally:
-            # 4. Restaurar la seleccion original
-            for node in nuke.allNodes():
-                node.setSelected(False)
-            for node in originally_selected_nodes:
-                if node and nuke.exists(node.name()):
-                    node.setSelected(True)
-                debug_print(
-                    f"Seleccion restaurada: {[n.name() for n in originally_selected_nodes if n]}"
-                )
-
-        if not os.path.exists(output_path):
-            nuke.message(
-                "Error: el archivo del snapshot no se generó. Por favor, verifica los permisos o la ruta temporal."
-            )
-            return
-
-        # Cargar el JPEG como QImage
-        qimage = QtGui.QImage(output_path)
-        if qimage.isNull():
-            nuke.message(
-                "Error al leer el snapshot generado. El archivo de imagen temporal está vacío o corrupto."
-            )
-            return
-
-        debug_print("Snapshot size:", qimage.width(), "×", qimage.height())
-
-        # Copiar al portapapeles
-        app = QApplication.instance()
-        if not app:
-            app = QApplication([])
+    # Se lee una sola vez: los mismos bytes van al portapapeles y a la galeria
+    with open(output_path, "rb") as handle:
+        data = handle.read()
+    qimage = QImage()
+    if not qimage.loadFromData(data, "JPG"):
+        nuke.message(
+            "Error al leer el snapshot generado. El archivo de imagen temporal está vacío o corrupto."
+        )
+        return
 
-        clipboard = app.clipboard()
-        clipboard.setImage(qimage)
+    debug_print("Snapshot size:", qimage.width(), "×", qimage.height())
 
-        debug_print("✅ Imagen copiada al portapapeles.")
+    # Copiar al portapapeles
+    app = QApplication.instance()
+    if not app:
+        app = QApplication([])
 
-        # Si se presiono Shift, guardar en la galeria
-        if save_to_gallery:
-            gallery_path = save_snapshot_to_gallery(output_path)
-            if gallery_path:
-                print(f"✅ Snapshot guardado en galeria con Shift")
-            else:
-                print(f"❌ Error al guardar en galeria")
+    clipboard = app.clipboard()
+    clipboard.setImage(qimage)
 
-        # Limpiar snapshots antiguos después del guardado exitoso
-        cleanup_old_snapshots(snapshot_number)
+    debug_print("✅ Imagen copiada al portapapeles.")
 
-        # NO eliminar el archivo temporal - lo necesitamos para show_snapshot()
-        debug_print(f"Archivo temporal mantenido para show_snapshot: {output_path}")
+    # Si se presiono Shift, guardar en la galeria
+    if save_to_gallery:
+        gallery_path = save_snapshot_to_gallery(output_path, data)
+        if gallery_path:
+            print(f"✅ Snapshot guardado en galeria con Shift")
+        else:
+            print(f"❌ Error al guardar en galeria")
 
-    finally:
-        # Restaurar el wav original si se cambio temporalmente
-        if render_complete_active and original_wav_path:
-            restore_original_wav(original_wav_path)
+    # Recordar este snapshot y eliminar el anterior. El archivo temporal se
+    # mantiene: lo necesita show_snapshot_hold()
+    remember_snapshot(snapshot_number, output_path)
+    debug_print(f"Archivo temporal mantenido para show_snapshot: {output_path}")
 
 
 def show_snapshot_hold(start):
@@ -633,13 +681,7 @@ def show_snapshot_hold(start):
         else:
             debug_print(f"Viewer activo: {view_node.name()}, sin nodo conectado")
 
-        # 3. Guardar estado original
-        originally_selected_nodes = list(nuke.selectedNodes())
-        debug_print(
-            f"Nodos originalmente seleccionados: {[n.name() for n in originally_selected_nodes]}"
-        )
-
-        # Obtener posicion para el nodo Read
+        # 3. Obtener posicion para el nodo Read
         viewer_node_xpos = view_node.xpos()
         viewer_node_ypos = view_node.ypos()
         input_node_xpos = viewer_node_xpos
@@ -652,19 +694,11 @@ def show_snapshot_hold(start):
 
         read_node = None
         try:
-            # 4. Deseleccionar todos los nodos y seleccionar el nodo conectado (si existe)
-            for node in nuke.allNodes():
-                node.setSelected(False)
-            if input_node:
-                input_node.setSelected(True)
-
-            # 5. Crear nodo Read temporal
+            # 4. Crear nodo Read temporal. Con nuke.nodes no hace falta
+            # deseleccionar todo el script: la seleccion no se toca
             safe_path = snapshot_path.replace("\\", "/")
-            read_node = nuke.createNode(
-                "Read",
-                f"file {{{safe_path}}} label 'LGA_SNAPSHOT_HOLD'",
-                inpanel=False,
-            )
+            read_node = nuke.nodes.Read(label="LGA_SNAPSHOT_HOLD")
+            read_node["file"].fromUserText(safe_path)
 
             # Posicionar el nodo Read
             read_node.setXpos(input_node_xpos)
@@ -674,7 +708,7 @@ def show_snapshot_hold(start):
                 f"Nodo Read creado: {read_node.name()} en posicion ({read_node.xpos()}, {read_node.ypos()})"
             )
 
-            # 6. Conectar el Read al viewer
+            # 5. Conectar el Read al viewer
             view_node.setInput(input_index, read_node)
             debug_print(f"Read conectado al viewer en input {input_index}")
             debug_print("✅ No se necesita reload - cada snapshot tiene nombre unico")
@@ -690,9 +724,6 @@ def show_snapshot_hold(start):
                 "original_input_node": input_node,
                 "viewer": view_node,
                 "input_index": input_index,
-                "originally_selected_nodes": list(
-                    originally_selected_nodes
-                ),  # Convertir a lista
             }
 
             print("🔽 HOLD SNAPSHOT: Mostrando snapshot")
@@ -723,7 +754,6 @@ def show_snapshot_hold(start):
                 input_node = state["original_input_node"]
                 view_node = state["viewer"]
                 input_index = state["input_index"]
-                originally_selected_nodes = state["originally_selected_nodes"]
 
                 # Verificar que el nodo Read aun existe
                 if read_node and nuke.exists(read_node.name()):
@@ -754,24 +784,6 @@ def show_snapshot_hold(start):
                     if app:
                         app.processEvents()
 
-                # Restaurar seleccion original
-                debug_print("🎯 Restaurando seleccion original...")
-                for node in nuke.allNodes():
-                    node.setSelected(False)
-                if originally_selected_nodes:
-                    for node in originally_selected_nodes:
-                        if node and nuke.exists(node.name()):
-                            node.setSelected(True)
-                    debug_print(
-                        f"Seleccion restaurada: {[n.name() for n in originally_selected_nodes if n]}"
-                    )
-                else:
-                    debug_print("No habia nodos seleccionados originalmente")
-
-                # CRÍTICO: Procesar eventos después de restaurar selección
-                if app:
-                    app.processEvents()
-
                 # Limpiar el estado
                 debug_print("🧹 Limpiando estado...")
                 _lga_snapshot_hold_state = None
@@ -88,27 +88,13 @@ def launch():
                 modifiers = app.keyboardModifiers()
                 shift_pressed = modifiers & QtCore.Qt.ShiftModifier
 
-                # Importar y ejecutar el script de snapshot
-                script_path = os.path.join(
-                    os.path.dirname(__file__), "LGA_viewer_SnapShot.py"
-                )
-                if os.path.exists(script_path):
-                    import importlib.util
+                # El mismo modulo que el menu y el boton Show: el Write de
+                # captura y el ultimo snapshot quedan en memoria entre tomas
+                import LGA_viewer_SnapShot
 
-                    spec = importlib.util.spec_from_file_location(
-                        "LGA_viewer_SnapShot", script_path
-                    )
-                    if spec and spec.loader:
-                        module = importlib.util.module_from_spec(spec)
-                        spec.loader.exec_module(module)
-
-                        # Llamar a la funcion take_snapshot del script con el parametro shift invertido
-                        # Sin shift = guarda en galeria, Con shift = NO guarda en galeria
-                        module.take_snapshot(save_to_gallery=not shift_pressed)
-                    else:
-                        nuke.message("Error: No se pudo cargar el modulo de SnapShot")
-                else:
-                    nuke.message(f"Error: Script no encontrado en {script_path}")
+                # Llamar a la funcion take_snapshot del script con el parametro shift invertido
+                # Sin shift = guarda en galeria, Con shift = NO guarda en galeria
+                LGA_viewer_SnapShot.take_snapshot(save_to_gallery=not shift_pressed)
             except Exception as e:
                 nuke.message(f"Error al ejecutar SnapShot: {str(e)}")
                 debug_print(f"Error en take_snapshot: {e}")
@@ -149,23 +135,11 @@ def launch():
         def _import_snapshot_module(self):
             """Importa el módulo de snapshot UNA SOLA VEZ"""
             try:
-                script_path = os.path.join(
-                    os.path.dirname(__file__), "LGA_viewer_SnapShot.py"
-                )
-                if os.path.exists(script_path):
-                    import importlib.util
+                # El mismo modulo que usa Take: conoce el ultimo snapshot
+                import LGA_viewer_SnapShot
 
-                    spec = importlib.util.spec_from_file_location(
-                        "LGA_viewer_SnapShot", script_path
-                    )
-                    if spec and spec.loader:
-                        self.snapshot_module = importlib.util.module_from_spec(spec)
-                        spec.loader.exec_module(self.snapshot_module)
-                        debug_print("✅ Módulo SnapShot importado correctamente")
-                    else:
-                        debug_print("❌ Error: No se pudo cargar el módulo de SnapShot")
-                else:
-                    debug_print(f"❌ Error: Script no encontrado en {script_path}")
+                self.snapshot_module = LGA_viewer_SnapShot
+                debug_print("✅ Módulo SnapShot importado correctamente")
             except Exception as e:
                 debug_print(f"❌ Error al importar módulo SnapShot: {str(e)}")
 
@@ -1,7 +1,7 @@
 """
 ___________________________________________________________________________________
 
-  LGA_viewer_SnapShot_Gallery v0.55 - Lega
+  LGA_viewer_SnapShot_Gallery v0.56 - Lega
   Crea una ventana que muestra los snapshots guardados organizados por proyecto
 
   v0.55 - El look sale de LGA_UI_Style_ToolPack: los tres grises de
@@ -11,6 +11,8 @@ ________________________________________________________________________________
   v0.53 - Shift click para revelar en explorador de archivos
         - Tooltips
   v0.54 - Thumb size persistente en config
+  v0.56 - El ini se lee y escribe con LGA_ToolPack_ConfigStore: abrir la
+          galeria ya no lo vuelve a parsear.
 ___________________________________________________________________________________
 
 """
@@ -21,9 +23,9 @@ import glob
 import shutil
 import subprocess  # Importar subprocess para abrir archivos en macOS/Linux
 import platform  # Importar platform para detectar el SO
-import configparser
 from LGA_QtAdapter_ToolPack import QtWidgets, QtCore, QtGui
 from LGA_UI_Style_ToolPack import SCROLLBAR, Color, Style
+import LGA_ToolPack_ConfigStore as config_store
 from LGA_tooltip_helper import (
     TOOLTIP_BG,
     TOOLTIP_PADDING_PX,
@@ -85,56 +87,26 @@ def get_user_config_dir():
     Obtiene el directorio de configuracion del usuario segun el sistema operativo.
     Usa la misma base que el resto de settings del ToolPack.
     """
-    system = platform.system()
-    if system == "Windows":
-        config_path = os.getenv("APPDATA")
-        if not config_path:
-            debug_print("Error: No se pudo encontrar la variable de entorno APPDATA.")
-            return None
-    elif system == "Darwin":
-        config_path = os.path.expanduser("~/Library/Application Support")
-    else:
-        config_path = os.path.expanduser("~/.config")
-        debug_print(
-            f"Sistema no reconocido ({system}), usando ~/.config como fallback."
-        )
-
-    return config_path
+    return config_store.get_user_config_dir()
 
 
 def get_config_path():
     """Devuelve la ruta completa al ini persistente de la galeria."""
-    try:
-        user_config_dir = get_user_config_dir()
-        if not user_config_dir:
-            return None
-        config_dir = os.path.join(user_config_dir, "LGA", "ToolPack")
-        return os.path.join(config_dir, CONFIG_FILE_NAME)
-    except Exception as e:
-        debug_print(f"Error al obtener la ruta de configuracion: {e}")
-        return None
+    return config_store.get_config_path(CONFIG_FILE_NAME)
 
 
 def ensure_config_exists():
     """Asegura que exista el ini de la galeria con defaults."""
     config_file_path = get_config_path()
-    if not config_file_path:
+    if not config_file_path or os.path.exists(config_file_path):
         return
-
-    config_dir = os.path.dirname(config_file_path)
     try:
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
-            debug_print(f"Directorio de configuracion creado: {config_dir}")
-
-        if not os.path.exists(config_file_path):
-            config = configparser.ConfigParser()
-            config[CONFIG_SECTION] = {
-                CONFIG_THUMBNAIL_SIZE_KEY: str(DEFAULT_THUMBNAIL_SIZE)
-            }
-            with open(config_file_path, "w", encoding="utf-8") as configfile:
-                config.write(configfile)
-            debug_print(f"Archivo de configuracion creado: {config_file_path}")
+        config_store.write_section(
+            config_file_path,
+            CONFIG_SECTION,
+            {CONFIG_THUMBNAIL_SIZE_KEY: str(DEFAULT_THUMBNAIL_SIZE)},
+        )
+        debug_print(f"Archivo de configuracion creado: {config_file_path}")
     except Exception as e:
         debug_print(f"Error al asegurar la configuracion: {e}")
 
@@ -148,16 +120,15 @@ def get_thumbnail_size_from_config():
     """Lee el tamaño persistente del slider o devuelve el default."""
     ensure_config_exists()
     config_file_path = get_config_path()
-    if not config_file_path or not os.path.exists(config_file_path):
+    if not config_file_path:
         return DEFAULT_THUMBNAIL_SIZE
 
-    config = configparser.ConfigParser()
     try:
-        config.read(config_file_path, encoding="utf-8")
-        value = config.getint(
+        value = config_store.get_value(
+            config_file_path,
             CONFIG_SECTION,
             CONFIG_THUMBNAIL_SIZE_KEY,
-            fallback=DEFAULT_THUMBNAIL_SIZE,
+            DEFAULT_THUMBNAIL_SIZE,
         )
         return clamp_thumbnail_size(value)
     except Exception as e:
@@ -171,24 +142,12 @@ def save_thumbnail_size_to_config(value):
     if not config_file_path:
         return False
 
-    config_dir = os.path.dirname(config_file_path)
     try:
-        if not os.path.exists(config_dir):
-            os.makedirs(config_dir)
-
-        config = configparser.ConfigParser()
-        if os.path.exists(config_file_path):
-            config.read(config_file_path, encoding="utf-8")
-        if not config.has_section(CONFIG_SECTION):
-            config.add_section(CONFIG_SECTION)
-
-        config.set(
+        config_store.write_section(
+            config_file_path,
             CONFIG_SECTION,
-            CONFIG_THUMBNAIL_SIZE_KEY,
-            str(clamp_thumbnail_size(value)),
+            {CONFIG_THUMBNAIL_SIZE_KEY: str(clamp_thumbnail_size(value))},
         )
-        with open(config_file_path, "w", encoding="utf-8") as configfile:
-            config.write(configfile)
         return True
     except Exception as e:
         debug_print(f"Error al guardar thumbnail_size en config: {e}")
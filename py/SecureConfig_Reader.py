@@ -1,13 +1,18 @@
 """
 ____________________________________________________________________
 
-  SecureConfig_Reader v1.02 | Lega
+  SecureConfig_Reader v1.03 | Lega
 
   Lee config.secure de PipeSync para credenciales/roles de Flow.
 
   v1.01: Copia local para LGA_ToolPack, usada por Show Flow Notes sin depender
          de HieroTools instalado/cargado.
   v1.02: Agrega trazas no sensibles para diagnosticar lectura de config.secure.
+  v1.03: La config desencriptada queda en memoria mientras config.secure y .key
+         no cambien de mtime ni de tamano: cada getter era abrir los dos
+         archivos, desencriptar y parsear el JSON otra vez. El XOR se hace
+         sobre el archivo entero como un solo entero, no byte por byte.
+         `python SecureConfig_Reader.py --benchmark` mide las dos cosas.
 ____________________________________________________________________
 
 Usado por runtime activo:
@@ -30,6 +35,8 @@ import sys
 import os
 import json
 import base64
+import copy
+import threading
 from pathlib import Path
 import hashlib
 
@@ -37,8 +44,13 @@ import hashlib
 # Variable global para activar o desactivar los prints de debug
 DEBUG = False
 
+# Las trazas van al log de Show Flow Notes. benchmark las apaga.
+_tracing = {"enabled": True}
+
 
 def _trace(*parts):
+    if not _tracing["enabled"]:
+        return
     try:
         log_path = Path(__file__).resolve().parents[1] / "logs" / "LGA_showFlowNotes.log"
         log_path.parent.mkdir(parents=True, exist_ok=True)
@@ -153,70 +165,123 @@ def get_encryption_key():
         return key
 
 
+def _xor(data, key):
+    """
+    XOR de `data` con `key` repetida. Los dos se toman como un solo entero y
+    el XOR lo hace Python en C de una vez, en lugar de un append por byte.
+    """
+    if not data:
+        return b""
+    repeats = len(data) // len(key) + 1
+    keystream = (key * repeats)[: len(data)]
+    value = int.from_bytes(data, "little") ^ int.from_bytes(keystream, "little")
+    return value.to_bytes(len(data), "little")
+
+
 def decrypt(encrypted_text, key):
     """Desencripta un texto usando XOR con la clave proporcionada."""
     if not encrypted_text:
         return ""
 
     try:
-        # Decodificar de base64
+        # Decodificar de base64 y desencriptar usando XOR
         encrypted_data = base64.b64decode(encrypted_text)
-
-        # Desencriptar usando XOR
-        decrypted_data = bytearray()
-        for i in range(len(encrypted_data)):
-            decrypted_data.append(encrypted_data[i] ^ key[i % len(key)])
-
-        result = decrypted_data.decode("utf-8")
+        result = _xor(encrypted_data, bytes(key)).decode("utf-8")
         return result
     except Exception as e:
         debug_print(f"[SecureConfig_Reader::decrypt] Error al desencriptar: {str(e)}")
         return ""
 
 
-def read_secure_config():
-    """Lee la configuración segura y devuelve un diccionario con los valores."""
+def _stamp(path):
     try:
-        _trace("read_secure_config started")
-        config_path = get_config_path()
-        _trace("config_path=", config_path, "exists=", config_path.exists())
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+# {(config_path, key_path): ((stamp config, stamp key), config o None)}
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def clear_cache():
+    """Olvida la config en memoria: la proxima lectura vuelve al disco."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _load_secure_config(config_path, key_path):
+    """Lee, desencripta y parsea config.secure. None si no se puede."""
+    _trace("config_path=", config_path, "exists=", config_path.exists())
+    debug_print(
+        f"[SecureConfig_Reader::read_secure_config] Ruta de configuración segura: {config_path}"
+    )
+
+    if not config_path.exists():
         debug_print(
-            f"[SecureConfig_Reader::read_secure_config] Ruta de configuración segura: {config_path}"
+            f"[SecureConfig_Reader::read_secure_config] Archivo de configuración segura no encontrado en: {config_path}"
         )
+        return None
 
-        if not config_path.exists():
-            debug_print(
-                f"[SecureConfig_Reader::read_secure_config] Archivo de configuración segura no encontrado en: {config_path}"
-            )
-            return None
+    # Obtener la clave de encriptación
+    _trace("getting encryption key")
+    if key_path.exists():
+        with open(key_path, "rb") as f:
+            key = f.read()
+    else:
+        key = generate_key()
+    _trace("encryption key length=", len(key) if key else 0)
 
-        # Obtener la clave de encriptación
-        _trace("getting encryption key")
-        key = get_encryption_key()
-        _trace("encryption key length=", len(key) if key else 0)
+    # Leer el archivo encriptado
+    _trace("reading encrypted config")
+    with open(config_path, "r") as f:
+        encrypted_data = f.read()
+    _trace("encrypted config chars=", len(encrypted_data))
+
+    # Desencriptar el contenido
+    _trace("decrypting config")
+    json_data = decrypt(encrypted_data, key)
+
+    if not json_data:
+        _trace("decrypt failed or returned empty")
+        debug_print(
+            f"[SecureConfig_Reader::read_secure_config] No se pudo desencriptar la configuración"
+        )
+        return None
 
-        # Leer el archivo encriptado
-        _trace("reading encrypted config")
-        with open(config_path, "r") as f:
-            encrypted_data = f.read()
-        _trace("encrypted config chars=", len(encrypted_data))
+    # Parsear el JSON
+    config = json.loads(json_data)
+    _trace("config parsed", "sections=", list(config.keys()) if isinstance(config, dict) else type(config))
+    # Comentado temporalmente este log. NO BORRAR!
+    # debug_print(f"Contenido de la configuración: {json.dumps(config, indent=2)}")
+    return config
 
-        # Desencriptar el contenido
-        _trace("decrypting config")
-        json_data = decrypt(encrypted_data, key)
 
-        if not json_data:
-            _trace("decrypt failed or returned empty")
-            debug_print(
-                f"[SecureConfig_Reader::read_secure_config] No se pudo desencriptar la configuración"
-            )
-            return None
+def _cached_config(config_path=None, key_path=None):
+    """
+    La config desencriptada, compartida: no modificarla. Se vuelve a leer
+    solo si config.secure o .key cambiaron de mtime o de tamano, o si la
+    lectura anterior fallo.
+    """
+    try:
+        config_path = config_path or get_config_path()
+        key_path = key_path or get_key_path()
+        cache_key = (str(config_path), str(key_path))
+        stamps = (_stamp(config_path), _stamp(key_path))
+        with _cache_lock:
+            entry = _cache.get(cache_key)
+        if entry is not None and entry[0] == stamps:
+            return entry[1]
 
-        # Parsear el JSON
-        config = json.loads(json_data)
-        _trace("config parsed", "sections=", list(config.keys()) if isinstance(config, dict) else type(config))
-        # Comentado temporalmente este log. NO BORRAR!
-        # debug_print(f"Contenido de la configuración: {json.dumps(config, indent=2)}")
+        _trace("read_secure_config started")
+        config = _load_secure_config(config_path, key_path)
+        if config is not None or stamps[0] is None:
+            # Un archivo que no existe tambien se recuerda; un fallo al
+            # desencriptar o parsear no, asi se reintenta en la proxima
+            with _cache_lock:
+                _cache[cache_key] = (stamps, config)
         return config
 
     except Exception as e:
@@ -230,10 +295,18 @@ def read_secure_config():
         return None
 
 
+def read_secure_config():
+    """
+    Lee la configuración segura y devuelve un diccionario con los valores.
+    Es una copia: quien la modifica no toca la de memoria.
+    """
+    return copy.deepcopy(_cached_config())
+
+
 def get_flow_credentials():
     """Obtiene las credenciales de Flow desde la configuración segura."""
     _trace("get_flow_credentials started")
-    config = read_secure_config()
+    config = _cached_config()
 
     if not config:
         _trace("get_flow_credentials no config")
@@ -266,7 +339,7 @@ def get_flow_credentials():
 
 def get_s3_credentials():
     """Obtiene las credenciales de Wasabi S3 desde la configuración segura."""
-    config = read_secure_config()
+    config = _cached_config()
 
     if not config:
         debug_print(
@@ -297,7 +370,7 @@ def get_s3_connection_limits():
     Returns:
         int: Número máximo de conexiones. Por defecto 30 si no está configurado.
     """
-    config = read_secure_config()
+    config = _cached_config()
 
     if not config:
         debug_print(
@@ -342,7 +415,7 @@ def get_s3_download_connection_limit():
     Returns:
         int: Número máximo de conexiones de descarga. Por defecto 30 si no está configurado o es inválido.
     """
-    config = read_secure_config()
+    config = _cached_config()
     default_limit = 30  # Coincide con el default en C++
 
     if not config:
@@ -388,7 +461,7 @@ def get_s3_upload_connection_limit():
     Returns:
         int: Número máximo de conexiones de subida. Por defecto 10 si no está configurado o es inválido.
     """
-    config = read_secure_config()
+    config = _cached_config()
     default_limit = 10  # Cambio: Nuevo máximo permitido
 
     if not config:
@@ -463,6 +536,7 @@ def save_flow_permission_group(permission_group):
         config_path = get_config_path()
         with open(config_path, "w") as f:
             f.write(encrypted_data)
+        clear_cache()
 
         debug_print(
             f"[SecureConfig_Reader::save_flow_permission_group] Grupo de permisos '{permission_group}' guardado en la configuración"
@@ -486,10 +560,7 @@ def encrypt(text, key):
 
     try:
         # Encriptar usando XOR
-        encrypted_data = bytearray()
-        text_bytes = text.encode("utf-8")
-        for i in range(len(text_bytes)):
-            encrypted_data.append(text_bytes[i] ^ key[i % len(key)])
+        encrypted_data = _xor(text.encode("utf-8"), bytes(key))
 
         # Codificar en base64
         result = base64.b64encode(encrypted_data).decode("utf-8")
@@ -499,8 +570,75 @@ def encrypt(text, key):
         return ""
 
 
+def benchmark(rounds=200):
+    """
+    Mide, con un config.secure sintetico en una carpeta temporal, la lectura
+    en frio -abrir, desencriptar, parsear-, la lectura con cache y el XOR
+    contra el loop byte por byte que se usaba antes.
+    """
+    import tempfile
+    import time
+
+    config = {
+        "Flow": {
+            "Url": "https://studio.shotgrid.autodesk.com",
+            "Login": "user",
+            "Password": "x" * 32,
+            "SpecialRoles": "Reviewer, Supervisor",
+        },
+        "Wasabi": {
+            "AccessKey": "A" * 20,
+            "SecretKey": "S" * 40,
+            "Endpoint": "https://s3.wasabisys.com",
+            "Region": "us-east-1",
+            "Connections": 30,
+        },
+        "Projects": [{"Name": "Project%03d" % i, "Path": "/mnt/p/%03d" % i} for i in range(100)],
+    }
+    key = generate_key()
+
+    def xor_per_byte(data):
+        result = bytearray()
+        for i in range(len(data)):
+            result.append(data[i] ^ key[i % len(key)])
+        return bytes(result)
+
+    _tracing["enabled"] = False
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            config_path = Path(folder) / "config.secure"
+            key_path = Path(folder) / ".key"
+            key_path.write_bytes(key)
+            config_path.write_text(encrypt(json.dumps(config), key))
+            data = base64.b64decode(config_path.read_text())
+
+            def timed(function):
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    function()
+                return (time.perf_counter() - start) / rounds * 1e6
+
+            results = {
+                "bytes": len(data),
+                "xor_per_byte_us": timed(lambda: xor_per_byte(data)),
+                "xor_us": timed(lambda: _xor(data, key)),
+                "cold_read_us": timed(lambda: _load_secure_config(config_path, key_path)),
+            }
+            _cached_config(config_path, key_path)
+            results["cached_read_us"] = timed(lambda: _cached_config(config_path, key_path))
+            assert _cached_config(config_path, key_path) == config
+            assert xor_per_byte(data) == _xor(data, key)
+    finally:
+        _tracing["enabled"] = True
+        clear_cache()
+    return results
+
+
 # Función principal para pruebas
-if __name__ == "__main__":
+if __name__ == "__main__" and "--benchmark" in sys.argv:
+    for name, value in benchmark().items():
+        print(f"{name}: {value:.1f}" if isinstance(value, float) else f"{name}: {value}")
+elif __name__ == "__main__":
     debug_print("[SecureConfig_Reader::main] Iniciando lectura de configuración segura")
 
     url, login, password = get_flow_credentials()